@@ -11,6 +11,9 @@ from ..exceptions import TimeoutError
 class BaseConnection(ABC):
     """Abstract base class for all connection types"""
     
+    # Lets subclasses that declare __slots__ drop the per-instance __dict__
+    __slots__ = ()
+    
     def __init__(self, host: str, username: str, password: Optional[str] = None,
                  key_filename: Optional[str] = None, port: Optional[int] = None,
                  timeout: int = 30):
@@ -3,17 +3,47 @@ Kubernetes connection handler with modern client libraries
 """
 
 import os
+import json
 import yaml
-import asyncio
+import hashlib
+import threading
 from typing import Dict, Any, Optional, List, Union, Tuple
 from pathlib import Path
 from kubernetes import client, config
 from kubernetes.client.rest import ApiException
 from kubernetes_asyncio import client as async_client, config as async_config
+from kubernetes_asyncio.client.exceptions import ApiException as AsyncApiException
+from kubernetes_asyncio.stream import WsApiClient
+from kubernetes_asyncio.stream.ws_client import STDOUT_CHANNEL, STDERR_CHANNEL, ERROR_CHANNEL
 from .base import BaseConnection
 from ..exceptions import ConnectionError, AuthenticationError
 
 
+# Keep-alive connections per API client; the kubernetes client default is cpu_count
+CONNECTION_POOL_MAXSIZE = max(64, (os.cpu_count() or 1) * 4)
+
+# API clients shared by connections with identical credentials, keyed by config digest
+_API_CLIENTS: Dict[str, client.ApiClient] = {}
+_API_CLIENTS_LOCK = threading.Lock()
+
+
+def _exec_exit_code(status: bytes) -> int:
+    """Exit code from an exec status frame: 0 on Success, else the ExitCode cause or 1"""
+    try:
+        data = json.loads(status)
+    except ValueError:
+        return 1
+    if data.get("status") == "Success":
+        return 0
+    for cause in (data.get("details") or {}).get("causes") or []:
+        if cause.get("reason") == "ExitCode":
+            try:
+                return int(cause.get("message"))
+            except (TypeError, ValueError):
+                break
+    return 1
+
+
 class KubernetesConnection(BaseConnection):
     """Modern Kubernetes connection handler with sync/async support"""
     
@@ -54,16 +84,22 @@ class KubernetesConnection(BaseConnection):
         self.verify_ssl = verify_ssl
         
         # Client instances
+        self.api_client = None  # Shared, pooled HTTP client behind the APIs below
         self.v1 = None  # Core API
         self.apps_v1 = None  # Apps API (Deployments, etc.)
         self.networking_v1 = None  # Networking API (NetworkPolicies)
+        self.batch_v1 = None  # Batch API (Jobs, CronJobs)
+        self.autoscaling_v2 = None  # Autoscaling API (HPAs)
         self.custom_objects_v1 = None  # Custom Resources
         
         # Async client instances
+        self.async_api_client = None  # Pooled aiohttp session behind the async APIs below
         self.async_v1 = None
         self.async_apps_v1 = None
         self.async_networking_v1 = None
         self.async_custom_objects_v1 = None
+        self.async_ws_client = None  # Websocket client for pod exec, created on first exec
+        self.async_exec_v1 = None
         
         self._connected = False
         self._cluster_info = {}
@@ -125,10 +161,29 @@ class KubernetesConnection(BaseConnection):
     
     def _initialize_clients(self) -> None:
         """Initialize all Kubernetes API clients"""
-        self.v1 = client.CoreV1Api()
-        self.apps_v1 = client.AppsV1Api()
-        self.networking_v1 = client.NetworkingV1Api()
-        self.custom_objects_v1 = client.CustomObjectsApi()
+        self.api_client = self._get_shared_api_client()
+        self.v1 = client.CoreV1Api(self.api_client)
+        self.apps_v1 = client.AppsV1Api(self.api_client)
+        self.networking_v1 = client.NetworkingV1Api(self.api_client)
+        self.batch_v1 = client.BatchV1Api(self.api_client)
+        self.autoscaling_v2 = client.AutoscalingV2Api(self.api_client)
+        self.custom_objects_v1 = client.CustomObjectsApi(self.api_client)
+    
+    def _get_shared_api_client(self) -> client.ApiClient:
+        """Return the pooled API client for the loaded credentials, creating it once"""
+        configuration = client.Configuration.get_default_copy()
+        identity = repr((configuration.host, sorted(configuration.api_key.items()),
+                         configuration.cert_file, configuration.key_file,
+                         configuration.ssl_ca_cert, configuration.verify_ssl))
+        key = hashlib.sha256(identity.encode()).hexdigest()
+        
+        with _API_CLIENTS_LOCK:
+            api_client = _API_CLIENTS.get(key)
+            if api_client is None:
+                configuration.connection_pool_maxsize = CONNECTION_POOL_MAXSIZE
+                api_client = client.ApiClient(configuration)
+                _API_CLIENTS[key] = api_client
+        return api_client
     
     async def _initialize_async_clients(self) -> None:
         """Initialize async Kubernetes API clients"""
@@ -137,10 +192,15 @@ class KubernetesConnection(BaseConnection):
         else:
             await self._connect_async_kubeconfig()
         
-        self.async_v1 = async_client.CoreV1Api()
-        self.async_apps_v1 = async_client.AppsV1Api()
-        self.async_networking_v1 = async_client.NetworkingV1Api()
-        self.async_custom_objects_v1 = async_client.CustomObjectsApi()
+        # One aiohttp session behind all async APIs; sessions are bound to the
+        # running event loop, so unlike the sync client it is not process-wide
+        configuration = async_client.Configuration.get_default_copy()
+        configuration.connection_pool_maxsize = CONNECTION_POOL_MAXSIZE
+        self.async_api_client = async_client.ApiClient(configuration)
+        self.async_v1 = async_client.CoreV1Api(self.async_api_client)
+        self.async_apps_v1 = async_client.AppsV1Api(self.async_api_client)
+        self.async_networking_v1 = async_client.NetworkingV1Api(self.async_api_client)
+        self.async_custom_objects_v1 = async_client.CustomObjectsApi(self.async_api_client)
     
     async def _connect_async_direct(self) -> None:
         """Connect async client using direct API server credentials"""
@@ -171,7 +231,7 @@ class KubernetesConnection(BaseConnection):
         """Verify connection by fetching cluster information"""
         try:
             # Get cluster version
-            version_info = client.VersionApi().get_code()
+            version_info = client.VersionApi(self.api_client).get_code()
             
             # Get node information
             nodes = self.v1.list_node()
@@ -191,19 +251,34 @@ class KubernetesConnection(BaseConnection):
     
     def disconnect(self) -> None:
         """Disconnect from Kubernetes cluster"""
+        # The API client stays open for other connections sharing it
+        self.api_client = None
         self.v1 = None
         self.apps_v1 = None
         self.networking_v1 = None
+        self.batch_v1 = None
+        self.autoscaling_v2 = None
         self.custom_objects_v1 = None
         
+        self.async_api_client = None
         self.async_v1 = None
         self.async_apps_v1 = None
         self.async_networking_v1 = None
         self.async_custom_objects_v1 = None
+        self.async_ws_client = None
+        self.async_exec_v1 = None
         
         self._connected = False
         self._cluster_info = {}
     
+    async def disconnect_async(self) -> None:
+        """Close the async API sessions, then disconnect"""
+        if self.async_api_client is not None:
+            await self.async_api_client.close()
+        if self.async_ws_client is not None:
+            await self.async_ws_client.close()
+        self.disconnect()
+    
     def is_connected(self) -> bool:
         """Check if connection is active"""
         if not self._connected or not self.v1:
@@ -278,11 +353,24 @@ class KubernetesConnection(BaseConnection):
         except Exception as e:
             return "", f"Command execution error: {str(e)}", 1
     
-    async def execute_command_async(self, command: str, **kwargs) -> Tuple[str, str, int]:
-        """Async version of execute_command"""
+    async def get_async_v1(self) -> async_client.CoreV1Api:
+        """Return the async Core API client, initializing the async clients on first use"""
         if not self.async_v1:
             await self._initialize_async_clients()
-        
+        return self.async_v1
+    
+    async def _get_async_exec_v1(self) -> async_client.CoreV1Api:
+        """Return a Core API bound to the websocket client, creating it on first use"""
+        if not self.async_exec_v1:
+            await self.get_async_v1()
+            # Exec streams are independent websockets, so concurrent execs
+            # share this client's session without blocking each other
+            self.async_ws_client = WsApiClient(self.async_api_client.configuration)
+            self.async_exec_v1 = async_client.CoreV1Api(self.async_ws_client)
+        return self.async_exec_v1
+    
+    async def execute_command_async(self, command: str, **kwargs) -> Tuple[str, str, int]:
+        """Async version of execute_command over a kubernetes_asyncio exec websocket"""
         pod_name = kwargs.get('pod_name')
         container = kwargs.get('container')
         namespace = kwargs.get('namespace', self.namespace)
@@ -290,10 +378,44 @@ class KubernetesConnection(BaseConnection):
         if not pod_name:
             raise ValueError("pod_name is required for Kubernetes command execution")
         
-        # Implementation would use kubernetes-asyncio stream
-        # For now, we'll run the sync version in an executor
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self.execute_command, command, **kwargs)
+        try:
+            v1 = await self._get_async_exec_v1()
+            ws_request = await v1.connect_get_namespaced_pod_exec(
+                pod_name,
+                namespace,
+                command=['/bin/sh', '-c', command],
+                container=container,
+                stderr=True,
+                stdin=False,
+                stdout=True,
+                tty=False,
+                _preload_content=False
+            )
+            
+            # Raw bytes per channel; a multi-byte character may span two frames
+            channels = {STDOUT_CHANNEL: bytearray(), STDERR_CHANNEL: bytearray(), ERROR_CHANNEL: bytearray()}
+            
+            async with ws_request as ws:
+                async for message in ws:
+                    # Each frame is a channel byte followed by its payload
+                    frame = message.data
+                    if len(frame) >= 2 and frame[0] in channels:
+                        channels[frame[0]] += frame[1:]
+            
+            stdout = channels[STDOUT_CHANNEL].decode('utf-8', errors='replace')
+            stderr = channels[STDERR_CHANNEL].decode('utf-8', errors='replace')
+            exit_code = _exec_exit_code(bytes(channels[ERROR_CHANNEL])) if channels[ERROR_CHANNEL] else None
+            
+            # Fall back to the sync heuristic if the status frame never arrived
+            if exit_code is None:
+                exit_code = 1 if stderr else 0
+            
+            return stdout, stderr, exit_code
+            
+        except AsyncApiException as e:
+            return "", f"Kubernetes API error: {str(e)}", 1
+        except Exception as e:
+            return "", f"Command execution error: {str(e)}", 1
     
     def upload_file(self, local_path: str, remote_path: str, **kwargs) -> bool:
         """
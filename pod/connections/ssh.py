@@ -10,6 +10,9 @@ from .base import BaseConnection
 from ..exceptions import ConnectionError, AuthenticationError, TimeoutError
 
 
+# Seconds between keepalive packets so idle NAT/firewall state doesn't drop the session
+SSH_KEEPALIVE_INTERVAL = 30
+
 class SSHConnection(BaseConnection):
     """SSH connection for Linux and Unix-like systems"""
     
@@ -49,6 +52,10 @@ class SSHConnection(BaseConnection):
                 connect_kwargs['password'] = self.password
                 
             self._client.connect(**connect_kwargs)
+            # Commands open channels on this one transport, so keep it alive between them
+            transport = self._client.get_transport()
+            if transport:
+                transport.set_keepalive(SSH_KEEPALIVE_INTERVAL)
             self._connected = True
             
         except paramiko.AuthenticationException as e:
@@ -70,10 +77,18 @@ class SSHConnection(BaseConnection):
             
         self._connected = False
     
+    def _ensure_connected(self) -> None:
+        """Re-establish a session whose transport dropped after a successful connect"""
+        if self.is_connected():
+            return
+        if not self._client:
+            raise ConnectionError("Not connected")
+        self.disconnect()
+        self.connect()
+    
     def execute_command(self, command: str, timeout: Optional[int] = None) -> Tuple[str, str, int]:
         """Execute command over SSH"""
-        if not self.is_connected():
-            raise ConnectionError("Not connected")
+        self._ensure_connected()
             
         timeout = timeout or self.timeout
         
@@ -120,8 +135,7 @@ class SSHConnection(BaseConnection):
     
     def upload_file(self, local_path: str, remote_path: str) -> bool:
         """Upload file via SFTP"""
-        if not self.is_connected():
-            raise ConnectionError("Not connected")
+        self._ensure_connected()
             
         try:
             if not self._sftp:
@@ -135,8 +149,7 @@ class SSHConnection(BaseConnection):
     
     def download_file(self, remote_path: str, local_path: str) -> bool:
         """Download file via SFTP"""
-        if not self.is_connected():
-            raise ConnectionError("Not connected")
+        self._ensure_connected()
             
         try:
             if not self._sftp:
@@ -3,20 +3,77 @@ Advanced Kubernetes workload management
 """
 
 import time
-import yaml
-from typing import Dict, Any, List, Optional, Tuple
+import asyncio
+import threading
+from functools import cached_property
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from kubernetes.client.rest import ApiException
 from ...connections.kubernetes import KubernetesConnection
 from ...network.cni import CNIManager, CNIConfig
 from ...exceptions import ProviderError
+from ...utils.executor import run_in_executor
+
+
+_ENV_NAME = "name"
+_ENV_VALUE = "value"
+
+
+def _env_list(env_vars: Dict[str, str]) -> List[Dict[str, str]]:
+    """Convert an environment mapping into container env entries"""
+    return [{_ENV_NAME: k, _ENV_VALUE: v} for k, v in env_vars.items()]
+
+
+def _utilization_metric(resource: str, percent: int) -> Dict[str, Any]:
+    """Build an HPA resource utilization metric"""
+    return {
+        "type": "Resource",
+        "resource": {
+            "name": resource,
+            "target": {
+                "type": "Utilization",
+                "averageUtilization": percent
+            }
+        }
+    }
 
 
 class WorkloadManager:
     """Advanced workload management with enterprise features"""
     
-    def __init__(self, connection: KubernetesConnection):
+    def __init__(self, connection: KubernetesConnection, warmup: bool = False):
         self.k8s = connection
         self.cni_manager = CNIManager(connection)
+        
+        self._warmup_thread = None
+        if warmup:
+            self._warmup_thread = threading.Thread(target=self._warmup_clients, daemon=True)
+            self._warmup_thread.start()
+    
+    # CNI detection is fixed for the lifetime of the manager, so the network setup
+    # path is resolved once, on the first workload that needs it
+    @cached_property
+    def _multus_enabled(self) -> bool:
+        """Whether Multus is installed, detected on first access"""
+        return self.cni_manager.detected_cnis.get("multus", False)
+    
+    @cached_property
+    def _vlan_handler(self) -> Optional[Callable[[CNIConfig, str], Any]]:
+        """VLAN isolation step for the detected CNI, resolved on first access"""
+        detected = self.cni_manager.detected_cnis
+        vlan_cni = next((cni for cni in ("calico", "cilium") if detected.get(cni)), None)
+        return {
+            "calico": self._apply_calico_ip_pool,
+            "cilium": self._apply_cilium_policy
+        }.get(vlan_cni)
+    
+    def _warmup_clients(self) -> None:
+        """Prime API discovery and the connection pool before the first create call"""
+        for api in (self.k8s.v1, self.k8s.apps_v1, self.k8s.batch_v1, self.k8s.autoscaling_v2):
+            try:
+                api.get_api_resources()
+            except Exception:
+                # Warmup is best effort; real calls surface their own errors
+                pass
     
     def create_advanced_deployment(self, 
                                  name: str,
@@ -61,15 +118,9 @@ class WorkloadManager:
                 "limits": {"memory": "128Mi", "cpu": "100m"}
             }
         
-        # Default labels
-        if not labels:
-            labels = {"app": name}
-        else:
-            labels.update({"app": name})
-        
-        # Default annotations
-        if not annotations:
-            annotations = {}
+        # Copy labels and annotations so the caller's dicts are never mutated
+        labels = {**(labels or {}), "app": name}
+        annotations = dict(annotations or {})
         
         # Setup network configuration
         if network_config:
@@ -88,9 +139,7 @@ class WorkloadManager:
         
         # Add environment variables
         if env_vars:
-            container_spec["env"] = [
-                {"name": k, "value": v} for k, v in env_vars.items()
-            ]
+            container_spec["env"] = _env_list(env_vars)
         
         # Add volume mounts
         if volume_mounts:
@@ -167,41 +216,43 @@ class WorkloadManager:
     
     def _setup_network_configuration(self, config: CNIConfig, namespace: str) -> None:
         """Setup advanced network configuration"""
-        if self.cni_manager.detected_cnis["multus"]:
+        if self._multus_enabled:
             # Create NetworkAttachmentDefinition
             net_attachment = self.cni_manager.create_network_attachment_definition(config)
             net_attachment["metadata"]["namespace"] = namespace
             self.cni_manager.apply_network_configuration(net_attachment)
         
         # Setup VLAN isolation
-        if config.vlan_id:
-            if self.cni_manager.detected_cnis["calico"]:
-                # Create Calico IP Pool
-                ip_pool = self.cni_manager.create_calico_ip_pool(
-                    name=f"vlan-{config.vlan_id}-pool",
-                    cidr=config.subnet or f"192.168.{config.vlan_id}.0/24",
-                    vlan_id=config.vlan_id
-                )
-                self.cni_manager.apply_network_configuration(ip_pool)
-            
-            elif self.cni_manager.detected_cnis["cilium"]:
-                # Create Cilium Network Policy
-                policy = self.cni_manager.create_cilium_network_policy(
-                    name=f"vlan-{config.vlan_id}-isolation",
-                    namespace=namespace,
-                    endpoint_selector={f"vlan-{config.vlan_id}": "true"},
-                    ingress_rules=[{
-                        "fromEndpoints": [{
-                            "matchLabels": {f"vlan-{config.vlan_id}": "true"}
-                        }]
-                    }],
-                    egress_rules=[{
-                        "toEndpoints": [{
-                            "matchLabels": {f"vlan-{config.vlan_id}": "true"}
-                        }]
-                    }]
-                )
-                self.cni_manager.apply_network_configuration(policy)
+        if config.vlan_id and self._vlan_handler:
+            self._vlan_handler(config, namespace)
+    
+    def _apply_calico_ip_pool(self, config: CNIConfig, namespace: str) -> None:
+        """Create Calico IP Pool for VLAN isolation"""
+        ip_pool = self.cni_manager.create_calico_ip_pool(
+            name=f"vlan-{config.vlan_id}-pool",
+            cidr=config.subnet or f"192.168.{config.vlan_id}.0/24",
+            vlan_id=config.vlan_id
+        )
+        self.cni_manager.apply_network_configuration(ip_pool)
+    
+    def _apply_cilium_policy(self, config: CNIConfig, namespace: str) -> None:
+        """Create Cilium Network Policy for VLAN isolation"""
+        policy = self.cni_manager.create_cilium_network_policy(
+            name=f"vlan-{config.vlan_id}-isolation",
+            namespace=namespace,
+            endpoint_selector={f"vlan-{config.vlan_id}": "true"},
+            ingress_rules=[{
+                "fromEndpoints": [{
+                    "matchLabels": {f"vlan-{config.vlan_id}": "true"}
+                }]
+            }],
+            egress_rules=[{
+                "toEndpoints": [{
+                    "matchLabels": {f"vlan-{config.vlan_id}": "true"}
+                }]
+            }]
+        )
+        self.cni_manager.apply_network_configuration(policy)
     
     def create_statefulset_with_storage(self,
                                       name: str,
@@ -216,10 +267,7 @@ class WorkloadManager:
                                       labels: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """Create StatefulSet with persistent storage"""
         
-        if not labels:
-            labels = {"app": name}
-        else:
-            labels.update({"app": name})
+        labels = {**(labels or {}), "app": name}
         
         if not resources:
             resources = {
@@ -314,10 +362,7 @@ class WorkloadManager:
                    labels: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """Create a Kubernetes Job"""
         
-        if not labels:
-            labels = {"app": name, "type": "job"}
-        else:
-            labels.update({"app": name, "type": "job"})
+        labels = {**(labels or {}), "app": name, "type": "job"}
         
         if not resources:
             resources = {
@@ -334,9 +379,7 @@ class WorkloadManager:
         }
         
         if env_vars:
-            container_spec["env"] = [
-                {"name": k, "value": v} for k, v in env_vars.items()
-            ]
+            container_spec["env"] = _env_list(env_vars)
         
         job = {
             "apiVersion": "batch/v1",
@@ -391,10 +434,7 @@ class WorkloadManager:
                        labels: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """Create a Kubernetes CronJob"""
         
-        if not labels:
-            labels = {"app": name, "type": "cronjob"}
-        else:
-            labels.update({"app": name, "type": "cronjob"})
+        labels = {**(labels or {}), "app": name, "type": "cronjob"}
         
         if not resources:
             resources = {
@@ -410,9 +450,7 @@ class WorkloadManager:
         }
         
         if env_vars:
-            container_spec["env"] = [
-                {"name": k, "value": v} for k, v in env_vars.items()
-            ]
+            container_spec["env"] = _env_list(env_vars)
         
         cronjob_spec = {
             "schedule": schedule,
@@ -464,6 +502,48 @@ class WorkloadManager:
         except ApiException as e:
             raise ProviderError(f"Failed to create CronJob: {str(e)}")
     
+    async def create_advanced_deployment_async(self, name: str, image: str, **kwargs) -> Dict[str, Any]:
+        """Async version of create_advanced_deployment"""
+        return await run_in_executor(self.create_advanced_deployment, name, image, **kwargs)
+    
+    async def create_statefulset_with_storage_async(self, name: str, image: str, **kwargs) -> Dict[str, Any]:
+        """Async version of create_statefulset_with_storage"""
+        return await run_in_executor(self.create_statefulset_with_storage, name, image, **kwargs)
+    
+    async def create_job_async(self, name: str, image: str, command: List[str], **kwargs) -> Dict[str, Any]:
+        """Async version of create_job"""
+        return await run_in_executor(self.create_job, name, image, command, **kwargs)
+    
+    async def create_cronjob_async(self, name: str, image: str, command: List[str],
+                                   schedule: str, **kwargs) -> Dict[str, Any]:
+        """Async version of create_cronjob"""
+        return await run_in_executor(self.create_cronjob, name, image, command, schedule, **kwargs)
+    
+    async def create_many_async(self, specs: List[Dict[str, Any]],
+                                workload_type: str = "deployment") -> List[Dict[str, Any]]:
+        """
+        Create many workloads of the same type concurrently
+        
+        Args:
+            specs: Keyword arguments for each workload creation call
+            workload_type: Type of workload (deployment, statefulset, job, cronjob)
+        
+        Returns:
+            Creation results in the same order as specs
+        """
+        create_methods = {
+            "deployment": self.create_advanced_deployment_async,
+            "statefulset": self.create_statefulset_with_storage_async,
+            "job": self.create_job_async,
+            "cronjob": self.create_cronjob_async
+        }
+        
+        if workload_type not in create_methods:
+            raise ProviderError(f"Unsupported workload type: {workload_type}")
+        
+        create = create_methods[workload_type]
+        return await asyncio.gather(*(create(**spec) for spec in specs))
+    
     def update_deployment_image(self, name: str, new_image: str, namespace: str = "default") -> bool:
         """Update deployment container image"""
         try:
@@ -490,24 +570,25 @@ class WorkloadManager:
     
     def rollback_deployment(self, name: str, namespace: str = "default", revision: Optional[int] = None) -> bool:
         """Rollback deployment to previous or specific revision"""
+        # Patch only the rollback annotation; a merge patch creates the
+        # annotations map if missing without clobbering existing entries
+        patch = {
+            "spec": {
+                "template": {
+                    "metadata": {
+                        "annotations": {
+                            "deployment.kubernetes.io/rollback": str(revision or "")
+                        }
+                    }
+                }
+            }
+        }
+        
         try:
-            # Get deployment
-            deployment = self.k8s.apps_v1.read_namespaced_deployment(
-                name=name,
-                namespace=namespace
-            )
-            
-            # Trigger rollback by updating annotation
-            if not deployment.spec.template.metadata.annotations:
-                deployment.spec.template.metadata.annotations = {}
-            
-            deployment.spec.template.metadata.annotations["deployment.kubernetes.io/rollback"] = str(revision or "")
-            
-            # Apply rollback
             self.k8s.apps_v1.patch_namespaced_deployment(
                 name=name,
                 namespace=namespace,
-                body=deployment
+                body=patch
             )
             
             return True
@@ -522,37 +603,80 @@ class WorkloadManager:
                 name=name,
                 namespace=namespace
             )
-            
-            status = {
-                "name": name,
-                "namespace": namespace,
-                "replicas": {
-                    "desired": deployment.spec.replicas,
-                    "current": deployment.status.replicas or 0,
-                    "ready": deployment.status.ready_replicas or 0,
-                    "available": deployment.status.available_replicas or 0,
-                    "unavailable": deployment.status.unavailable_replicas or 0
-                },
-                "conditions": [],
-                "revision": deployment.metadata.annotations.get("deployment.kubernetes.io/revision", "unknown"),
-                "strategy": deployment.spec.strategy.type if deployment.spec.strategy else "RollingUpdate"
-            }
-            
-            # Parse conditions
-            if deployment.status.conditions:
-                for condition in deployment.status.conditions:
-                    status["conditions"].append({
-                        "type": condition.type,
-                        "status": condition.status,
-                        "reason": condition.reason or "Unknown",
-                        "message": condition.message or ""
-                    })
-            
-            return status
+            return self._build_deployment_status(deployment, name, namespace)
             
         except ApiException:
             return {"error": "Deployment not found"}
     
+    def get_many_deployment_status(self, namespace: str = "default",
+                                   label_selector: Optional[str] = None,
+                                   field_selector: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Get status for every deployment matching the selectors in one paginated list
+        
+        Args:
+            namespace: Namespace to list deployments in
+            label_selector: Optional Kubernetes label selector
+            field_selector: Optional Kubernetes field selector
+            
+        Returns:
+            Mapping of deployment name to the same status dict as get_deployment_status
+        """
+        statuses = {}
+        token = None
+        
+        try:
+            while True:
+                response = self.k8s.apps_v1.list_namespaced_deployment(
+                    namespace=namespace,
+                    label_selector=label_selector,
+                    field_selector=field_selector,
+                    limit=500,
+                    _continue=token
+                )
+                for deployment in response.items:
+                    name = deployment.metadata.name
+                    statuses[name] = self._build_deployment_status(deployment, name, namespace)
+                
+                token = response.metadata._continue if response.metadata else None
+                if not token:
+                    break
+                    
+        except ApiException as e:
+            raise ProviderError(f"Failed to list deployments: {str(e)}")
+            
+        return statuses
+    
+    def _build_deployment_status(self, deployment: Any, name: str, namespace: str) -> Dict[str, Any]:
+        """Build a status dict from an already-fetched deployment object"""
+        annotations = deployment.metadata.annotations or {}
+        status = {
+            "name": name,
+            "namespace": namespace,
+            "replicas": {
+                "desired": deployment.spec.replicas,
+                "current": deployment.status.replicas or 0,
+                "ready": deployment.status.ready_replicas or 0,
+                "available": deployment.status.available_replicas or 0,
+                "unavailable": deployment.status.unavailable_replicas or 0
+            },
+            "conditions": [],
+            "revision": annotations.get("deployment.kubernetes.io/revision", "unknown"),
+            "strategy": deployment.spec.strategy.type if deployment.spec.strategy else "RollingUpdate"
+        }
+        
+        # Parse conditions
+        if deployment.status.conditions:
+            for condition in deployment.status.conditions:
+                status["conditions"].append({
+                    "type": condition.type,
+                    "status": condition.status,
+                    "reason": condition.reason or "Unknown",
+                    "message": condition.message or ""
+                })
+        
+        return status
+    
     def wait_for_deployment_ready(self, name: str, namespace: str = "default", timeout: int = 300) -> bool:
         """Wait for deployment to be ready"""
         start_time = time.time()
@@ -655,28 +779,10 @@ class WorkloadManager:
                    memory_percent: Optional[int] = None) -> Dict[str, Any]:
         """Create Horizontal Pod Autoscaler"""
         
-        metrics = [{
-            "type": "Resource",
-            "resource": {
-                "name": "cpu",
-                "target": {
-                    "type": "Utilization",
-                    "averageUtilization": cpu_percent
-                }
-            }
-        }]
+        metrics = [_utilization_metric("cpu", cpu_percent)]
         
         if memory_percent:
-            metrics.append({
-                "type": "Resource",
-                "resource": {
-                    "name": "memory",
-                    "target": {
-                        "type": "Utilization",
-                        "averageUtilization": memory_percent
-                    }
-                }
-            })
+            metrics.append(_utilization_metric("memory", memory_percent))
         
         hpa = {
             "apiVersion": "autoscaling/v2",
@@ -3,25 +3,41 @@ vSphere Client wrapper for VM management
 """
 
 import ssl
-import atexit
-from typing import Optional, Dict, Any, List
+import time
+import logging
+import weakref
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Optional, Dict, Any, List, Callable, Iterator, Tuple
+from contextlib import closing
 from pyVim import connect
 from pyVmomi import vim, vmodl
 from ...exceptions import ConnectionError, VMNotFoundError, AuthenticationError
 
+logger = logging.getLogger(__name__)
+
+# vCenter accepts at most 60 concurrent provisioning/power operations per host
+MAX_CONCURRENT_OPERATIONS = 60
+
 
 class VSphereClient:
     """vSphere API client for VM operations"""
     
     def __init__(self, host: str, username: str, password: str, port: int = 443, 
-                 disable_ssl_verification: bool = False):
+                 disable_ssl_verification: bool = False, pool_size: int = 32):
         self.host = host
         self.username = username
         self.password = password
         self.port = port
         self.disable_ssl_verification = disable_ssl_verification
+        self.pool_size = pool_size
         self._service_instance = None
         self._content = None
+        self._views: Dict[tuple, Any] = {}
+        self._name_cache: Dict[Tuple[Tuple[str, ...], str], Any] = {}
+        self._task_monitor: Optional['TaskMonitor'] = None
+        self._finalizer = None
         
     def connect(self) -> None:
         """Establish connection to vSphere"""
@@ -39,7 +55,17 @@ class VSphereClient:
                 sslContext=context
             )
             
-            atexit.register(connect.Disconnect, self._service_instance)
+            # Views and cached references from a previous session are no longer valid
+            self._views = {}
+            self._name_cache = {}
+            # SmartConnect doesn't expose the stub's pool size; widen it so
+            # concurrent callers reuse keep-alive connections instead of
+            # handshaking a fresh one whenever more than 5 are in flight
+            stub = getattr(self._service_instance, '_stub', None)
+            if stub is not None and hasattr(stub, 'poolSize'):
+                stub.poolSize = self.pool_size
+            # Tie session cleanup to this client rather than the interpreter
+            self._finalizer = weakref.finalize(self, connect.Disconnect, self._service_instance)
             self._content = self._service_instance.RetrieveContent()
             
         except vim.fault.InvalidLogin:
@@ -49,6 +75,14 @@ class VSphereClient:
     
     def disconnect(self) -> None:
         """Disconnect from vSphere"""
+        self._destroy_views()
+        self._name_cache = {}
+        if self._task_monitor:
+            self._task_monitor.close()
+            self._task_monitor = None
+        if self._finalizer:
+            self._finalizer.detach()
+            self._finalizer = None
         if self._service_instance:
             connect.Disconnect(self._service_instance)
             self._service_instance = None
@@ -61,19 +95,80 @@ class VSphereClient:
             raise ConnectionError("Not connected to vSphere")
         return self._content
     
+    def _get_view(self, vimtype: List) -> Any:
+        """Get a cached ContainerView over the root folder, creating it on first use"""
+        key = tuple(vimtype)
+        view = self._views.get(key)
+        if view is None:
+            # Recursive views on the root folder are kept current by vCenter,
+            # so they can be reused for the lifetime of the session
+            view = self.content.viewManager.CreateContainerView(
+                self.content.rootFolder, list(vimtype), True)
+            self._views[key] = view
+        return view
+    
+    def _destroy_views(self) -> None:
+        """Destroy all cached ContainerViews"""
+        for view in self._views.values():
+            try:
+                view.Destroy()
+            except Exception:
+                # The session may already be gone
+                pass
+        self._views = {}
+    
+    def _iter_view_properties(self, vimtype: List, path_set: List[str], page_size: int = 1000,
+                              container: Optional[Any] = None) -> Iterator[Any]:
+        """Yield ObjectContent for every object in a view, paging through results"""
+        if container is None:
+            container = self._get_view(vimtype)
+        pc = vmodl.query.PropertyCollector
+        traversal = pc.TraversalSpec(name='traverseView', path='view', skip=False,
+                                     type=vim.view.ContainerView)
+        filter_spec = pc.FilterSpec(
+            objectSet=[pc.ObjectSpec(obj=container, skip=True, selectSet=[traversal])],
+            propSet=[pc.PropertySpec(type=t, pathSet=path_set) for t in vimtype]
+        )
+        collector = self.content.propertyCollector
+        
+        token = None
+        try:
+            result = collector.RetrievePropertiesEx([filter_spec], pc.RetrieveOptions(maxObjects=page_size))
+            while result:
+                token = result.token
+                yield from result.objects
+                if not token:
+                    break
+                next_token, token = token, None
+                result = collector.ContinueRetrievePropertiesEx(next_token)
+        finally:
+            # Release server-side results when the caller stops early
+            if token:
+                collector.CancelRetrievePropertiesEx(token)
+    
     def get_obj(self, vimtype: List, name: str) -> Optional[Any]:
         """Get vSphere object by name"""
-        obj = None
-        container = self.content.viewManager.CreateContainerView(
-            self.content.rootFolder, vimtype, True)
-        
-        for c in container.view:
-            if c.name == name:
-                obj = c
-                break
-                
-        container.Destroy()
-        return obj
+        key = (tuple(t.__name__ for t in vimtype), name)
+        cached = self._name_cache.get(key)
+        if cached is not None:
+            if self._is_live(cached, vimtype[0], name):
+                return cached
+            del self._name_cache[key]
+            
+        # Fetch names in batched pages rather than one round-trip per object
+        with closing(self._iter_view_properties(vimtype, ['name'])) as objects:
+            for obj_content in objects:
+                if any(prop.val == name for prop in obj_content.propSet):
+                    self._name_cache[key] = obj_content.obj
+                    return obj_content.obj
+        return None
+    
+    def _is_live(self, obj: Any, obj_type: type, name: str) -> bool:
+        """Check a cached reference still exists and still has the expected name"""
+        try:
+            return self.get_properties(obj, obj_type, ['name']).get('name') == name
+        except vmodl.fault.ManagedObjectNotFound:
+            return False
     
     def get_vm(self, vm_name: str) -> vim.VirtualMachine:
         """Get VM object by name"""
@@ -84,15 +179,44 @@ class VSphereClient:
     
     def get_all_vms(self) -> List[vim.VirtualMachine]:
         """Get all VMs in vSphere"""
-        container = self.content.viewManager.CreateContainerView(
-            self.content.rootFolder, [vim.VirtualMachine], True)
-        vms = list(container.view)
-        container.Destroy()
-        return vms
+        return list(self._get_view([vim.VirtualMachine]).view)
+    
+    def get_all_vms_with_props(self, path_set: List[str],
+                               page: int = 1000) -> List[Tuple[vim.VirtualMachine, Dict[str, Any]]]:
+        """
+        Get all VMs together with selected properties in batched calls
+        
+        Args:
+            path_set: Property paths to fetch for each VM
+            page: Maximum objects returned per round-trip
+            
+        Returns:
+            List of (vm, {path: value}) tuples; unset properties are omitted
+        """
+        return [
+            (obj_content.obj, {prop.name: prop.val for prop in obj_content.propSet})
+            for obj_content in self._iter_view_properties([vim.VirtualMachine], path_set, page)
+        ]
+    
+    def get_view_properties(self, root: Any, vimtype: List,
+                            path_set: List[str]) -> List[Tuple[Any, Dict[str, Any]]]:
+        """Get objects of the given types below root together with selected properties"""
+        container = self.content.viewManager.CreateContainerView(root, vimtype, True)
+        try:
+            return [
+                (obj_content.obj, {prop.name: prop.val for prop in obj_content.propSet})
+                for obj_content in self._iter_view_properties(vimtype, path_set, container=container)
+            ]
+        finally:
+            container.Destroy()
+    
+    def find_network(self, network_name: str) -> Optional[vim.Network]:
+        """Find network object by name, returning None if it does not exist"""
+        return self.get_obj([vim.Network], network_name)
     
     def get_network(self, network_name: str) -> vim.Network:
         """Get network object by name"""
-        network = self.get_obj([vim.Network], network_name)
+        network = self.find_network(network_name)
         if not network:
             raise VMNotFoundError(f"Network '{network_name}' not found")
         return network
@@ -106,22 +230,293 @@ class VSphereClient:
             return dc
         else:
             # Return first datacenter if name not specified
-            container = self.content.viewManager.CreateContainerView(
-                self.content.rootFolder, [vim.Datacenter], True)
+            container = self._get_view([vim.Datacenter])
             if container.view:
-                dc = container.view[0]
-                container.Destroy()
-                return dc
-            container.Destroy()
+                return container.view[0]
             raise VMNotFoundError("No datacenters found")
     
+    def get_properties(self, obj: Any, obj_type: type, path_set: List[str]) -> Dict[str, Any]:
+        """Fetch several properties of one managed object in a single round-trip"""
+        pc = vmodl.query.PropertyCollector
+        filter_spec = pc.FilterSpec(
+            objectSet=[pc.ObjectSpec(obj=obj)],
+            propSet=[pc.PropertySpec(type=obj_type, pathSet=path_set)]
+        )
+        
+        result = self.content.propertyCollector.RetrievePropertiesEx([filter_spec], pc.RetrieveOptions())
+        if not result or not result.objects:
+            return {}
+            
+        # Unset properties are omitted from propSet entirely
+        return {prop.name: prop.val for prop in result.objects[0].propSet}
+    
+    def get_properties_many(self, objs: List[Any], obj_type: type,
+                            path_set: List[str]) -> Dict[Any, Dict[str, Any]]:
+        """Fetch the same properties for several managed objects in one call"""
+        if not objs:
+            return {}
+            
+        pc = vmodl.query.PropertyCollector
+        filter_spec = pc.FilterSpec(
+            objectSet=[pc.ObjectSpec(obj=obj) for obj in objs],
+            propSet=[pc.PropertySpec(type=obj_type, pathSet=path_set)]
+        )
+        collector = self.content.propertyCollector
+        
+        values = {}
+        result = collector.RetrievePropertiesEx([filter_spec], pc.RetrieveOptions())
+        while result:
+            for obj_content in result.objects:
+                values[obj_content.obj] = {prop.name: prop.val for prop in obj_content.propSet}
+            if not result.token:
+                break
+            result = collector.ContinueRetrievePropertiesEx(result.token)
+            
+        return values
+    
+    def wait_for_updates(self, obj: Any, obj_type: type, path_set: List[str],
+                         done: Callable[[Dict[str, Any]], bool],
+                         timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Block on server-pushed property changes instead of polling
+        
+        Args:
+            obj: Managed object to watch
+            obj_type: vim type of the managed object
+            path_set: Property paths to watch
+            done: Predicate over the latest property values
+            timeout: Optional timeout in seconds
+            
+        Returns:
+            Latest property values once done() is satisfied, None on timeout
+        """
+        pc = vmodl.query.PropertyCollector
+        filter_spec = pc.FilterSpec(
+            objectSet=[pc.ObjectSpec(obj=obj)],
+            propSet=[pc.PropertySpec(type=obj_type, pathSet=path_set)]
+        )
+        
+        # A dedicated collector keeps this filter isolated from other waiters
+        collector = self.content.propertyCollector.CreatePropertyCollector()
+        try:
+            collector.CreateFilter(filter_spec, True)
+            deadline = time.time() + timeout if timeout else None
+            values: Dict[str, Any] = {}
+            version = ""
+            
+            while True:
+                max_wait = 60
+                if deadline:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        return None
+                    max_wait = max(1, min(max_wait, int(remaining)))
+                    
+                update = collector.WaitForUpdatesEx(version, pc.WaitOptions(maxWaitSeconds=max_wait))
+                if update is None:
+                    continue
+                    
+                version = update.version
+                for filter_update in update.filterSet:
+                    for obj_update in filter_update.objectSet:
+                        for change in obj_update.changeSet:
+                            values[change.name] = change.val
+                            
+                if done(values):
+                    return values
+        finally:
+            collector.Destroy()
+    
     def wait_for_task(self, task: vim.Task) -> bool:
         """Wait for vSphere task to complete"""
-        while task.info.state not in [vim.TaskInfo.State.success, 
-                                      vim.TaskInfo.State.error]:
-            pass
+        terminal = (vim.TaskInfo.State.success, vim.TaskInfo.State.error)
+        state = task.info.state
+        
+        if state in terminal:
+            error = task.info.error if state == vim.TaskInfo.State.error else None
+        else:
+            values = self.wait_for_updates(
+                task, vim.Task, ['info.state', 'info.error'],
+                lambda v: v.get('info.state') in terminal
+            )
+            state = values['info.state']
+            error = values.get('info.error')
             
-        if task.info.state == vim.TaskInfo.State.error:
-            raise Exception(f"Task failed: {task.info.error}")
+        if state == vim.TaskInfo.State.error:
+            raise Exception(f"Task failed: {error}")
+            
+        return True
+    
+    async def wait_for_task_async(self, task: vim.Task) -> bool:
+        """Async version of wait_for_task"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.wait_for_task, task)
+    
+    def watch_task(self, task: vim.Task) -> Future:
+        """
+        Track a task through the shared task monitor
+        
+        Args:
+            task: Task to track
+            
+        Returns:
+            Future resolved with True on success or failed with the task error
+        """
+        if self._task_monitor is None:
+            self._task_monitor = TaskMonitor(self)
+        return self._task_monitor.watch(task)
+
+
+class TaskMonitor:
+    """Tracks many tasks through one PropertyCollector and a single background waiter"""
+    
+    _TERMINAL = (vim.TaskInfo.State.success, vim.TaskInfo.State.error)
+    
+    def __init__(self, client: VSphereClient):
+        self._client = client
+        self._collector = None
+        self._futures: Dict[str, Future] = {}
+        self._filters: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._version = ""
+        
+    def watch(self, task: vim.Task) -> Future:
+        """Register a task and return a future for its completion"""
+        pc = vmodl.query.PropertyCollector
+        future: Future = Future()
+        
+        with self._lock:
+            if self._collector is None:
+                self._collector = self._client.content.propertyCollector.CreatePropertyCollector()
+                self._version = ""
+                
+            filter_spec = pc.FilterSpec(
+                objectSet=[pc.ObjectSpec(obj=task)],
+                propSet=[pc.PropertySpec(type=vim.Task, pathSet=['info.state', 'info.error'])]
+            )
+            self._futures[task._moId] = future
+            self._filters[task._moId] = self._collector.CreateFilter(filter_spec, True)
             
-        return True
\ No newline at end of file
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+                
+        return future
+    
+    def close(self) -> None:
+        """Destroy the collector; pending futures are cancelled"""
+        with self._lock:
+            for future in self._futures.values():
+                future.cancel()
+            self._futures = {}
+            self._filters = {}
+            self._thread = None
+            if self._collector is not None:
+                try:
+                    self._collector.Destroy()
+                except Exception:
+                    # The session may already be gone
+                    pass
+                self._collector = None
+    
+    def _run(self) -> None:
+        """Wait for task updates until no tasks are pending"""
+        wait_options = vmodl.query.PropertyCollector.WaitOptions(maxWaitSeconds=5)
+        current = threading.current_thread()
+        
+        while True:
+            with self._lock:
+                # Exit when superseded by close() or when nothing is pending
+                if self._thread is not current:
+                    return
+                if not self._futures:
+                    self._thread = None
+                    return
+                collector = self._collector
+                version = self._version
+                
+            try:
+                update = collector.WaitForUpdatesEx(version, wait_options)
+            except Exception as e:
+                self._fail_all(e, current)
+                return
+                
+            if update is None:
+                continue
+                
+            with self._lock:
+                if self._thread is not current:
+                    return
+                self._version = update.version
+                
+            for filter_update in update.filterSet:
+                for obj_update in filter_update.objectSet:
+                    values = {change.name: change.val for change in obj_update.changeSet}
+                    if values.get('info.state') in self._TERMINAL:
+                        self._resolve(obj_update.obj._moId, values)
+    
+    def _resolve(self, task_id: str, values: Dict[str, Any]) -> None:
+        """Complete the future for a finished task"""
+        with self._lock:
+            future = self._futures.pop(task_id, None)
+            task_filter = self._filters.pop(task_id, None)
+            
+        if task_filter is not None:
+            task_filter.Destroy()
+        if future is None:
+            return
+            
+        if values['info.state'] == vim.TaskInfo.State.error:
+            future.set_exception(Exception(f"Task failed: {values.get('info.error')}"))
+        else:
+            future.set_result(True)
+    
+    def _fail_all(self, error: Exception, thread: threading.Thread) -> None:
+        """Fail every pending future after the waiter stops"""
+        with self._lock:
+            if self._thread is not thread:
+                return
+            futures = list(self._futures.values())
+            self._futures = {}
+            self._filters = {}
+            self._thread = None
+            # The collector is unusable after a failed wait
+            self._collector = None
+            
+        for future in futures:
+            future.set_exception(error)
+
+
+def run_many(func: Callable[[str], Any], names: List[str], max_concurrent: int = 10,
+             default: Any = False) -> Dict[str, Any]:
+    """
+    Run a blocking per-VM operation for many names on a thread pool
+    
+    Each worker blocks on vSphere network I/O, so threads overlap the waits
+    despite the GIL. A failure is logged and recorded as ``default`` so one
+    bad VM does not abort the rest of the batch.
+    
+    Args:
+        func: Callable taking a single name
+        names: Names to process
+        max_concurrent: Worker count, capped at MAX_CONCURRENT_OPERATIONS
+        default: Result recorded for names whose call raised
+        
+    Returns:
+        Mapping of name to result
+    """
+    if not names:
+        return {}
+    workers = max(1, min(max_concurrent, MAX_CONCURRENT_OPERATIONS, len(names)))
+    results: Dict[str, Any] = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(func, name): name for name in names}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                logger.warning(f"Bulk operation failed for {name}: {e}")
+                results[name] = default
+    return results
@@ -2,10 +2,20 @@
 Network configuration for vSphere VMs
 """
 
-from typing import Optional, List, Dict, Any
+import re
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Any, Iterator
 from pyVmomi import vim
-from .client import VSphereClient
+from .client import VSphereClient, run_many
 from ...exceptions import NetworkConfigError
+from ...utils.executor import run_in_executor
+
+
+# Resolved once; each vim.vm.device lookup goes through pyVmomi's lazy module loader
+_ETHERNET_TYPE = vim.vm.device.VirtualEthernetCard
+
+# Labels vCenter assigns to NICs, e.g. "Network adapter 1"
+_ADAPTER_LABEL_RE = re.compile(r'Network adapter (\d+)$')
 
 
 class NetworkConfigurator:
@@ -13,20 +23,124 @@ class NetworkConfigurator:
     
     def __init__(self, vsphere_client: VSphereClient):
         self.client = vsphere_client
+        # Highest adapter number seen per VM, keyed by managed object ID
+        self._adapter_numbers: Dict[str, int] = {}
         
     def configure_vlan(self, vm_name: str, adapter_label: str, vlan_id: int, 
                       network_name: Optional[str] = None) -> bool:
         """Configure VLAN for VM network adapter"""
         vm = self.client.get_vm(vm_name)
+        self._reconfigure(vm, [self._vlan_change(vm, adapter_label, vlan_id, network_name)])
+        return True
+    
+    async def configure_vlan_async(self, vm_name: str, adapter_label: str, vlan_id: int,
+                                   network_name: Optional[str] = None) -> bool:
+        """Async version of configure_vlan"""
+        return await run_in_executor(
+            self.configure_vlan, vm_name, adapter_label, vlan_id, network_name=network_name
+        )
+    
+    def configure_vlan_many(self, vm_names: List[str], adapter_label: str, vlan_id: int,
+                            network_name: Optional[str] = None, max_concurrent: int = 10) -> Dict[str, bool]:
+        """Configure the same VLAN on many VMs, False for any that failed"""
+        return run_many(lambda name: self.configure_vlan(name, adapter_label, vlan_id, network_name),
+                        vm_names, max_concurrent)
+    
+    def add_network_adapter(self, vm_name: str, network_name: str, 
+                           adapter_type: str = 'vmxnet3') -> str:
+        """Add new network adapter to VM"""
+        vm = self.client.get_vm(vm_name)
+        adapter_number = self._get_next_adapter_number(vm)
+        device_change = self._add_adapter_change(vm, network_name, adapter_type, adapter_number)
+        
+        self._reconfigure(vm, [device_change])
+        self._adapter_numbers[vm._moId] = adapter_number
+        
+        return device_change.device.deviceInfo.label
+    
+    async def add_network_adapter_async(self, vm_name: str, network_name: str,
+                                        adapter_type: str = 'vmxnet3') -> str:
+        """Async version of add_network_adapter"""
+        return await run_in_executor(
+            self.add_network_adapter, vm_name, network_name, adapter_type=adapter_type
+        )
+    
+    def remove_network_adapter(self, vm_name: str, adapter_label: str) -> bool:
+        """Remove network adapter from VM"""
+        vm = self.client.get_vm(vm_name)
+        self._reconfigure(vm, [self._remove_adapter_change(vm, adapter_label)])
+        self._adapter_numbers.pop(vm._moId, None)
+        return True
+    
+    def connect_adapter(self, vm_name: str, adapter_label: str, connected: bool = True) -> bool:
+        """Connect or disconnect network adapter"""
+        vm = self.client.get_vm(vm_name)
+        self._reconfigure(vm, [self._connect_adapter_change(vm, adapter_label, connected)])
+        return True
+    
+    @contextmanager
+    def batch(self, vm_name: str) -> Iterator['ReconfigBatch']:
+        """
+        Collect adapter changes for one VM and apply them in a single reconfigure task
         
+        Args:
+            vm_name: Name of the VM to reconfigure
+            
+        Yields:
+            ReconfigBatch accepting the same operations as this configurator
+        """
+        batch = ReconfigBatch(self, self.client.get_vm(vm_name))
+        yield batch
+        batch.commit()
+    
+    def get_network_adapters(self, vm_name: str) -> List[Dict[str, Any]]:
+        """Get all network adapters for VM"""
+        vm = self.client.get_vm(vm_name)
+        devices = [d for d in vm.config.hardware.device if isinstance(d, _ETHERNET_TYPE)]
+        
+        # Resolve all backing network names in one call instead of one per adapter
+        networks = {d.backing.network for d in devices if getattr(d.backing, 'network', None)}
+        network_names = self.client.get_properties_many(list(networks), vim.Network, ['name'])
+        
+        adapters = []
+        for device in devices:
+            network_name = 'Unknown'
+            vlan_id = None
+            
+            if hasattr(device.backing, 'network'):
+                network_name = network_names.get(device.backing.network, {}).get('name', 'Unknown')
+            elif hasattr(device.backing, 'port'):
+                network_name = device.backing.port.portgroupKey
+                # Would need to query portgroup for VLAN ID
+                
+            adapters.append({
+                'label': device.deviceInfo.label,
+                'type': type(device).__name__,
+                'network': network_name,
+                'mac_address': device.macAddress,
+                'connected': device.connectable.connected,
+                'vlan_id': vlan_id,
+                'key': device.key,
+            })
+            
+        return adapters
+    
+    def _reconfigure(self, vm: vim.VirtualMachine, device_changes: List[vim.vm.device.VirtualDeviceSpec]) -> None:
+        """Apply device changes to a VM in one reconfigure task"""
+        spec = vim.vm.ConfigSpec()
+        spec.deviceChange = device_changes
+        
+        task = vm.ReconfigVM_Task(spec=spec)
+        self.client.wait_for_task(task)
+    
+    def _vlan_change(self, vm: vim.VirtualMachine, adapter_label: str, vlan_id: int,
+                     network_name: Optional[str] = None) -> vim.vm.device.VirtualDeviceSpec:
+        """Build the device change moving an adapter onto a VLAN"""
         # Find the network adapter
         adapter = self._get_network_adapter(vm, adapter_label)
         if not adapter:
             raise NetworkConfigError(f"Network adapter '{adapter_label}' not found")
             
-        # Create reconfigure spec
-        spec = vim.vm.ConfigSpec()
-        
         # Configure network backing based on type
         if network_name:
             # Use specific network/portgroup
@@ -46,10 +160,8 @@ class NetworkConfigurator:
             # Configure VLAN ID on existing backing
             if hasattr(adapter.backing, 'port'):
                 # DVS - need to find/create portgroup with VLAN
-                pg_name = f"VLAN-{vlan_id}"
-                try:
-                    network = self.client.get_network(pg_name)
-                except:
+                network = self.client.find_network(f"VLAN-{vlan_id}")
+                if network is None:
                     # Would need to create portgroup - simplified for now
                     raise NetworkConfigError(f"Portgroup for VLAN {vlan_id} not found")
                     
@@ -60,24 +172,15 @@ class NetworkConfigurator:
             else:
                 raise NetworkConfigError("Cannot set VLAN ID without distributed vSwitch")
                 
-        # Create device change spec
         device_change = vim.vm.device.VirtualDeviceSpec()
         device_change.operation = vim.vm.device.VirtualDeviceSpec.Operation.edit
         device_change.device = adapter
         device_change.device.backing = backing
-        
-        spec.deviceChange = [device_change]
-        
-        # Apply configuration
-        task = vm.ReconfigVM_Task(spec=spec)
-        self.client.wait_for_task(task)
-        
-        return True
+        return device_change
     
-    def add_network_adapter(self, vm_name: str, network_name: str, 
-                           adapter_type: str = 'vmxnet3') -> str:
-        """Add new network adapter to VM"""
-        vm = self.client.get_vm(vm_name)
+    def _add_adapter_change(self, vm: vim.VirtualMachine, network_name: str, adapter_type: str,
+                            adapter_number: int, device_key: int = -1) -> vim.vm.device.VirtualDeviceSpec:
+        """Build the device change adding a new network adapter"""
         network = self.client.get_network(network_name)
         
         # Create network adapter
@@ -90,9 +193,10 @@ class NetworkConfigurator:
         else:
             raise NetworkConfigError(f"Unknown adapter type: {adapter_type}")
             
-        # Configure adapter
+        # Configure adapter; devices added in one reconfigure need distinct negative temporary keys
+        adapter.key = device_key
         adapter.deviceInfo = vim.Description()
-        adapter.deviceInfo.label = f"Network adapter {self._get_next_adapter_number(vm)}"
+        adapter.deviceInfo.label = f"Network adapter {adapter_number}"
         adapter.deviceInfo.summary = network_name
         
         # Configure backing
@@ -112,108 +216,128 @@ class NetworkConfigurator:
         adapter.connectable.allowGuestControl = True
         adapter.connectable.connected = True
         
-        # Create spec
-        spec = vim.vm.ConfigSpec()
         device_change = vim.vm.device.VirtualDeviceSpec()
         device_change.operation = vim.vm.device.VirtualDeviceSpec.Operation.add
         device_change.device = adapter
-        spec.deviceChange = [device_change]
-        
-        # Apply configuration
-        task = vm.ReconfigVM_Task(spec=spec)
-        self.client.wait_for_task(task)
-        
-        return adapter.deviceInfo.label
+        return device_change
     
-    def remove_network_adapter(self, vm_name: str, adapter_label: str) -> bool:
-        """Remove network adapter from VM"""
-        vm = self.client.get_vm(vm_name)
+    def _remove_adapter_change(self, vm: vim.VirtualMachine, adapter_label: str) -> vim.vm.device.VirtualDeviceSpec:
+        """Build the device change removing a network adapter"""
         adapter = self._get_network_adapter(vm, adapter_label)
-        
         if not adapter:
             raise NetworkConfigError(f"Network adapter '{adapter_label}' not found")
             
-        # Create spec
-        spec = vim.vm.ConfigSpec()
         device_change = vim.vm.device.VirtualDeviceSpec()
         device_change.operation = vim.vm.device.VirtualDeviceSpec.Operation.remove
         device_change.device = adapter
-        spec.deviceChange = [device_change]
-        
-        # Apply configuration
-        task = vm.ReconfigVM_Task(spec=spec)
-        self.client.wait_for_task(task)
-        
-        return True
+        return device_change
     
-    def connect_adapter(self, vm_name: str, adapter_label: str, connected: bool = True) -> bool:
-        """Connect or disconnect network adapter"""
-        vm = self.client.get_vm(vm_name)
+    def _connect_adapter_change(self, vm: vim.VirtualMachine, adapter_label: str,
+                                connected: bool) -> vim.vm.device.VirtualDeviceSpec:
+        """Build the device change connecting or disconnecting a network adapter"""
         adapter = self._get_network_adapter(vm, adapter_label)
-        
         if not adapter:
             raise NetworkConfigError(f"Network adapter '{adapter_label}' not found")
             
-        # Create spec
-        spec = vim.vm.ConfigSpec()
         device_change = vim.vm.device.VirtualDeviceSpec()
         device_change.operation = vim.vm.device.VirtualDeviceSpec.Operation.edit
         device_change.device = adapter
         device_change.device.connectable.connected = connected
-        spec.deviceChange = [device_change]
-        
-        # Apply configuration  
-        task = vm.ReconfigVM_Task(spec=spec)
-        self.client.wait_for_task(task)
-        
-        return True
-    
-    def get_network_adapters(self, vm_name: str) -> List[Dict[str, Any]]:
-        """Get all network adapters for VM"""
-        vm = self.client.get_vm(vm_name)
-        adapters = []
-        
-        for device in vm.config.hardware.device:
-            if isinstance(device, vim.vm.device.VirtualEthernetCard):
-                network_name = 'Unknown'
-                vlan_id = None
-                
-                if hasattr(device.backing, 'network'):
-                    network_name = device.backing.network.name
-                elif hasattr(device.backing, 'port'):
-                    network_name = device.backing.port.portgroupKey
-                    # Would need to query portgroup for VLAN ID
-                    
-                adapters.append({
-                    'label': device.deviceInfo.label,
-                    'type': type(device).__name__,
-                    'network': network_name,
-                    'mac_address': device.macAddress,
-                    'connected': device.connectable.connected,
-                    'vlan_id': vlan_id,
-                    'key': device.key,
-                })
-                
-        return adapters
+        return device_change
     
     def _get_network_adapter(self, vm: vim.VirtualMachine, adapter_label: str) -> Optional[vim.vm.device.VirtualEthernetCard]:
         """Get network adapter by label"""
         for device in vm.config.hardware.device:
-            if isinstance(device, vim.vm.device.VirtualEthernetCard):
+            if isinstance(device, _ETHERNET_TYPE):
                 if device.deviceInfo.label == adapter_label:
                     return device
         return None
     
     def _get_next_adapter_number(self, vm: vim.VirtualMachine) -> int:
         """Get next available adapter number"""
-        max_num = 0
-        for device in vm.config.hardware.device:
-            if isinstance(device, vim.vm.device.VirtualEthernetCard):
-                # Extract number from label like "Network adapter 1"
-                try:
-                    num = int(device.deviceInfo.label.split()[-1])
-                    max_num = max(max_num, num)
-                except (ValueError, AttributeError, IndexError):
-                    # Device label may not have expected format or be None
-                    continue
-        return max_num + 1
\ No newline at end of file
+        max_num = self._adapter_numbers.get(vm._moId)
+        if max_num is None:
+            max_num = 0
+            for device in vm.config.hardware.device:
+                if isinstance(device, _ETHERNET_TYPE) and device.deviceInfo:
+                    # Labels in any other format are skipped
+                    match = _ADAPTER_LABEL_RE.match(device.deviceInfo.label or '')
+                    if match:
+                        max_num = max(max_num, int(match.group(1)))
+            self._adapter_numbers[vm._moId] = max_num
+        return max_num + 1
+
+
+class ReconfigBatch:
+    """Accumulates adapter changes for one VM and applies them as a single reconfigure task"""
+    
+    def __init__(self, configurator: NetworkConfigurator, vm: vim.VirtualMachine):
+        self._configurator = configurator
+        self.vm = vm
+        self.device_changes: List[vim.vm.device.VirtualDeviceSpec] = []
+        # Pending edit spec per device key, so several edits of one adapter share a spec
+        self._edits: Dict[int, vim.vm.device.VirtualDeviceSpec] = {}
+        self._last_adapter_number: Optional[int] = None
+        self._next_device_key = -1
+        self._removed = False
+        
+    def configure_vlan(self, adapter_label: str, vlan_id: int, network_name: Optional[str] = None) -> None:
+        """Queue a VLAN change for a network adapter"""
+        change = self._configurator._vlan_change(self.vm, adapter_label, vlan_id, network_name)
+        pending = self._edits.get(change.device.key)
+        if pending is not None:
+            pending.device.backing = change.device.backing
+        else:
+            self._queue_edit(change)
+    
+    def add_network_adapter(self, network_name: str, adapter_type: str = 'vmxnet3') -> str:
+        """Queue a new network adapter and return the label it will get"""
+        if self._last_adapter_number is None:
+            adapter_number = self._configurator._get_next_adapter_number(self.vm)
+        else:
+            adapter_number = self._last_adapter_number + 1
+            
+        device_change = self._configurator._add_adapter_change(
+            self.vm, network_name, adapter_type, adapter_number, self._next_device_key
+        )
+        self.device_changes.append(device_change)
+        self._last_adapter_number = adapter_number
+        self._next_device_key -= 1
+        return device_change.device.deviceInfo.label
+    
+    def remove_network_adapter(self, adapter_label: str) -> None:
+        """Queue removal of a network adapter"""
+        self.device_changes.append(self._configurator._remove_adapter_change(self.vm, adapter_label))
+        self._removed = True
+    
+    def connect_adapter(self, adapter_label: str, connected: bool = True) -> None:
+        """Queue a connect or disconnect of a network adapter"""
+        change = self._configurator._connect_adapter_change(self.vm, adapter_label, connected)
+        pending = self._edits.get(change.device.key)
+        if pending is not None:
+            pending.device.connectable.connected = connected
+        else:
+            self._queue_edit(change)
+    
+    def _queue_edit(self, change: vim.vm.device.VirtualDeviceSpec) -> None:
+        """Queue the first edit spec of a device"""
+        self._edits[change.device.key] = change
+        self.device_changes.append(change)
+    
+    def commit(self) -> bool:
+        """Apply all queued changes in one reconfigure task"""
+        if not self.device_changes:
+            return True
+            
+        self._configurator._reconfigure(self.vm, self.device_changes)
+        
+        # Keep the configurator's adapter number cache consistent
+        numbers = self._configurator._adapter_numbers
+        if self._removed:
+            numbers.pop(self.vm._moId, None)
+        elif self._last_adapter_number is not None:
+            numbers[self.vm._moId] = self._last_adapter_number
+            
+        self.device_changes = []
+        self._edits = {}
+        return True
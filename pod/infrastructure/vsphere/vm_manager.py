@@ -3,49 +3,76 @@ VM lifecycle management for vSphere
 """
 
 import time
-from typing import Dict, Any, Optional, List
+import asyncio
+import threading
+from typing import Dict, Any, Optional, List, Tuple
 from pyVmomi import vim
-from .client import VSphereClient
+from .client import VSphereClient, run_many
 from ...exceptions import VMNotFoundError, OSError
+from ...utils.executor import run_in_executor
+
+
+# Resolved once; each vim.vm.device lookup goes through pyVmomi's lazy module loader
+_DISK_TYPE = vim.vm.device.VirtualDisk
+_ETHERNET_TYPE = vim.vm.device.VirtualEthernetCard
+
+# Linux guest ID prefixes that do not contain "linux", e.g. rhel8_64Guest, so
+# the OS is known even before VMware Tools reports a guest family
+_LINUX_GUEST_PREFIXES = ('rhel', 'centos', 'rocky', 'almalinux', 'oracle', 'ubuntu',
+                         'debian', 'sles', 'opensuse', 'fedora', 'coreos', 'photon')
 
 
 class VMManager:
     """Manages VM lifecycle operations"""
     
+    # Properties read by get_vm_info, fetched in one PropertyCollector call
+    _VM_INFO_PROPERTIES = [
+        'name', 'config.uuid', 'config.guestId', 'config.files.vmPathName',
+        'config.hardware.numCPU', 'config.hardware.memoryMB', 'config.hardware.device',
+        'runtime.powerState', 'guest.hostName', 'guest.ipAddress', 'guest.guestFamily',
+        'guest.toolsStatus', 'guest.toolsVersion',
+    ]
+    
+    # Properties read before power transitions, fetched together
+    _POWER_PROPERTIES = ['runtime.powerState', 'guest.toolsStatus']
+    
+    # Name of the snapshot taken on sources that have none when linked cloning
+    _LINKED_CLONE_SNAPSHOT = 'pod-linked-clone-base'
+    
     def __init__(self, vsphere_client: VSphereClient):
         self.client = vsphere_client
+        self._snapshot_lock = threading.Lock()
         
     def get_vm_info(self, vm_name: str) -> Dict[str, Any]:
         """Get detailed VM information"""
         vm = self.client.get_vm(vm_name)
+        props = self.client.get_properties(vm, vim.VirtualMachine, self._VM_INFO_PROPERTIES)
+        disks, networks = self._get_device_info(props.get('config.hardware.device', []))
         
         # Get guest info
         guest_info = {
-            'os_type': self._detect_os_type(vm),
-            'hostname': vm.guest.hostName,
-            'ip_address': vm.guest.ipAddress,
-            'tools_status': vm.guest.toolsStatus,
-            'tools_version': vm.guest.toolsVersion,
+            'os_type': self._detect_os_type(props),
+            'hostname': props.get('guest.hostName'),
+            'ip_address': props.get('guest.ipAddress'),
+            'tools_status': props.get('guest.toolsStatus'),
+            'tools_version': props.get('guest.toolsVersion'),
         }
         
         # Get hardware info
         hardware_info = {
-            'cpu_count': vm.config.hardware.numCPU,
-            'memory_mb': vm.config.hardware.memoryMB,
-            'disks': self._get_disk_info(vm),
-            'networks': self._get_network_info(vm),
+            'cpu_count': props.get('config.hardware.numCPU'),
+            'memory_mb': props.get('config.hardware.memoryMB'),
+            'disks': disks,
+            'networks': networks,
         }
         
-        # Get power state
-        power_state = vm.runtime.powerState
-        
         return {
-            'name': vm.name,
-            'uuid': vm.config.uuid,
-            'power_state': power_state,
+            'name': props.get('name'),
+            'uuid': props.get('config.uuid'),
+            'power_state': props.get('runtime.powerState'),
             'guest': guest_info,
             'hardware': hardware_info,
-            'path': vm.config.files.vmPathName,
+            'path': props.get('config.files.vmPathName'),
         }
     
     def power_on(self, vm_name: str, wait_for_ip: bool = True) -> bool:
@@ -66,42 +93,17 @@ class VMManager:
     def power_off(self, vm_name: str, force: bool = False) -> bool:
         """Power off VM"""
         vm = self.client.get_vm(vm_name)
-        
-        if vm.runtime.powerState == vim.VirtualMachinePowerState.poweredOff:
-            return True
-            
-        if force or vm.guest.toolsStatus != vim.VirtualMachineToolsStatus.toolsOk:
-            task = vm.PowerOffVM_Task()
-            self.client.wait_for_task(task)
-        else:
-            # Try graceful shutdown first
-            try:
-                vm.ShutdownGuest()
-                # Wait for shutdown
-                timeout = 60
-                start_time = time.time()
-                while vm.runtime.powerState != vim.VirtualMachinePowerState.poweredOff:
-                    if time.time() - start_time > timeout:
-                        # Force power off after timeout
-                        task = vm.PowerOffVM_Task()
-                        self.client.wait_for_task(task)
-                        break
-                    time.sleep(1)
-            except Exception:
-                # Fallback to force power off
-                task = vm.PowerOffVM_Task()
-                self.client.wait_for_task(task)
-                
-        return True
+        return self._power_off(vm, self._get_power_properties(vm), force)
     
     def restart(self, vm_name: str, wait_for_ip: bool = True) -> bool:
         """Restart VM"""
         vm = self.client.get_vm(vm_name)
+        props = self._get_power_properties(vm)
         
-        if vm.runtime.powerState != vim.VirtualMachinePowerState.poweredOn:
+        if props.get('runtime.powerState') != vim.VirtualMachinePowerState.poweredOn:
             return self.power_on(vm_name, wait_for_ip)
             
-        if vm.guest.toolsStatus == vim.VirtualMachineToolsStatus.toolsOk:
+        if props.get('guest.toolsStatus') == vim.VirtualMachineToolsStatus.toolsOk:
             vm.RebootGuest()
         else:
             task = vm.ResetVM_Task()
@@ -118,8 +120,22 @@ class VMManager:
                  datacenter_name: Optional[str] = None,
                  folder_path: Optional[str] = None,
                  resource_pool_name: Optional[str] = None,
-                 datastore_name: Optional[str] = None) -> vim.VirtualMachine:
-        """Clone a VM"""
+                 datastore_name: Optional[str] = None,
+                 linked: bool = False,
+                 instant: bool = False,
+                 snapshot: Optional[vim.vm.Snapshot] = None) -> vim.VirtualMachine:
+        """
+        Clone a VM
+        
+        Args:
+            linked: Create a linked clone backed by a delta disk on the source's
+                current snapshot, taking a base snapshot first if none exists
+            instant: Fork the running source VM with InstantClone (vSphere 6.7+)
+            snapshot: Source snapshot to base a linked clone on instead of the current one
+        """
+        if linked and instant:
+            raise ValueError("linked and instant clones are mutually exclusive")
+            
         source_vm = self.client.get_vm(source_vm_name)
         datacenter = self.client.get_datacenter(datacenter_name)
         
@@ -143,15 +159,26 @@ class VMManager:
             datastore = self.client.get_obj([vim.Datastore], datastore_name)
             relocate_spec.datastore = datastore
             
-        clone_spec = vim.vm.CloneSpec()
-        clone_spec.location = relocate_spec
-        clone_spec.powerOn = False
-        
-        task = source_vm.Clone(
-            folder=dest_folder,
-            name=new_vm_name,
-            spec=clone_spec
-        )
+        if instant:
+            # InstantClone takes its destination folder from the relocate spec
+            relocate_spec.folder = dest_folder
+            instant_spec = vim.vm.InstantCloneSpec(name=new_vm_name, location=relocate_spec)
+            task = source_vm.InstantClone_Task(spec=instant_spec)
+        else:
+            clone_spec = vim.vm.CloneSpec()
+            clone_spec.location = relocate_spec
+            clone_spec.powerOn = False
+            
+            if linked:
+                # Only a child delta disk is created; the source disks are shared
+                relocate_spec.diskMoveType = vim.vm.RelocateSpec.DiskMoveOptions.createNewChildDiskBacking
+                clone_spec.snapshot = snapshot or self._get_linked_clone_snapshot(source_vm)
+                
+            task = source_vm.Clone(
+                folder=dest_folder,
+                name=new_vm_name,
+                spec=clone_spec
+            )
         
         self.client.wait_for_task(task)
         return self.client.get_vm(new_vm_name)
@@ -161,94 +188,220 @@ class VMManager:
         vm = self.client.get_vm(vm_name)
         
         # Power off first if needed
-        if vm.runtime.powerState != vim.VirtualMachinePowerState.poweredOff:
-            self.power_off(vm_name, force=True)
+        self._power_off(vm, self._get_power_properties(vm), force=True)
             
         task = vm.Destroy_Task()
         self.client.wait_for_task(task)
         return True
     
-    def _detect_os_type(self, vm: vim.VirtualMachine) -> str:
-        """Detect OS type from VM"""
-        guest_id = vm.config.guestId.lower()
-        guest_family = vm.guest.guestFamily
+    def power_on_many(self, vm_names: List[str], max_concurrent: int = 10,
+                      wait_for_ip: bool = True) -> Dict[str, bool]:
+        """Power on many VMs on a thread pool, False for any that failed"""
+        return run_many(lambda name: self.power_on(name, wait_for_ip), vm_names, max_concurrent)
+    
+    def clone_many(self, source_vm_name: str, new_vm_names: List[str], max_concurrent: int = 10,
+                   **kwargs) -> Dict[str, Optional[vim.VirtualMachine]]:
+        """Clone a source VM into many new VMs, None for any clone that failed"""
+        if kwargs.get('linked') and kwargs.get('snapshot') is None:
+            # Resolve the base snapshot before fanning out so every clone shares it
+            kwargs['snapshot'] = self._get_linked_clone_snapshot(self.client.get_vm(source_vm_name))
+        return run_many(lambda name: self.clone_vm(source_vm_name, name, **kwargs),
+                        new_vm_names, max_concurrent, default=None)
+    
+    def delete_many(self, vm_names: List[str], max_concurrent: int = 10) -> Dict[str, bool]:
+        """Delete many VMs on a thread pool, False for any that failed"""
+        return run_many(self.delete_vm, vm_names, max_concurrent)
+    
+    async def power_on_async(self, vm_name: str, wait_for_ip: bool = True) -> bool:
+        """Async version of power_on"""
+        return await run_in_executor(self.power_on, vm_name, wait_for_ip=wait_for_ip)
+    
+    async def power_off_async(self, vm_name: str, force: bool = False) -> bool:
+        """Async version of power_off"""
+        return await run_in_executor(self.power_off, vm_name, force=force)
+    
+    async def restart_async(self, vm_name: str, wait_for_ip: bool = True) -> bool:
+        """Async version of restart"""
+        return await run_in_executor(self.restart, vm_name, wait_for_ip=wait_for_ip)
+    
+    async def clone_vm_async(self, source_vm_name: str, new_vm_name: str, **kwargs) -> vim.VirtualMachine:
+        """Async version of clone_vm"""
+        return await run_in_executor(self.clone_vm, source_vm_name, new_vm_name, **kwargs)
+    
+    async def delete_vm_async(self, vm_name: str) -> bool:
+        """Async version of delete_vm"""
+        return await run_in_executor(self.delete_vm, vm_name)
+    
+    async def power_on_many_async(self, vm_names: List[str], wait_for_ip: bool = True) -> List[bool]:
+        """
+        Power on many VMs concurrently, returning results in input order
+        
+        All power-on tasks are submitted first and tracked through the client's
+        shared task monitor rather than one blocking wait per VM.
+        """
+        async def power_on_one(vm_name: str) -> bool:
+            vm, task = await run_in_executor(self._start_power_on, vm_name)
+            if task is None:
+                return True
+            await asyncio.wrap_future(self.client.watch_task(task))
+            if wait_for_ip:
+                await run_in_executor(self._wait_for_ip, vm)
+            return True
+        
+        return await asyncio.gather(*(power_on_one(name) for name in vm_names))
+    
+    def _get_power_properties(self, vm: vim.VirtualMachine) -> Dict[str, Any]:
+        """Fetch power state and tools status in one PropertyCollector call"""
+        return self.client.get_properties(vm, vim.VirtualMachine, self._POWER_PROPERTIES)
+    
+    def _power_off(self, vm: vim.VirtualMachine, props: Dict[str, Any], force: bool) -> bool:
+        """Power off a VM given its already-fetched power properties"""
+        if props.get('runtime.powerState') == vim.VirtualMachinePowerState.poweredOff:
+            return True
+            
+        if force or props.get('guest.toolsStatus') != vim.VirtualMachineToolsStatus.toolsOk:
+            task = vm.PowerOffVM_Task()
+            self.client.wait_for_task(task)
+        else:
+            # Try graceful shutdown first
+            try:
+                vm.ShutdownGuest()
+                # Block on the power state change pushed by vCenter
+                values = self.client.wait_for_updates(
+                    vm, vim.VirtualMachine, ['runtime.powerState'],
+                    lambda v: v.get('runtime.powerState') == vim.VirtualMachinePowerState.poweredOff,
+                    timeout=60
+                )
+                if values is None:
+                    # Force power off after timeout
+                    task = vm.PowerOffVM_Task()
+                    self.client.wait_for_task(task)
+            except Exception:
+                # Fallback to force power off
+                task = vm.PowerOffVM_Task()
+                self.client.wait_for_task(task)
+                
+        return True
+    
+    def _start_power_on(self, vm_name: str) -> Tuple[vim.VirtualMachine, Optional[vim.Task]]:
+        """Submit a power-on task, returning no task if the VM is already on"""
+        vm = self.client.get_vm(vm_name)
+        if vm.runtime.powerState == vim.VirtualMachinePowerState.poweredOn:
+            return vm, None
+        return vm, vm.PowerOnVM_Task()
+    
+    def _get_linked_clone_snapshot(self, vm: vim.VirtualMachine) -> vim.vm.Snapshot:
+        """Return the VM's current snapshot, creating a base snapshot if it has none"""
+        if vm.snapshot is None:
+            # Concurrent linked clones of one source must not each take a base snapshot
+            with self._snapshot_lock:
+                if vm.snapshot is None:
+                    task = vm.CreateSnapshot_Task(
+                        name=self._LINKED_CLONE_SNAPSHOT,
+                        description="Base snapshot for linked clones",
+                        memory=False,
+                        quiesce=False
+                    )
+                    self.client.wait_for_task(task)
+        return vm.snapshot.currentSnapshot
+    
+    def _detect_os_type(self, props: Dict[str, Any]) -> str:
+        """Detect OS type from already-fetched VM properties"""
+        guest_id = (props.get('config.guestId') or '').lower()
+        guest_family = props.get('guest.guestFamily')
         
         if 'windows' in guest_id or guest_family == 'windowsGuest':
             return 'windows'
-        elif 'linux' in guest_id or guest_family == 'linuxGuest':
+        elif 'linux' in guest_id or guest_family == 'linuxGuest' or guest_id.startswith(_LINUX_GUEST_PREFIXES):
             # Check if it's a container
-            if self._is_container(vm):
+            if self._is_container(props.get('name') or ''):
                 return 'container'
             return 'linux'
         else:
             return 'unknown'
     
-    def _is_container(self, vm: vim.VirtualMachine) -> bool:
+    def _is_container(self, vm_name: str) -> bool:
         """Check if VM is actually a container"""
         # This is a simplified check - in practice you might check annotations
         # or custom attributes to identify containers
-        return 'container' in vm.name.lower() or 'docker' in vm.name.lower()
+        name = vm_name.lower()
+        return 'container' in name or 'docker' in name
     
-    def _get_disk_info(self, vm: vim.VirtualMachine) -> List[Dict[str, Any]]:
-        """Get disk information for VM"""
+    def _get_device_info(self, devices: List[vim.vm.device.VirtualDevice]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Classify a VM device list into disk and network info in one pass"""
         disks = []
-        for device in vm.config.hardware.device:
-            if isinstance(device, vim.vm.device.VirtualDisk):
-                disks.append({
-                    'label': device.deviceInfo.label,
-                    'capacity_gb': device.capacityInKB / 1024 / 1024,
-                    'thin_provisioned': device.backing.thinProvisioned if hasattr(device.backing, 'thinProvisioned') else False,
-                })
-        return disks
-    
-    def _get_network_info(self, vm: vim.VirtualMachine) -> List[Dict[str, Any]]:
-        """Get network adapter information"""
         networks = []
-        for device in vm.config.hardware.device:
-            if isinstance(device, vim.vm.device.VirtualEthernetCard):
-                network_name = 'Unknown'
-                if hasattr(device.backing, 'network'):
-                    network_name = device.backing.network.name
-                elif hasattr(device.backing, 'port'):
-                    network_name = device.backing.port.portgroupKey
-                    
-                networks.append({
-                    'label': device.deviceInfo.label,
-                    'network': network_name,
-                    'mac_address': device.macAddress,
-                    'connected': device.connectable.connected,
-                    'type': type(device).__name__,
-                })
-        return networks
+        for device in devices:
+            if isinstance(device, _DISK_TYPE):
+                disks.append(self._disk_entry(device))
+            elif isinstance(device, _ETHERNET_TYPE):
+                networks.append(self._network_entry(device))
+        return disks, networks
+    
+    def _get_disk_info(self, devices: List[vim.vm.device.VirtualDevice]) -> List[Dict[str, Any]]:
+        """Get disk information from a VM device list"""
+        return [self._disk_entry(d) for d in devices if isinstance(d, _DISK_TYPE)]
+    
+    def _get_network_info(self, devices: List[vim.vm.device.VirtualDevice]) -> List[Dict[str, Any]]:
+        """Get network adapter information from a VM device list"""
+        return [self._network_entry(d) for d in devices if isinstance(d, _ETHERNET_TYPE)]
+    
+    def _disk_entry(self, device: vim.vm.device.VirtualDisk) -> Dict[str, Any]:
+        """Build disk info for a single virtual disk"""
+        return {
+            'label': device.deviceInfo.label,
+            'capacity_gb': device.capacityInKB / 1024 / 1024,
+            'thin_provisioned': device.backing.thinProvisioned if hasattr(device.backing, 'thinProvisioned') else False,
+        }
+    
+    def _network_entry(self, device: vim.vm.device.VirtualEthernetCard) -> Dict[str, Any]:
+        """Build network info for a single network adapter"""
+        network_name = 'Unknown'
+        if hasattr(device.backing, 'network'):
+            network_name = device.backing.network.name
+        elif hasattr(device.backing, 'port'):
+            network_name = device.backing.port.portgroupKey
+            
+        return {
+            'label': device.deviceInfo.label,
+            'network': network_name,
+            'mac_address': device.macAddress,
+            'connected': device.connectable.connected,
+            'type': type(device).__name__,
+        }
     
     def _wait_for_ip(self, vm: vim.VirtualMachine, timeout: int = 300) -> str:
         """Wait for VM to get an IP address"""
-        start_time = time.time()
-        
-        while time.time() - start_time < timeout:
-            if vm.guest.ipAddress:
-                return vm.guest.ipAddress
-            time.sleep(2)
+        if vm.guest.ipAddress:
+            return vm.guest.ipAddress
+            
+        values = self.client.wait_for_updates(
+            vm, vim.VirtualMachine, ['guest.ipAddress'],
+            lambda v: bool(v.get('guest.ipAddress')),
+            timeout=timeout
+        )
+        if values:
+            return values['guest.ipAddress']
             
         raise OSError(f"Timeout waiting for IP address on VM {vm.name}")
     
     def _get_folder_by_path(self, datacenter: vim.Datacenter, path: str) -> vim.Folder:
         """Get folder by path"""
-        # Simple implementation - in practice this would handle nested paths
-        folders = path.split('/')
+        folders = [name for name in path.split('/') if name]
         current_folder = datacenter.vmFolder
-        
+        if not folders:
+            return current_folder
+            
+        # Fetch every folder's name and parent in one call, then walk the path locally
+        children: Dict[Any, Dict[str, vim.Folder]] = {}
+        for folder, props in self.client.get_view_properties(current_folder, [vim.Folder], ['name', 'parent']):
+            children.setdefault(props.get('parent'), {})[props.get('name')] = folder
+            
         for folder_name in folders:
-            if folder_name:
-                found = False
-                for child in current_folder.childEntity:
-                    if isinstance(child, vim.Folder) and child.name == folder_name:
-                        current_folder = child
-                        found = True
-                        break
-                if not found:
-                    raise VMNotFoundError(f"Folder '{folder_name}' not found in path '{path}'")
-                    
+            current_folder = children.get(current_folder, {}).get(folder_name)
+            if current_folder is None:
+                raise VMNotFoundError(f"Folder '{folder_name}' not found in path '{path}'")
+                
         return current_folder
     
     def _get_default_resource_pool(self, datacenter: vim.Datacenter) -> vim.ResourcePool:
@@ -3,15 +3,166 @@ CNI (Container Network Interface) integration utilities
 Supports advanced networking with Calico, Cilium, Multus, and other CNI plugins
 """
 
+import copy
 import json
-import yaml
-from typing import Dict, Any, List, Optional, Union
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Callable, Dict, Any, List, Optional, Tuple, Set
 from dataclasses import dataclass
+from functools import cached_property
 from kubernetes.client.rest import ApiException
 from ..connections.kubernetes import KubernetesConnection
+from ..os_abstraction.base import _DATACLASS_SLOTS
+from ..utils.executor import run_in_executor
 
 
-@dataclass
+# Serialized CNI configs kept per CNIManager before the cache is reset
+SPEC_CONFIG_CACHE_SIZE = 256
+
+# Seconds a cluster's detected CNI plugin set is reused across CNIManager instances
+CNI_CACHE_TTL = 300
+
+# Per-request timeout in seconds for detection LISTs, so a stalled apiserver can't hang detection
+CNI_DETECTION_TIMEOUT = 5
+
+# Detection results per cluster and result name, shared by CNIManager and
+# KubernetesHandler; clusters are keyed by (api server or kubeconfig, context)
+_DETECTION_CACHE: Dict[Tuple[Tuple[Optional[str], Optional[str]], str], Tuple[float, Any]] = {}
+_DETECTION_CACHE_LOCK = threading.Lock()
+
+# Pod labels whose presence marks each CNI plugin as installed
+_CNI_POD_LABELS: Dict[str, List[Tuple[str, str]]] = {
+    "calico": [("k8s-app", "calico-node"), ("projectcalico.org/ds-ready", "true")],
+    "cilium": [("k8s-app", "cilium"), ("app.kubernetes.io/name", "cilium-agent")],
+    "flannel": [("app", "flannel"), ("k8s-app", "flannel")],
+    "weave": [("name", "weave-net"), ("app", "weave-net")],
+    "multus": [("app", "multus"), ("name", "multus")],
+    "antrea": [("app", "antrea"), ("component", "antrea-agent")],
+    "sriov": [("app", "sriov-device-plugin"), ("app", "sriov-cni")],
+}
+
+# Indexes over the markers: plugin per (label key, value), and marker values per key
+_CNI_MARKER_INDEX: Dict[Tuple[str, str], str] = {
+    marker: name for name, markers in _CNI_POD_LABELS.items() for marker in markers
+}
+_CNI_LABEL_VALUES: Dict[str, frozenset] = {
+    key: frozenset(v for k, v in _CNI_MARKER_INDEX if k == key)
+    for key, _ in _CNI_MARKER_INDEX
+}
+
+# Field manager recorded on objects this library applies
+FIELD_MANAGER = "pod-lib"
+
+# Request options for server-side apply; force takes ownership of conflicting fields
+_SERVER_SIDE_APPLY = MappingProxyType({
+    "field_manager": FIELD_MANAGER,
+    "force": True,
+    "_content_type": "application/apply-patch+yaml",
+})
+
+# Custom resources apply_network_configuration can apply, keyed by (API group, kind)
+# and mapped to (version, plural, namespaced)
+_CUSTOM_RESOURCE_ROUTES: Dict[Tuple[str, str], Tuple[str, str, bool]] = {
+    ("k8s.cni.cncf.io", "NetworkAttachmentDefinition"): ("v1", "network-attachment-definitions", True),
+    ("projectcalico.org", "IPPool"): ("v3", "ippools", False),
+    ("projectcalico.org", "BGPConfiguration"): ("v3", "bgpconfigurations", False),
+    ("cilium.io", "CiliumNetworkPolicy"): ("v2", "ciliumnetworkpolicies", True),
+    ("cilium.io", "CiliumClusterwideNetworkPolicy"): ("v2", "ciliumclusterwidenetworkpolicies", False),
+}
+
+# Capabilities all start disabled; observability is filled from detected plugins
+_DEFAULT_CAPABILITIES = MappingProxyType({
+    "network_policies": False,
+    "encryption": False,
+    "load_balancing": False,
+    "service_mesh": False,
+    "multi_cluster": False,
+    "bgp_routing": False,
+    "ebpf": False,
+    "vlan_support": False,
+    "sr_iov": False,
+    "bandwidth_management": False,
+    "observability": None,
+})
+
+# Capabilities each CNI plugin enables, and the observability integrations it brings
+_CNI_CAPABILITIES: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    # Calico encryption is WireGuard
+    "calico": (("network_policies", "bgp_routing", "vlan_support", "encryption", "multi_cluster"),
+               ("calico-monitoring",)),
+    "cilium": (("network_policies", "ebpf", "encryption", "load_balancing", "service_mesh",
+                "bandwidth_management", "multi_cluster"),
+               ("hubble", "cilium-metrics")),
+    "multus": (("vlan_support", "sr_iov"), ()),
+    "sriov": (("sr_iov", "bandwidth_management"), ()),
+}
+
+# Read-only CNI config skeletons; per-call keys are None placeholders that keep
+# the serialized key order stable and are always overridden
+_MACVLAN_TEMPLATE = MappingProxyType({
+    "cniVersion": "0.3.1", "name": None, "type": "macvlan", "master": None,
+    "mode": "bridge", "mtu": None, "ipam": None,
+})
+_SRIOV_TEMPLATE = MappingProxyType({
+    "cniVersion": "0.3.1", "name": None, "type": "sriov", "deviceID": None,
+    "mtu": None, "ipam": None,
+})
+_BRIDGE_TEMPLATE = MappingProxyType({
+    "cniVersion": "0.3.1", "name": None, "type": "bridge", "bridge": None,
+    "isGateway": True, "isDefaultGateway": False, "forceAddress": False,
+    "ipMasq": True, "mtu": None, "hairpinMode": True, "ipam": None,
+})
+_IPVLAN_TEMPLATE = MappingProxyType({
+    "cniVersion": "0.3.1", "name": None, "type": "ipvlan", "master": None,
+    "mode": "l2", "mtu": None, "ipam": None,
+})
+
+
+def _encode_nad_config(manifest: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the manifest with a dict spec.config JSON-encoded, as Multus requires"""
+    spec = manifest.get("spec")
+    if isinstance(spec, dict) and isinstance(spec.get("config"), dict):
+        return {**manifest, "spec": {**spec, "config": json.dumps(spec["config"])}}
+    return manifest
+
+
+def _cluster_key(k8s: KubernetesConnection) -> Tuple[Optional[str], Optional[str]]:
+    """Identify the cluster by api server or kubeconfig, and context"""
+    return (k8s.api_server or k8s.kubeconfig_path, k8s.context)
+
+
+def _cached_detection(k8s: KubernetesConnection, name: str, ttl: float,
+                      detect: Callable[[], Tuple[Any, bool]], refresh: bool = False) -> Any:
+    """
+    Return a detection result, reusing one younger than ttl for the same cluster
+    
+    detect returns the result and whether it is complete; partial results
+    from failed probes are not worth reusing and are not cached.
+    """
+    key = (_cluster_key(k8s), name)
+    if not refresh:
+        with _DETECTION_CACHE_LOCK:
+            cached = _DETECTION_CACHE.get(key)
+        if cached and time.monotonic() - cached[0] < ttl:
+            return copy.deepcopy(cached[1])
+    
+    value, complete = detect()
+    if complete:
+        with _DETECTION_CACHE_LOCK:
+            _DETECTION_CACHE[key] = (time.monotonic(), copy.deepcopy(value))
+    return value
+
+
+def invalidate_detection_cache() -> None:
+    """Forget detection results so the next probe queries the cluster again"""
+    with _DETECTION_CACHE_LOCK:
+        _DETECTION_CACHE.clear()
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class CNIConfig:
     """CNI configuration for advanced networking"""
     name: str
@@ -22,14 +173,18 @@ class CNIConfig:
     gateway: Optional[str] = None
     master_interface: Optional[str] = None
     mtu: int = 1500
-    dns_servers: List[str] = None
-    routes: List[Dict[str, str]] = None
+    dns_servers: Tuple[str, ...] = ("8.8.8.8", "8.8.4.4")
+    routes: Tuple[Tuple[Tuple[str, str], ...], ...] = ()
     
     def __post_init__(self):
-        if self.dns_servers is None:
-            self.dns_servers = ["8.8.8.8", "8.8.4.4"]
-        if self.routes is None:
-            self.routes = []
+        # Lists and route dicts are accepted but stored as tuples so configs are hashable
+        dns_servers = ("8.8.8.8", "8.8.4.4") if self.dns_servers is None else tuple(self.dns_servers)
+        routes = tuple(
+            tuple(route.items()) if isinstance(route, dict) else tuple(route)
+            for route in self.routes or ()
+        )
+        object.__setattr__(self, "dns_servers", dns_servers)
+        object.__setattr__(self, "routes", routes)
 
 
 class CNIManager:
@@ -37,10 +192,28 @@ class CNIManager:
     
     def __init__(self, k8s_connection: KubernetesConnection):
         self.k8s = k8s_connection
-        self.detected_cnis = self._detect_cni_plugins()
-        self.capabilities = self._analyze_capabilities()
+        # Serialized CNI configs keyed by the (hashable) CNIConfig
+        self._spec_configs: Dict[CNIConfig, str] = {}
+    
+    @cached_property
+    def detected_cnis(self) -> Dict[str, bool]:
+        """CNI plugins installed in the cluster, detected on first access"""
+        return self._detect_cni_plugins()
     
-    def _detect_cni_plugins(self) -> Dict[str, bool]:
+    @cached_property
+    def capabilities(self) -> Dict[str, Any]:
+        """Network capabilities of the detected CNI plugins, analyzed on first access"""
+        return self._analyze_capabilities()
+    
+    def _detect_cni_plugins(self, refresh: bool = False) -> Dict[str, bool]:
+        """Detect CNI plugins, reusing a recent result for the same cluster"""
+        def detect() -> Tuple[Dict[str, bool], bool]:
+            plugins = self._scan_cni_plugins()
+            return plugins, "detection_errors" not in plugins
+        
+        return _cached_detection(self.k8s, "detected_cnis", CNI_CACHE_TTL, detect, refresh=refresh)
+    
+    def _scan_cni_plugins(self) -> Dict[str, bool]:
         """Detect and analyze available CNI plugins"""
         plugins = {
             "calico": False,
@@ -55,153 +228,72 @@ class CNIManager:
             "sriov": False
         }
         
+        errors = []
         try:
-            # Check for Calico
-            calico_check = self._check_cni_presence("calico", [
-                {"label": "k8s-app=calico-node"},
-                {"label": "projectcalico.org/ds-ready=true"}
-            ])
-            plugins["calico"] = calico_check
-            
-            # Check for Cilium
-            cilium_check = self._check_cni_presence("cilium", [
-                {"label": "k8s-app=cilium"},
-                {"label": "app.kubernetes.io/name=cilium-agent"}
-            ])
-            plugins["cilium"] = cilium_check
-            
-            # Check for Flannel
-            flannel_check = self._check_cni_presence("flannel", [
-                {"label": "app=flannel"},
-                {"label": "k8s-app=flannel"}
-            ])
-            plugins["flannel"] = flannel_check
-            
-            # Check for Weave
-            weave_check = self._check_cni_presence("weave", [
-                {"label": "name=weave-net"},
-                {"label": "app=weave-net"}
-            ])
-            plugins["weave"] = weave_check
-            
-            # Check for Multus
-            multus_check = self._check_cni_presence("multus", [
-                {"label": "app=multus"},
-                {"label": "name=multus"}
-            ])
-            plugins["multus"] = multus_check
-            
-            # Check for Antrea
-            antrea_check = self._check_cni_presence("antrea", [
-                {"label": "app=antrea"},
-                {"label": "component=antrea-agent"}
-            ])
-            plugins["antrea"] = antrea_check
-            
-            # Check for SR-IOV
-            sriov_check = self._check_cni_presence("sriov", [
-                {"label": "app=sriov-device-plugin"},
-                {"label": "app=sriov-cni"}
-            ])
-            plugins["sriov"] = sriov_check
-            
-        except ApiException as e:
-            # CNI detection limited due to API access issues
-            plugins["detection_errors"] = [f"CNI detection limited: {e.reason}"]
+            # Selectors can't OR across keys, so ask once per label key for all its values
+            for key, values in _CNI_LABEL_VALUES.items():
+                try:
+                    found = self._find_label_values(key, values)
+                except ApiException as e:
+                    # CNI detection limited due to API access issues; keep scanning other keys
+                    errors.append(f"CNI detection limited: {e.reason}")
+                    continue
+                for value in found:
+                    plugins[_CNI_MARKER_INDEX[(key, value)]] = True
         except Exception as e:
             # CNI detection failed
-            plugins["detection_errors"] = [f"CNI detection failed: {str(e)}"]
+            errors.append(f"CNI detection failed: {str(e)}")
         
+        if errors:
+            plugins["detection_errors"] = errors
         return plugins
     
-    def _check_cni_presence(self, cni_name: str, selectors: List[Dict[str, str]]) -> bool:
-        """Check if specific CNI is present using multiple selector strategies"""
-        for selector in selectors:
-            try:
-                if "label" in selector:
-                    pods = self.k8s.v1.list_pod_for_all_namespaces(
-                        label_selector=selector["label"],
-                        limit=1
-                    )
-                    if pods.items:
-                        return True
-            except ApiException as e:
-                # Invalid label selector or API rate limiting, try next selector
-                continue
-            except Exception as e:
-                # Selector failed, try next one
-                continue
-        return False
+    def _find_label_values(self, key: str, values: frozenset) -> Set[str]:
+        """Return which of the given values of a label key appear on any pod"""
+        selector = f"{key} in ({','.join(sorted(values))})"
+        found: Set[str] = set()
+        token = None
+        try:
+            while True:
+                # resourceVersion "0" is served from the apiserver watch cache, not etcd
+                pods = self.k8s.v1.list_pod_for_all_namespaces(
+                    label_selector=selector,
+                    limit=500,
+                    resource_version="0",
+                    _continue=token,
+                    _request_timeout=CNI_DETECTION_TIMEOUT
+                )
+                for pod in pods.items:
+                    value = (pod.metadata.labels or {}).get(key)
+                    if value in values:
+                        found.add(value)
+                token = pods.metadata._continue if pods.metadata else None
+                if not token or found == values:
+                    return found
+        except ApiException as e:
+            if e.status != 400:
+                # Access denied, rate limited or unavailable: the result is incomplete
+                raise
+            # Invalid label selector, treat the key as absent
+            return found
     
     def _analyze_capabilities(self) -> Dict[str, Any]:
         """Analyze network capabilities based on detected CNI plugins"""
-        capabilities = {
-            "network_policies": False,
-            "encryption": False,
-            "load_balancing": False,
-            "service_mesh": False,
-            "multi_cluster": False,
-            "bgp_routing": False,
-            "ebpf": False,
-            "vlan_support": False,
-            "sr_iov": False,
-            "bandwidth_management": False,
-            "observability": []
-        }
-        
-        # Calico capabilities
-        if self.detected_cnis["calico"]:
-            capabilities.update({
-                "network_policies": True,
-                "bgp_routing": True,
-                "vlan_support": True,
-                "encryption": True,  # WireGuard support
-                "multi_cluster": True
-            })
-            capabilities["observability"].append("calico-monitoring")
-        
-        # Cilium capabilities
-        if self.detected_cnis["cilium"]:
-            capabilities.update({
-                "network_policies": True,
-                "ebpf": True,
-                "encryption": True,
-                "load_balancing": True,
-                "service_mesh": True,
-                "bandwidth_management": True,
-                "multi_cluster": True
-            })
-            capabilities["observability"].extend(["hubble", "cilium-metrics"])
-        
-        # Multus capabilities
-        if self.detected_cnis["multus"]:
-            capabilities.update({
-                "vlan_support": True,
-                "sr_iov": True
-            })
+        capabilities = dict(_DEFAULT_CAPABILITIES)
+        observability: Dict[str, None] = {}
         
-        # SR-IOV capabilities
-        if self.detected_cnis["sriov"]:
-            capabilities.update({
-                "sr_iov": True,
-                "bandwidth_management": True
-            })
+        for name, (enabled, endpoints) in _CNI_CAPABILITIES.items():
+            if self.detected_cnis.get(name):
+                capabilities.update(dict.fromkeys(enabled, True))
+                observability.update(dict.fromkeys(endpoints))
         
+        capabilities["observability"] = list(observability)
         return capabilities
     
     def create_network_attachment_definition(self, config: CNIConfig) -> Dict[str, Any]:
         """Create Multus NetworkAttachmentDefinition for advanced networking"""
         
-        if config.type == "macvlan":
-            cni_config = self._create_macvlan_config(config)
-        elif config.type == "sriov":
-            cni_config = self._create_sriov_config(config)
-        elif config.type == "bridge":
-            cni_config = self._create_bridge_config(config)
-        elif config.type == "ipvlan":
-            cni_config = self._create_ipvlan_config(config)
-        else:
-            raise ValueError(f"Unsupported CNI type: {config.type}")
+        spec_config = self._serialize_cni_config(config)
         
         network_attachment = {
             "apiVersion": "k8s.cni.cncf.io/v1",
@@ -215,96 +307,89 @@ class CNIManager:
                 }
             },
             "spec": {
-                "config": json.dumps(cni_config)
+                "config": spec_config
             }
         }
         
         return network_attachment
     
+    def create_many_network_attachment_definitions(self, configs: List[CNIConfig],
+                                                    workers: int = 16) -> List[bool]:
+        """
+        Build and apply NetworkAttachmentDefinitions for many networks
+        
+        Manifests are built up front, then applied on a bounded thread pool that
+        shares the connection's pooled API client.
+        
+        Args:
+            configs: Network configurations, one NAD each
+            workers: Maximum concurrent apply requests
+        
+        Returns:
+            Apply results in the same order as configs
+        """
+        if not configs:
+            return []
+        attachments = [self.create_network_attachment_definition(config) for config in configs]
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(attachments)))) as executor:
+            return list(executor.map(self.apply_network_configuration, attachments))
+    
+    def build_cni_config(self, config: CNIConfig) -> Dict[str, Any]:
+        """Build the CNI plugin config as a dict, without serializing it into a NAD"""
+        builder = self._CONFIG_BUILDERS.get(config.type)
+        if builder is None:
+            raise ValueError(f"Unsupported CNI type: {config.type}")
+        return builder(self, config)
+    
+    def _serialize_cni_config(self, config: CNIConfig) -> str:
+        """Build and serialize the CNI config, reusing the result for identical configs"""
+        spec_config = self._spec_configs.get(config)
+        if spec_config is None:
+            spec_config = json.dumps(self.build_cni_config(config))
+            if len(self._spec_configs) >= SPEC_CONFIG_CACHE_SIZE:
+                self._spec_configs.clear()
+            self._spec_configs[config] = spec_config
+        return spec_config
+    
     def _create_macvlan_config(self, config: CNIConfig) -> Dict[str, Any]:
         """Create MACVLAN CNI configuration"""
-        cni_config = {
-            "cniVersion": "0.3.1",
-            "name": config.name,
-            "type": "macvlan",
-            "master": config.master_interface or "eth0",
-            "mode": "bridge",
-            "mtu": config.mtu,
-            "ipam": {
-                "type": "static" if config.subnet else "dhcp"
-            }
-        }
+        cni_config = dict(
+            _MACVLAN_TEMPLATE,
+            name=config.name,
+            master=config.master_interface or "eth0",
+            mtu=config.mtu,
+            ipam=self._static_ipam(config, with_routes=True) if config.subnet else {"type": "dhcp"}
+        )
         
         if config.vlan_id:
             cni_config["vlan"] = config.vlan_id
         
-        if config.subnet:
-            cni_config["ipam"] = {
-                "type": "static",
-                "addresses": [
-                    {
-                        "address": config.subnet,
-                        "gateway": config.gateway
-                    }
-                ],
-                "dns": {
-                    "nameservers": config.dns_servers
-                },
-                "routes": config.routes
-            }
-        
         return cni_config
     
     def _create_sriov_config(self, config: CNIConfig) -> Dict[str, Any]:
         """Create SR-IOV CNI configuration"""
-        cni_config = {
-            "cniVersion": "0.3.1",
-            "name": config.name,
-            "type": "sriov",
-            "deviceID": config.master_interface or "0000:00:00.0",
-            "mtu": config.mtu,
-            "ipam": {
-                "type": "static" if config.subnet else "dhcp"
-            }
-        }
+        cni_config = dict(
+            _SRIOV_TEMPLATE,
+            name=config.name,
+            deviceID=config.master_interface or "0000:00:00.0",
+            mtu=config.mtu,
+            ipam=self._static_ipam(config) if config.subnet else {"type": "dhcp"}
+        )
         
         if config.vlan_id:
             cni_config["vlan"] = config.vlan_id
         
-        if config.subnet:
-            cni_config["ipam"] = {
-                "type": "static",
-                "addresses": [
-                    {
-                        "address": config.subnet,
-                        "gateway": config.gateway
-                    }
-                ],
-                "dns": {
-                    "nameservers": config.dns_servers
-                }
-            }
-        
         return cni_config
     
     def _create_bridge_config(self, config: CNIConfig) -> Dict[str, Any]:
         """Create bridge CNI configuration"""
-        cni_config = {
-            "cniVersion": "0.3.1",
-            "name": config.name,
-            "type": "bridge",
-            "bridge": config.bridge or f"br-{config.name}",
-            "isGateway": True,
-            "isDefaultGateway": False,
-            "forceAddress": False,
-            "ipMasq": True,
-            "mtu": config.mtu,
-            "hairpinMode": True,
-            "ipam": {
-                "type": "host-local",
-                "subnet": config.subnet or "10.244.0.0/16"
-            }
-        }
+        cni_config = dict(
+            _BRIDGE_TEMPLATE,
+            name=config.name,
+            bridge=config.bridge or f"br-{config.name}",
+            mtu=config.mtu,
+            ipam={"type": "host-local", "subnet": config.subnet or "10.244.0.0/16"}
+        )
         
         if config.vlan_id:
             cni_config["vlan"] = config.vlan_id
@@ -313,33 +398,41 @@ class CNIManager:
     
     def _create_ipvlan_config(self, config: CNIConfig) -> Dict[str, Any]:
         """Create IPVLAN CNI configuration"""
-        cni_config = {
-            "cniVersion": "0.3.1",
-            "name": config.name,
-            "type": "ipvlan",
-            "master": config.master_interface or "eth0",
-            "mode": "l2",
-            "mtu": config.mtu,
-            "ipam": {
-                "type": "static" if config.subnet else "dhcp"
+        return dict(
+            _IPVLAN_TEMPLATE,
+            name=config.name,
+            master=config.master_interface or "eth0",
+            mtu=config.mtu,
+            ipam=self._static_ipam(config) if config.subnet else {"type": "dhcp"}
+        )
+    
+    def _static_ipam(self, config: CNIConfig, with_routes: bool = False) -> Dict[str, Any]:
+        """Create static IPAM configuration for the configured subnet"""
+        ipam = {
+            "type": "static",
+            "addresses": [
+                {
+                    "address": config.subnet,
+                    "gateway": config.gateway
+                }
+            ],
+            "dns": {
+                "nameservers": list(config.dns_servers)
             }
         }
         
-        if config.subnet:
-            cni_config["ipam"] = {
-                "type": "static",
-                "addresses": [
-                    {
-                        "address": config.subnet,
-                        "gateway": config.gateway
-                    }
-                ],
-                "dns": {
-                    "nameservers": config.dns_servers
-                }
-            }
+        if with_routes:
+            ipam["routes"] = [dict(route) for route in config.routes]
         
-        return cni_config
+        return ipam
+    
+    # CNI config builder per NetworkAttachmentDefinition plugin type
+    _CONFIG_BUILDERS = {
+        "macvlan": _create_macvlan_config,
+        "sriov": _create_sriov_config,
+        "bridge": _create_bridge_config,
+        "ipvlan": _create_ipvlan_config,
+    }
     
     def create_calico_ip_pool(self, name: str, cidr: str, vlan_id: Optional[int] = None) -> Dict[str, Any]:
         """Create Calico IP Pool for VLAN isolation"""
@@ -451,7 +544,7 @@ class CNIManager:
                 version="v1",
                 namespace=namespace,
                 plural="network-attachment-definitions",
-                body=network_attachment
+                body=_encode_nad_config(network_attachment)
             )
             return {"success": True}
         except ApiException as e:
@@ -496,67 +589,73 @@ class CNIManager:
             return False
 
     def apply_network_configuration(self, config_dict: Dict[str, Any]) -> bool:
-        """Apply network configuration to the cluster"""
+        """
+        Apply network configuration to the cluster with server-side apply
+        
+        Creates the resource or corrects drift on an existing one in a single
+        idempotent PATCH, so repeated applies need no existence check.
+        """
         try:
-            api_version = config_dict.get("apiVersion", "")
+            config_dict = _encode_nad_config(config_dict)
+            group = config_dict.get("apiVersion", "").split("/", 1)[0]
             kind = config_dict.get("kind", "")
+            metadata = config_dict.get("metadata", {})
             
-            if "k8s.cni.cncf.io" in api_version and kind == "NetworkAttachmentDefinition":
-                self.k8s.custom_objects_v1.create_namespaced_custom_object(
-                    group="k8s.cni.cncf.io",
-                    version="v1",
-                    namespace=config_dict["metadata"]["namespace"],
-                    plural="network-attachment-definitions",
-                    body=config_dict
+            if (group, kind) == ("networking.k8s.io", "NetworkPolicy"):
+                self.k8s.networking_v1.patch_namespaced_network_policy(
+                    name=metadata["name"],
+                    namespace=metadata["namespace"],
+                    body=config_dict,
+                    **_SERVER_SIDE_APPLY
                 )
-            elif "projectcalico.org" in api_version:
-                if kind == "IPPool":
-                    self.k8s.custom_objects_v1.create_cluster_custom_object(
-                        group="projectcalico.org",
-                        version="v3",
-                        plural="ippools",
-                        body=config_dict
-                    )
-                elif kind == "BGPConfiguration":
-                    self.k8s.custom_objects_v1.create_cluster_custom_object(
-                        group="projectcalico.org",
-                        version="v3",
-                        plural="bgpconfigurations",
-                        body=config_dict
-                    )
-            elif "cilium.io" in api_version:
-                if kind == "CiliumNetworkPolicy":
-                    self.k8s.custom_objects_v1.create_namespaced_custom_object(
-                        group="cilium.io",
-                        version="v2",
-                        namespace=config_dict["metadata"]["namespace"],
-                        plural="ciliumnetworkpolicies",
-                        body=config_dict
-                    )
-                elif kind == "CiliumClusterwideNetworkPolicy":
-                    self.k8s.custom_objects_v1.create_cluster_custom_object(
-                        group="cilium.io",
-                        version="v2",
-                        plural="ciliumclusterwidenetworkpolicies",
-                        body=config_dict
-                    )
-            elif "networking.k8s.io" in api_version and kind == "NetworkPolicy":
-                self.k8s.networking_v1.create_namespaced_network_policy(
-                    namespace=config_dict["metadata"]["namespace"],
-                    body=config_dict
+                return True
+            
+            route = _CUSTOM_RESOURCE_ROUTES.get((group, kind))
+            if route is None:
+                return False
+            version, plural, namespaced = route
+            
+            if namespaced:
+                self.k8s.custom_objects_v1.patch_namespaced_custom_object(
+                    group=group,
+                    version=version,
+                    namespace=metadata["namespace"],
+                    plural=plural,
+                    name=metadata["name"],
+                    body=config_dict,
+                    **_SERVER_SIDE_APPLY
                 )
             else:
-                return False
+                self.k8s.custom_objects_v1.patch_cluster_custom_object(
+                    group=group,
+                    version=version,
+                    plural=plural,
+                    name=metadata["name"],
+                    body=config_dict,
+                    **_SERVER_SIDE_APPLY
+                )
             
             return True
             
-        except ApiException as e:
-            if e.status == 409:  # Already exists
-                return True
-            return False
         except Exception:
             return False
     
+    async def apply_network_configuration_async(self, config_dict: Dict[str, Any]) -> bool:
+        """Async version of apply_network_configuration"""
+        return await run_in_executor(self.apply_network_configuration, config_dict)
+    
+    async def apply_many_async(self, configs: List[Dict[str, Any]]) -> List[bool]:
+        """
+        Apply many network configurations concurrently
+        
+        Args:
+            configs: Resource manifests accepted by apply_network_configuration
+        
+        Returns:
+            Apply results in the same order as configs
+        """
+        return await asyncio.gather(*(self.apply_network_configuration_async(c) for c in configs))
+    
     def get_network_observability_config(self) -> Dict[str, Any]:
         """Get observability configuration for network monitoring"""
         config = {
@@ -2,14 +2,22 @@
 OS abstraction layer modules
 """
 
+import importlib
+
 from .base import BaseOSHandler, CommandResult, NetworkInterface, NetworkConfig
-from .linux import LinuxHandler
-from .windows import WindowsHandler
-from .container import ContainerHandler, ContainerConnection
-from .kubernetes import KubernetesHandler
-from .factory import OSHandlerFactory
 
-__all__ = [
+# Handlers pull in their transport libraries (paramiko, pywinrm, docker, kubernetes),
+# so they are imported on first attribute access rather than with the package
+_LAZY_ATTRIBUTES = {
+    'LinuxHandler': '.linux',
+    'WindowsHandler': '.windows',
+    'ContainerHandler': '.container',
+    'ContainerConnection': '.container',
+    'KubernetesHandler': '.kubernetes',
+    'OSHandlerFactory': '.factory',
+}
+
+__all__ = (
     'BaseOSHandler',
     'CommandResult',
     'NetworkInterface',
@@ -19,5 +27,19 @@ __all__ = [
     'ContainerHandler',
     'ContainerConnection',
     'KubernetesHandler',
-    'OSHandlerFactory'
-]
\ No newline at end of file
+    'OSHandlerFactory',
+)
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # Cache on the package so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
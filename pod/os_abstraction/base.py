@@ -2,27 +2,65 @@
 Base OS interface for all operating systems
 """
 
+import socket
+import struct
+import sys
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass
 
+# __slots__ for dataclasses needs Python 3.10+
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+# All 33 contiguous IPv4 masks, built once; other masks fall back to bit counting
+_PREFIX_TO_NETMASK = tuple(
+    socket.inet_ntoa(struct.pack('!I', (0xffffffff << (32 - p)) & 0xffffffff))
+    for p in range(33)
+)
+_NETMASK_TO_PREFIX = {mask: prefix for prefix, mask in enumerate(_PREFIX_TO_NETMASK)}
+
+# Set bits in each octet value, indexed by the octet
+_OCTET_BITS = bytes(bin(octet).count('1') for octet in range(256))
+
+
+def _netmask_prefix(netmask: str) -> int:
+    """Prefix length of a dotted netmask, counting bits only for non-contiguous masks"""
+    prefix = _NETMASK_TO_PREFIX.get(netmask)
+    if prefix is None:
+        prefix = sum(_OCTET_BITS[int(octet)] for octet in netmask.split('.'))
+    return prefix
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class CommandResult:
     """Normalized command execution result"""
     stdout: str
     stderr: str
     exit_code: int
-    success: bool
     command: str
     duration: float
     data: Optional[Dict[str, Any]] = None  # Parsed structured data
     
+    @property
+    def success(self) -> bool:
+        """Whether the command exited with status 0"""
+        return self.exit_code == 0
+    
     def __bool__(self) -> bool:
         return self.success
+    
+    @classmethod
+    def ok(cls, stdout: str, command: str, duration: float = 0.0) -> "CommandResult":
+        """Build a successful result with empty stderr"""
+        return cls(stdout, "", 0, command, duration)
+    
+    @classmethod
+    def fail(cls, stderr: str, command: str, duration: float = 0.0, exit_code: int = 1) -> "CommandResult":
+        """Build a failed result with empty stdout"""
+        return cls("", stderr, exit_code, command, duration)
 
 
-@dataclass 
+@dataclass(**_DATACLASS_SLOTS)
 class NetworkInterface:
     """Normalized network interface info"""
     name: str
@@ -36,7 +74,7 @@ class NetworkInterface:
     type: str  # ethernet/wifi/virtual
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class NetworkConfig:
     """Network configuration request"""
     interface: str
@@ -2,30 +2,79 @@
 Container OS handler implementation with VLAN support
 """
 
+import os
 import re
 import json
 import time
+import logging
+import asyncio
+import tempfile
+import functools
+import uuid
+import shlex
+import selectors
+import threading
 import subprocess  # nosec B404
-from typing import Dict, Any, Optional, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Sequence, Tuple, Union
 from .base import BaseOSHandler, CommandResult, NetworkInterface, NetworkConfig
 from .linux import LinuxHandler
 from ..connections.base import BaseConnection
 
 
+logger = logging.getLogger(__name__)
+
+# Fields read by ContainerHandler.get_container_info, joined with the ASCII unit separator
+_SUMMARY_FORMAT = "\x1f".join((
+    "{{.Id}}",
+    "{{.Config.Image}}",
+    "{{.Created}}",
+    "{{.State.Status}}",
+    "{{json .NetworkSettings.Networks}}",
+))
+
+
 class ContainerConnection(BaseConnection):
     """Connection handler for Docker containers"""
     
-    def __init__(self, container_id: str, use_docker: bool = True):
+    __slots__ = (
+        "container_id", "command_prefix", "persistent_shell",
+        "_exec_prefix", "_bash_exec_prefix", "_script_exec_cmd", "_running_check_cmd",
+        "_cp_prefix", "_cp_container_path",
+        "_connected", "_check_ttl", "_last_check_ts", "_check_lock",
+        "_full_inspect", "_shell", "_shell_lock",
+        "__weakref__",
+    )
+    
+    def __init__(self, container_id: str, use_docker: bool = True,
+                 persistent_shell: bool = False):
         """
         Initialize container connection
         
         Args:
             container_id: Container ID or name
             use_docker: Use docker command (True) or podman (False)
+            persistent_shell: Keep one `exec -i` bash session open and run
+                commands through it instead of paying an exec per command
         """
         self.container_id = container_id
         self.command_prefix = "docker" if use_docker else "podman"
+        # argv templates built once; per call only the command is appended
+        self._exec_prefix = [self.command_prefix, "exec", container_id]
+        self._bash_exec_prefix = self._exec_prefix + ["/bin/bash", "-c"]
+        self._script_exec_cmd = [self.command_prefix, "exec", "-i", container_id, "/bin/bash", "-s"]
+        self._running_check_cmd = [self.command_prefix, "inspect", "--format", "{{.State.Running}}", container_id]
+        self._cp_prefix = [self.command_prefix, "cp"]
+        self._cp_container_path = f"{container_id}:"
         self._connected = False
+        # is_connected() trusts a successful inspect for this many seconds
+        self._check_ttl = 1.0
+        self._last_check_ts = 0.0
+        self._check_lock = threading.Lock()
+        self._full_inspect: Optional[Dict[str, Any]] = None
+        self.persistent_shell = persistent_shell
+        self._shell: Optional[subprocess.Popen] = None
+        self._shell_lock = threading.Lock()
     
     @property
     def default_port(self) -> int:
@@ -36,77 +85,317 @@ class ContainerConnection(BaseConnection):
         """Connect to container (verify it exists and is running)"""
         try:
             # Check if container exists and is running
-            cmd = [self.command_prefix, "inspect", self.container_id]
-            result = subprocess.run(cmd, capture_output=True, text=True)  # nosec B603
-            
-            if result.returncode == 0:
-                container_info = json.loads(result.stdout)
-                if isinstance(container_info, list):
-                    container_info = container_info[0]
-                    
-                state = container_info.get('State', {})
-                if state.get('Running', False):
+            state = self.inspect(refresh=True).get('State', {})
+            if state.get('Running', False):
+                self._connected = True
+                self._last_check_ts = time.monotonic()
+            else:
+                # Try to start the container
+                cmd = [self.command_prefix, "start", self.container_id]
+                result = subprocess.run(  # nosec B603
+                    cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+                )
+                if result.returncode == 0:
                     self._connected = True
+                    # State and networks changed on start
+                    self._full_inspect = None
                 else:
-                    # Try to start the container
-                    cmd = [self.command_prefix, "start", self.container_id]
-                    result = subprocess.run(cmd, capture_output=True, text=True)  # nosec B603
-                    if result.returncode == 0:
-                        self._connected = True
-                    else:
-                        raise ConnectionError(f"Failed to start container: {result.stderr}")
-            else:
-                raise ConnectionError(f"Container not found: {result.stderr}")
-                
+                    raise ConnectionError(f"Failed to start container: {result.stderr}")
+                    
         except Exception as e:
             raise ConnectionError(f"Failed to connect to container: {str(e)}")
             
+        if self.persistent_shell:
+            self._open_shell()
+            
+    def inspect(self, refresh: bool = False) -> Dict[str, Any]:
+        """
+        Return the container's inspect document
+        
+        The parsed JSON is kept on the connection and reused until refresh is
+        requested; scalar checks such as is_connected() use --format instead.
+        """
+        if self._full_inspect is None or refresh:
+            cmd = [self.command_prefix, "inspect", self.container_id]
+            result = subprocess.run(cmd, capture_output=True, text=True)  # nosec B603
+            if result.returncode != 0:
+                raise ConnectionError(f"Container not found: {result.stderr}")
+                
+            data = json.loads(result.stdout)
+            if isinstance(data, list):
+                data = data[0]
+            self._full_inspect = data
+            
+        return self._full_inspect
+        
+    def summary(self) -> Dict[str, Any]:
+        """
+        Return the container's id, image, created time, status and networks
+        
+        Served from the cached inspect document when connect() fetched one;
+        otherwise only these fields are requested with a --format template
+        rather than fetching and parsing the whole document.
+        """
+        if self._full_inspect is not None:
+            data = self._full_inspect
+            return {
+                'id': data.get('Id', ''),
+                'image': data.get('Config', {}).get('Image', ''),
+                'created': data.get('Created', ''),
+                'status': data.get('State', {}).get('Status', ''),
+                'networks': data.get('NetworkSettings', {}).get('Networks') or {},
+            }
+            
+        cmd = [self.command_prefix, "inspect", "--format", _SUMMARY_FORMAT, self.container_id]
+        result = subprocess.run(cmd, capture_output=True, text=True)  # nosec B603
+        if result.returncode != 0:
+            raise ConnectionError(f"Container not found: {result.stderr}")
+            
+        fields = result.stdout.rstrip("\n").split("\x1f")
+        if len(fields) != 5:
+            raise ValueError(f"Unexpected inspect output: {result.stdout!r}")
+            
+        container_id, image, created, status, networks = fields
+        return {
+            'id': container_id,
+            'image': image,
+            'created': created,
+            'status': status,
+            # Only the networks field needs JSON decoding
+            'networks': json.loads(networks) or {},
+        }
+        
     def disconnect(self):
         """Disconnect from container"""
+        with self._shell_lock:
+            self._close_shell()
         self._connected = False
+        self._last_check_ts = 0.0
+        self._full_inspect = None
         
     def is_connected(self) -> bool:
-        """Check if connected to container"""
+        """Check if connected to container (cached for _check_ttl seconds)"""
         if not self._connected:
             return False
             
-        # Verify container is still running
-        cmd = [self.command_prefix, "inspect", self.container_id, "--format={{.State.Running}}"]
-        result = subprocess.run(cmd, capture_output=True, text=True) # nosec B603
+        # Held across the inspect so concurrent callers share one check
+        with self._check_lock:
+            if time.monotonic() - self._last_check_ts < self._check_ttl:
+                return True
+                
+            # Verify container is still running
+            result = subprocess.run(self._running_check_cmd, capture_output=True, text=True) # nosec B603
+            
+            running = result.returncode == 0 and result.stdout.strip() == 'true'
+            self._last_check_ts = time.monotonic() if running else 0.0
+            return running
+        
+    def execute_command(self, command: Union[str, Sequence[str]],
+                        timeout: int = 30, capture: bool = True) -> Tuple[str, str, int]:
+        """
+        Execute command in container
+        
+        A string is run through /bin/bash -c; an argv sequence is exec'd
+        directly, skipping the in-container shell. With a persistent shell
+        open, either form is sent over it instead of a new exec. Pass
+        capture=False when only the exit code matters: stdout is discarded
+        (returned as "") instead of being piped back.
+        """
+        if self._shell is not None:
+            if not self.is_connected():
+                raise ConnectionError("Not connected to container")
+            text = command if isinstance(command, str) else shlex.join(command)
+            result = self._shell_exec(text, timeout)
+            if result is not None:
+                return result if capture else ("", result[1], result[2])
+                
+        # Build docker/podman exec command
+        if isinstance(command, str):
+            return self._exec(self._bash_exec_prefix + [command], timeout, capture=capture)
+        return self._exec(self._exec_prefix + list(command), timeout, capture=capture)
         
-        return result.returncode == 0 and result.stdout.strip() == 'true'
+    def execute_script(self, script: str, timeout: int = 30) -> Tuple[str, str, int]:
+        """Run a multi-line shell script in the container with one exec (fed on stdin)"""
+        return self._exec(self._script_exec_cmd, timeout, script=script)
         
-    def execute_command(self, command: str, timeout: int = 30) -> Tuple[str, str, int]:
-        """Execute command in container"""
+    def _exec(self, exec_cmd: List[str], timeout: int, script: Optional[str] = None,
+              capture: bool = True) -> Tuple[str, str, int]:
+        """Run a docker/podman exec argv, optionally piping a script to stdin"""
         if not self.is_connected():
             raise ConnectionError("Not connected to container")
             
-        # Build docker/podman exec command
-        exec_cmd = [self.command_prefix, "exec", self.container_id, "/bin/bash", "-c", command]
-        
         try:
             result = subprocess.run(  # nosec B603
                 exec_cmd,
-                capture_output=True,
+                input=script,
+                stdout=subprocess.PIPE if capture else subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
                 text=True,
                 timeout=timeout
             )
             
-            return result.stdout, result.stderr, result.returncode
+            if result.returncode == 125:
+                # The runtime could not exec (container gone/stopped); recheck next time
+                with self._check_lock:
+                    self._last_check_ts = 0.0
+                
+            return result.stdout or "", result.stderr, result.returncode
             
         except subprocess.TimeoutExpired:
             return "", f"Command timed out after {timeout} seconds", 124
             
+    async def aexecute_command(self, command: Union[str, Sequence[str]],
+                               timeout: int = 30) -> Tuple[str, str, int]:
+        """Async execute_command: runs the exec as an asyncio subprocess"""
+        if isinstance(command, str):
+            return await self._aexec(self._bash_exec_prefix + [command], timeout)
+        return await self._aexec(self._exec_prefix + list(command), timeout)
+        
+    async def aexecute_script(self, script: str, timeout: int = 30) -> Tuple[str, str, int]:
+        """Async execute_script: pipes the script to one asyncio exec subprocess"""
+        return await self._aexec(self._script_exec_cmd, timeout, script=script)
+        
+    async def _aexec(self, exec_cmd: List[str], timeout: int,
+                     script: Optional[str] = None) -> Tuple[str, str, int]:
+        """Run a docker/podman exec argv without blocking the event loop"""
+        # The running check may spawn an inspect, so keep it off the loop
+        connected = await asyncio.get_running_loop().run_in_executor(None, self.is_connected)
+        if not connected:
+            raise ConnectionError("Not connected to container")
+            
+        proc = await asyncio.create_subprocess_exec(
+            *exec_cmd,
+            stdin=asyncio.subprocess.PIPE if script is not None else None,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                proc.communicate(script.encode() if script is not None else None),
+                timeout
+            )
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return "", f"Command timed out after {timeout} seconds", 124
+            
+        if proc.returncode == 125:
+            # The runtime could not exec (container gone/stopped); recheck next time
+            with self._check_lock:
+                self._last_check_ts = 0.0
+                
+        return stdout.decode(errors="replace"), stderr.decode(errors="replace"), proc.returncode
+        
+    def _open_shell(self):
+        """Start the long-lived `exec -i` bash session used by execute_command"""
+        cmd = [self.command_prefix, "exec", "-i", self.container_id, "/bin/bash"]
+        try:
+            self._shell = subprocess.Popen(  # nosec B603
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                bufsize=0
+            )
+        except OSError:
+            # Per-command exec still works without the session
+            self._shell = None
+            
+    def _close_shell(self):
+        """Ask the persistent shell to exit, killing it if it does not"""
+        shell, self._shell = self._shell, None
+        if shell is None:
+            return
+            
+        try:
+            shell.stdin.write(b"exit\n")
+            shell.stdin.close()
+            shell.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            shell.kill()
+            shell.wait()
+            
+    def _shell_exec(self, command: str, timeout: int) -> Optional[Tuple[str, str, int]]:
+        """
+        Run one command over the persistent shell
+        
+        The command runs in a subshell with stdin from /dev/null, so cd/exit
+        and stdin readers cannot disturb the session. A per-call marker
+        echoed on both streams frames the output; the exit code follows the
+        stderr marker. Returns None when the shell is gone, so the caller
+        falls back to a regular exec.
+        """
+        with self._shell_lock:
+            shell = self._shell
+            if shell is None or shell.poll() is not None:
+                self._shell = None
+                return None
+                
+            marker_text = f"__POD_END_{uuid.uuid4().hex}__"
+            marker = marker_text.encode()
+            payload = (
+                f"(\n{command}\n) </dev/null\n"
+                f"__pod_rc=$?\n"
+                f"printf '%s%d\\n' '{marker_text}' \"$__pod_rc\" >&2\n"
+                f"printf '%s\\n' '{marker_text}'\n"
+            ).encode()
+            
+            try:
+                shell.stdin.write(payload)
+            except OSError:
+                self._close_shell()
+                return None
+                
+            buffers = {shell.stdout.fileno(): bytearray(), shell.stderr.fileno(): bytearray()}
+            out, err = buffers.values()
+            deadline = time.monotonic() + timeout
+            
+            with selectors.DefaultSelector() as selector:
+                for fd in buffers:
+                    selector.register(fd, selectors.EVENT_READ)
+                    
+                while not (marker + b"\n" in out and re.search(re.escape(marker) + rb"-?\d+\n", err)):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        # The command is still running in the session; discard it
+                        self._close_shell()
+                        return "", f"Command timed out after {timeout} seconds", 124
+                        
+                    for key, _ in selector.select(remaining):
+                        data = os.read(key.fd, 65536)
+                        if not data:
+                            # Session ended mid-command (container stopped)
+                            self._close_shell()
+                            with self._check_lock:
+                                self._last_check_ts = 0.0
+                            return out.decode(errors="replace"), err.decode(errors="replace"), 125
+                        buffers[key.fd] += data
+                        
+            err_end = err.index(marker)
+            exit_code = int(err[err_end + len(marker):].split(b"\n", 1)[0])
+            return (
+                out[:out.index(marker)].decode(errors="replace"),
+                err[:err_end].decode(errors="replace"),
+                exit_code
+            )
+            
     def upload_file(self, local_path: str, remote_path: str) -> bool:
         """Upload file to container"""
-        cmd = [self.command_prefix, "cp", local_path, f"{self.container_id}:{remote_path}"]
-        result = subprocess.run(cmd, capture_output=True)  # nosec B603
-        return result.returncode == 0
+        return self._copy(local_path, self._cp_container_path + remote_path)
         
     def download_file(self, remote_path: str, local_path: str) -> bool:
         """Download file from container"""
-        cmd = [self.command_prefix, "cp", f"{self.container_id}:{remote_path}", local_path]
-        result = subprocess.run(cmd, capture_output=True)  # nosec B603
+        return self._copy(self._cp_container_path + remote_path, local_path)
+        
+    def _copy(self, source: str, destination: str) -> bool:
+        """Run docker/podman cp, keeping only stderr for diagnostics"""
+        cmd = self._cp_prefix + [source, destination]
+        result = subprocess.run(  # nosec B603
+            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+        )
+        if result.returncode != 0:
+            logger.debug(f"{self.command_prefix} cp {source} {destination} failed: {result.stderr.strip()}")
         return result.returncode == 0
 
 
@@ -116,17 +405,140 @@ class ContainerHandler(LinuxHandler):
     Extends LinuxHandler since containers typically run Linux
     """
     
-    def __init__(self, connection: ContainerConnection, host_bridge: Optional[str] = None):
+    # Probed in order; container images often ship without apt lists
+    _PACKAGE_MANAGERS = {
+        'apt-get': 'apt-get update && apt-get install -y',  # Debian, Ubuntu
+        'dnf': 'dnf install -y',              # Fedora, RHEL 8+, Rocky 9
+        'yum': 'yum install -y',              # RHEL 7, CentOS
+        'zypper': 'zypper install -y',        # openSUSE
+        'pacman': 'pacman -S --noconfirm',    # Arch
+    }
+    
+    def __init__(self, connection: ContainerConnection, host_bridge: Optional[str] = None,
+                 use_nsenter: bool = False):
         """
         Initialize container handler
         
         Args:
             connection: Container connection
             host_bridge: Optional host bridge name for VLAN configuration
+            use_nsenter: Run network setup scripts with nsenter into the
+                container's namespaces instead of through the runtime daemon
+                (requires root on the container host)
         """
         super().__init__(connection)
         self.host_bridge = host_bridge or "br0"
+        self.use_nsenter = use_nsenter
         self._container_info = None
+        self._container_pid: Optional[int] = None
+        
+    def execute_command(self, command: Union[str, Sequence[str]], timeout: int = 30,
+                        as_admin: bool = False) -> CommandResult:
+        """Execute a shell string, or an argv list without a shell, in the container"""
+        if isinstance(command, str):
+            return super().execute_command(command, timeout=timeout, as_admin=as_admin)
+            
+        start_time = time.time()
+        argv = list(command)
+        if as_admin and argv[:1] != ['sudo']:
+            argv.insert(0, 'sudo')
+            
+        stdout, stderr, exit_code = self.connection.execute_command(argv, timeout=timeout)
+        
+        return CommandResult(
+            stdout=stdout,
+            stderr=stderr,
+            exit_code=exit_code,
+            command=shlex.join(argv),
+            duration=time.time() - start_time
+        )
+        
+    def _exec_script(self, commands: List[str], timeout: int = 60,
+                     as_admin: bool = False) -> CommandResult:
+        """Run commands as one `set -e` script, so a setup sequence costs a single exec"""
+        if self.use_nsenter and self._resolve_pid():
+            # nsenter already runs as root on the host, so no sudo
+            script = "set -e\n" + "\n".join(commands) + "\n"
+            return self._nsenter_exec(["/bin/sh", "-s"], script=script, timeout=timeout)
+            
+        if as_admin:
+            commands = [f"sudo {cmd}" for cmd in commands]
+        script = "set -e\n" + "\n".join(commands) + "\n"
+        
+        start_time = time.time()
+        stdout, stderr, exit_code = self.connection.execute_script(script, timeout=timeout)
+        
+        return CommandResult(
+            stdout=stdout,
+            stderr=stderr,
+            exit_code=exit_code,
+            command=script,
+            duration=time.time() - start_time
+        )
+        
+    async def _aexec_script(self, commands: List[str], timeout: int = 60,
+                            as_admin: bool = False) -> CommandResult:
+        """Async _exec_script; the nsenter path runs on the default executor"""
+        if self.use_nsenter:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, functools.partial(self._exec_script, commands, timeout, as_admin)
+            )
+            
+        if as_admin:
+            commands = [f"sudo {cmd}" for cmd in commands]
+        script = "set -e\n" + "\n".join(commands) + "\n"
+        
+        start_time = time.time()
+        stdout, stderr, exit_code = await self.connection.aexecute_script(script, timeout=timeout)
+        
+        return CommandResult(
+            stdout=stdout,
+            stderr=stderr,
+            exit_code=exit_code,
+            command=script,
+            duration=time.time() - start_time
+        )
+        
+    def _resolve_pid(self) -> Optional[int]:
+        """Return the container's host PID (cached), or None if it cannot be found"""
+        if self._container_pid is None and isinstance(self.connection, ContainerConnection):
+            cmd = [self.connection.command_prefix, "inspect", "--format", "{{.State.Pid}}",
+                   self.connection.container_id]
+            result = subprocess.run(cmd, capture_output=True, text=True)  # nosec B603
+            if result.returncode == 0 and result.stdout.strip().isdigit():
+                # A stopped container reports pid 0
+                self._container_pid = int(result.stdout.strip()) or None
+        return self._container_pid
+        
+    def _nsenter_exec(self, argv: List[str], script: Optional[str] = None,
+                      timeout: int = 60) -> CommandResult:
+        """Run argv on the host inside the container's network and mount namespaces"""
+        cmd = ["nsenter", "-t", str(self._container_pid), "-n", "-m", "--", *argv]
+        start_time = time.time()
+        
+        try:
+            result = subprocess.run(  # nosec B603
+                cmd,
+                input=script,
+                capture_output=True,
+                text=True,
+                timeout=timeout
+            )
+            stdout, stderr, exit_code = result.stdout, result.stderr, result.returncode
+        except subprocess.TimeoutExpired:
+            stdout, stderr, exit_code = "", f"Command timed out after {timeout} seconds", 124
+            
+        if exit_code != 0 and "No such process" in stderr:
+            # Container restarted under a new pid; resolve again next time
+            self._container_pid = None
+            
+        return CommandResult(
+            stdout=stdout,
+            stderr=stderr,
+            exit_code=exit_code,
+            command=script if script is not None else shlex.join(cmd),
+            duration=time.time() - start_time
+        )
         
     def configure_network(self, config: NetworkConfig) -> CommandResult:
         """
@@ -144,85 +556,94 @@ class ContainerHandler(LinuxHandler):
             
     def _configure_vlan_network(self, config: NetworkConfig) -> CommandResult:
         """Configure VLAN network for container"""
-        # First, ensure vlan module is loaded (containers are privileged)
-        self.execute_command("modprobe 8021q")
+        result = self._exec_script(self._vlan_commands(config))
+        if result.success and config.dns_servers:
+            self._write_resolv_conf(config.dns_servers)
+        return self._vlan_result(config, result)
+        
+    async def _aconfigure_vlan_network(self, config: NetworkConfig) -> CommandResult:
+        """Async _configure_vlan_network"""
+        result = await self._aexec_script(self._vlan_commands(config))
+        if result.success and config.dns_servers:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._write_resolv_conf, config.dns_servers
+            )
+        return self._vlan_result(config, result)
         
-        # Create VLAN interface
+    def _vlan_commands(self, config: NetworkConfig) -> List[str]:
+        """Build the setup script lines for one VLAN interface"""
         vlan_iface = f"{config.interface}.{config.vlan_id}"
         
-        # Remove existing VLAN interface if exists
-        self.execute_command(f"ip link delete {vlan_iface}")
-        
-        # Create new VLAN interface
-        result = self.execute_command(
-            f"ip link add link {config.interface} name {vlan_iface} type vlan id {config.vlan_id}"
-        )
+        commands = [
+            # Containers are privileged; the module may already be built in
+            "modprobe 8021q 2>/dev/null || true",
+            # Remove existing VLAN interface if exists (outside the batch,
+            # which stops at its first error)
+            f"ip link delete {vlan_iface} 2>/dev/null || true",
+        ]
         
-        if not result.success:
-            return result
-            
-        # Bring up the VLAN interface
-        result = self.execute_command(f"ip link set {vlan_iface} up")
+        # One ip process and netlink session for the interface setup
+        ip_batch = [
+            f"link add link {config.interface} name {vlan_iface} type vlan id {config.vlan_id}",
+            f"link set {vlan_iface} up",
+        ]
         
-        if not result.success:
-            return result
-            
         # Configure IP on VLAN interface
         if not config.dhcp:
             prefix = self._netmask_to_prefix(config.netmask) if config.netmask else 24
-            result = self.execute_command(
-                f"ip addr add {config.ip_address}/{prefix} dev {vlan_iface}"
-            )
+            ip_batch.append(f"addr add {config.ip_address}/{prefix} dev {vlan_iface}")
             
-            if not result.success:
-                return result
-                
-            # Add default route if gateway specified
-            if config.gateway:
-                # Remove existing default routes
-                self.execute_command("ip route del default")
-                
-                # Add new default route
-                result = self.execute_command(
-                    f"ip route add default via {config.gateway} dev {vlan_iface}"
-                )
-                
-        # Configure DNS if specified
-        if config.dns_servers:
-            dns_config = "\n".join(f"nameserver {dns}" for dns in config.dns_servers)
-            self.execute_command(f"echo '{dns_config}' > /etc/resolv.conf")
+        commands.append("ip -batch - <<'IPBATCH'\n" + "\n".join(ip_batch) + "\nIPBATCH")
+        
+        # Replace any default route if gateway specified
+        if not config.dhcp and config.gateway:
+            commands.append("ip route del default 2>/dev/null || true")
+            commands.append(f"ip route add default via {config.gateway} dev {vlan_iface}")
+            
+        return commands
+        
+    def _write_resolv_conf(self, dns_servers: List[str]) -> bool:
+        """Copy a resolv.conf for dns_servers into the container"""
+        content = "".join(f"nameserver {dns}\n" for dns in dns_servers)
+        
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".resolv.conf", delete=False) as tmp:
+            tmp.write(content)
+        try:
+            # The runtime cp keeps the source mode; resolv.conf must stay world-readable
+            os.chmod(tmp.name, 0o644)
+            if self.connection.upload_file(tmp.name, "/etc/resolv.conf"):
+                return True
+        finally:
+            os.unlink(tmp.name)
+            
+        # Some runtimes refuse to cp onto the bind-mounted file; write it in place
+        return self.execute_command(f"printf %s {shlex.quote(content)} > /etc/resolv.conf").success
+        
+    @staticmethod
+    def _vlan_result(config: NetworkConfig, result: CommandResult) -> CommandResult:
+        """Return the script failure, or a summary result on success"""
+        if not result.success:
+            return result
             
         return CommandResult(
             stdout=f"VLAN {config.vlan_id} configured on {config.interface}",
             stderr="",
             exit_code=0,
-            success=True,
             command="configure_vlan_network",
             duration=0
         )
         
     def install_package(self, package_name: str) -> CommandResult:
         """Install a package using the appropriate package manager (privileged containers)"""
-        # Detect package manager
-        pkg_managers = [
-            ('apt-get', 'apt-get update && apt-get install -y'),  # Debian, Ubuntu
-            ('dnf', 'dnf install -y'),      # Fedora, RHEL 8+, Rocky 9
-            ('yum', 'yum install -y'),      # RHEL 7, CentOS
-            ('zypper', 'zypper install -y'),    # openSUSE
-            ('pacman', 'pacman -S --noconfirm') # Arch
-        ]
-        
-        for manager, install_cmd in pkg_managers:
-            result = self.execute_command(f"which {manager}")
-            if result.success:
-                # No as_admin needed for privileged containers
-                return self.execute_command(f"{install_cmd} {package_name}")
-                
+        pkg_manager = self._detect_package_manager()
+        if pkg_manager:
+            # No as_admin needed for privileged containers
+            return self.execute_command(f"{pkg_manager[1]} {package_name}")
+            
         return CommandResult(
             stdout="",
             stderr="No supported package manager found",
             exit_code=1,
-            success=False,
             command=f"install {package_name}",
             duration=0
         )
@@ -236,24 +657,14 @@ class ContainerHandler(LinuxHandler):
         # Install bridge utilities if not present
         self.install_package("bridge-utils")
         
-        # Create bridge
-        self.execute_command(f"brctl addbr {bridge_name}")
-        
-        # Create VLAN interface
         vlan_iface = f"{physical_interface}.{vlan_id}"
-        result = self.execute_command(
-            f"ip link add link {physical_interface} name {vlan_iface} type vlan id {vlan_id}"
-        )
-        
-        if result.success:
-            # Add VLAN interface to bridge
-            self.execute_command(f"brctl addif {bridge_name} {vlan_iface}")
-            
-            # Bring up bridge and VLAN interface
-            self.execute_command(f"ip link set {bridge_name} up")
-            self.execute_command(f"ip link set {vlan_iface} up")
-            
-        return result
+        return self._exec_script([
+            f"brctl addbr {bridge_name} 2>/dev/null || true",
+            f"ip link add link {physical_interface} name {vlan_iface} type vlan id {vlan_id}",
+            f"brctl addif {bridge_name} {vlan_iface}",
+            f"ip link set {bridge_name} up",
+            f"ip link set {vlan_iface} up",
+        ])
         
     def add_veth_pair(self, veth_name: str, peer_name: str, 
                      bridge_name: Optional[str] = None) -> CommandResult:
@@ -261,21 +672,16 @@ class ContainerHandler(LinuxHandler):
         Create veth pair for container networking
         Useful for connecting containers to specific VLANs
         """
-        # Create veth pair
-        result = self.execute_command(
-            f"ip link add {veth_name} type veth peer name {peer_name}",
-            as_admin=True
-        )
-        
-        if result.success and bridge_name:
-            # Add veth to bridge
-            self.execute_command(f"brctl addif {bridge_name} {veth_name}", as_admin=True)
-            
-            # Bring up interfaces
-            self.execute_command(f"ip link set {veth_name} up", as_admin=True)
-            self.execute_command(f"ip link set {peer_name} up", as_admin=True)
+        commands = [f"ip link add {veth_name} type veth peer name {peer_name}"]
+        
+        if bridge_name:
+            commands += [
+                f"brctl addif {bridge_name} {veth_name}",
+                f"ip link set {veth_name} up",
+                f"ip link set {peer_name} up",
+            ]
             
-        return result
+        return self._exec_script(commands, as_admin=True)
         
     def get_container_info(self) -> Dict[str, Any]:
         """Get container information"""
@@ -292,33 +698,25 @@ class ContainerHandler(LinuxHandler):
         }
         
         if isinstance(self.connection, ContainerConnection):
-            # Get container info from host
-            cmd = [self.connection.command_prefix, "inspect", self.connection.container_id]
-            result = subprocess.run(cmd, capture_output=True, text=True)  # nosec B603
-            
-            if result.returncode == 0:
-                try:
-                    data = json.loads(result.stdout)
-                    if isinstance(data, list):
-                        data = data[0]
-                        
-                    info['container_id'] = data.get('Id', '')[:12]
-                    info['image'] = data.get('Config', {}).get('Image', '')
-                    info['created'] = data.get('Created', '')
-                    info['status'] = data.get('State', {}).get('Status', '')
-                    
-                    # Get network info
-                    networks = data.get('NetworkSettings', {}).get('Networks', {})
-                    for net_name, net_info in networks.items():
-                        info['networks'].append({
-                            'name': net_name,
-                            'ip_address': net_info.get('IPAddress', ''),
-                            'gateway': net_info.get('Gateway', ''),
-                            'mac_address': net_info.get('MacAddress', '')
-                        })
-                        
-                except json.JSONDecodeError:
-                    pass
+            try:
+                data = self.connection.summary()
+            except (ConnectionError, ValueError):
+                data = None
+                
+            if data:
+                info['container_id'] = data['id'][:12]
+                info['image'] = data['image']
+                info['created'] = data['created']
+                info['status'] = data['status']
+                
+                # Get network info
+                for net_name, net_info in data['networks'].items():
+                    info['networks'].append({
+                        'name': net_name,
+                        'ip_address': net_info.get('IPAddress', ''),
+                        'gateway': net_info.get('Gateway', ''),
+                        'mac_address': net_info.get('MacAddress', '')
+                    })
                     
         self._container_info = info
         return info
@@ -336,7 +734,8 @@ class ContainerHandler(LinuxHandler):
         
         return info
         
-    def configure_container_networking(self, vlan_configs: List[Dict[str, Any]]) -> List[CommandResult]:
+    def configure_container_networking(self, vlan_configs: List[Dict[str, Any]],
+                                       max_workers: int = 8) -> List[CommandResult]:
         """
         Configure multiple VLAN interfaces for the container
         
@@ -346,34 +745,48 @@ class ContainerHandler(LinuxHandler):
                 - ip_address: IP address for this VLAN
                 - netmask: Network mask
                 - interface: Base interface (default: eth0)
+            max_workers: Maximum VLANs configured concurrently
                 
         Returns:
-            List of command results for each VLAN configuration
+            List of command results for each VLAN configuration, in input order
         """
-        results = []
-        
         # Load 8021q module
         self.execute_command("modprobe 8021q", as_admin=True)
         
-        for config in vlan_configs:
-            vlan_id = config['vlan_id']
-            ip_address = config['ip_address']
-            netmask = config.get('netmask', '255.255.255.0')
-            interface = config.get('interface', 'eth0')
-            
-            # Create network config
-            net_config = NetworkConfig(
-                interface=interface,
-                ip_address=ip_address,
-                netmask=netmask,
-                vlan_id=vlan_id,
-                dhcp=False
-            )
+        net_configs = self._vlan_net_configs(vlan_configs)
+        if not net_configs:
+            return []
             
-            result = self.configure_network(net_config)
-            results.append(result)
+        # Each VLAN is an independent exec, so the waits overlap on threads
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(net_configs))) as executor:
+            return list(executor.map(self.configure_network, net_configs))
             
-        return results
+    async def aconfigure_container_networking(self, vlan_configs: List[Dict[str, Any]]) -> List[CommandResult]:
+        """
+        Async configure_container_networking
+        
+        All VLAN scripts run as concurrent asyncio subprocesses on the
+        calling loop, so many containers can be provisioned from one thread
+        with asyncio.gather.
+        """
+        await self.connection.aexecute_command("sudo modprobe 8021q")
+        
+        net_configs = self._vlan_net_configs(vlan_configs)
+        return list(await asyncio.gather(*(self._aconfigure_vlan_network(c) for c in net_configs)))
+        
+    @staticmethod
+    def _vlan_net_configs(vlan_configs: List[Dict[str, Any]]) -> List[NetworkConfig]:
+        """Convert VLAN config dicts to static NetworkConfigs"""
+        return [
+            NetworkConfig(
+                interface=config.get('interface', 'eth0'),
+                ip_address=config['ip_address'],
+                netmask=config.get('netmask', '255.255.255.0'),
+                vlan_id=config['vlan_id'],
+                dhcp=False
+            )
+            for config in vlan_configs
+        ]
         
     def create_macvlan_interface(self, name: str, parent: str, 
                                vlan_id: Optional[int] = None) -> CommandResult:
@@ -381,23 +794,19 @@ class ContainerHandler(LinuxHandler):
         Create MACVLAN interface for container
         This allows containers to appear as separate hosts on the network
         """
+        commands = []
         if vlan_id:
-            # Create VLAN interface first
+            # Create VLAN interface first (it may already exist)
             vlan_parent = f"{parent}.{vlan_id}"
-            self.execute_command(
-                f"ip link add link {parent} name {vlan_parent} type vlan id {vlan_id}",
-                as_admin=True
-            )
-            self.execute_command(f"ip link set {vlan_parent} up", as_admin=True)
+            commands += [
+                f"ip link add link {parent} name {vlan_parent} type vlan id {vlan_id} 2>/dev/null || true",
+                f"ip link set {vlan_parent} up",
+            ]
             parent = vlan_parent
             
-        # Create MACVLAN interface
-        result = self.execute_command(
+        commands += [
             f"ip link add {name} link {parent} type macvlan mode bridge",
-            as_admin=True
-        )
+            f"ip link set {name} up",
+        ]
         
-        if result.success:
-            self.execute_command(f"ip link set {name} up", as_admin=True)
-            
-        return result
\ No newline at end of file
+        return self._exec_script(commands, as_admin=True)
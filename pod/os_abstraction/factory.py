@@ -2,7 +2,11 @@
 OS handler factory for automatic OS detection and handler instantiation
 """
 
+import re
+import sys
 import logging
+import weakref
+from types import MappingProxyType
 from typing import Optional, Dict, Any, Type
 from .base import BaseOSHandler
 from .linux import LinuxHandler
@@ -14,6 +18,41 @@ from ..connections.winrm import WinRMConnection
 
 logger = logging.getLogger(__name__)
 
+# Distribution markers in precedence order. os-release lists parent distros in
+# ID_LIKE, so the highest-ranked marker present wins, not the first in the text.
+_DISTRO_MARKERS = ('ubuntu', 'debian', 'rhel', 'red hat', 'centos', 'rocky', 'fedora', 'opensuse', 'suse')
+_DISTRO_RANK = {marker: rank for rank, marker in enumerate(_DISTRO_MARKERS)}
+_DISTRO_RE = re.compile('|'.join(re.escape(marker) for marker in _DISTRO_MARKERS))
+_DISTRO_ALIASES = {'red hat': 'rhel', 'suse': 'opensuse'}
+
+
+# vSphere guest ID prefixes, first match wins. Covers every released variant
+# (e.g. rhel9_64Guest, windows2022srvNext_64Guest) without listing each one.
+_GUEST_ID_RULES = (
+    (r'rhel', 'rhel'),
+    (r'centos', 'centos'),
+    (r'ubuntu', 'ubuntu'),
+    (r'debian', 'debian'),
+    (r'sles', 'opensuse'),
+    (r'other\w*Linux', 'linux'),
+    (r'windows\d{4}srv', 'windows_server'),
+    (r'windows\d+Server', 'windows_server'),
+    (r'windows10', 'windows_10'),
+    (r'windows11', 'windows_11'),
+    (r'windows\d', 'windows'),
+)
+_GUEST_ID_RE = re.compile('^(?:' + '|'.join(f'({pattern})' for pattern, _ in _GUEST_ID_RULES) + ')')
+_GUEST_ID_TYPES = tuple(os_type for _, os_type in _GUEST_ID_RULES)
+
+
+def _match_distro(text: str) -> Optional[str]:
+    """Return the highest-precedence distribution named in lowercased text"""
+    found = set(_DISTRO_RE.findall(text))
+    if not found:
+        return None
+    marker = min(found, key=_DISTRO_RANK.__getitem__)
+    return _DISTRO_ALIASES.get(marker, marker)
+
 
 class OSHandlerFactory:
     """Factory for creating OS-specific handlers"""
@@ -34,37 +73,15 @@ class OSHandlerFactory:
         'windows_11': WindowsHandler,
     }
     
-    # Mapping of guest IDs to OS types (vSphere specific)
-    _vsphere_guest_map = {
-        # Linux variants
-        'rhel8_64Guest': 'rhel',
-        'rhel7_64Guest': 'rhel',
-        'rhel6_64Guest': 'rhel',
-        'centos8_64Guest': 'centos',
-        'centos7_64Guest': 'centos',
-        'centos6_64Guest': 'centos',
-        'ubuntu64Guest': 'ubuntu',
-        'debian10_64Guest': 'debian',
-        'debian9_64Guest': 'debian',
-        'debian8_64Guest': 'debian',
-        'sles15_64Guest': 'opensuse',
-        'sles12_64Guest': 'opensuse',
-        'other3xLinux64Guest': 'linux',
-        'otherLinux64Guest': 'linux',
-        
-        # Windows variants
-        'windows9_64Guest': 'windows',
-        'windows9Server64Guest': 'windows_server',
-        'windows2019srv_64Guest': 'windows_server',
-        'windows2016srv_64Guest': 'windows_server',
-        'windows2012srv_64Guest': 'windows_server',
-        'windows8Server64Guest': 'windows_server',
-        'windows7Server64Guest': 'windows_server',
-        'windows7_64Guest': 'windows',
-        'windows8_64Guest': 'windows',
-        'windows10_64Guest': 'windows_10',
-        'windows11_64Guest': 'windows_11',
-    }
+    # Read-only live view of _handlers; register_handler is the only writer
+    registered_handlers = MappingProxyType(_handlers)
+    
+    # Explicit guest ID -> OS type overrides (vSphere specific); IDs not
+    # listed here are classified by the _GUEST_ID_RULES prefixes
+    _vsphere_guest_map: Dict[str, str] = {}
+    
+    # Distribution probed over each live SSH connection; entries drop with the connection
+    _detection_cache: "weakref.WeakKeyDictionary[BaseConnection, str]" = weakref.WeakKeyDictionary()
     
     @classmethod
     def create_handler(cls, connection: BaseConnection, 
@@ -84,10 +101,10 @@ class OSHandlerFactory:
         """
         os_type = cls._detect_os_type(connection, os_info)
         
-        if os_type not in cls._handlers:
+        handler_class = cls._handlers.get(os_type)
+        if handler_class is None:
             raise ValueError(f"Unsupported OS type: {os_type}")
             
-        handler_class = cls._handlers[os_type]
         logger.info(f"Creating {handler_class.__name__} for OS type: {os_type}")
         
         return handler_class(connection)
@@ -107,20 +124,25 @@ class OSHandlerFactory:
         """
         # First, check if OS type is explicitly provided
         if os_info and 'type' in os_info:
-            return os_info['type'].lower()
+            # Interned so the handler lookup can match keys by identity
+            return sys.intern(os_info['type'].lower())
             
         # Check vSphere guest ID if available
         if os_info and 'guest_id' in os_info:
-            guest_id = os_info['guest_id']
-            if guest_id in cls._vsphere_guest_map:
-                return cls._vsphere_guest_map[guest_id]
+            os_type = cls._guest_id_os_type(os_info['guest_id'])
+            if os_type is not None:
+                return os_type
                 
         # Infer from connection type
         if isinstance(connection, WinRMConnection):
             return 'windows'
         elif isinstance(connection, SSHConnection):
-            # Try to detect Linux distribution
-            return cls._detect_linux_distro(connection)
+            # Try to detect Linux distribution (probed once per connection)
+            distro = cls._detection_cache.get(connection)
+            if distro is None:
+                distro = cls._detect_linux_distro(connection)
+                cls._detection_cache[connection] = distro
+            return distro
             
         # Check guest family if available (vSphere)
         if os_info and 'guest_family' in os_info:
@@ -136,6 +158,16 @@ class OSHandlerFactory:
         else:
             return 'linux'
     
+    @classmethod
+    def _guest_id_os_type(cls, guest_id: str) -> Optional[str]:
+        """Map a vSphere guest ID to an OS type, or None if unrecognised"""
+        os_type = cls._vsphere_guest_map.get(guest_id)
+        if os_type is None:
+            match = _GUEST_ID_RE.match(guest_id)
+            if match:
+                os_type = _GUEST_ID_TYPES[match.lastindex - 1]
+        return os_type
+    
     @classmethod
     def _detect_linux_distro(cls, connection: SSHConnection) -> str:
         """
@@ -152,23 +184,10 @@ class OSHandlerFactory:
             stdout, stderr, exit_code = connection.execute_command("cat /etc/os-release")
             
             if exit_code == 0:
-                os_release = stdout.lower()
-                
-                # Check for specific distributions
-                if 'ubuntu' in os_release:
-                    return 'ubuntu'
-                elif 'debian' in os_release:
-                    return 'debian'
-                elif 'rhel' in os_release or 'red hat' in os_release:
-                    return 'rhel'
-                elif 'centos' in os_release:
-                    return 'centos'
-                elif 'rocky' in os_release:
-                    return 'rocky'
-                elif 'fedora' in os_release:
-                    return 'fedora'
-                elif 'opensuse' in os_release or 'suse' in os_release:
-                    return 'opensuse'
+                # Single regex pass instead of one substring scan per distribution
+                distro = _match_distro(stdout.lower())
+                if distro:
+                    return distro
                     
             # Try alternative detection methods
             stdout, stderr, exit_code = connection.execute_command("uname -a")
@@ -197,7 +216,7 @@ class OSHandlerFactory:
         if not issubclass(handler_class, BaseOSHandler):
             raise ValueError("Handler class must inherit from BaseOSHandler")
             
-        cls._handlers[os_type.lower()] = handler_class
+        cls._handlers[sys.intern(os_type.lower())] = handler_class
         logger.info(f"Registered {handler_class.__name__} for OS type: {os_type}")
     
     @classmethod
@@ -209,9 +228,19 @@ class OSHandlerFactory:
             guest_id: vSphere guest ID
             os_type: OS type string
         """
-        cls._vsphere_guest_map[guest_id] = os_type.lower()
+        cls._vsphere_guest_map[sys.intern(guest_id)] = sys.intern(os_type.lower())
         logger.info(f"Registered guest ID mapping: {guest_id} -> {os_type}")
     
+    @classmethod
+    def invalidate_cache(cls, connection: BaseConnection):
+        """
+        Forget the OS type detected for a connection
+        
+        Args:
+            connection: Connection whose host should be probed again
+        """
+        cls._detection_cache.pop(connection, None)
+    
     @classmethod
     def get_supported_os_types(cls) -> list:
         """Get list of supported OS types"""
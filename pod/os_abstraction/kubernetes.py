@@ -3,14 +3,217 @@ Kubernetes OS handler with advanced networking and VLAN support
 """
 
 import json
+import math
+import orjson
+import random
 import yaml
 import time
 import asyncio
-from typing import Dict, Any, Optional, List, Tuple, Union
+import functools
+import threading
+from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Set, Tuple, Union, Callable
+from kubernetes import watch
 from kubernetes.client.rest import ApiException
-from .base import BaseOSHandler, CommandResult, NetworkInterface, NetworkConfig
+from urllib3.exceptions import HTTPError
+from kubernetes_asyncio import watch as async_watch
+from kubernetes_asyncio.client.exceptions import ApiException as AsyncApiException
+from .base import _DATACLASS_SLOTS, _netmask_prefix, BaseOSHandler, CommandResult, NetworkInterface, NetworkConfig
 from ..connections.kubernetes import KubernetesConnection
 from ..exceptions import NetworkConfigError, CommandExecutionError
+from ..network.cni import _cached_detection, _cluster_key, invalidate_detection_cache
+from ..utils.executor import run_in_executor
+
+# Upper bound on concurrent API probes during cluster capability detection
+DETECTION_WORKERS = 8
+
+# Multus macvlan CNI config; fields are substituted as JSON-encoded values so the
+# result matches json.dumps of the equivalent dict without building it per call
+_MULTUS_VLAN_CONFIG_TEMPLATE = (
+    '{{"cniVersion": "0.3.1", "name": {name}, "type": "macvlan", "master": {master}, '
+    '"vlan": {vlan}, "ipam": {{"type": "static", '
+    '"addresses": [{{"address": {address}, "gateway": {gateway}}}], '
+    '"dns": {{"nameservers": {nameservers}}}}}}}'
+)
+
+# Field manager owning the fields of pods applied by this handler
+FIELD_MANAGER = "pod-lib"
+APPLY_PATCH_CONTENT_TYPE = "application/apply-patch+yaml"
+
+# Pod phase reported once all containers have started
+POD_PHASE_RUNNING = "Running"
+
+# NetworkInterface fields after ip_addresses shared by every pod interface: default pod
+# subnet netmask, unknown gateway, VLAN not extracted from annotations, MTU, state, type.
+# Passed positionally since dataclasses.replace on a template is slower than __init__
+_POD_INTERFACE_DEFAULTS = ("255.255.255.0", "unknown", None, 1500, "up", "pod")
+
+# Seconds listed or created VLAN resource names are trusted before listing again
+CREATED_RESOURCE_TTL = 60
+
+# Seconds before re-opening a failed pod watch, growing to the maximum on repeated failures
+WATCH_RETRY_BASE_DELAY = 0.2
+WATCH_RETRY_MAX_DELAY = 5.0
+
+# Nodes fetched per list page by get_os_info
+NODE_LIST_PAGE_SIZE = 500
+
+# Seconds detected CNI plugins and capabilities are reused across handler instances
+DETECTION_CACHE_TTL = 60
+
+# Label selectors of the pods whose presence reveals a cluster capability
+_MARKER_POD_SELECTORS = {
+    "istio": "app=istiod",
+    "nginx": "app.kubernetes.io/name=ingress-nginx",
+    "traefik": "app.kubernetes.io/name=traefik",
+    "sriov": "app=sriov-device-plugin",
+}
+
+# Capabilities that cost apiserver probes, each computed on first access
+_PROBED_CAPABILITIES = ("network_policies", "service_mesh", "ingress_controllers", "sr_iov")
+
+# Seconds between full re-lists that reconcile the shared cluster state cache
+CLUSTER_STATE_RESYNC = 60
+
+# Shared cluster state caches, keyed by cluster like the detection cache
+_CLUSTER_STATES: Dict[Tuple[Optional[str], Optional[str]], "_ClusterStateCache"] = {}
+_CLUSTER_STATES_LOCK = threading.Lock()
+
+
+class _ClusterStateCache:
+    """Nodes and pods of one cluster, kept current by background list+watch threads"""
+    
+    def __init__(self, v1: Any, resync_period: float = CLUSTER_STATE_RESYNC):
+        self._sources = {
+            "nodes": v1.list_node,
+            "pods": v1.list_pod_for_all_namespaces,
+        }
+        self._resync_period = resync_period
+        self._stores: Dict[str, Dict[str, Any]] = {kind: {} for kind in self._sources}
+        self._synced = {kind: threading.Event() for kind in self._sources}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watches: List[watch.Watch] = []
+        self._threads: List[threading.Thread] = []
+        self._refs = 0
+        
+    @classmethod
+    def acquire(cls, key: Tuple[Optional[str], Optional[str]], v1: Any) -> "_ClusterStateCache":
+        """Return the running cache for a cluster, starting it on first use"""
+        with _CLUSTER_STATES_LOCK:
+            state = _CLUSTER_STATES.get(key)
+            if state is None:
+                state = cls(v1)
+                state.start()
+                _CLUSTER_STATES[key] = state
+            state._refs += 1
+        return state
+    
+    def release(self) -> None:
+        """Drop one reference, stopping the watches when nobody uses the cache"""
+        with _CLUSTER_STATES_LOCK:
+            self._refs -= 1
+            if self._refs > 0:
+                return
+            for key, state in list(_CLUSTER_STATES.items()):
+                if state is self:
+                    del _CLUSTER_STATES[key]
+        self.stop()
+    
+    def start(self) -> None:
+        """Start one list+watch thread per resource kind"""
+        for kind in self._sources:
+            thread = threading.Thread(target=self._run, args=(kind,), daemon=True,
+                                      name=f"k8s-cluster-state-{kind}")
+            self._threads.append(thread)
+            thread.start()
+    
+    def stop(self) -> None:
+        """Stop the watch threads"""
+        self._stop.set()
+        with self._lock:
+            for active in self._watches:
+                active.stop()
+    
+    def nodes(self, timeout: float = 0) -> Optional[List[Any]]:
+        """Cached nodes, or None if the first list has not completed"""
+        return self._snapshot("nodes", timeout)
+    
+    def pods(self, timeout: float = 0) -> Optional[List[Any]]:
+        """Cached pods in all namespaces, or None if the first list has not completed"""
+        return self._snapshot("pods", timeout)
+    
+    def _snapshot(self, kind: str, timeout: float) -> Optional[List[Any]]:
+        """Copy the objects of one kind once it has synced"""
+        if not self._synced[kind].wait(timeout):
+            return None
+        with self._lock:
+            return list(self._stores[kind].values())
+    
+    @staticmethod
+    def _key(obj: Any) -> str:
+        """Store key of an object: namespace/name, or name for cluster-scoped kinds"""
+        metadata = obj.metadata
+        return f"{metadata.namespace}/{metadata.name}" if metadata.namespace else metadata.name
+    
+    def _run(self, kind: str) -> None:
+        """List, then watch until the resync period ends, then list again to reconcile"""
+        list_func = self._sources[kind]
+        
+        while not self._stop.is_set():
+            try:
+                listing = list_func()
+                with self._lock:
+                    self._stores[kind] = {self._key(obj): obj for obj in listing.items}
+                self._synced[kind].set()
+                
+                resource_watch = watch.Watch()
+                with self._lock:
+                    if self._stop.is_set():
+                        return
+                    self._watches.append(resource_watch)
+                try:
+                    for event in resource_watch.stream(
+                        list_func,
+                        resource_version=listing.metadata.resource_version,
+                        timeout_seconds=int(self._resync_period)
+                    ):
+                        obj = event["object"]
+                        with self._lock:
+                            if event["type"] == "DELETED":
+                                self._stores[kind].pop(self._key(obj), None)
+                            else:
+                                self._stores[kind][self._key(obj)] = obj
+                finally:
+                    with self._lock:
+                        self._watches.remove(resource_watch)
+                        
+            except Exception:
+                # Keep serving the last known state; the next list heals any gap
+                self._stop.wait(1)
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
+class _VlanContext:
+    """VLAN fields derived once from a NetworkConfig and shared by the CNI configurers"""
+    vlan_id: int
+    name: str  # vlan-<id>, also the pod label and attachment name
+    interface: str
+    address: str  # ip/prefix
+    gateway: Optional[str]
+    dns_servers: Tuple[str, ...]
+    
+    @classmethod
+    def from_config(cls, config: NetworkConfig) -> "_VlanContext":
+        return cls(
+            vlan_id=config.vlan_id,
+            name=f"vlan-{config.vlan_id}",
+            interface=config.interface or "eth0",
+            address=f"{config.ip_address}/{KubernetesHandler._netmask_to_cidr(config.netmask)}",
+            gateway=config.gateway,
+            dns_servers=tuple(config.dns_servers or ("8.8.8.8",))
+        )
 
 
 class KubernetesHandler(BaseOSHandler):
@@ -19,144 +222,310 @@ class KubernetesHandler(BaseOSHandler):
     Supports CNI plugins, NetworkPolicies, and VLAN isolation
     """
     
-    def __init__(self, connection: KubernetesConnection):
+    def __init__(self, connection: KubernetesConnection, use_informer: bool = False):
         """
         Initialize Kubernetes handler
         
         Args:
             connection: KubernetesConnection instance
+            use_informer: Answer node and pod queries from a shared, watch-driven
+                cache of the cluster instead of listing on every call
         """
         super().__init__(connection)
         self.k8s = connection
-        self.cni_plugins = self._detect_cni_plugins()
-        self.network_capabilities = self._detect_network_capabilities()
+        self._create_lock = threading.Lock()
+        self._pending_creates: Dict[Tuple[str, Optional[str], str], Future] = {}
+        self._existing_resources: Dict[Tuple[str, Optional[str]], Tuple[float, Set[str]]] = {}
+        # Capabilities are probed lazily, on first access, by their properties
+        self._capability_errors: Dict[str, str] = {}
+        self._detect_cluster()
+        self._cluster_state = (
+            _ClusterStateCache.acquire(_cluster_key(connection), connection.v1) if use_informer else None
+        )
+    
+    def close(self) -> None:
+        """Release the shared cluster state cache, if this handler uses one"""
+        if self._cluster_state is not None:
+            self._cluster_state.release()
+            self._cluster_state = None
+    
+    def _detect_cluster(self) -> None:
+        """Detect CNI plugins, reusing a recent result for the same cluster"""
+        self.cni_plugins = self._cached_detection(
+            "cni_plugins",
+            lambda: (self._detect_cni_plugins(), not hasattr(self, "cni_detection_warnings"))
+        )
+    
+    def _cached_detection(self, name: str, detect: Callable[[], Tuple[Any, bool]]) -> Any:
+        """Return a detection result, reusing a recent one for the same cluster"""
+        return _cached_detection(self.k8s, name, DETECTION_CACHE_TTL, detect)
+    
+    @classmethod
+    def invalidate_detection_cache(cls) -> None:
+        """Forget detection results so the next handler queries the cluster again"""
+        invalidate_detection_cache()
     
     def _detect_cni_plugins(self) -> List[str]:
         """Detect available CNI plugins in the cluster"""
-        plugins = []
+        v1 = self.k8s.v1
+        results = self._run_probes([
+            # Calico marks its nodes; the others are found by their daemon pods
+            ("calico", functools.partial(v1.list_node, label_selector="projectcalico.org/ds-ready=true", limit=1)),
+            ("cilium", functools.partial(v1.list_pod_for_all_namespaces, label_selector="k8s-app=cilium", limit=1)),
+            ("flannel", functools.partial(v1.list_pod_for_all_namespaces, label_selector="app=flannel", limit=1)),
+            ("weave", functools.partial(v1.list_pod_for_all_namespaces, label_selector="name=weave-net", limit=1)),
+            # Multus (multiple CNI support)
+            ("multus", functools.partial(v1.list_pod_for_all_namespaces, label_selector="app=multus", limit=1)),
+        ])
         
-        try:
-            # Check for Calico
-            calico_nodes = self.k8s.v1.list_node(label_selector="projectcalico.org/ds-ready=true")
-            if calico_nodes.items:
-                plugins.append("calico")
-            
-            # Check for Cilium
-            cilium_pods = self.k8s.v1.list_pod_for_all_namespaces(label_selector="k8s-app=cilium")
-            if cilium_pods.items:
-                plugins.append("cilium")
-            
-            # Check for Flannel
-            flannel_pods = self.k8s.v1.list_pod_for_all_namespaces(label_selector="app=flannel")
-            if flannel_pods.items:
-                plugins.append("flannel")
-            
-            # Check for Weave
-            weave_pods = self.k8s.v1.list_pod_for_all_namespaces(label_selector="name=weave-net")
-            if weave_pods.items:
-                plugins.append("weave")
-            
-            # Check for Multus (multiple CNI support)
-            multus_pods = self.k8s.v1.list_pod_for_all_namespaces(label_selector="app=multus")
-            if multus_pods.items:
-                plugins.append("multus")
+        plugins = []
+        warnings = []
+        for plugin, result in results.items():
+            if isinstance(result, ApiException):
+                # CNI detection limited due to API access issues
+                warnings.append(f"CNI detection limited: {result.reason}")
+            elif isinstance(result, Exception):
+                # CNI detection failed, continue with default
+                warnings.append(f"CNI detection failed: {str(result)}")
+            elif result:
+                plugins.append(plugin)
                 
-        except ApiException as e:
-            # CNI detection limited due to API access issues
-            self.cni_detection_warnings = [f"CNI detection limited: {e.reason}"]
-        except Exception as e:
-            # CNI detection failed, continue with default
-            self.cni_detection_warnings = [f"CNI detection failed: {str(e)}"]
+        if warnings:
+            self.cni_detection_warnings = warnings
         
         return plugins if plugins else ["default"]
     
-    def _detect_network_capabilities(self) -> Dict[str, bool]:
-        """Detect network capabilities of the cluster"""
+    @property
+    def network_capabilities(self) -> Dict[str, Any]:
+        """Network capabilities of the cluster, probing any not read yet concurrently"""
+        pending = [name for name in _PROBED_CAPABILITIES if name not in self.__dict__]
+        if len(pending) > 1:
+            with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+                list(executor.map(functools.partial(getattr, self), pending))
+                
         capabilities = {
-            "network_policies": False,
+            "network_policies": self.network_policies,
             "pod_security_policies": False,
-            "service_mesh": False,
-            "ingress_controllers": [],
+            "service_mesh": self.service_mesh,
+            "ingress_controllers": self.ingress_controllers,
             "load_balancers": [],
-            "cni_chaining": False,
-            "sr_iov": False,
+            "cni_chaining": self.cni_chaining,
+            "sr_iov": self.sr_iov,
             "dpdk": False
         }
+        capabilities.update(self._capability_errors)
+        return capabilities
+    
+    @functools.cached_property
+    def network_policies(self) -> bool:
+        """Whether NetworkPolicies are supported, probed on first access"""
+        return self._cached_detection("network_policies", self._probe_network_policies)
+    
+    @functools.cached_property
+    def service_mesh(self) -> bool:
+        """Whether an Istio service mesh runs in the cluster, probed on first access"""
+        return "istio" in self._marker_pods("service_mesh", ("istio",))
+    
+    @functools.cached_property
+    def ingress_controllers(self) -> List[str]:
+        """Ingress controllers running in the cluster, probed on first access"""
+        return self._marker_pods("ingress_controllers", ("nginx", "traefik"))
+    
+    @functools.cached_property
+    def sr_iov(self) -> bool:
+        """Whether the SR-IOV device plugin runs in the cluster, probed on first access"""
+        return "sriov" in self._marker_pods("sr_iov", ("sriov",))
+    
+    @property
+    def cni_chaining(self) -> bool:
+        """Whether Multus provides CNI chaining"""
+        return "multus" in self.cni_plugins
+    
+    def _probe_network_policies(self) -> Tuple[bool, bool]:
+        """Check NetworkPolicy support; only the list call needs to be allowed"""
+        result = self._run_probes([("network_policies", functools.partial(
+            self.k8s.networking_v1.list_network_policy_for_all_namespaces, limit=1
+        ))])["network_policies"]
+        if isinstance(result, ApiException):
+            self._capability_errors["network_policy_error"] = f"NetworkPolicy API access denied: {result.reason}"
+            return False, False
+        if isinstance(result, Exception):
+            self._capability_errors["network_policy_error"] = f"NetworkPolicy detection failed: {str(result)}"
+            return False, False
+        return True, True
+    
+    def _marker_pods(self, name: str, markers: Tuple[str, ...]) -> List[str]:
+        """Which of the given marker pods run anywhere in the cluster"""
+        def detect() -> Tuple[List[str], bool]:
+            list_pods = self.k8s.v1.list_pod_for_all_namespaces
+            results = self._run_probes([
+                (marker, functools.partial(list_pods, label_selector=_MARKER_POD_SELECTORS[marker], limit=1))
+                for marker in markers
+            ])
+            complete = True
+            for result in results.values():
+                if isinstance(result, ApiException):
+                    self._capability_errors["advanced_networking_error"] = f"Advanced network detection limited: {result.reason}"
+                    complete = False
+                elif isinstance(result, Exception):
+                    self._capability_errors["advanced_networking_error"] = f"Advanced network detection failed: {str(result)}"
+                    complete = False
+            return [marker for marker, result in results.items() if result is True], complete
+            
+        return self._cached_detection(name, detect)
+    
+    @staticmethod
+    def _run_probes(probes: List[Tuple[str, Callable[[], Any]]]) -> Dict[str, Any]:
+        """
+        Run independent existence probes concurrently
         
-        try:
-            # Check NetworkPolicy support
+        Returns whether each probe's list call matched anything, or the
+        exception it raised, keyed by name in the order given, so total
+        latency is the slowest probe rather than the sum of all of them.
+        """
+        with ThreadPoolExecutor(max_workers=min(DETECTION_WORKERS, len(probes))) as executor:
+            futures = [
+                (name, executor.submit(KubernetesHandler._probe_has_items, probe))
+                for name, probe in probes
+            ]
+            
+        results = {}
+        for name, future in futures:
             try:
-                self.k8s.networking_v1.list_network_policy_for_all_namespaces(limit=1)
-                capabilities["network_policies"] = True
-            except ApiException as e:
-                capabilities["network_policy_error"] = f"NetworkPolicy API access denied: {e.reason}"
+                results[name] = future.result()
             except Exception as e:
-                capabilities["network_policy_error"] = f"NetworkPolicy detection failed: {str(e)}"
-            
-            # Check for Istio service mesh
-            istio_pods = self.k8s.v1.list_pod_for_all_namespaces(label_selector="app=istiod")
-            if istio_pods.items:
-                capabilities["service_mesh"] = True
-            
-            # Check for ingress controllers
-            ingress_controllers = []
-            nginx_pods = self.k8s.v1.list_pod_for_all_namespaces(label_selector="app.kubernetes.io/name=ingress-nginx")
-            if nginx_pods.items:
-                ingress_controllers.append("nginx")
-            
-            traefik_pods = self.k8s.v1.list_pod_for_all_namespaces(label_selector="app.kubernetes.io/name=traefik")
-            if traefik_pods.items:
-                ingress_controllers.append("traefik")
-                
-            capabilities["ingress_controllers"] = ingress_controllers
-            
-            # Check for Multus (CNI chaining support)
-            if "multus" in self.cni_plugins:
-                capabilities["cni_chaining"] = True
-            
-            # Check for SR-IOV support
-            sriov_pods = self.k8s.v1.list_pod_for_all_namespaces(label_selector="app=sriov-device-plugin")
-            if sriov_pods.items:
-                capabilities["sr_iov"] = True
-                
-        except ApiException as e:
-            capabilities["advanced_networking_error"] = f"Advanced network detection limited: {e.reason}"
-        except Exception as e:
-            capabilities["advanced_networking_error"] = f"Advanced network detection failed: {str(e)}"
-        
-        return capabilities
+                results[name] = e
+        return results
+    
+    @staticmethod
+    def _probe_has_items(probe: Callable[..., Any]) -> bool:
+        """Call a list probe without model deserialization and check for items"""
+        # The raw response skips building V1Pod objects; with limit=1 the body
+        # holds at most one item, so decoding it is cheap
+        response = probe(_preload_content=False)
+        try:
+            if response.status != 200:
+                return False
+            return bool(orjson.loads(response.data).get("items"))
+        finally:
+            response.release_conn()
     
     def get_os_info(self) -> Dict[str, Any]:
         """Get Kubernetes cluster and node information"""
         cluster_info = self.k8s.get_cluster_info()
         
         # Get node information
-        nodes = []
         try:
-            node_list = self.k8s.v1.list_node()
-            for node in node_list.items:
-                node_info = {
-                    'name': node.metadata.name,
-                    'os': node.status.node_info.operating_system,
-                    'architecture': node.status.node_info.architecture,
-                    'kernel_version': node.status.node_info.kernel_version,
-                    'container_runtime': node.status.node_info.container_runtime_version,
-                    'kubelet_version': node.status.node_info.kubelet_version,
-                    'cpu_capacity': node.status.capacity.get('cpu', 'unknown'),
-                    'memory_capacity': node.status.capacity.get('memory', 'unknown'),
-                    'conditions': [
-                        {
-                            'type': condition.type,
-                            'status': condition.status,
-                            'reason': condition.reason or 'Unknown'
-                        }
-                        for condition in node.status.conditions or []
-                    ]
-                }
-                nodes.append(node_info)
+            node_items = self._cluster_state.nodes() if self._cluster_state else None
+            if node_items is not None:
+                nodes = [self._node_info(node) for node in node_items]
+            else:
+                nodes = []
+                token = None
+                while True:
+                    response = self.k8s.v1.list_node(**self._node_page_options(token))
+                    try:
+                        page = orjson.loads(response.data)
+                    finally:
+                        response.release_conn()
+                    nodes.extend(self._raw_node_info(node) for node in page.get("items") or [])
+                    token = (page.get("metadata") or {}).get("continue")
+                    if not token:
+                        break
+        except Exception:
+            nodes = []
+        
+        return self._build_os_info(cluster_info, nodes)
+    
+    async def get_os_info_async(self) -> Dict[str, Any]:
+        """Async version of get_os_info using the kubernetes_asyncio client"""
+        cluster_info = await run_in_executor(self.k8s.get_cluster_info)
+        
+        try:
+            node_items = self._cluster_state.nodes() if self._cluster_state else None
+            if node_items is not None:
+                nodes = [self._node_info(node) for node in node_items]
+            else:
+                v1 = await self.k8s.get_async_v1()
+                nodes = []
+                token = None
+                while True:
+                    response = await v1.list_node(**self._node_page_options(token))
+                    try:
+                        page = orjson.loads(await response.read())
+                    finally:
+                        response.release()
+                    nodes.extend(self._raw_node_info(node) for node in page.get("items") or [])
+                    token = (page.get("metadata") or {}).get("continue")
+                    if not token:
+                        break
         except Exception:
             nodes = []
         
+        return self._build_os_info(cluster_info, nodes)
+    
+    @staticmethod
+    def _node_page_options(token: Optional[str]) -> Dict[str, Any]:
+        """List options for one page of raw node objects"""
+        options = {"limit": NODE_LIST_PAGE_SIZE, "_preload_content": False}
+        if token:
+            # Continue tokens pin the snapshot and forbid resourceVersion options
+            options["_continue"] = token
+        else:
+            # resourceVersion "0" is served from the apiserver watch cache, not etcd
+            options["resource_version"] = "0"
+            options["resource_version_match"] = "NotOlderThan"
+        return options
+    
+    @staticmethod
+    def _node_info(node: Any) -> Dict[str, Any]:
+        """Summarize a node object"""
+        return {
+            'name': node.metadata.name,
+            'os': node.status.node_info.operating_system,
+            'architecture': node.status.node_info.architecture,
+            'kernel_version': node.status.node_info.kernel_version,
+            'container_runtime': node.status.node_info.container_runtime_version,
+            'kubelet_version': node.status.node_info.kubelet_version,
+            'cpu_capacity': node.status.capacity.get('cpu', 'unknown'),
+            'memory_capacity': node.status.capacity.get('memory', 'unknown'),
+            'conditions': [
+                {
+                    'type': condition.type,
+                    'status': condition.status,
+                    'reason': condition.reason or 'Unknown'
+                }
+                for condition in node.status.conditions or []
+            ]
+        }
+    
+    @staticmethod
+    def _raw_node_info(node: Dict[str, Any]) -> Dict[str, Any]:
+        """Summarize a node from a raw list response, ignoring everything else it carries"""
+        status = node.get('status') or {}
+        node_info = status.get('nodeInfo') or {}
+        capacity = status.get('capacity') or {}
+        return {
+            'name': node['metadata']['name'],
+            'os': node_info.get('operatingSystem'),
+            'architecture': node_info.get('architecture'),
+            'kernel_version': node_info.get('kernelVersion'),
+            'container_runtime': node_info.get('containerRuntimeVersion'),
+            'kubelet_version': node_info.get('kubeletVersion'),
+            'cpu_capacity': capacity.get('cpu', 'unknown'),
+            'memory_capacity': capacity.get('memory', 'unknown'),
+            'conditions': [
+                {
+                    'type': condition.get('type'),
+                    'status': condition.get('status'),
+                    'reason': condition.get('reason') or 'Unknown'
+                }
+                for condition in status.get('conditions') or []
+            ]
+        }
+    
+    def _build_os_info(self, cluster_info: Dict[str, Any], nodes: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Assemble get_os_info output from cluster info and node summaries"""
         return {
             'type': 'kubernetes',
             'platform': 'kubernetes',
@@ -186,177 +555,152 @@ class KubernetesHandler(BaseOSHandler):
                 return self._configure_standard_network(config)
                 
         except Exception as e:
-            return CommandResult(
-                stdout="",
-                stderr=f"Network configuration failed: {str(e)}",
-                exit_code=1,
-                success=False,
-                command=f"configure_network(vlan_id={config.vlan_id})",
-                duration=0.0
+            return CommandResult.fail(
+                f"Network configuration failed: {str(e)}",
+                f"configure_network(vlan_id={config.vlan_id})"
             )
     
     def _configure_vlan_network(self, config: NetworkConfig) -> CommandResult:
         """Configure VLAN-based network isolation using CNI plugins"""
-        start_time = time.time()
+        start_time = time.monotonic()
         
         try:
+            ctx = _VlanContext.from_config(config)
             if "multus" in self.cni_plugins:
-                return self._configure_multus_vlan(config)
+                return self._configure_multus_vlan(config, ctx)
             elif "calico" in self.cni_plugins:
-                return self._configure_calico_vlan(config)
+                return self._configure_calico_vlan(config, ctx)
             elif "cilium" in self.cni_plugins:
-                return self._configure_cilium_vlan(config)
+                return self._configure_cilium_vlan(config, ctx)
             else:
-                return self._configure_generic_vlan(config)
+                return self._configure_generic_vlan(config, ctx)
                 
         except Exception as e:
-            duration = time.time() - start_time
-            return CommandResult(
-                stdout="",
-                stderr=f"VLAN configuration failed: {str(e)}",
-                exit_code=1,
-                success=False,
-                command=f"configure_vlan_network(vlan_id={config.vlan_id})",
-                duration=duration
+            return CommandResult.fail(
+                f"VLAN configuration failed: {str(e)}",
+                f"configure_vlan_network(vlan_id={config.vlan_id})",
+                time.monotonic() - start_time
             )
     
-    def _configure_multus_vlan(self, config: NetworkConfig) -> CommandResult:
+    def _configure_multus_vlan(self, config: NetworkConfig,
+                               ctx: Optional[_VlanContext] = None) -> CommandResult:
         """Configure VLAN using Multus CNI for multiple network interfaces"""
-        start_time = time.time()
+        start_time = time.monotonic()
+        ctx = ctx or _VlanContext.from_config(config)
         
         # Create NetworkAttachmentDefinition for VLAN
         network_attachment = {
             "apiVersion": "k8s.cni.cncf.io/v1",
             "kind": "NetworkAttachmentDefinition",
             "metadata": {
-                "name": f"vlan-{config.vlan_id}",
+                "name": ctx.name,
                 "namespace": self.k8s.namespace
             },
             "spec": {
-                "config": json.dumps({
-                    "cniVersion": "0.3.1",
-                    "name": f"vlan-{config.vlan_id}",
-                    "type": "macvlan",
-                    "master": config.interface or "eth0",
-                    "vlan": config.vlan_id,
-                    "ipam": {
-                        "type": "static",
-                        "addresses": [
-                            {
-                                "address": f"{config.ip_address}/{self._netmask_to_cidr(config.netmask)}",
-                                "gateway": config.gateway
-                            }
-                        ],
-                        "dns": {
-                            "nameservers": config.dns_servers or ["8.8.8.8"]
-                        }
-                    }
-                })
+                "config": _MULTUS_VLAN_CONFIG_TEMPLATE.format(
+                    name=json.dumps(ctx.name),
+                    master=json.dumps(ctx.interface),
+                    vlan=json.dumps(ctx.vlan_id),
+                    address=json.dumps(ctx.address),
+                    gateway=json.dumps(ctx.gateway),
+                    nameservers=json.dumps(ctx.dns_servers)
+                )
             }
         }
         
-        try:
-            # Apply the NetworkAttachmentDefinition
-            self.k8s.custom_objects_v1.create_namespaced_custom_object(
+        # Apply the NetworkAttachmentDefinition
+        created = self._create_resource(
+            ("NetworkAttachmentDefinition", self.k8s.namespace, ctx.name),
+            functools.partial(
+                self.k8s.custom_objects_v1.create_namespaced_custom_object,
                 group="k8s.cni.cncf.io",
                 version="v1",
                 namespace=self.k8s.namespace,
                 plural="network-attachment-definitions",
                 body=network_attachment
+            ),
+            functools.partial(
+                self.k8s.custom_objects_v1.list_namespaced_custom_object,
+                group="k8s.cni.cncf.io",
+                version="v1",
+                namespace=self.k8s.namespace,
+                plural="network-attachment-definitions"
             )
-            
-            duration = time.time() - start_time
-            return CommandResult(
-                stdout=f"VLAN {config.vlan_id} NetworkAttachmentDefinition created successfully",
-                stderr="",
-                exit_code=0,
-                success=True,
-                command=f"create_multus_vlan({config.vlan_id})",
-                duration=duration
-            )
-            
-        except ApiException as e:
-            if e.status == 409:  # Already exists
-                duration = time.time() - start_time
-                return CommandResult(
-                    stdout=f"VLAN {config.vlan_id} NetworkAttachmentDefinition already exists",
-                    stderr="",
-                    exit_code=0,
-                    success=True,
-                    command=f"create_multus_vlan({config.vlan_id})",
-                    duration=duration
-                )
-            raise
+        )
+        
+        state = "created successfully" if created else "already exists"
+        return CommandResult.ok(
+            f"VLAN {ctx.vlan_id} NetworkAttachmentDefinition {state}",
+            f"create_multus_vlan({ctx.vlan_id})",
+            time.monotonic() - start_time
+        )
     
-    def _configure_calico_vlan(self, config: NetworkConfig) -> CommandResult:
+    def _configure_calico_vlan(self, config: NetworkConfig,
+                               ctx: Optional[_VlanContext] = None) -> CommandResult:
         """Configure VLAN using Calico BGP and IP pools"""
-        start_time = time.time()
+        start_time = time.monotonic()
+        ctx = ctx or _VlanContext.from_config(config)
         
         # Create Calico IP Pool for VLAN
         ip_pool = {
             "apiVersion": "projectcalico.org/v3",
             "kind": "IPPool",
             "metadata": {
-                "name": f"vlan-{config.vlan_id}-pool"
+                "name": f"{ctx.name}-pool"
             },
             "spec": {
-                "cidr": f"{config.ip_address}/{self._netmask_to_cidr(config.netmask)}",
+                "cidr": ctx.address,
                 "vxlanMode": "Never",
                 "ipipMode": "Never",
                 "natOutgoing": True,
                 "blockSize": 26,
-                "nodeSelector": f"vlan-{config.vlan_id} == 'true'"
+                "nodeSelector": f"{ctx.name} == 'true'"
             }
         }
         
-        try:
-            # Apply Calico IP Pool
-            self.k8s.custom_objects_v1.create_cluster_custom_object(
+        # Apply Calico IP Pool
+        created = self._create_resource(
+            ("IPPool", None, f"{ctx.name}-pool"),
+            functools.partial(
+                self.k8s.custom_objects_v1.create_cluster_custom_object,
                 group="projectcalico.org",
                 version="v3",
                 plural="ippools",
                 body=ip_pool
+            ),
+            functools.partial(
+                self.k8s.custom_objects_v1.list_cluster_custom_object,
+                group="projectcalico.org",
+                version="v3",
+                plural="ippools"
             )
-            
-            duration = time.time() - start_time
-            return CommandResult(
-                stdout=f"Calico IP Pool for VLAN {config.vlan_id} created successfully",
-                stderr="",
-                exit_code=0,
-                success=True,
-                command=f"create_calico_vlan({config.vlan_id})",
-                duration=duration
-            )
-            
-        except ApiException as e:
-            if e.status == 409:  # Already exists
-                duration = time.time() - start_time
-                return CommandResult(
-                    stdout=f"Calico IP Pool for VLAN {config.vlan_id} already exists",
-                    stderr="",
-                    exit_code=0,
-                    success=True,
-                    command=f"create_calico_vlan({config.vlan_id})",
-                    duration=duration
-                )
-            raise
+        )
+        
+        state = "created successfully" if created else "already exists"
+        return CommandResult.ok(
+            f"Calico IP Pool for VLAN {ctx.vlan_id} {state}",
+            f"create_calico_vlan({ctx.vlan_id})",
+            time.monotonic() - start_time
+        )
     
-    def _configure_cilium_vlan(self, config: NetworkConfig) -> CommandResult:
+    def _configure_cilium_vlan(self, config: NetworkConfig,
+                               ctx: Optional[_VlanContext] = None) -> CommandResult:
         """Configure VLAN using Cilium eBPF networking"""
-        start_time = time.time()
+        start_time = time.monotonic()
+        ctx = ctx or _VlanContext.from_config(config)
         
         # Create CiliumNetworkPolicy for VLAN isolation
         network_policy = {
             "apiVersion": "cilium.io/v2",
             "kind": "CiliumNetworkPolicy",
             "metadata": {
-                "name": f"vlan-{config.vlan_id}-policy",
+                "name": f"{ctx.name}-policy",
                 "namespace": self.k8s.namespace
             },
             "spec": {
                 "endpointSelector": {
                     "matchLabels": {
-                        f"vlan-{config.vlan_id}": "true"
+                        ctx.name: "true"
                     }
                 },
                 "ingress": [
@@ -364,7 +708,7 @@ class KubernetesHandler(BaseOSHandler):
                         "fromEndpoints": [
                             {
                                 "matchLabels": {
-                                    f"vlan-{config.vlan_id}": "true"
+                                    ctx.name: "true"
                                 }
                             }
                         ]
@@ -375,7 +719,7 @@ class KubernetesHandler(BaseOSHandler):
                         "toEndpoints": [
                             {
                                 "matchLabels": {
-                                    f"vlan-{config.vlan_id}": "true"
+                                    ctx.name: "true"
                                 }
                             }
                         ]
@@ -389,55 +733,51 @@ class KubernetesHandler(BaseOSHandler):
             }
         }
         
-        try:
-            # Apply Cilium Network Policy
-            self.k8s.custom_objects_v1.create_namespaced_custom_object(
+        # Apply Cilium Network Policy
+        created = self._create_resource(
+            ("CiliumNetworkPolicy", self.k8s.namespace, f"{ctx.name}-policy"),
+            functools.partial(
+                self.k8s.custom_objects_v1.create_namespaced_custom_object,
                 group="cilium.io",
                 version="v2",
                 namespace=self.k8s.namespace,
                 plural="ciliumnetworkpolicies",
                 body=network_policy
+            ),
+            functools.partial(
+                self.k8s.custom_objects_v1.list_namespaced_custom_object,
+                group="cilium.io",
+                version="v2",
+                namespace=self.k8s.namespace,
+                plural="ciliumnetworkpolicies"
             )
-            
-            duration = time.time() - start_time
-            return CommandResult(
-                stdout=f"Cilium Network Policy for VLAN {config.vlan_id} created successfully",
-                stderr="",
-                exit_code=0,
-                success=True,
-                command=f"create_cilium_vlan({config.vlan_id})",
-                duration=duration
-            )
-            
-        except ApiException as e:
-            if e.status == 409:  # Already exists
-                duration = time.time() - start_time
-                return CommandResult(
-                    stdout=f"Cilium Network Policy for VLAN {config.vlan_id} already exists",
-                    stderr="",
-                    exit_code=0,
-                    success=True,
-                    command=f"create_cilium_vlan({config.vlan_id})",
-                    duration=duration
-                )
-            raise
+        )
+        
+        state = "created successfully" if created else "already exists"
+        return CommandResult.ok(
+            f"Cilium Network Policy for VLAN {ctx.vlan_id} {state}",
+            f"create_cilium_vlan({ctx.vlan_id})",
+            time.monotonic() - start_time
+        )
     
-    def _configure_generic_vlan(self, config: NetworkConfig) -> CommandResult:
+    def _configure_generic_vlan(self, config: NetworkConfig,
+                                ctx: Optional[_VlanContext] = None) -> CommandResult:
         """Configure VLAN using standard Kubernetes NetworkPolicy"""
-        start_time = time.time()
+        start_time = time.monotonic()
+        ctx = ctx or _VlanContext.from_config(config)
         
         # Create standard NetworkPolicy for basic isolation
         network_policy = {
             "apiVersion": "networking.k8s.io/v1",
             "kind": "NetworkPolicy",
             "metadata": {
-                "name": f"vlan-{config.vlan_id}-isolation",
+                "name": f"{ctx.name}-isolation",
                 "namespace": self.k8s.namespace
             },
             "spec": {
                 "podSelector": {
                     "matchLabels": {
-                        f"vlan-{config.vlan_id}": "true"
+                        ctx.name: "true"
                     }
                 },
                 "policyTypes": ["Ingress", "Egress"],
@@ -447,7 +787,7 @@ class KubernetesHandler(BaseOSHandler):
                             {
                                 "podSelector": {
                                     "matchLabels": {
-                                        f"vlan-{config.vlan_id}": "true"
+                                        ctx.name: "true"
                                     }
                                 }
                             }
@@ -460,7 +800,7 @@ class KubernetesHandler(BaseOSHandler):
                             {
                                 "podSelector": {
                                     "matchLabels": {
-                                        f"vlan-{config.vlan_id}": "true"
+                                        ctx.name: "true"
                                     }
                                 }
                             }
@@ -476,95 +816,245 @@ class KubernetesHandler(BaseOSHandler):
             }
         }
         
-        try:
-            # Apply NetworkPolicy
-            self.k8s.networking_v1.create_namespaced_network_policy(
+        # Apply NetworkPolicy
+        created = self._create_resource(
+            ("NetworkPolicy", self.k8s.namespace, f"{ctx.name}-isolation"),
+            functools.partial(
+                self.k8s.networking_v1.create_namespaced_network_policy,
                 namespace=self.k8s.namespace,
                 body=network_policy
+            ),
+            functools.partial(
+                self.k8s.networking_v1.list_namespaced_network_policy,
+                namespace=self.k8s.namespace
             )
-            
-            duration = time.time() - start_time
-            return CommandResult(
-                stdout=f"NetworkPolicy for VLAN {config.vlan_id} created successfully",
-                stderr="",
-                exit_code=0,
-                success=True,
-                command=f"create_generic_vlan({config.vlan_id})",
-                duration=duration
-            )
-            
-        except ApiException as e:
-            if e.status == 409:  # Already exists
-                duration = time.time() - start_time
-                return CommandResult(
-                    stdout=f"NetworkPolicy for VLAN {config.vlan_id} already exists",
-                    stderr="",
-                    exit_code=0,
-                    success=True,
-                    command=f"create_generic_vlan({config.vlan_id})",
-                    duration=duration
-                )
+        )
+        
+        state = "created successfully" if created else "already exists"
+        return CommandResult.ok(
+            f"NetworkPolicy for VLAN {ctx.vlan_id} {state}",
+            f"create_generic_vlan({ctx.vlan_id})",
+            time.monotonic() - start_time
+        )
+    
+    def _create_resource(self, key: Tuple[str, Optional[str], str], create: Callable[[], Any],
+                         list_existing: Callable[..., Any]) -> bool:
+        """
+        Create a VLAN resource once, however many callers ask for it concurrently
+        
+        The names of each (kind, namespace) are listed once and reused for
+        CREATED_RESOURCE_TTL seconds, so resources that already exist cost no
+        API call. The first caller for a missing (kind, namespace, name) key
+        performs the create; concurrent callers wait for its outcome instead of
+        racing it into 409s.
+        
+        Returns:
+            True if this call created the resource, False if it already existed
+        """
+        scope, name = key[:2], key[2]
+        with self._create_lock:
+            listing = self._existing_resources.get(scope)
+            listed = listing is not None and time.monotonic() - listing[0] < CREATED_RESOURCE_TTL
+            if listed and name in listing[1]:
+                return False
+            pending = self._pending_creates.get(key)
+            if pending is None:
+                pending = self._pending_creates[key] = Future()
+                owner = True
+            else:
+                owner = False
+                
+        if not owner:
+            # Re-raises the owner's failure so every caller reports it
+            pending.result()
+            return False
+        
+        try:
+            names = None if listed else self._list_resource_names(list_existing)
+            if names is not None and name in names:
+                created = False
+            else:
+                try:
+                    create()
+                    created = True
+                except ApiException as e:
+                    if e.status != 409:  # Anything but already exists
+                        raise
+                    created = False
+        except BaseException as e:
+            with self._create_lock:
+                del self._pending_creates[key]
+            pending.set_exception(e)
             raise
+        
+        with self._create_lock:
+            if names is not None:
+                self._existing_resources[scope] = (time.monotonic(), names)
+            self._existing_resources.setdefault(scope, (time.monotonic(), set()))[1].add(name)
+            del self._pending_creates[key]
+        pending.set_result(None)
+        return created
+    
+    @staticmethod
+    def _list_resource_names(list_existing: Callable[..., Any]) -> Optional[Set[str]]:
+        """Names of the existing resources of one kind, or None if they can't be listed"""
+        try:
+            response = list_existing(_preload_content=False)
+            try:
+                items = orjson.loads(response.data).get("items") or []
+            finally:
+                response.release_conn()
+            return {item["metadata"]["name"] for item in items}
+        except Exception:
+            # Missing CRDs, list permissions or a bad body; creating will tell us what exists
+            return None
     
     def _configure_standard_network(self, config: NetworkConfig) -> CommandResult:
         """Configure standard pod networking without VLAN"""
-        start_time = time.time()
-        
         # For standard networking, we primarily work with Services and Ingress
         # This is a placeholder for standard network configuration
-        
-        duration = time.time() - start_time
-        return CommandResult(
-            stdout="Standard network configuration applied",
-            stderr="",
-            exit_code=0,
-            success=True,
-            command="configure_standard_network",
-            duration=duration
-        )
+        return CommandResult.ok("Standard network configuration applied", "configure_standard_network")
     
-    def _netmask_to_cidr(self, netmask: str) -> int:
+    @staticmethod
+    def _netmask_to_cidr(netmask: str) -> int:
         """Convert netmask to CIDR notation"""
         if not netmask:
             return 24  # Default
         
-        # Convert netmask to CIDR
-        octets = netmask.split('.')
-        cidr = 0
-        for octet in octets:
-            cidr += bin(int(octet)).count('1')
-        return cidr
+        return _netmask_prefix(netmask)
     
     def get_network_interfaces(self) -> List[NetworkInterface]:
         """Get network interfaces for pods in the namespace"""
-        interfaces = []
-        
         try:
-            pods = self.k8s.list_pods(namespace=self.k8s.namespace)
-            
-            for pod in pods:
-                if pod['status'] == 'Running' and pod['ip']:
-                    interface = NetworkInterface(
-                        name=f"pod-{pod['name']}",
-                        mac_address="unknown",  # Pod MAC addresses are typically managed by CNI
-                        ip_addresses=[pod['ip']],
-                        netmask="255.255.255.0",  # Default pod subnet
-                        gateway="unknown",
-                        vlan_id=None,  # Would need to extract from annotations
-                        mtu=1500,
-                        state="up" if pod['status'] == 'Running' else "down",
-                        type="pod"
-                    )
-                    interfaces.append(interface)
+            addresses = self._cached_pod_addresses()
+            if addresses is None:
+                # Only running pods have a usable address; let the apiserver drop the
+                # rest and read the raw JSON instead of deserializing full V1Pod models
+                response = self.k8s.v1.list_namespaced_pod(
+                    self.k8s.namespace,
+                    field_selector=f"status.phase={POD_PHASE_RUNNING}",
+                    _preload_content=False
+                )
+                try:
+                    addresses = self._raw_pod_addresses(response.data)
+                finally:
+                    response.release_conn()
                     
         except ApiException as e:
             # Log pod access issues but return empty interfaces list
-            pass
+            return []
         except Exception as e:
             # Log interface discovery failures but return empty interfaces list
-            pass
+            return []
         
-        return interfaces
+        return self._pod_interfaces(addresses)
+    
+    def get_network_interfaces_for(self, pod_names: List[str]) -> List[NetworkInterface]:
+        """
+        Get network interfaces for specific pods with a single API call
+        
+        Pods are matched on metadata.name on both paths. A single pod is
+        fetched with a plain Get. Several pods are listed with the app label
+        that create_pod_with_vlan sets to the pod name; only when some names
+        are not returned that way are the namespace's running pods listed.
+        
+        Args:
+            pod_names: Names of the pods in the namespace
+        
+        Returns:
+            Interfaces of the named pods that are running and have an address
+        """
+        names = sorted(set(pod_names))
+        if not names:
+            return []
+        
+        try:
+            if len(names) == 1:
+                pod = self.k8s.v1.read_namespaced_pod(names[0], self.k8s.namespace)
+                addresses = [(pod.metadata.name, pod.status.pod_ip)] if pod.status.phase == POD_PHASE_RUNNING else []
+            else:
+                wanted = set(names)
+                addresses = [
+                    address for address in self._running_pod_addresses(f"app in ({','.join(names)})")
+                    if address[0] in wanted
+                ]
+                # Pods not created by create_pod_with_vlan may carry another app label
+                missing = wanted.difference(name for name, _ in addresses)
+                if missing:
+                    addresses += [address for address in self._running_pod_addresses() if address[0] in missing]
+                    
+        except ApiException:
+            # Missing pods or access issues leave nothing to report
+            return []
+        except Exception:
+            # Log interface discovery failures but return empty interfaces list
+            return []
+        
+        return self._pod_interfaces(addresses)
+    
+    def _running_pod_addresses(self, label_selector: Optional[str] = None) -> List[Tuple[str, Optional[str]]]:
+        """Names and IPs of the namespace's running pods, optionally narrowed by labels"""
+        response = self.k8s.v1.list_namespaced_pod(
+            self.k8s.namespace,
+            label_selector=label_selector,
+            field_selector=f"status.phase={POD_PHASE_RUNNING}",
+            _preload_content=False
+        )
+        try:
+            return self._raw_pod_addresses(response.data)
+        finally:
+            response.release_conn()
+    
+    async def get_network_interfaces_async(self) -> List[NetworkInterface]:
+        """Async version of get_network_interfaces using the kubernetes_asyncio client"""
+        try:
+            addresses = self._cached_pod_addresses()
+            if addresses is None:
+                v1 = await self.k8s.get_async_v1()
+                response = await v1.list_namespaced_pod(
+                    self.k8s.namespace,
+                    field_selector=f"status.phase={POD_PHASE_RUNNING}",
+                    _preload_content=False
+                )
+                try:
+                    addresses = self._raw_pod_addresses(await response.read())
+                finally:
+                    response.release()
+                    
+        except (ApiException, AsyncApiException) as e:
+            # Log pod access issues but return empty interfaces list
+            return []
+        except Exception as e:
+            # Log interface discovery failures but return empty interfaces list
+            return []
+        
+        return self._pod_interfaces(addresses)
+    
+    def _cached_pod_addresses(self) -> Optional[List[Tuple[str, Optional[str]]]]:
+        """Names and IPs of running pods in the namespace from the cluster state cache"""
+        cached_pods = self._cluster_state.pods() if self._cluster_state else None
+        if cached_pods is None:
+            return None
+        return [
+            (pod.metadata.name, pod.status.pod_ip)
+            for pod in cached_pods
+            if pod.metadata.namespace == self.k8s.namespace and pod.status.phase == POD_PHASE_RUNNING
+        ]
+    
+    @staticmethod
+    def _raw_pod_addresses(data: bytes) -> List[Tuple[str, Optional[str]]]:
+        """Names and IPs of the pods in a raw pod list response body"""
+        pods = orjson.loads(data).get("items") or []
+        return [(pod["metadata"]["name"], pod.get("status", {}).get("podIP")) for pod in pods]
+    
+    @staticmethod
+    def _pod_interfaces(addresses: List[Tuple[str, Optional[str]]]) -> List[NetworkInterface]:
+        """Build interfaces for the pods that have an address"""
+        return [
+            NetworkInterface(f"pod-{pod_name}", "unknown", [pod_ip], *_POD_INTERFACE_DEFAULTS)
+            for pod_name, pod_ip in addresses
+            if pod_ip
+        ]
     
     def create_pod_with_vlan(self, pod_name: str, image: str, vlan_id: int, 
                            network_config: NetworkConfig) -> CommandResult:
@@ -580,7 +1070,7 @@ class KubernetesHandler(BaseOSHandler):
         Returns:
             CommandResult with creation status
         """
-        start_time = time.time()
+        start_time = time.monotonic()
         
         # Only configure VLAN network if vlan_id is specified
         if vlan_id > 0:
@@ -588,6 +1078,56 @@ class KubernetesHandler(BaseOSHandler):
             if not vlan_result.success:
                 return vlan_result
         
+        try:
+            # Create the pod with server-side apply, one write that also
+            # converges a pod left over from an earlier attempt
+            self.k8s.v1.patch_namespaced_pod(
+                name=pod_name,
+                namespace=self.k8s.namespace,
+                body=self._vlan_pod_spec(pod_name, image, vlan_id),
+                field_manager=FIELD_MANAGER,
+                force=True,
+                _content_type=APPLY_PATCH_CONTENT_TYPE
+            )
+            
+            # Wait for pod to be ready
+            self._wait_for_pod_ready(pod_name, timeout=300)
+            
+        except ApiException as e:
+            return self._create_pod_result(pod_name, vlan_id, start_time, e)
+        
+        return self._create_pod_result(pod_name, vlan_id, start_time)
+    
+    async def create_pod_with_vlan_async(self, pod_name: str, image: str, vlan_id: int,
+                                         network_config: NetworkConfig) -> CommandResult:
+        """Async version of create_pod_with_vlan using the kubernetes_asyncio client"""
+        start_time = time.monotonic()
+        
+        if vlan_id > 0:
+            # VLAN attachments go through the custom objects API, which stays sync
+            vlan_result = await run_in_executor(self._configure_vlan_network, network_config)
+            if not vlan_result.success:
+                return vlan_result
+        
+        try:
+            v1 = await self.k8s.get_async_v1()
+            await v1.patch_namespaced_pod(
+                name=pod_name,
+                namespace=self.k8s.namespace,
+                body=self._vlan_pod_spec(pod_name, image, vlan_id),
+                field_manager=FIELD_MANAGER,
+                force=True,
+                _content_type=APPLY_PATCH_CONTENT_TYPE
+            )
+            await self._wait_for_pod_ready_async(pod_name, timeout=300)
+            
+        except AsyncApiException as e:
+            return self._create_pod_result(pod_name, vlan_id, start_time, e)
+        
+        return self._create_pod_result(pod_name, vlan_id, start_time)
+    
+    def _vlan_pod_spec(self, pod_name: str, image: str, vlan_id: int) -> Dict[str, Any]:
+        """Build the manifest of a pod attached to a VLAN"""
         # Pod specification with VLAN labels and annotations
         pod_spec = {
             "apiVersion": "v1",
@@ -629,66 +1169,107 @@ class KubernetesHandler(BaseOSHandler):
         # Add Multus annotations if available
         if "multus" in self.cni_plugins:
             pod_spec["metadata"]["annotations"]["k8s.v1.cni.cncf.io/networks"] = f"vlan-{vlan_id}"
-        
-        try:
-            # Create the pod
-            self.k8s.v1.create_namespaced_pod(
-                namespace=self.k8s.namespace,
-                body=pod_spec
-            )
-            
-            # Wait for pod to be ready
-            self._wait_for_pod_ready(pod_name, timeout=300)
-            
-            duration = time.time() - start_time
-            return CommandResult(
-                stdout=f"Pod {pod_name} created successfully with VLAN {vlan_id}",
-                stderr="",
-                exit_code=0,
-                success=True,
-                command=f"create_pod_with_vlan({pod_name}, vlan_id={vlan_id})",
-                duration=duration
-            )
             
-        except ApiException as e:
-            duration = time.time() - start_time
-            return CommandResult(
-                stdout="",
-                stderr=f"Failed to create pod: {str(e)}",
-                exit_code=1,
-                success=False,
-                command=f"create_pod_with_vlan({pod_name}, vlan_id={vlan_id})",
-                duration=duration
-            )
+        return pod_spec
+    
+    @staticmethod
+    def _create_pod_result(pod_name: str, vlan_id: int, start_time: float,
+                           error: Optional[Exception] = None) -> CommandResult:
+        """Build the create_pod_with_vlan result"""
+        duration = time.monotonic() - start_time
+        command = f"create_pod_with_vlan({pod_name}, vlan_id={vlan_id})"
+        if error is not None:
+            return CommandResult.fail(f"Failed to create pod: {str(error)}", command, duration)
+        return CommandResult.ok(f"Pod {pod_name} created successfully with VLAN {vlan_id}", command, duration)
     
     def _wait_for_pod_ready(self, pod_name: str, timeout: int = 300) -> bool:
-        """Wait for pod to be in Ready state"""
-        start_time = time.time()
+        """Wait for pod to be in Ready state, watching it instead of polling"""
+        deadline = time.monotonic() + timeout
+        resource_version = None
+        attempt = 0
         
-        while time.time() - start_time < timeout:
+        while True:
+            remaining = math.ceil(deadline - time.monotonic())
+            if remaining <= 0:
+                return False
+            
+            last_seen = resource_version
+            pod_watch = watch.Watch()
             try:
-                pod = self.k8s.v1.read_namespaced_pod(
-                    name=pod_name,
-                    namespace=self.k8s.namespace
-                )
-                
-                if pod.status.phase == 'Running':
-                    # Check container readiness
-                    if pod.status.container_statuses:
-                        all_ready = all(cs.ready for cs in pod.status.container_statuses)
-                        if all_ready:
-                            return True
-                
-                time.sleep(5)
-                
-            except ApiException:
-                time.sleep(5)
+                # The first events replay the pod's current state, so a pod that is
+                # already ready returns immediately
+                for event in pod_watch.stream(
+                    self.k8s.v1.list_namespaced_pod,
+                    namespace=self.k8s.namespace,
+                    field_selector=f"metadata.name={pod_name}",
+                    resource_version=resource_version,
+                    timeout_seconds=remaining
+                ):
+                    pod = event["object"]
+                    resource_version = pod.metadata.resource_version
+                    if event["type"] != "DELETED" and self._pod_ready(pod):
+                        return True
+                        
+            except (ApiException, HTTPError) as e:
+                # HTTPError covers idle watch connections dropped by a proxy or load balancer
+                if isinstance(e, ApiException) and e.status == 410:
+                    # Our resourceVersion was compacted away; resume from current state
+                    resource_version = None
+                # Back off while the watch keeps failing without delivering anything new
+                attempt = attempt + 1 if resource_version == last_seen else 0
+                time.sleep(min(self._retry_delay(attempt), max(0, deadline - time.monotonic())))
+            finally:
+                pod_watch.stop()
+    
+    @staticmethod
+    def _retry_delay(attempt: int) -> float:
+        """Jittered exponential backoff so bursts of waiters don't retry in lockstep"""
+        return min(WATCH_RETRY_MAX_DELAY, WATCH_RETRY_BASE_DELAY * 1.5 ** attempt) * random.uniform(0.8, 1.2)
+    
+    @staticmethod
+    def _pod_ready(pod: Any) -> bool:
+        """Check whether a pod is running with every container ready"""
+        if pod.status.phase != POD_PHASE_RUNNING or not pod.status.container_statuses:
+            return False
+        return all(cs.ready for cs in pod.status.container_statuses)
+    
+    async def _wait_for_pod_ready_async(self, pod_name: str, timeout: int = 300) -> bool:
+        """Async version of _wait_for_pod_ready"""
+        deadline = time.monotonic() + timeout
+        resource_version = None
+        attempt = 0
+        v1 = await self.k8s.get_async_v1()
         
-        return False
+        while True:
+            remaining = math.ceil(deadline - time.monotonic())
+            if remaining <= 0:
+                return False
+            
+            last_seen = resource_version
+            try:
+                async with async_watch.Watch() as pod_watch:
+                    async for event in pod_watch.stream(
+                        v1.list_namespaced_pod,
+                        namespace=self.k8s.namespace,
+                        field_selector=f"metadata.name={pod_name}",
+                        resource_version=resource_version,
+                        timeout_seconds=remaining
+                    ):
+                        pod = event["object"]
+                        resource_version = pod.metadata.resource_version
+                        if event["type"] != "DELETED" and self._pod_ready(pod):
+                            return True
+                            
+            except AsyncApiException as e:
+                if e.status == 410:
+                    # Our resourceVersion was compacted away; resume from current state
+                    resource_version = None
+                attempt = attempt + 1 if resource_version == last_seen else 0
+                await asyncio.sleep(min(self._retry_delay(attempt), max(0, deadline - time.monotonic())))
     
     def delete_pod(self, pod_name: str) -> CommandResult:
         """Delete a pod"""
-        start_time = time.time()
+        start_time = time.monotonic()
         
         try:
             self.k8s.v1.delete_namespaced_pod(
@@ -696,25 +1277,41 @@ class KubernetesHandler(BaseOSHandler):
                 namespace=self.k8s.namespace
             )
             
-            duration = time.time() - start_time
-            return CommandResult(
-                stdout=f"Pod {pod_name} deleted successfully",
-                stderr="",
-                exit_code=0,
-                success=True,
-                command=f"delete_pod({pod_name})",
-                duration=duration
+            return CommandResult.ok(
+                f"Pod {pod_name} deleted successfully",
+                f"delete_pod({pod_name})",
+                time.monotonic() - start_time
             )
             
         except ApiException as e:
-            duration = time.time() - start_time
-            return CommandResult(
-                stdout="",
-                stderr=f"Failed to delete pod: {str(e)}",
-                exit_code=1,
-                success=False,
-                command=f"delete_pod({pod_name})",
-                duration=duration
+            return CommandResult.fail(
+                f"Failed to delete pod: {str(e)}",
+                f"delete_pod({pod_name})",
+                time.monotonic() - start_time
+            )
+    
+    async def delete_pod_async(self, pod_name: str) -> CommandResult:
+        """Async version of delete_pod using the kubernetes_asyncio client"""
+        start_time = time.monotonic()
+        
+        try:
+            v1 = await self.k8s.get_async_v1()
+            await v1.delete_namespaced_pod(
+                name=pod_name,
+                namespace=self.k8s.namespace
+            )
+            
+            return CommandResult.ok(
+                f"Pod {pod_name} deleted successfully",
+                f"delete_pod({pod_name})",
+                time.monotonic() - start_time
+            )
+            
+        except AsyncApiException as e:
+            return CommandResult.fail(
+                f"Failed to delete pod: {str(e)}",
+                f"delete_pod({pod_name})",
+                time.monotonic() - start_time
             )
     
     def test_network_connectivity(self, source_pod: str, target_ip: str, 
@@ -730,10 +1327,7 @@ class KubernetesHandler(BaseOSHandler):
         Returns:
             CommandResult with connectivity test results
         """
-        if port:
-            command = f"nc -zv {target_ip} {port}"
-        else:
-            command = f"ping -c 3 {target_ip}"
+        command = self._connectivity_command(target_ip, port)
         
         try:
             stdout, stderr, exit_code = self.k8s.execute_command(
@@ -746,7 +1340,6 @@ class KubernetesHandler(BaseOSHandler):
                 stdout=stdout,
                 stderr=stderr,
                 exit_code=exit_code,
-                success=exit_code == 0,
                 command=command,
                 duration=0.0
             )
@@ -756,11 +1349,56 @@ class KubernetesHandler(BaseOSHandler):
                 stdout="",
                 stderr=f"Network connectivity test failed: {str(e)}",
                 exit_code=1,
-                success=False,
                 command=command,
                 duration=0.0
             )
     
+    async def test_network_connectivity_async(self, source_pod: str, target_ip: str,
+                                              port: Optional[int] = None) -> CommandResult:
+        """Async version of test_network_connectivity"""
+        results = await self.test_network_connectivity_many(source_pod, [(target_ip, port)])
+        return results[0]
+    
+    async def test_network_connectivity_many(self, source_pod: str,
+                                             targets: List[Tuple[str, Optional[int]]]) -> List[CommandResult]:
+        """
+        Test connectivity from one pod to several targets concurrently
+        
+        Args:
+            source_pod: Source pod name
+            targets: (target IP, optional port) pairs
+        
+        Returns:
+            CommandResults in the order of targets
+        """
+        return list(await asyncio.gather(*(
+            self._test_connectivity_async(source_pod, target_ip, port)
+            for target_ip, port in targets
+        )))
+    
+    async def _test_connectivity_async(self, source_pod: str, target_ip: str,
+                                       port: Optional[int]) -> CommandResult:
+        """Run one connectivity check over an async exec stream"""
+        command = self._connectivity_command(target_ip, port)
+        
+        try:
+            stdout, stderr, exit_code = await self.k8s.execute_command_async(
+                command,
+                pod_name=source_pod,
+                namespace=self.k8s.namespace
+            )
+            return CommandResult(stdout, stderr, exit_code, command, 0.0)
+            
+        except Exception as e:
+            return CommandResult.fail(f"Network connectivity test failed: {str(e)}", command)
+    
+    @staticmethod
+    def _connectivity_command(target_ip: str, port: Optional[int]) -> str:
+        """Shell command probing a target, by TCP connect when a port is given"""
+        if port:
+            return f"nc -zv {target_ip} {port}"
+        return f"ping -c 3 {target_ip}"
+    
     # Override base methods that don't apply to Kubernetes
     def install_package(self, package_name: str, **kwargs) -> CommandResult:
         """Package installation not applicable for Kubernetes pods"""
@@ -768,7 +1406,6 @@ class KubernetesHandler(BaseOSHandler):
             stdout="Package installation should be handled in container image",
             stderr="",
             exit_code=0,
-            success=True,
             command=f"install_package({package_name})",
             duration=0.0
         )
@@ -779,7 +1416,6 @@ class KubernetesHandler(BaseOSHandler):
             stdout="Package uninstallation should be handled in container image",
             stderr="",
             exit_code=0,
-            success=True,
             command=f"uninstall_package({package_name})",
             duration=0.0
         )
@@ -792,7 +1428,6 @@ class KubernetesHandler(BaseOSHandler):
                 stdout="",
                 stderr="pod_name required for pod restart",
                 exit_code=1,
-                success=False,
                 command="reboot",
                 duration=0.0
             )
@@ -807,7 +1442,6 @@ class KubernetesHandler(BaseOSHandler):
             stdout=f"Pod {pod_name} restart initiated",
             stderr="",
             exit_code=0,
-            success=True,
             command=f"restart_pod({pod_name})",
             duration=0.0
         )
@@ -820,7 +1454,6 @@ class KubernetesHandler(BaseOSHandler):
                 stdout="",
                 stderr="pod_name required for pod shutdown",
                 exit_code=1,
-                success=False,
                 command="shutdown",
                 duration=0.0
             )
@@ -836,7 +1469,6 @@ class KubernetesHandler(BaseOSHandler):
                 stdout=stdout,
                 stderr=stderr,
                 exit_code=exit_code,
-                success=exit_code == 0,
                 command=command,
                 duration=0.0
             )
@@ -845,7 +1477,6 @@ class KubernetesHandler(BaseOSHandler):
                 stdout="",
                 stderr=str(e),
                 exit_code=1,
-                success=False,
                 command=command,
                 duration=0.0
             )
@@ -858,7 +1489,6 @@ class KubernetesHandler(BaseOSHandler):
                 stdout="File uploaded successfully" if success else "",
                 stderr="" if success else "File upload failed",
                 exit_code=0 if success else 1,
-                success=success,
                 command=f"upload_file({local_path}, {remote_path})",
                 duration=0.0
             )
@@ -867,7 +1497,6 @@ class KubernetesHandler(BaseOSHandler):
                 stdout="",
                 stderr=str(e),
                 exit_code=1,
-                success=False,
                 command=f"upload_file({local_path}, {remote_path})",
                 duration=0.0
             )
@@ -880,7 +1509,6 @@ class KubernetesHandler(BaseOSHandler):
                 stdout="File downloaded successfully" if success else "",
                 stderr="" if success else "File download failed",
                 exit_code=0 if success else 1,
-                success=success,
                 command=f"download_file({remote_path}, {local_path})",
                 duration=0.0
             )
@@ -889,7 +1517,6 @@ class KubernetesHandler(BaseOSHandler):
                 stdout="",
                 stderr=str(e),
                 exit_code=1,
-                success=False,
                 command=f"download_file({remote_path}, {local_path})",
                 duration=0.0
             )
@@ -940,7 +1567,6 @@ class KubernetesHandler(BaseOSHandler):
             stdout="User creation not applicable for containers",
             stderr="",
             exit_code=0,
-            success=True,
             command=f"create_user({username})",
             duration=0.0
         )
@@ -951,7 +1577,6 @@ class KubernetesHandler(BaseOSHandler):
             stdout="Hostname setting not applicable for pods",
             stderr="",
             exit_code=0,
-            success=True,
             command=f"set_hostname({hostname})",
             duration=0.0
         )
@@ -970,7 +1595,6 @@ class KubernetesHandler(BaseOSHandler):
             stdout="Network service restart not applicable for pods",
             stderr="",
             exit_code=0,
-            success=True,
             command="restart_network_service",
             duration=0.0
         )
@@ -5,14 +5,53 @@ Linux OS handler implementation
 import re
 import json
 import time
-from typing import Dict, Any, Optional, List
-from .base import BaseOSHandler, CommandResult, NetworkInterface, NetworkConfig
+from typing import Callable, Dict, Any, Optional, List, Tuple
+from .base import _PREFIX_TO_NETMASK, _netmask_prefix, BaseOSHandler, CommandResult, NetworkInterface, NetworkConfig
 from ..connections.ssh import SSHConnection
 
 
+# Patterns for ip addr / ip route output, compiled once for the per-line parsing loops
+_IFACE_RE = re.compile(r'^\d+: (\S+):')
+_MAC_RE = re.compile(r'link/ether (\S+)')
+_INET_RE = re.compile(r'inet (\S+)/(\d+)')
+_MTU_RE = re.compile(r'mtu (\d+)')
+_VLAN_RE = re.compile(r'\.(\d+)@')
+_DEFAULT_ROUTE_RE = re.compile(r'default via (\S+) dev (\S+)')
+
+# Record separator printed between the outputs of commands batched into one remote call
+_BATCH_SEPARATOR = '\x1e'
+
+# Memory counters read straight from /proc/meminfo, filtered on the host
+_MEMINFO_COMMAND = (
+    "awk '/^(MemTotal|MemFree|MemAvailable|Buffers|Cached|SReclaimable|SwapTotal|SwapFree):/"
+    " {print $1, $2}' /proc/meminfo"
+)
+
+# Seconds host facts are reused before querying the host again
+CPU_INFO_CACHE_TTL = 300
+MEMORY_INFO_CACHE_TTL = 5
+
+
 class LinuxHandler(BaseOSHandler):
     """Handler for Linux operating systems"""
     
+    # Install commands by package manager, in order of preference
+    _PACKAGE_MANAGERS: Dict[str, str] = {
+        'dnf': 'dnf install -y',              # Fedora, RHEL 8+, Rocky 9
+        'yum': 'yum install -y',              # RHEL 7, CentOS
+        'apt-get': 'apt-get install -y',      # Debian, Ubuntu
+        'zypper': 'zypper install -y',        # openSUSE
+        'pacman': 'pacman -S --noconfirm',    # Arch
+    }
+    
+    def __init__(self, connection):
+        super().__init__(connection)
+        # Host facts by name as (monotonic timestamp, info)
+        self._info_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # Detected once per handler; neither changes during a session
+        self._network_manager: Optional[str] = None
+        self._pkg_manager: Optional[Tuple[str, str]] = None
+    
     def execute_command(self, command: str, timeout: int = 30, 
                        as_admin: bool = False) -> CommandResult:
         """Execute command on Linux"""
@@ -32,7 +71,6 @@ class LinuxHandler(BaseOSHandler):
             stdout=stdout,
             stderr=stderr,
             exit_code=exit_code,
-            success=exit_code == 0,
             command=command,
             duration=duration
         )
@@ -51,6 +89,8 @@ class LinuxHandler(BaseOSHandler):
         # Parse JSON output
         try:
             iface_data = json.loads(result.stdout)
+            # One route query for all interfaces rather than one per interface
+            gateways = self._get_default_gateways()
             for iface in iface_data:
                 ip_addresses = []
                 netmask = None
@@ -68,7 +108,7 @@ class LinuxHandler(BaseOSHandler):
                 vlan_id = None
                 if '@' in iface.get('ifname', ''):
                     # VLAN interface like eth0.100@eth0
-                    vlan_match = re.search(r'\.(\d+)@', iface['ifname'])
+                    vlan_match = _VLAN_RE.search(iface['ifname'])
                     if vlan_match:
                         vlan_id = int(vlan_match.group(1))
                         
@@ -77,7 +117,7 @@ class LinuxHandler(BaseOSHandler):
                     mac_address=mac_address,
                     ip_addresses=ip_addresses,
                     netmask=netmask,
-                    gateway=self._get_default_gateway(iface.get('ifname')),
+                    gateway=gateways.get(iface.get('ifname')),
                     vlan_id=vlan_id,
                     mtu=iface.get('mtu', 1500),
                     state='up' if 'UP' in iface.get('flags', []) else 'down',
@@ -135,54 +175,35 @@ class LinuxHandler(BaseOSHandler):
             'hostname': 'unknown'
         }
         
+        # One round-trip for all four facts; a failed command leaves an empty section
+        os_release, kernel, architecture, hostname = self._batched_exec([
+            "cat /etc/os-release", "uname -r", "uname -m", "hostname"
+        ])
+        
         # Get distribution info
-        result = self.execute_command("cat /etc/os-release")
-        if result.success:
-            for line in result.stdout.split('\n'):
-                if line.startswith('NAME='):
-                    info['distribution'] = line.split('=')[1].strip('"')
-                elif line.startswith('VERSION='):
-                    info['version'] = line.split('=')[1].strip('"')
-                    
-        # Get kernel version
-        result = self.execute_command("uname -r")
-        if result.success:
-            info['kernel'] = result.stdout.strip()
-            
-        # Get architecture
-        result = self.execute_command("uname -m")
-        if result.success:
-            info['architecture'] = result.stdout.strip()
-            
-        # Get hostname
-        result = self.execute_command("hostname")
-        if result.success:
-            info['hostname'] = result.stdout.strip()
+        for line in os_release.split('\n'):
+            if line.startswith('NAME='):
+                info['distribution'] = line.split('=')[1].strip('"')
+            elif line.startswith('VERSION='):
+                info['version'] = line.split('=')[1].strip('"')
+        
+        for key, value in (('kernel', kernel), ('architecture', architecture), ('hostname', hostname)):
+            if value.strip():
+                info[key] = value.strip()
             
         self._os_info = info
         return info
     
     def install_package(self, package_name: str) -> CommandResult:
         """Install a package using the appropriate package manager"""
-        # Detect package manager
-        pkg_managers = [
-            ('dnf', 'dnf install -y'),      # Fedora, RHEL 8+, Rocky 9
-            ('yum', 'yum install -y'),      # RHEL 7, CentOS
-            ('apt-get', 'apt-get install -y'),  # Debian, Ubuntu
-            ('zypper', 'zypper install -y'),    # openSUSE
-            ('pacman', 'pacman -S --noconfirm') # Arch
-        ]
-        
-        for manager, install_cmd in pkg_managers:
-            result = self.execute_command(f"which {manager}")
-            if result.success:
-                return self.execute_command(f"{install_cmd} {package_name}", as_admin=True)
+        pkg_manager = self._detect_package_manager()
+        if pkg_manager:
+            return self.execute_command(f"{pkg_manager[1]} {package_name}", as_admin=True)
                 
         return CommandResult(
             stdout="",
             stderr="No supported package manager found",
             exit_code=1,
-            success=False,
             command=f"install {package_name}",
             duration=0
         )
@@ -276,28 +297,41 @@ class LinuxHandler(BaseOSHandler):
     
     def get_memory_info(self) -> Dict[str, Any]:
         """Get memory information"""
+        return self._cached_info('memory', MEMORY_INFO_CACHE_TTL, self._read_memory_info)
+    
+    def _read_memory_info(self) -> Tuple[Dict[str, Any], bool]:
+        """Query memory information, reporting whether the query succeeded"""
         info = {}
         
-        result = self.execute_command("free -b")
+        result = self.execute_command(_MEMINFO_COMMAND)
         if result.success:
-            lines = result.stdout.strip().split('\n')
-            for line in lines:
-                if line.startswith('Mem:'):
-                    parts = line.split()
-                    info['total'] = int(parts[1])
-                    info['used'] = int(parts[2])
-                    info['free'] = int(parts[3])
-                    info['available'] = int(parts[6]) if len(parts) > 6 else info['free']
-                elif line.startswith('Swap:'):
-                    parts = line.split()
-                    info['swap_total'] = int(parts[1])
-                    info['swap_used'] = int(parts[2])
-                    info['swap_free'] = int(parts[3])
+            # "MemTotal: 8052320" lines, sizes in kB
+            meminfo = {}
+            for line in result.stdout.split('\n'):
+                parts = line.split()
+                if len(parts) == 2:
+                    meminfo[parts[0].rstrip(':')] = int(parts[1]) * 1024
                     
-        return info
+            if 'MemTotal' in meminfo:
+                info['total'] = meminfo['MemTotal']
+                info['free'] = meminfo.get('MemFree', 0)
+                # Same accounting as free(1): buffers, page cache and reclaimable slab aren't used
+                buff_cache = meminfo.get('Buffers', 0) + meminfo.get('Cached', 0) + meminfo.get('SReclaimable', 0)
+                info['used'] = info['total'] - info['free'] - buff_cache
+                info['available'] = meminfo.get('MemAvailable', info['free'])
+            if 'SwapTotal' in meminfo:
+                info['swap_total'] = meminfo['SwapTotal']
+                info['swap_free'] = meminfo.get('SwapFree', 0)
+                info['swap_used'] = info['swap_total'] - info['swap_free']
+                    
+        return info, result.success
     
     def get_cpu_info(self) -> Dict[str, Any]:
         """Get CPU information"""
+        return self._cached_info('cpu', CPU_INFO_CACHE_TTL, self._read_cpu_info)
+    
+    def _read_cpu_info(self) -> Tuple[Dict[str, Any], bool]:
+        """Query CPU information, reporting whether the query succeeded"""
         info = {
             'count': 0,
             'model': 'unknown',
@@ -317,7 +351,7 @@ class LinuxHandler(BaseOSHandler):
                 elif line.startswith('Architecture:'):
                     info['architecture'] = line.split(':')[1].strip()
                     
-        return info
+        return info, result.success
     
     def upload_file(self, local_path: str, remote_path: str) -> bool:
         """Upload file to remote system"""
@@ -364,8 +398,34 @@ class LinuxHandler(BaseOSHandler):
         return files
     
     # Helper methods
+    def _batched_exec(self, commands: List[str]) -> List[str]:
+        """Run commands in one remote call and return the stdout of each"""
+        result = self.execute_command("; printf '\\036'; ".join(commands))
+        sections = result.stdout.split(_BATCH_SEPARATOR)
+        # A dropped connection can cut the output short
+        return (sections + [''] * len(commands))[:len(commands)]
+    
+    def _cached_info(self, name: str, ttl: float,
+                     fetch: Callable[[], Tuple[Dict[str, Any], bool]]) -> Dict[str, Any]:
+        """Return a copy of a host fact, refetching once it is older than ttl"""
+        cached = self._info_cache.get(name)
+        if cached is not None and time.monotonic() - cached[0] < ttl:
+            return dict(cached[1])
+        
+        info, complete = fetch()
+        # Failed queries are retried on the next call rather than cached
+        if complete:
+            self._info_cache[name] = (time.monotonic(), dict(info))
+        return info
+    
     def _detect_network_manager(self) -> str:
         """Detect which network management system is in use"""
+        if self._network_manager is None:
+            self._network_manager = self._query_network_manager()
+        return self._network_manager
+    
+    def _query_network_manager(self) -> str:
+        """Ask the host which network management system is active"""
         # Check for NetworkManager
         result = self.execute_command("systemctl is-active NetworkManager")
         if result.success and result.stdout.strip() == 'active':
@@ -378,6 +438,18 @@ class LinuxHandler(BaseOSHandler):
             
         return 'legacy'
     
+    def _detect_package_manager(self) -> Optional[Tuple[str, str]]:
+        """Return the (manager, install command) of the preferred package manager present"""
+        if self._pkg_manager is None:
+            # One round-trip printing the path of the first manager found
+            result = self.execute_command(
+                f"for m in {' '.join(self._PACKAGE_MANAGERS)}; do command -v $m && break; done"
+            )
+            found = result.stdout.strip().rsplit('/', 1)[-1] if result.success else ''
+            if found in self._PACKAGE_MANAGERS:
+                self._pkg_manager = (found, self._PACKAGE_MANAGERS[found])
+        return self._pkg_manager
+    
     def _configure_network_nm(self, config: NetworkConfig) -> CommandResult:
         """Configure network using NetworkManager"""
         con_name = f"pod-{config.interface}"
@@ -437,21 +509,33 @@ class LinuxHandler(BaseOSHandler):
     
     def _prefix_to_netmask(self, prefix: int) -> str:
         """Convert CIDR prefix to netmask"""
-        mask = (0xffffffff << (32 - prefix)) & 0xffffffff
-        return '.'.join([str((mask >> (8 * i)) & 0xff) for i in range(3, -1, -1)])
+        return _PREFIX_TO_NETMASK[prefix]
     
     def _netmask_to_prefix(self, netmask: str) -> int:
         """Convert netmask to CIDR prefix"""
-        return sum(bin(int(x)).count('1') for x in netmask.split('.'))
+        return _netmask_prefix(netmask)
     
-    def _get_default_gateway(self, interface: str) -> Optional[str]:
-        """Get default gateway for interface"""
-        result = self.execute_command(f"ip route show default dev {interface}")
+    def _get_default_gateways(self) -> Dict[str, str]:
+        """Map each interface that has a default route to its gateway"""
+        gateways = {}
+        
+        result = self.execute_command("ip -j route show default")
         if result.success:
-            match = re.search(r'default via (\S+)', result.stdout)
-            if match:
-                return match.group(1)
-        return None
+            try:
+                for route in json.loads(result.stdout):
+                    if route.get('dev') and route.get('gateway'):
+                        # Routes are listed by metric, so the first one wins
+                        gateways.setdefault(route['dev'], route['gateway'])
+                return gateways
+            except (json.JSONDecodeError, AttributeError, TypeError):
+                pass
+                
+        # iproute2 without JSON support
+        result = self.execute_command("ip route show default")
+        if result.success:
+            for gateway, dev in _DEFAULT_ROUTE_RE.findall(result.stdout):
+                gateways.setdefault(dev, gateway)
+        return gateways
     
     def _get_interface_type(self, name: str) -> str:
         """Determine interface type from name"""
@@ -473,7 +557,7 @@ class LinuxHandler(BaseOSHandler):
         
         for line in output.split('\n'):
             # New interface
-            match = re.match(r'^\d+: (\S+):', line)
+            match = _IFACE_RE.match(line)
             if match:
                 if current_iface:
                     interfaces.append(current_iface)
@@ -498,19 +582,19 @@ class LinuxHandler(BaseOSHandler):
                     current_iface.state = 'up'
                     
                 # Get MTU
-                mtu_match = re.search(r'mtu (\d+)', line)
+                mtu_match = _MTU_RE.search(line)
                 if mtu_match:
                     current_iface.mtu = int(mtu_match.group(1))
                     
             # MAC address
             elif current_iface and 'link/ether' in line:
-                mac_match = re.search(r'link/ether (\S+)', line)
+                mac_match = _MAC_RE.search(line)
                 if mac_match:
                     current_iface.mac_address = mac_match.group(1)
                     
             # IP address
             elif current_iface and 'inet ' in line:
-                ip_match = re.search(r'inet (\S+)/(\d+)', line)
+                ip_match = _INET_RE.search(line)
                 if ip_match:
                     current_iface.ip_addresses.append(ip_match.group(1))
                     if not current_iface.netmask:
@@ -30,7 +30,6 @@ class WindowsHandler(BaseOSHandler):
             stdout=stdout,
             stderr=stderr,
             exit_code=exit_code,
-            success=exit_code == 0,
             command=command,
             duration=duration
         )
@@ -51,7 +50,6 @@ class WindowsHandler(BaseOSHandler):
             stdout=stdout,
             stderr=stderr,
             exit_code=exit_code,
-            success=exit_code == 0,
             command=f"PowerShell: {script[:50]}...",
             duration=duration
         )
@@ -250,7 +248,6 @@ class WindowsHandler(BaseOSHandler):
             stdout="",
             stderr="No package manager available. Install winget or Chocolatey.",
             exit_code=1,
-            success=False,
             command=f"install {package_name}",
             duration=0
         )
@@ -0,0 +1,13 @@
+"""
+Helpers for running blocking calls from async code
+"""
+
+import asyncio
+import functools
+from typing import Any, Callable
+
+
+async def run_in_executor(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking call in the default executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
@@ -25,6 +25,17 @@ def mock_vsphere_service_instance():
     return MockServiceInstance()
 
 
+def _resolve_properties(obj, obj_type, path_set):
+    """Resolve PropertyCollector paths against attributes of a mock object"""
+    values = {}
+    for path in path_set:
+        value = obj
+        for attr in path.split('.'):
+            value = getattr(value, attr)
+        values[path] = value
+    return values
+
+
 @pytest.fixture
 def mock_vsphere_client():
     """Mock vSphere client"""
@@ -43,6 +54,10 @@ def mock_vsphere_client():
     client.get_network = Mock()
     client.get_datacenter = Mock()
     client.wait_for_task = Mock(return_value=True)
+    client.get_properties = Mock(side_effect=_resolve_properties)
+    client.get_properties_many = Mock(side_effect=lambda objs, obj_type, path_set: {
+        obj: _resolve_properties(obj, obj_type, path_set) for obj in objs
+    })
     
     return client
 
@@ -184,7 +199,6 @@ def sample_command_result():
         stdout="Command executed successfully",
         stderr="",
         exit_code=0,
-        success=True,
         command="echo 'test'",
         duration=0.1
     )
@@ -339,11 +353,16 @@ tmpfs           394M     0  394M   0% /run/user/1000'''
 
 
 @pytest.fixture
-def mock_free_output():
-    """Mock free -b output"""
-    return '''              total        used        free      shared  buff/cache   available
-Mem:     4147159040   524288000  3000000000    16777216   622870000  3500000000
-Swap:    2147483648           0  2147483648           0           0  2147483648'''
+def mock_meminfo_output():
+    """Mock filtered /proc/meminfo output"""
+    return """MemTotal: 4049960
+MemFree: 2929688
+MemAvailable: 3417968
+Buffers: 102400
+Cached: 450000
+SReclaimable: 55872
+SwapTotal: 2097152
+SwapFree: 2097152"""
 
 
 @pytest.fixture
@@ -2,6 +2,7 @@
 Unit tests for base classes
 """
 
+import sys
 import pytest
 from unittest.mock import Mock, patch
 from pod.os_abstraction.base import CommandResult, NetworkInterface, NetworkConfig, BaseOSHandler
@@ -18,7 +19,6 @@ class TestCommandResult:
             stdout="output",
             stderr="error",
             exit_code=0,
-            success=True,
             command="test command",
             duration=0.5,
             data={"key": "value"}
@@ -32,13 +32,22 @@ class TestCommandResult:
         assert result.duration == 0.5
         assert result.data == {"key": "value"}
 
+    def test_ok_and_fail_factories(self):
+        """Test the success and failure shorthands"""
+        ok = CommandResult.ok("done", "cmd", 0.25)
+        fail = CommandResult.fail("boom", "cmd")
+        
+        assert ok == CommandResult(stdout="done", stderr="", exit_code=0, command="cmd", duration=0.25)
+        assert ok.success is True
+        assert fail == CommandResult(stdout="", stderr="boom", exit_code=1, command="cmd", duration=0.0)
+        assert CommandResult.fail("boom", "cmd", exit_code=124).exit_code == 124
+
     def test_init_minimal(self):
         """Test CommandResult initialization with minimal parameters"""
         result = CommandResult(
             stdout="output",
             stderr="",
             exit_code=0,
-            success=True,
             command="test",
             duration=0.1
         )
@@ -47,14 +56,23 @@ class TestCommandResult:
 
     def test_bool_success(self):
         """Test boolean conversion for successful result"""
-        result = CommandResult("", "", 0, True, "test", 0.1)
+        result = CommandResult("", "", 0, "test", 0.1)
         assert bool(result) is True
 
     def test_bool_failure(self):
         """Test boolean conversion for failed result"""
-        result = CommandResult("", "error", 1, False, "test", 0.1)
+        result = CommandResult("", "error", 1, "test", 0.1)
         assert bool(result) is False
 
+    def test_success_follows_exit_code(self):
+        """Test success is derived from the exit code rather than stored"""
+        result = CommandResult("", "", 0, "test", 0.1)
+        result.exit_code = 2
+        
+        assert result.success is False
+        if sys.version_info >= (3, 10):
+            assert not hasattr(result, "__dict__")
+
 
 class TestNetworkInterface:
     """Test cases for NetworkInterface"""
@@ -150,48 +168,57 @@ class TestNetworkConfig:
         assert config.interface == "eth0"
         assert config.dhcp is True
 
+    def test_slots(self):
+        """Test network dataclasses carry no per-instance __dict__"""
+        config = NetworkConfig(interface="eth0")
+        
+        if sys.version_info >= (3, 10):
+            assert not hasattr(config, "__dict__")
+            with pytest.raises(AttributeError):
+                config.unknown = True
+
 
 class MockOSHandler(BaseOSHandler):
     """Mock implementation of BaseOSHandler for testing"""
     
     def execute_command(self, command: str, timeout: int = 30, as_admin: bool = False):
-        return CommandResult("mock output", "", 0, True, command, 0.1)
+        return CommandResult("mock output", "", 0, command, 0.1)
     
     def get_network_interfaces(self):
         return []
     
     def configure_network(self, config):
-        return CommandResult("", "", 0, True, "configure_network", 0.1)
+        return CommandResult("", "", 0, "configure_network", 0.1)
     
     def restart_network_service(self):
-        return CommandResult("", "", 0, True, "restart_network", 0.1)
+        return CommandResult("", "", 0, "restart_network", 0.1)
     
     def get_os_info(self):
         return {"type": "mock", "distribution": "test"}
     
     def install_package(self, package_name: str):
-        return CommandResult("", "", 0, True, f"install {package_name}", 0.1)
+        return CommandResult("", "", 0, f"install {package_name}", 0.1)
     
     def start_service(self, service_name: str):
-        return CommandResult("", "", 0, True, f"start {service_name}", 0.1)
+        return CommandResult("", "", 0, f"start {service_name}", 0.1)
     
     def stop_service(self, service_name: str):
-        return CommandResult("", "", 0, True, f"stop {service_name}", 0.1)
+        return CommandResult("", "", 0, f"stop {service_name}", 0.1)
     
     def get_service_status(self, service_name: str):
-        return CommandResult("active", "", 0, True, f"status {service_name}", 0.1)
+        return CommandResult("active", "", 0, f"status {service_name}", 0.1)
     
     def create_user(self, username: str, password=None, groups=None):
-        return CommandResult("", "", 0, True, f"create_user {username}", 0.1)
+        return CommandResult("", "", 0, f"create_user {username}", 0.1)
     
     def set_hostname(self, hostname: str):
-        return CommandResult("", "", 0, True, f"set_hostname {hostname}", 0.1)
+        return CommandResult("", "", 0, f"set_hostname {hostname}", 0.1)
     
     def get_processes(self):
         return []
     
     def kill_process(self, process_id: int, signal: int = 15):
-        return CommandResult("", "", 0, True, f"kill {process_id}", 0.1)
+        return CommandResult("", "", 0, f"kill {process_id}", 0.1)
     
     def get_disk_usage(self):
         return []
@@ -212,10 +239,10 @@ class MockOSHandler(BaseOSHandler):
         return True
     
     def create_directory(self, path: str, recursive: bool = True):
-        return CommandResult("", "", 0, True, f"mkdir {path}", 0.1)
+        return CommandResult("", "", 0, f"mkdir {path}", 0.1)
     
     def remove_file(self, path: str):
-        return CommandResult("", "", 0, True, f"rm {path}", 0.1)
+        return CommandResult("", "", 0, f"rm {path}", 0.1)
     
     def list_directory(self, path: str):
         return []
@@ -17,7 +17,6 @@ class ConcreteOSHandler(BaseOSHandler):
             stdout=stdout,
             stderr=stderr,
             exit_code=code,
-            success=code == 0,
             command=command,
             duration=0.1
         )
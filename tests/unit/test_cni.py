@@ -0,0 +1,405 @@
+"""
+Unit tests for CNI management
+"""
+
+import asyncio
+import pytest
+from dataclasses import FrozenInstanceError, replace
+from unittest.mock import Mock, patch
+from pod.network import cni
+from pod.network.cni import CNIManager
+
+
+def _pod(labels):
+    """Build a mock pod carrying the given labels"""
+    pod = Mock()
+    pod.metadata.labels = labels
+    return pod
+
+
+class TestCNIManager:
+    """Test CNI plugin detection and configuration"""
+
+    @pytest.fixture(autouse=True)
+    def clear_cni_cache(self):
+        """Isolate tests from detection results cached by other tests"""
+        cni._DETECTION_CACHE.clear()
+        yield
+        cni._DETECTION_CACHE.clear()
+
+    @pytest.fixture
+    def mock_connection(self):
+        """Create mock Kubernetes connection with Calico pods present"""
+        connection = Mock()
+        connection.namespace = "default"
+        connection.api_server = None
+        connection.kubeconfig_path = "/tmp/kubeconfig"
+        connection.context = "lab"
+
+        def list_pods(label_selector, **kwargs):
+            if label_selector.startswith("k8s-app in "):
+                items = [_pod({"k8s-app": "calico-node"})]
+            else:
+                items = []
+            return Mock(items=items, metadata=Mock(_continue=None))
+
+        connection.v1.list_pod_for_all_namespaces.side_effect = list_pods
+        return connection
+
+    def test_detects_plugins(self, mock_connection):
+        """Test detection marks the plugins whose pods exist"""
+        manager = CNIManager(mock_connection)
+
+        assert manager.detected_cnis["calico"] is True
+        assert manager.detected_cnis["cilium"] is False
+        assert manager.capabilities["bgp_routing"] is True
+
+    def test_detection_deferred_until_first_access(self, mock_connection):
+        """Test building configs alone never queries the cluster"""
+        from pod.network.cni import CNIConfig
+        manager = CNIManager(mock_connection)
+        manager.create_network_attachment_definition(CNIConfig(name="br", type="bridge"))
+
+        mock_connection.v1.list_pod_for_all_namespaces.assert_not_called()
+
+        assert manager.capabilities["bgp_routing"] is True
+        calls = mock_connection.v1.list_pod_for_all_namespaces.call_count
+        assert manager.detected_cnis["calico"] is True
+        assert mock_connection.v1.list_pod_for_all_namespaces.call_count == calls
+
+    def test_detection_served_from_apiserver_cache(self, mock_connection):
+        """Test pod LISTs read the watch cache with a bounded timeout"""
+        CNIManager(mock_connection).detected_cnis
+
+        calls = mock_connection.v1.list_pod_for_all_namespaces.call_args_list
+        assert calls
+        for call in calls:
+            assert call.kwargs["resource_version"] == "0"
+            assert call.kwargs["_request_timeout"] == cni.CNI_DETECTION_TIMEOUT
+
+    def test_detection_timeout_reported_and_not_cached(self, mock_connection):
+        """Test a stalled apiserver surfaces as a detection error that is retried later"""
+        from urllib3.exceptions import ReadTimeoutError
+        mock_connection.v1.list_pod_for_all_namespaces.side_effect = ReadTimeoutError(None, None, "timed out")
+
+        detected = CNIManager(mock_connection).detected_cnis
+
+        assert "detection_errors" in detected
+        assert cni._DETECTION_CACHE == {}
+
+    def test_detection_queries_once_per_label_key(self, mock_connection):
+        """Test all marker values for a label key share one set-based selector"""
+        CNIManager(mock_connection).detected_cnis
+
+        selectors = [call.kwargs["label_selector"]
+                     for call in mock_connection.v1.list_pod_for_all_namespaces.call_args_list]
+        assert len(selectors) == len(set(selectors)) == 6
+        assert "k8s-app in (calico-node,cilium,flannel)" in selectors
+        assert "app in (antrea,flannel,multus,sriov-cni,sriov-device-plugin,weave-net)" in selectors
+
+    def test_detection_pages_until_all_values_seen(self, mock_connection):
+        """Test a key keeps paging while some of its values are unseen"""
+        pages = [
+            Mock(items=[_pod({"k8s-app": "calico-node"})], metadata=Mock(_continue="next")),
+            Mock(items=[_pod({"k8s-app": "cilium"})], metadata=Mock(_continue=None)),
+        ]
+
+        def list_pods(label_selector, _continue=None, **kwargs):
+            if label_selector.startswith("k8s-app in "):
+                return pages[1] if _continue == "next" else pages[0]
+            return Mock(items=[], metadata=Mock(_continue=None))
+
+        mock_connection.v1.list_pod_for_all_namespaces.side_effect = list_pods
+        manager = CNIManager(mock_connection)
+
+        assert manager.detected_cnis["calico"] is True
+        assert manager.detected_cnis["cilium"] is True
+        assert manager.detected_cnis["flannel"] is False
+
+    def test_detection_skips_failing_label_key(self, mock_connection):
+        """Test an API error on one key leaves the other keys detected but reported"""
+        from kubernetes.client.rest import ApiException
+        list_pods = mock_connection.v1.list_pod_for_all_namespaces.side_effect
+
+        def failing(label_selector, **kwargs):
+            if label_selector.startswith("app in "):
+                raise ApiException(status=403)
+            return list_pods(label_selector, **kwargs)
+
+        mock_connection.v1.list_pod_for_all_namespaces.side_effect = failing
+        manager = CNIManager(mock_connection)
+
+        assert manager.detected_cnis["calico"] is True
+        assert len(manager.detected_cnis["detection_errors"]) == 1
+        assert cni._DETECTION_CACHE == {}
+
+    def test_detection_ignores_invalid_selector(self, mock_connection):
+        """Test a rejected selector counts as absent without marking the scan incomplete"""
+        from kubernetes.client.rest import ApiException
+        list_pods = mock_connection.v1.list_pod_for_all_namespaces.side_effect
+
+        def failing(label_selector, **kwargs):
+            if label_selector.startswith("app in "):
+                raise ApiException(status=400)
+            return list_pods(label_selector, **kwargs)
+
+        mock_connection.v1.list_pod_for_all_namespaces.side_effect = failing
+        manager = CNIManager(mock_connection)
+
+        assert manager.detected_cnis["calico"] is True
+        assert "detection_errors" not in manager.detected_cnis
+
+    def test_unavailable_apiserver_not_cached(self, mock_connection):
+        """Test a scan failing with 503 is not reused by a later manager"""
+        from kubernetes.client.rest import ApiException
+        list_pods = mock_connection.v1.list_pod_for_all_namespaces.side_effect
+        mock_connection.v1.list_pod_for_all_namespaces.side_effect = ApiException(status=503)
+
+        detected = CNIManager(mock_connection).detected_cnis
+
+        assert detected["multus"] is False
+        assert "detection_errors" in detected
+        assert cni._DETECTION_CACHE == {}
+
+        def recovered(label_selector, **kwargs):
+            if label_selector.startswith("app in "):
+                return Mock(items=[_pod({"app": "multus"})], metadata=Mock(_continue=None))
+            return list_pods(label_selector, **kwargs)
+
+        mock_connection.v1.list_pod_for_all_namespaces.side_effect = recovered
+        assert CNIManager(mock_connection).detected_cnis["multus"] is True
+
+    def test_marker_indexes_cover_every_label(self):
+        """Test each marker label resolves to its plugin and is queried under its key"""
+        for name, markers in cni._CNI_POD_LABELS.items():
+            for key, value in markers:
+                assert cni._CNI_MARKER_INDEX[(key, value)] == name
+                assert value in cni._CNI_LABEL_VALUES[key]
+
+    def test_detection_cached_across_instances(self, mock_connection):
+        """Test a second manager for the same cluster skips the pod LISTs"""
+        first = CNIManager(mock_connection)
+        first.detected_cnis
+        calls = mock_connection.v1.list_pod_for_all_namespaces.call_count
+
+        second = CNIManager(mock_connection)
+        second.detected_cnis
+
+        assert mock_connection.v1.list_pod_for_all_namespaces.call_count == calls
+        assert second.detected_cnis == first.detected_cnis
+        assert second.detected_cnis is not first.detected_cnis
+
+    def test_detection_cache_keyed_by_cluster(self, mock_connection):
+        """Test a different context is detected separately"""
+        CNIManager(mock_connection).detected_cnis
+        calls = mock_connection.v1.list_pod_for_all_namespaces.call_count
+
+        mock_connection.context = "other"
+        CNIManager(mock_connection).detected_cnis
+
+        assert mock_connection.v1.list_pod_for_all_namespaces.call_count == 2 * calls
+
+    def test_detection_cache_expires(self, mock_connection):
+        """Test detection runs again once the TTL has passed"""
+        with patch('pod.network.cni.time.monotonic', return_value=1000.0):
+            CNIManager(mock_connection).detected_cnis
+        calls = mock_connection.v1.list_pod_for_all_namespaces.call_count
+
+        with patch('pod.network.cni.time.monotonic', return_value=1000.0 + cni.CNI_CACHE_TTL):
+            CNIManager(mock_connection).detected_cnis
+
+        assert mock_connection.v1.list_pod_for_all_namespaces.call_count == 2 * calls
+
+    def test_refresh_bypasses_cache(self, mock_connection):
+        """Test refresh forces a new scan"""
+        manager = CNIManager(mock_connection)
+        manager.detected_cnis
+        calls = mock_connection.v1.list_pod_for_all_namespaces.call_count
+
+        manager._detect_cni_plugins(refresh=True)
+
+        assert mock_connection.v1.list_pod_for_all_namespaces.call_count == 2 * calls
+
+    def test_apply_many_async(self, mock_connection):
+        """Test configurations are applied concurrently with ordered results"""
+        manager = CNIManager(mock_connection)
+        pool = manager.create_calico_ip_pool("vlan-100", "10.100.0.0/24")
+        policy = manager.create_cilium_network_policy("deny", "default", {"app": "web"})
+        unknown = {"apiVersion": "example.com/v1", "kind": "Widget"}
+
+        results = asyncio.run(manager.apply_many_async([pool, policy, unknown]))
+
+        assert results == [True, True, False]
+        custom = mock_connection.custom_objects_v1
+        assert custom.patch_cluster_custom_object.call_args.kwargs["plural"] == "ippools"
+        assert custom.patch_namespaced_custom_object.call_args.kwargs["plural"] == "ciliumnetworkpolicies"
+
+    def test_macvlan_config_from_template(self, mock_connection):
+        """Test per-call configs are independent of the shared template"""
+        from pod.network.cni import CNIConfig
+        manager = CNIManager(mock_connection)
+        static = manager._create_macvlan_config(CNIConfig(
+            name="lab", type="macvlan", vlan_id=100, subnet="10.0.0.0/24", gateway="10.0.0.1"
+        ))
+        dhcp = manager._create_macvlan_config(CNIConfig(name="dhcp", type="macvlan"))
+
+        assert list(static)[:7] == ["cniVersion", "name", "type", "master", "mode", "mtu", "ipam"]
+        assert static["ipam"]["addresses"] == [{"address": "10.0.0.0/24", "gateway": "10.0.0.1"}]
+        assert static["vlan"] == 100
+        assert dhcp["ipam"] == {"type": "dhcp"}
+        assert "vlan" not in dhcp
+        assert cni._MACVLAN_TEMPLATE["name"] is None
+
+    def test_network_attachment_dispatches_by_type(self, mock_connection):
+        """Test each supported type uses its builder and unknown types are rejected"""
+        from pod.network.cni import CNIConfig
+        manager = CNIManager(mock_connection)
+
+        for cni_type in ("macvlan", "sriov", "bridge", "ipvlan"):
+            nad = manager.create_network_attachment_definition(CNIConfig(name="net", type=cni_type))
+            assert f'"type": "{cni_type}"' in nad["spec"]["config"]
+
+        with pytest.raises(ValueError, match="Unsupported CNI type"):
+            manager.create_network_attachment_definition(CNIConfig(name="net", type="vxlan"))
+
+    def test_spec_config_cached_for_identical_configs(self, mock_connection):
+        """Test identical configs reuse the serialized spec and changes rebuild it"""
+        from pod.network.cni import CNIConfig
+        manager = CNIManager(mock_connection)
+        config = CNIConfig(name="lab", type="macvlan", subnet="10.0.0.0/24",
+                           routes=[{"dst": "0.0.0.0/0", "gw": "10.0.0.1"}])
+
+        with patch.object(CNIManager, '_CONFIG_BUILDERS',
+                          {"macvlan": Mock(wraps=CNIManager._create_macvlan_config)}) as builders:
+            first = manager.create_network_attachment_definition(config)
+            second = manager.create_network_attachment_definition(
+                CNIConfig(name="lab", type="macvlan", subnet="10.0.0.0/24",
+                          routes=[{"dst": "0.0.0.0/0", "gw": "10.0.0.1"}])
+            )
+            third = manager.create_network_attachment_definition(replace(config, mtu=9000))
+
+        assert builders["macvlan"].call_count == 2
+        assert first["spec"]["config"] == second["spec"]["config"]
+        assert '"mtu": 9000' in third["spec"]["config"]
+
+    def test_capabilities_merged_from_detected_plugins(self, mock_connection):
+        """Test capabilities and observability come from every detected plugin"""
+        manager = CNIManager(mock_connection)
+        manager.detected_cnis = {"calico": True, "cilium": True, "sriov": True, "multus": False}
+
+        capabilities = manager._analyze_capabilities()
+
+        assert capabilities["bgp_routing"] is True
+        assert capabilities["ebpf"] is True
+        assert capabilities["sr_iov"] is True
+        assert capabilities["vlan_support"] is True
+        assert capabilities["observability"] == ["calico-monitoring", "hubble", "cilium-metrics"]
+
+    def test_capabilities_default_when_nothing_detected(self, mock_connection):
+        """Test every capability is off without a supporting plugin"""
+        manager = CNIManager(mock_connection)
+        manager.detected_cnis = {"flannel": True}
+
+        capabilities = manager._analyze_capabilities()
+
+        assert capabilities["observability"] == []
+        assert not any(v for k, v in capabilities.items() if k != "observability")
+        assert cni._DEFAULT_CAPABILITIES["observability"] is None
+
+    def test_cni_config_frozen_and_hashable(self):
+        """Test configs normalise list inputs to tuples and compare by value"""
+        from pod.network.cni import CNIConfig
+        config = CNIConfig(name="lab", type="macvlan", dns_servers=["1.1.1.1"],
+                           routes=[{"dst": "0.0.0.0/0", "gw": "10.0.0.1"}])
+
+        assert config.dns_servers == ("1.1.1.1",)
+        assert config.routes == ((("dst", "0.0.0.0/0"), ("gw", "10.0.0.1")),)
+        assert hash(config) == hash(CNIConfig(name="lab", type="macvlan", dns_servers=("1.1.1.1",),
+                                              routes=[{"dst": "0.0.0.0/0", "gw": "10.0.0.1"}]))
+        assert CNIConfig(name="x", type="bridge", dns_servers=None).dns_servers == ("8.8.8.8", "8.8.4.4")
+        with pytest.raises(FrozenInstanceError):
+            config.mtu = 9000
+
+    def test_apply_network_configuration_routes(self, mock_connection):
+        """Test each supported kind is server-side applied to its API"""
+        manager = CNIManager(mock_connection)
+        nad = manager.create_network_attachment_definition(cni.CNIConfig(name="br", type="bridge"))
+        bgp = manager.create_calico_bgp_configuration(64512, "10.0.0.1")
+        cluster_policy = manager.create_cilium_cluster_wide_policy("deny-all", {"role": "edge"})
+        network_policy = {"apiVersion": "networking.k8s.io/v1", "kind": "NetworkPolicy",
+                          "metadata": {"name": "deny", "namespace": "default"}}
+        unknown_calico = {"apiVersion": "projectcalico.org/v3", "kind": "FelixConfiguration"}
+
+        assert manager.apply_network_configuration(nad) is True
+        assert manager.apply_network_configuration(bgp) is True
+        assert manager.apply_network_configuration(cluster_policy) is True
+        assert manager.apply_network_configuration(network_policy) is True
+        assert manager.apply_network_configuration(unknown_calico) is False
+
+        apply_options = dict(field_manager="pod-lib", force=True,
+                             _content_type="application/apply-patch+yaml")
+        custom = mock_connection.custom_objects_v1
+        custom.patch_namespaced_custom_object.assert_called_once_with(
+            group="k8s.cni.cncf.io", version="v1", namespace="default",
+            plural="network-attachment-definitions", name="br", body=nad, **apply_options
+        )
+        assert [(c.kwargs["plural"], c.kwargs["name"])
+                for c in custom.patch_cluster_custom_object.call_args_list] == [
+            ("bgpconfigurations", "default"), ("ciliumclusterwidenetworkpolicies", "deny-all")
+        ]
+        mock_connection.networking_v1.patch_namespaced_network_policy.assert_called_once_with(
+            name="deny", namespace="default", body=network_policy, **apply_options
+        )
+        custom.create_namespaced_custom_object.assert_not_called()
+        custom.create_cluster_custom_object.assert_not_called()
+
+    def test_apply_network_configuration_api_error(self, mock_connection):
+        """Test a rejected apply is reported as failure"""
+        from kubernetes.client.rest import ApiException
+        manager = CNIManager(mock_connection)
+        mock_connection.custom_objects_v1.patch_cluster_custom_object.side_effect = ApiException(status=422)
+
+        assert manager.apply_network_configuration(manager.create_calico_ip_pool("p", "10.0.0.0/24")) is False
+
+    def test_create_many_network_attachment_definitions(self, mock_connection):
+        """Test every NAD is applied and results keep input order"""
+        manager = CNIManager(mock_connection)
+        configs = [cni.CNIConfig(name=f"vlan-{vlan}", type="macvlan", vlan_id=vlan) for vlan in (100, 200, 300)]
+
+        def apply(**kwargs):
+            if kwargs["name"] == "vlan-200":
+                raise RuntimeError("apiserver unavailable")
+
+        mock_connection.custom_objects_v1.patch_namespaced_custom_object.side_effect = apply
+
+        results = manager.create_many_network_attachment_definitions(configs, workers=2)
+
+        assert results == [True, False, True]
+        applied = {c.kwargs["name"] for c in mock_connection.custom_objects_v1.patch_namespaced_custom_object.call_args_list}
+        assert applied == {"vlan-100", "vlan-200", "vlan-300"}
+        assert manager.create_many_network_attachment_definitions([]) == []
+
+    def test_build_cni_config_returns_dict(self, mock_connection):
+        """Test the plugin config is available without serializing a NAD"""
+        manager = CNIManager(mock_connection)
+
+        config = manager.build_cni_config(cni.CNIConfig(name="lab", type="ipvlan", mtu=9000))
+
+        assert config["type"] == "ipvlan"
+        assert config["mtu"] == 9000
+        with pytest.raises(ValueError):
+            manager.build_cni_config(cni.CNIConfig(name="lab", type="vxlan"))
+
+    def test_apply_encodes_dict_nad_config(self, mock_connection):
+        """Test a NAD carrying a dict config is sent with the JSON string Multus expects"""
+        import json
+        manager = CNIManager(mock_connection)
+        plugin_config = manager.build_cni_config(cni.CNIConfig(name="br", type="bridge"))
+        nad = {"apiVersion": "k8s.cni.cncf.io/v1", "kind": "NetworkAttachmentDefinition",
+               "metadata": {"name": "br", "namespace": "default"}, "spec": {"config": plugin_config}}
+
+        assert manager.apply_network_configuration(nad) is True
+
+        body = mock_connection.custom_objects_v1.patch_namespaced_custom_object.call_args.kwargs["body"]
+        assert json.loads(body["spec"]["config"]) == plugin_config
+        assert nad["spec"]["config"] is plugin_config
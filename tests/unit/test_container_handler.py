@@ -4,13 +4,30 @@ Unit tests for Container OS handler
 
 import pytest
 import json
+import asyncio
+import os
+import stat
+import shutil
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, patch, MagicMock, call
 from pod.os_abstraction.container import ContainerHandler, ContainerConnection
 from pod.os_abstraction.base import NetworkConfig, CommandResult
 from pod.connections.container import DockerConnection
 
 
+def _as_text(command):
+    """Render an executed command (shell string or argv list) as text"""
+    return command if isinstance(command, str) else " ".join(command)
+
+
+def _executed(connection):
+    """Commands and scripts sent to a mocked container connection, in call order"""
+    calls = connection.method_calls
+    return [_as_text(c[1][0]) for c in calls if c[0] in ("execute_command", "execute_script")]
+
+
 class TestContainerConnection:
     """Test container connection functionality"""
     
@@ -38,6 +55,62 @@ class TestContainerConnection:
         called_args = mock_run.call_args[0][0]
         assert called_args == ["docker", "inspect", "test-container"]
     
+    @patch('subprocess.run')
+    def test_connect_caches_inspect_document(self, mock_run, container_connection):
+        """Test the inspect fetched by connect is reused until refresh"""
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout=json.dumps([{"Id": "abc123", "State": {"Running": True}}])
+        )
+        
+        container_connection.connect()
+        
+        assert container_connection.inspect()["Id"] == "abc123"
+        assert mock_run.call_count == 1
+        container_connection.inspect(refresh=True)
+        assert mock_run.call_count == 2
+    
+    @patch('subprocess.run')
+    def test_summary_uses_format_template(self, mock_run, container_connection):
+        """Test summary requests only its fields when nothing is cached"""
+        networks = {"bridge": {"IPAddress": "172.17.0.2"}}
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout="\x1f".join(["abc123", "rocky:9", "2023-01-01", "running", json.dumps(networks)]) + "\n"
+        )
+        
+        summary = container_connection.summary()
+        
+        assert summary == {'id': "abc123", 'image': "rocky:9", 'created': "2023-01-01",
+                           'status': "running", 'networks': networks}
+        args = mock_run.call_args[0][0]
+        assert args[:3] == ["docker", "inspect", "--format"]
+        assert "{{json .NetworkSettings.Networks}}" in args[3]
+    
+    @patch('subprocess.run')
+    def test_summary_reuses_cached_inspect(self, mock_run, container_connection):
+        """Test summary reads the document cached by connect"""
+        mock_run.return_value = MagicMock(returncode=0, stdout=json.dumps([{
+            "Id": "abc123", "Config": {"Image": "alpine"}, "Created": "now",
+            "State": {"Running": True, "Status": "running"},
+            "NetworkSettings": {"Networks": None}
+        }]))
+        container_connection.connect()
+        
+        summary = container_connection.summary()
+        
+        assert summary['image'] == "alpine"
+        assert summary['networks'] == {}
+        assert mock_run.call_count == 1
+    
+    @patch('subprocess.run')
+    def test_connect_missing_container(self, mock_run, container_connection):
+        """Test a failed inspect surfaces as a connection error"""
+        mock_run.return_value = MagicMock(returncode=1, stdout="", stderr="No such object")
+        
+        with pytest.raises(ConnectionError, match="Container not found"):
+            container_connection.connect()
+    
     @patch('subprocess.run')
     def test_connect_stopped_container(self, mock_run, container_connection):
         """Test connecting to a stopped container (should start it)"""
@@ -77,6 +150,81 @@ class TestContainerConnection:
         exec_call_args = mock_run.call_args[0][0]
         assert exec_call_args == ["docker", "exec", "test-container", "/bin/bash", "-c", "ls -la"]
     
+    @patch('subprocess.run')
+    def test_execute_argv_skips_shell(self, mock_run, container_connection):
+        """Test argv commands are exec'd without /bin/bash -c"""
+        container_connection._connected = True
+        mock_run.side_effect = [
+            MagicMock(returncode=0, stdout="true"),
+            MagicMock(returncode=0, stdout="", stderr="")
+        ]
+        
+        container_connection.execute_command(["ip", "link", "set", "eth0.100", "up"])
+        
+        inspect_args = mock_run.call_args_list[0][0][0]
+        assert inspect_args == ["docker", "inspect", "--format", "{{.State.Running}}", "test-container"]
+        exec_args = mock_run.call_args[0][0]
+        assert exec_args == ["docker", "exec", "test-container", "ip", "link", "set", "eth0.100", "up"]
+        assert all("shell" not in c.kwargs for c in mock_run.call_args_list)
+    
+    @patch('subprocess.run')
+    def test_execute_script_pipes_stdin(self, mock_run, container_connection):
+        """Test scripts run in one interactive exec with the script on stdin"""
+        container_connection._connected = True
+        mock_run.side_effect = [
+            MagicMock(returncode=0, stdout="true"),
+            MagicMock(returncode=0, stdout="", stderr="")
+        ]
+        
+        container_connection.execute_script("set -e\nip link show\n")
+        
+        assert mock_run.call_args[0][0] == ["docker", "exec", "-i", "test-container", "/bin/bash", "-s"]
+        assert mock_run.call_args.kwargs["input"] == "set -e\nip link show\n"
+    
+    @patch('subprocess.run')
+    def test_is_connected_cached_within_ttl(self, mock_run, container_connection):
+        """Test back-to-back execs reuse one running check"""
+        container_connection._connected = True
+        mock_run.side_effect = [
+            MagicMock(returncode=0, stdout="true"),
+            MagicMock(returncode=0, stdout="", stderr=""),
+            MagicMock(returncode=0, stdout="", stderr=""),
+        ]
+        
+        container_connection.execute_command("true")
+        container_connection.execute_command("true")
+        
+        assert mock_run.call_count == 3
+        assert mock_run.call_args_list[0][0][0][1] == "inspect"
+    
+    @patch('subprocess.run')
+    def test_exit_125_invalidates_connection_check(self, mock_run, container_connection):
+        """Test a runtime exec failure forces the next call to re-inspect"""
+        container_connection._connected = True
+        mock_run.side_effect = [
+            MagicMock(returncode=0, stdout="true"),
+            MagicMock(returncode=125, stdout="", stderr="container is not running"),
+            MagicMock(returncode=0, stdout="false"),
+        ]
+        
+        _, _, code = container_connection.execute_command("true")
+        
+        assert code == 125
+        assert container_connection.is_connected() is False
+        assert mock_run.call_count == 3
+    
+    @patch('subprocess.run')
+    def test_concurrent_is_connected_shares_one_inspect(self, mock_run, container_connection):
+        """Test threads racing on is_connected trigger a single inspect"""
+        container_connection._connected = True
+        mock_run.return_value = MagicMock(returncode=0, stdout="true")
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            states = list(executor.map(lambda _: container_connection.is_connected(), range(16)))
+        
+        assert all(states)
+        assert mock_run.call_count == 1
+    
     @patch('subprocess.run')
     def test_upload_file(self, mock_run, container_connection):
         """Test file upload to container"""
@@ -89,10 +237,145 @@ class TestContainerConnection:
         cp_call_args = mock_run.call_args[0][0]
         assert cp_call_args == ["docker", "cp", "/local/file.txt", "test-container:/container/file.txt"]
     
+    @patch('subprocess.run')
+    def test_copy_discards_stdout(self, mock_run, container_connection):
+        """Test cp does not pipe stdout back and reports failure by exit code"""
+        mock_run.return_value = MagicMock(returncode=1, stderr="no such container")
+        
+        assert container_connection.upload_file("/local/file.txt", "/container/file.txt") is False
+        assert mock_run.call_args.kwargs["stdout"] is subprocess.DEVNULL
+        assert mock_run.call_args.kwargs["stderr"] is subprocess.PIPE
+    
+    @patch('subprocess.run')
+    def test_execute_without_capture(self, mock_run, container_connection):
+        """Test capture=False discards stdout"""
+        container_connection._connected = True
+        mock_run.side_effect = [
+            MagicMock(returncode=0, stdout="true"),
+            MagicMock(returncode=0, stdout=None, stderr="")
+        ]
+        
+        assert container_connection.execute_command("true", capture=False) == ("", "", 0)
+        assert mock_run.call_args.kwargs["stdout"] is subprocess.DEVNULL
+    
+    @patch('subprocess.run')
+    def test_download_file(self, mock_run, container_connection):
+        """Test file download from container"""
+        mock_run.return_value = MagicMock(returncode=0)
+        
+        assert container_connection.download_file("/container/file.txt", "/local/file.txt") is True
+        assert mock_run.call_args[0][0] == ["docker", "cp", "test-container:/container/file.txt", "/local/file.txt"]
+    
+    def test_slots(self, container_connection):
+        """Test connections carry no __dict__ but stay weak-referenceable"""
+        import weakref
+        
+        assert not hasattr(container_connection, "__dict__")
+        assert weakref.ref(container_connection)() is container_connection
+        with pytest.raises(AttributeError):
+            container_connection.unknown = True
+    
     def test_podman_support(self):
         """Test using podman instead of docker"""
         conn = ContainerConnection("test-container", use_docker=False)
         assert conn.command_prefix == "podman"
+        assert conn._bash_exec_prefix == ["podman", "exec", "test-container", "/bin/bash", "-c"]
+
+
+@pytest.mark.skipif(shutil.which("bash") is None, reason="needs a local bash")
+class TestContainerPersistentShell:
+    """Test command framing over a persistent exec session"""
+    
+    @pytest.fixture
+    def shell_connection(self):
+        """Connection whose persistent session is a local bash process"""
+        conn = ContainerConnection("test-container", persistent_shell=True)
+        conn._connected = True
+        conn._last_check_ts = float("inf")
+        conn._shell = subprocess.Popen(
+            ["bash"], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE, bufsize=0
+        )
+        yield conn
+        conn.disconnect()
+    
+    @patch('subprocess.Popen')
+    @patch('subprocess.run')
+    def test_connect_opens_session(self, mock_run, mock_popen):
+        """Test connect starts one interactive bash exec"""
+        mock_run.return_value = MagicMock(returncode=0, stdout=json.dumps([{"State": {"Running": True}}]))
+        conn = ContainerConnection("test-container", persistent_shell=True)
+        
+        conn.connect()
+        
+        assert mock_popen.call_args[0][0] == ["docker", "exec", "-i", "test-container", "/bin/bash"]
+    
+    def test_streams_and_exit_code_framed(self, shell_connection):
+        """Test stdout, stderr and exit code are split per command"""
+        assert shell_connection.execute_command("printf out; echo err >&2; exit 3") == ("out", "err\n", 3)
+        assert shell_connection.execute_command(["echo", "a b"]) == ("a b\n", "", 0)
+    
+    def test_commands_do_not_leak_state(self, shell_connection):
+        """Test cd and stdin readers stay inside their own subshell"""
+        start, _, _ = shell_connection.execute_command("pwd")
+        shell_connection.execute_command("cd / && cat")
+        
+        assert shell_connection.execute_command("pwd")[0] == start
+    
+    def test_timeout_drops_session(self, shell_connection):
+        """Test a timed out command closes the session"""
+        stdout, stderr, code = shell_connection.execute_command("sleep 5", timeout=0.2)
+        
+        assert code == 124
+        assert shell_connection._shell is None
+    
+    @patch('subprocess.run')
+    def test_dead_session_falls_back_to_exec(self, mock_run, shell_connection):
+        """Test commands use a regular exec once the session has exited"""
+        shell_connection._shell.kill()
+        shell_connection._shell.wait()
+        mock_run.return_value = MagicMock(returncode=0, stdout="ok", stderr="")
+        
+        assert shell_connection.execute_command("true") == ("ok", "", 0)
+        assert mock_run.call_args[0][0][:3] == ["docker", "exec", "test-container"]
+
+
+@pytest.mark.skipif(shutil.which("bash") is None, reason="needs a local bash")
+class TestContainerAsyncExec:
+    """Test the asyncio exec driver against a local bash standing in for the runtime"""
+    
+    @pytest.fixture
+    def local_connection(self):
+        """Connection whose exec argv templates run bash on the host"""
+        conn = ContainerConnection("test-container")
+        conn._connected = True
+        conn._last_check_ts = float("inf")
+        conn._bash_exec_prefix = ["bash", "-c"]
+        conn._script_exec_cmd = ["bash", "-s"]
+        return conn
+    
+    def test_aexecute_command(self, local_connection):
+        """Test stdout, stderr and exit code come back from the subprocess"""
+        result = asyncio.run(local_connection.aexecute_command("echo out; echo err >&2; exit 4"))
+        
+        assert result == ("out\n", "err\n", 4)
+    
+    def test_aexecute_script_pipes_stdin(self, local_connection):
+        """Test scripts are fed on stdin"""
+        result = asyncio.run(local_connection.aexecute_script("set -e\necho one\necho two\n"))
+        
+        assert result == ("one\ntwo\n", "", 0)
+    
+    def test_aexecute_timeout(self, local_connection):
+        """Test a slow command is killed and reported like the sync path"""
+        result = asyncio.run(local_connection.aexecute_command("sleep 5", timeout=0.2))
+        
+        assert result == ("", "Command timed out after 0.2 seconds", 124)
+    
+    def test_requires_connection(self):
+        """Test the async path checks the connection first"""
+        with pytest.raises(ConnectionError):
+            asyncio.run(ContainerConnection("test-container").aexecute_command("true"))
 
 
 class TestContainerHandler:
@@ -103,6 +386,7 @@ class TestContainerHandler:
         """Create a mock container connection"""
         mock = Mock(spec=ContainerConnection)
         mock.execute_command.return_value = ("", "", 0)
+        mock.execute_script.return_value = ("", "", 0)
         mock.upload_file.return_value = True
         mock.download_file.return_value = True
         mock.container_id = "test-container"
@@ -132,18 +416,95 @@ class TestContainerHandler:
         assert result.success is True
         
         # Check that VLAN commands were executed
-        calls = mock_container_connection.execute_command.call_args_list
-        commands = [call[0][0] for call in calls]
+        commands = _executed(mock_container_connection)
         
         # Should load 8021q module
         assert any("modprobe 8021q" in cmd for cmd in commands)
         
         # Should create VLAN interface
-        assert any("ip link add link eth0 name eth0.100 type vlan id 100" in cmd for cmd in commands)
+        assert any("link add link eth0 name eth0.100 type vlan id 100" in cmd for cmd in commands)
         
         # Should configure IP
         assert any("192.168.100.10" in cmd for cmd in commands)
     
+    def test_vlan_setup_runs_as_one_script(self, container_handler, mock_container_connection):
+        """Test VLAN setup is batched into a single set -e exec"""
+        config = NetworkConfig(interface="eth0", ip_address="10.0.0.5", vlan_id=7)
+        
+        result = container_handler.configure_network(config)
+        
+        assert result.success is True
+        mock_container_connection.execute_command.assert_not_called()
+        mock_container_connection.execute_script.assert_called_once()
+        script = mock_container_connection.execute_script.call_args[0][0]
+        assert script.startswith("set -e\n")
+        assert ("ip -batch - <<'IPBATCH'\n"
+                "link add link eth0 name eth0.7 type vlan id 7\n"
+                "link set eth0.7 up\n"
+                "addr add 10.0.0.5/24 dev eth0.7\n"
+                "IPBATCH\n") in script
+        
+    def test_vlan_routes_outside_ip_batch(self, container_handler, mock_container_connection):
+        """Test gateway routes run after the batch and DHCP skips the address"""
+        container_handler.configure_network(
+            NetworkConfig(interface="eth0", ip_address="10.0.0.5", gateway="10.0.0.1", vlan_id=7)
+        )
+        script = mock_container_connection.execute_script.call_args[0][0]
+        assert script.endswith("IPBATCH\nip route del default 2>/dev/null || true\n"
+                               "ip route add default via 10.0.0.1 dev eth0.7\n")
+        
+        container_handler.configure_network(NetworkConfig(interface="eth0", dhcp=True, vlan_id=8))
+        script = mock_container_connection.execute_script.call_args[0][0]
+        assert "addr add" not in script
+        assert script.endswith("link set eth0.8 up\nIPBATCH\n")
+        
+    def test_argv_command_recorded_as_text(self, container_handler, mock_container_connection):
+        """Test argv commands are passed through and recorded shell-quoted"""
+        result = container_handler.execute_command(["ip", "addr", "add", "10.0.0.5/24", "dev", "eth0.7"],
+                                                   as_admin=True)
+        
+        mock_container_connection.execute_command.assert_called_once_with(
+            ["sudo", "ip", "addr", "add", "10.0.0.5/24", "dev", "eth0.7"], timeout=30
+        )
+        assert result.command == "sudo ip addr add 10.0.0.5/24 dev eth0.7"
+        
+    def test_veth_pair_script_uses_sudo(self, container_handler, mock_container_connection):
+        """Test admin scripts prefix each command with sudo"""
+        container_handler.add_veth_pair("veth0", "veth1")
+        
+        script = mock_container_connection.execute_script.call_args[0][0]
+        assert script == "set -e\nsudo ip link add veth0 type veth peer name veth1\n"
+        
+    @patch('subprocess.run')
+    def test_nsenter_runs_script_on_host(self, mock_run, mock_container_connection):
+        """Test use_nsenter resolves the pid once and bypasses the runtime exec"""
+        handler = ContainerHandler(mock_container_connection, use_nsenter=True)
+        mock_run.side_effect = [
+            MagicMock(returncode=0, stdout="4242\n", stderr=""),
+            MagicMock(returncode=0, stdout="", stderr=""),
+            MagicMock(returncode=0, stdout="", stderr=""),
+        ]
+        
+        handler.add_veth_pair("veth0", "veth1")
+        result = handler.create_macvlan_interface("mv0", "eth0")
+        
+        assert result.success is True
+        mock_container_connection.execute_script.assert_not_called()
+        assert mock_run.call_args_list[0][0][0] == ["docker", "inspect", "--format", "{{.State.Pid}}", "test-container"]
+        assert mock_run.call_args[0][0] == ["nsenter", "-t", "4242", "-n", "-m", "--", "/bin/sh", "-s"]
+        assert "ip link add mv0 link eth0 type macvlan mode bridge" in mock_run.call_args.kwargs["input"]
+        assert "sudo" not in mock_run.call_args_list[1].kwargs["input"]
+    
+    @patch('subprocess.run')
+    def test_nsenter_falls_back_without_pid(self, mock_run, mock_container_connection):
+        """Test a stopped container (pid 0) keeps using the runtime exec"""
+        handler = ContainerHandler(mock_container_connection, use_nsenter=True)
+        mock_run.return_value = MagicMock(returncode=0, stdout="0\n", stderr="")
+        
+        handler.add_veth_pair("veth0", "veth1")
+        
+        mock_container_connection.execute_script.assert_called_once()
+    
     def test_configure_network_without_vlan(self, container_handler, mock_container_connection):
         """Test standard network configuration without VLAN"""
         config = NetworkConfig(
@@ -156,8 +517,7 @@ class TestContainerHandler:
         result = container_handler.configure_network(config)
         
         # Should use standard Linux network configuration
-        calls = mock_container_connection.execute_command.call_args_list
-        commands = [call[0][0] for call in calls]
+        commands = _executed(mock_container_connection)
         
         # Should NOT create VLAN interface
         assert not any("type vlan" in cmd for cmd in commands)
@@ -166,8 +526,7 @@ class TestContainerHandler:
         """Test creating VLAN bridge"""
         result = container_handler.create_vlan_bridge("br100", 100, "eth0")
         
-        calls = mock_container_connection.execute_command.call_args_list
-        commands = [call[0][0] for call in calls]
+        commands = _executed(mock_container_connection)
         
         # Should create bridge
         assert any("brctl addbr br100" in cmd for cmd in commands)
@@ -182,8 +541,7 @@ class TestContainerHandler:
         """Test creating veth pair"""
         result = container_handler.add_veth_pair("veth0", "veth1", "br0")
         
-        calls = mock_container_connection.execute_command.call_args_list
-        commands = [call[0][0] for call in calls]
+        commands = _executed(mock_container_connection)
         
         # Should create veth pair
         assert any("ip link add veth0 type veth peer name veth1" in cmd for cmd in commands)
@@ -191,33 +549,25 @@ class TestContainerHandler:
         # Should add to bridge
         assert any("brctl addif br0 veth0" in cmd for cmd in commands)
     
-    @patch('subprocess.run')
-    def test_get_container_info(self, mock_run, container_handler, mock_container_connection):
+    def test_get_container_info(self, container_handler, mock_container_connection):
         """Test getting container information"""
         mock_container_connection.container_id = "test-container"
         mock_container_connection.command_prefix = "docker"
         
-        container_info = {
-            "Id": "abc123def456789",
-            "Config": {"Image": "rocky:9"},
-            "Created": "2023-01-01T10:00:00Z",
-            "State": {"Status": "running"},
-            "NetworkSettings": {
-                "Networks": {
-                    "bridge": {
-                        "IPAddress": "172.17.0.2",
-                        "Gateway": "172.17.0.1",
-                        "MacAddress": "02:42:ac:11:00:02"
-                    }
+        mock_container_connection.summary.return_value = {
+            'id': "abc123def456789",
+            'image': "rocky:9",
+            'created': "2023-01-01T10:00:00Z",
+            'status': "running",
+            'networks': {
+                "bridge": {
+                    "IPAddress": "172.17.0.2",
+                    "Gateway": "172.17.0.1",
+                    "MacAddress": "02:42:ac:11:00:02"
                 }
             }
         }
         
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout=json.dumps([container_info])
-        )
-        
         info = container_handler.get_container_info()
         
         assert info['container_id'] == "abc123def456"
@@ -225,6 +575,15 @@ class TestContainerHandler:
         assert info['status'] == "running"
         assert len(info['networks']) == 1
         assert info['networks'][0]['ip_address'] == "172.17.0.2"
+        
+    def test_get_container_info_missing_container(self, container_handler, mock_container_connection):
+        """Test inspect failures leave the info fields empty"""
+        mock_container_connection.summary.side_effect = ConnectionError("Container not found")
+        
+        info = container_handler.get_container_info()
+        
+        assert info['container_id'] == ''
+        assert info['networks'] == []
     
     def test_get_os_info(self, container_handler, mock_container_connection):
         """Test getting OS info includes container info"""
@@ -269,20 +628,56 @@ class TestContainerHandler:
         assert all(r.success for r in results)
         
         # Check both VLANs were configured
-        calls = mock_container_connection.execute_command.call_args_list
-        commands = [call[0][0] for call in calls]
+        commands = _executed(mock_container_connection)
         
         assert any("eth0.100" in cmd for cmd in commands)
         assert any("eth0.200" in cmd for cmd in commands)
         assert any("192.168.100.10" in cmd for cmd in commands)
         assert any("192.168.200.10" in cmd for cmd in commands)
     
+    def test_configure_container_networking_keeps_order(self, container_handler, mock_container_connection):
+        """Test concurrent VLAN setup returns results in input order"""
+        def slow_first(script, timeout=60):
+            if "eth0.100" in script:
+                time.sleep(0.05)
+                return "", "vlan 100 failed", 1
+            return "", "", 0
+        mock_container_connection.execute_script.side_effect = slow_first
+        
+        results = container_handler.configure_container_networking([
+            {'vlan_id': 100, 'ip_address': '192.168.100.10'},
+            {'vlan_id': 200, 'ip_address': '192.168.200.10'},
+        ])
+        
+        assert [r.success for r in results] == [False, True]
+        assert results[0].stderr == "vlan 100 failed"
+        
+    def test_aconfigure_container_networking(self, container_handler, mock_container_connection):
+        """Test the async variant runs one script per VLAN and keeps order"""
+        mock_container_connection.aexecute_command.return_value = ("", "", 0)
+        mock_container_connection.aexecute_script.side_effect = [("", "", 0), ("", "denied", 1)]
+        
+        results = asyncio.run(container_handler.aconfigure_container_networking([
+            {'vlan_id': 100, 'ip_address': '192.168.100.10'},
+            {'vlan_id': 200, 'ip_address': '192.168.200.10'},
+        ]))
+        
+        assert [r.success for r in results] == [True, False]
+        assert results[0].stdout == "VLAN 100 configured on eth0"
+        mock_container_connection.aexecute_command.assert_awaited_once_with("sudo modprobe 8021q")
+        scripts = [c[0][0] for c in mock_container_connection.aexecute_script.call_args_list]
+        assert "addr add 192.168.100.10/24 dev eth0.100" in scripts[0]
+        mock_container_connection.execute_script.assert_not_called()
+    
+    def test_configure_container_networking_empty(self, container_handler):
+        """Test an empty VLAN list yields no results"""
+        assert container_handler.configure_container_networking([]) == []
+        
     def test_create_macvlan_interface(self, container_handler, mock_container_connection):
         """Test creating MACVLAN interface"""
         result = container_handler.create_macvlan_interface("macvlan0", "eth0", vlan_id=100)
         
-        calls = mock_container_connection.execute_command.call_args_list
-        commands = [call[0][0] for call in calls]
+        commands = _executed(mock_container_connection)
         
         # Should create VLAN interface first
         assert any("eth0.100 type vlan id 100" in cmd for cmd in commands)
@@ -300,20 +695,47 @@ class TestContainerHandler:
             vlan_id=100
         )
         
+        uploaded = {}
+        def capture_upload(local_path, remote_path):
+            with open(local_path) as f:
+                uploaded[remote_path] = f.read()
+            return True
+        mock_container_connection.upload_file.side_effect = capture_upload
+        
         result = container_handler.configure_network(config)
         
-        calls = mock_container_connection.execute_command.call_args_list
-        commands = [call[0][0] for call in calls]
+        # Should configure DNS by copying a file, not through the shell
+        assert result.success is True
+        assert uploaded == {"/etc/resolv.conf": "nameserver 8.8.8.8\nnameserver 8.8.4.4\n"}
+        assert not any("resolv.conf" in cmd for cmd in _executed(mock_container_connection))
+        local_path = mock_container_connection.upload_file.call_args[0][0]
+        assert not os.path.exists(local_path)
+    
+    def test_dns_file_uploaded_world_readable(self, container_handler, mock_container_connection):
+        """Test the copied resolv.conf stays readable by non-root processes"""
+        modes = []
+        mock_container_connection.upload_file.side_effect = (
+            lambda local_path, remote_path: modes.append(stat.S_IMODE(os.stat(local_path).st_mode)) or True
+        )
         
-        # Should configure DNS
-        assert any("nameserver 8.8.8.8" in cmd for cmd in commands)
-        assert any("nameserver 8.8.4.4" in cmd for cmd in commands)
+        assert container_handler._write_resolv_conf(["8.8.8.8"]) is True
+        assert modes == [0o644]
+    
+    def test_dns_falls_back_to_shell_write(self, container_handler, mock_container_connection):
+        """Test resolv.conf is written in place when the copy is refused"""
+        mock_container_connection.upload_file.return_value = False
+        config = NetworkConfig(interface="eth0", ip_address="10.0.0.5", vlan_id=7,
+                               dns_servers=["1.1.1.1"])
+        
+        container_handler.configure_network(config)
+        
+        assert _executed(mock_container_connection)[-1] == "printf %s 'nameserver 1.1.1.1\n' > /etc/resolv.conf"
     
     def test_inherited_linux_functionality(self, container_handler, mock_container_connection):
         """Test that container handler inherits Linux functionality"""
         # Test package installation (container handler overrides install_package)
         mock_container_connection.execute_command.side_effect = [
-            ("", "", 0),  # which apt-get
+            ("apt-get\n", "", 0),  # package manager probe
             ("Package installed", "", 0)  # apt-get update && install
         ]
         
@@ -324,6 +746,30 @@ class TestContainerHandler:
         calls = mock_container_connection.execute_command.call_args_list
         assert any("apt-get" in str(call) for call in calls)
     
+    def test_package_manager_detected_once(self, container_handler, mock_container_connection):
+        """Test the package manager probe runs once per handler"""
+        mock_container_connection.execute_command.side_effect = [
+            ("dnf\n", "", 0),
+            ("", "", 0),
+            ("", "", 0),
+        ]
+        
+        container_handler.install_package("tcpdump")
+        container_handler.install_package("iproute")
+        
+        commands = _executed(mock_container_connection)
+        assert len(commands) == 3
+        assert commands[0] == "for m in apt-get dnf yum zypper pacman; do command -v $m && break; done"
+        assert commands[1:] == ["dnf install -y tcpdump", "dnf install -y iproute"]
+    
+    def test_no_package_manager(self, container_handler, mock_container_connection):
+        """Test installs fail cleanly when no manager is found"""
+        result = container_handler.install_package("tcpdump")
+        
+        assert result.success is False
+        assert result.stderr == "No supported package manager found"
+        assert container_handler._pkg_manager is None
+    
     def test_error_handling(self, container_handler, mock_container_connection):
         """Test error handling in VLAN configuration"""
         config = NetworkConfig(
@@ -333,14 +779,11 @@ class TestContainerHandler:
             vlan_id=100
         )
         
-        # Make VLAN creation fail
-        mock_container_connection.execute_command.side_effect = [
-            ("", "", 0),  # modprobe succeeds
-            ("", "", 0),  # delete existing interface
-            ("", "Error: Permission denied", 1),  # create VLAN fails
-        ]
+        # Make VLAN creation fail partway through the script
+        mock_container_connection.execute_script.return_value = ("", "Error: Permission denied", 1)
         
         result = container_handler.configure_network(config)
         
         assert result.success is False
-        assert result.exit_code == 1
\ No newline at end of file
+        assert result.exit_code == 1
+        assert result.stderr == "Error: Permission denied"
\ No newline at end of file
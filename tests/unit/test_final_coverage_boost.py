@@ -147,7 +147,6 @@ class TestOSAbstractionBaseFinal:
             stdout="output",
             stderr="",
             exit_code=0,
-            success=True,
             command="test",
             duration=0.1
         )
@@ -158,7 +157,6 @@ class TestOSAbstractionBaseFinal:
             stdout="",
             stderr="error",
             exit_code=1,
-            success=False,
             command="test",
             duration=0.1
         )
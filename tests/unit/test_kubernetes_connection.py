@@ -128,6 +128,146 @@ class TestKubernetesConnection:
                 with pytest.raises(ConnectionError, match="Kubernetes authentication failed"):
                     k8s_connection.connect()
     
+    @patch('pod.connections.kubernetes.client.ApiClient')
+    def test_api_client_shared_and_pooled(self, mock_api_client, k8s_connection):
+        """Test connections with the same credentials share one sized pool"""
+        from pod.connections import kubernetes as k8s_module
+        k8s_module._API_CLIENTS.clear()
+        other = KubernetesConnection(kubeconfig_path="/mock/kubeconfig")
+        
+        k8s_connection._initialize_clients()
+        other._initialize_clients()
+        
+        mock_api_client.assert_called_once()
+        configuration = mock_api_client.call_args.args[0]
+        assert configuration.connection_pool_maxsize >= 64
+        assert k8s_connection.api_client is other.api_client
+        assert k8s_connection.v1.api_client is mock_api_client.return_value
+        k8s_module._API_CLIENTS.clear()
+    
+    @patch('pod.connections.kubernetes.client.ApiClient')
+    def test_api_client_keyed_by_credentials(self, mock_api_client, k8s_connection):
+        """Test different credentials get separate API clients"""
+        from pod.connections import kubernetes as k8s_module
+        k8s_module._API_CLIENTS.clear()
+        mock_api_client.side_effect = lambda configuration: Mock()
+        
+        with patch('pod.connections.kubernetes.client.Configuration.get_default_copy') as mock_copy:
+            mock_copy.side_effect = [
+                Mock(host="https://a:6443", api_key={"authorization": "Bearer a"}),
+                Mock(host="https://b:6443", api_key={"authorization": "Bearer b"}),
+            ]
+            first = k8s_connection._get_shared_api_client()
+            second = k8s_connection._get_shared_api_client()
+        
+        assert first is not second
+        k8s_module._API_CLIENTS.clear()
+    
+    @patch('pod.connections.kubernetes.async_client.ApiClient')
+    def test_async_apis_share_one_client(self, mock_api_client, k8s_connection):
+        """Test the async APIs share one pooled API client"""
+        import asyncio
+        
+        async def initialize():
+            with patch.object(k8s_connection, '_connect_async_kubeconfig'):
+                return await k8s_connection.get_async_v1()
+        
+        v1 = asyncio.run(initialize())
+        
+        mock_api_client.assert_called_once()
+        assert mock_api_client.call_args.args[0].connection_pool_maxsize >= 64
+        assert v1 is k8s_connection.async_v1
+        for api in (k8s_connection.async_v1, k8s_connection.async_apps_v1,
+                    k8s_connection.async_networking_v1, k8s_connection.async_custom_objects_v1):
+            assert api.api_client is mock_api_client.return_value
+    
+    def test_disconnect_async_closes_session(self, k8s_connection):
+        """Test async disconnection closes the async API client"""
+        import asyncio
+        from unittest.mock import AsyncMock
+        api_client = Mock(close=AsyncMock())
+        k8s_connection.async_api_client = api_client
+        k8s_connection.async_v1 = Mock()
+        
+        asyncio.run(k8s_connection.disconnect_async())
+        
+        api_client.close.assert_awaited_once()
+        assert k8s_connection.async_api_client is None
+        assert k8s_connection.async_v1 is None
+    
+    def test_execute_command_async_reads_exec_channels(self, k8s_connection):
+        """Test async exec splits stdout/stderr frames and takes the exit code from the status frame"""
+        import asyncio
+        from unittest.mock import AsyncMock
+        
+        frames = [b"\x01hello ", b"\x01world", b"\x02warn", b"\x01",
+                  b'\x03{"status": "Failure", "details": {"causes": [{"reason": "ExitCode", "message": "2"}]}}']
+        
+        class FakeWebSocket:
+            async def __aenter__(self):
+                return self
+            
+            async def __aexit__(self, *exc):
+                return False
+            
+            async def __aiter__(self):
+                for frame in frames:
+                    yield Mock(data=frame)
+        
+        exec_v1 = Mock()
+        exec_v1.connect_get_namespaced_pod_exec = AsyncMock(return_value=FakeWebSocket())
+        
+        with patch.object(k8s_connection, '_get_async_exec_v1', AsyncMock(return_value=exec_v1)):
+            result = asyncio.run(k8s_connection.execute_command_async("ls", pod_name="pod-1"))
+        
+        assert result == ("hello world", "warn", 2)
+        call = exec_v1.connect_get_namespaced_pod_exec.call_args
+        assert call.args == ("pod-1", "test-namespace")
+        assert call.kwargs["command"] == ["/bin/sh", "-c", "ls"]
+        assert call.kwargs["_preload_content"] is False
+    
+    def _run_exec_frames(self, k8s_connection, frames):
+        """Run execute_command_async against a websocket yielding the given frames"""
+        import asyncio
+        from unittest.mock import AsyncMock
+        
+        class FakeWebSocket:
+            async def __aenter__(self):
+                return self
+            
+            async def __aexit__(self, *exc):
+                return False
+            
+            async def __aiter__(self):
+                for frame in frames:
+                    yield Mock(data=frame)
+        
+        exec_v1 = Mock()
+        exec_v1.connect_get_namespaced_pod_exec = AsyncMock(return_value=FakeWebSocket())
+        with patch.object(k8s_connection, '_get_async_exec_v1', AsyncMock(return_value=exec_v1)):
+            return asyncio.run(k8s_connection.execute_command_async("ls", pod_name="pod-1"))
+    
+    def test_execute_command_async_joins_split_characters(self, k8s_connection):
+        """Test a multi-byte character split across frames is decoded intact"""
+        encoded = "héllo".encode("utf-8")
+        frames = [b"\x01" + encoded[:2], b"\x01" + encoded[2:], b'\x03{"status": "Success"}']
+        
+        assert self._run_exec_frames(k8s_connection, frames) == ("héllo", "", 0)
+    
+    def test_execute_command_async_failure_without_causes(self, k8s_connection):
+        """Test a Failure status with no causes keeps the output and exits 1"""
+        frames = [b"\x01partial", b"\x02sh: not found",
+                  b'\x03{"status": "Failure", "message": "exec failed", "reason": "InternalError"}']
+        
+        assert self._run_exec_frames(k8s_connection, frames) == ("partial", "sh: not found", 1)
+    
+    def test_execute_command_async_requires_pod(self, k8s_connection):
+        """Test async exec rejects calls without a pod name"""
+        import asyncio
+        
+        with pytest.raises(ValueError):
+            asyncio.run(k8s_connection.execute_command_async("ls"))
+    
     def test_disconnect(self, k8s_connection):
         """Test disconnection"""
         k8s_connection.v1 = Mock()
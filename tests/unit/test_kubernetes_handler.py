@@ -2,22 +2,43 @@
 Unit tests for Kubernetes OS handler
 """
 
+import asyncio
+import json
 import pytest
+import threading
 import time
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, PropertyMock, patch, MagicMock
+from pod.network import cni
+from pod.os_abstraction import kubernetes
 from pod.os_abstraction.kubernetes import KubernetesHandler
 from pod.connections.kubernetes import KubernetesConnection
-from pod.os_abstraction.base import NetworkConfig, CommandResult
+from pod.os_abstraction.base import NetworkConfig, NetworkInterface, CommandResult
+
+
+def _raw_list(count=0):
+    """Build an undeserialized list response as returned with _preload_content=False"""
+    body = '{"kind": "List", "items": [%s]}' % ", ".join(["{}"] * count)
+    return Mock(status=200, data=body.encode())
 
 
 class TestKubernetesHandler:
     """Test Kubernetes OS handler functionality"""
     
+    @pytest.fixture(autouse=True)
+    def clear_detection_cache(self):
+        """Isolate tests from detection results cached by other tests"""
+        KubernetesHandler.invalidate_detection_cache()
+        yield
+        KubernetesHandler.invalidate_detection_cache()
+    
     @pytest.fixture
     def mock_k8s_connection(self):
         """Create a mock Kubernetes connection"""
         mock_conn = Mock(spec=KubernetesConnection)
         mock_conn.namespace = "test-namespace"
+        mock_conn.api_server = None
+        mock_conn.kubeconfig_path = "/tmp/kubeconfig"
+        mock_conn.context = "lab"
         mock_conn.v1 = Mock()
         mock_conn.networking_v1 = Mock()
         mock_conn.custom_objects_v1 = Mock()
@@ -59,6 +80,161 @@ class TestKubernetesHandler:
         
         assert "cilium" in handler.cni_plugins
     
+    def test_detect_cni_plugins_probes(self, mock_k8s_connection):
+        """Test CNI probes fetch a single item and keep detection order"""
+        def list_pods(label_selector, limit, _preload_content):
+            return _raw_list(1 if label_selector in ("app=multus", "k8s-app=cilium") else 0)
+        
+        mock_k8s_connection.v1.list_node.return_value = _raw_list()
+        mock_k8s_connection.v1.list_pod_for_all_namespaces.side_effect = list_pods
+        handler = KubernetesHandler(mock_k8s_connection)
+        
+        assert handler.cni_plugins == ["cilium", "multus"]
+        assert handler.network_capabilities["cni_chaining"] is True
+        mock_k8s_connection.v1.list_node.assert_called_once_with(
+            label_selector="projectcalico.org/ds-ready=true", limit=1, _preload_content=False
+        )
+        for call in mock_k8s_connection.v1.list_pod_for_all_namespaces.call_args_list:
+            assert call.kwargs["limit"] == 1
+            assert call.kwargs["_preload_content"] is False
+    
+    def test_detect_cni_plugins_runs_probes_concurrently(self, mock_k8s_connection):
+        """Test CNI probes overlap instead of running back to back"""
+        import threading
+        barrier = threading.Barrier(5, timeout=5)
+        
+        def probe(**kwargs):
+            barrier.wait()
+            return _raw_list()
+        
+        mock_k8s_connection.v1.list_node.side_effect = probe
+        mock_k8s_connection.v1.list_pod_for_all_namespaces.side_effect = probe
+        handler = KubernetesHandler(mock_k8s_connection)
+        
+        assert handler.cni_plugins == ["default"]
+        assert not hasattr(handler, "cni_detection_warnings")
+    
+    def test_detect_cni_plugins_api_error(self, mock_k8s_connection):
+        """Test a failing probe is reported without hiding the others"""
+        from kubernetes.client.rest import ApiException
+        mock_k8s_connection.v1.list_node.side_effect = ApiException(status=403, reason="Forbidden")
+        mock_k8s_connection.v1.list_pod_for_all_namespaces.return_value = _raw_list(1)
+        handler = KubernetesHandler(mock_k8s_connection)
+        
+        assert handler.cni_plugins == ["cilium", "flannel", "weave", "multus"]
+        assert handler.cni_detection_warnings == ["CNI detection limited: Forbidden"]
+    
+    def test_detect_network_capabilities(self, mock_k8s_connection):
+        """Test capability probes map onto the capability flags"""
+        def list_pods(label_selector, limit, _preload_content):
+            found = ("app=istiod", "app.kubernetes.io/name=traefik")
+            return _raw_list(1 if label_selector in found else 0)
+        
+        mock_k8s_connection.networking_v1.list_network_policy_for_all_namespaces.side_effect = RuntimeError("boom")
+        mock_k8s_connection.v1.list_pod_for_all_namespaces.side_effect = list_pods
+        with patch.object(KubernetesHandler, '_detect_cni_plugins', return_value=["default"]):
+            handler = KubernetesHandler(mock_k8s_connection)
+        
+        capabilities = handler.network_capabilities
+        assert capabilities["network_policies"] is False
+        assert capabilities["network_policy_error"] == "NetworkPolicy detection failed: boom"
+        assert capabilities["service_mesh"] is True
+        assert capabilities["ingress_controllers"] == ["traefik"]
+        assert capabilities["sr_iov"] is False
+        assert capabilities["cni_chaining"] is False
+        mock_k8s_connection.networking_v1.list_network_policy_for_all_namespaces.assert_called_once_with(
+            limit=1, _preload_content=False
+        )
+    
+    def test_probe_releases_connection(self, mock_k8s_connection):
+        """Test raw probe responses are returned to the connection pool"""
+        response = _raw_list(1)
+        probe = Mock(return_value=response)
+        
+        assert KubernetesHandler._probe_has_items(probe) is True
+        probe.assert_called_once_with(_preload_content=False)
+        response.release_conn.assert_called_once()
+        
+        empty = _raw_list()
+        assert KubernetesHandler._probe_has_items(Mock(return_value=empty)) is False
+        empty.release_conn.assert_called_once()
+    
+    def test_capabilities_probed_on_first_access(self, mock_k8s_connection):
+        """Test construction probes only CNI plugins and each capability probes its own markers"""
+        def list_pods(label_selector, limit, _preload_content):
+            return _raw_list(1 if label_selector == "app=istiod" else 0)
+        
+        mock_k8s_connection.v1.list_node.return_value = _raw_list()
+        mock_k8s_connection.v1.list_pod_for_all_namespaces.side_effect = list_pods
+        handler = KubernetesHandler(mock_k8s_connection)
+        list_pods_mock = mock_k8s_connection.v1.list_pod_for_all_namespaces
+        assert list_pods_mock.call_count == 4  # cilium, flannel, weave, multus
+        
+        assert handler.service_mesh is True
+        assert handler.service_mesh is True
+        assert list_pods_mock.call_count == 5
+        assert list_pods_mock.call_args.kwargs["label_selector"] == "app=istiod"
+        mock_k8s_connection.networking_v1.list_network_policy_for_all_namespaces.assert_not_called()
+        
+        # Another handler for the cluster reuses the probed capability
+        assert KubernetesHandler(mock_k8s_connection).service_mesh is True
+        assert list_pods_mock.call_count == 5
+    
+    def test_detection_cached_per_cluster(self, mock_k8s_connection):
+        """Test handlers for the same cluster reuse recent detection results"""
+        mock_k8s_connection.v1.list_node.return_value = _raw_list(1)
+        mock_k8s_connection.v1.list_pod_for_all_namespaces.return_value = _raw_list()
+        mock_k8s_connection.networking_v1.list_network_policy_for_all_namespaces.return_value = _raw_list()
+        
+        first = KubernetesHandler(mock_k8s_connection)
+        first.network_capabilities["ingress_controllers"].append("haproxy")
+        second = KubernetesHandler(mock_k8s_connection)
+        
+        assert second.cni_plugins == ["calico"]
+        assert second.network_capabilities["ingress_controllers"] == []
+        assert mock_k8s_connection.v1.list_node.call_count == 1
+        
+        KubernetesHandler.invalidate_detection_cache()
+        KubernetesHandler(mock_k8s_connection)
+        assert mock_k8s_connection.v1.list_node.call_count == 2
+    
+    def test_detection_cache_expires(self, mock_k8s_connection):
+        """Test detection runs again once the cached result is older than the TTL"""
+        mock_k8s_connection.v1.list_node.return_value = _raw_list()
+        mock_k8s_connection.v1.list_pod_for_all_namespaces.return_value = _raw_list()
+        mock_k8s_connection.networking_v1.list_network_policy_for_all_namespaces.return_value = _raw_list()
+        
+        with patch('pod.network.cni.time.monotonic', return_value=1000.0):
+            KubernetesHandler(mock_k8s_connection)
+        with patch('pod.network.cni.time.monotonic',
+                   return_value=1000.0 + kubernetes.DETECTION_CACHE_TTL + 1):
+            KubernetesHandler(mock_k8s_connection)
+        
+        assert mock_k8s_connection.v1.list_node.call_count == 2
+    
+    def test_failed_detection_not_cached(self, mock_k8s_connection):
+        """Test partial results from failing probes are not reused"""
+        mock_k8s_connection.v1.list_node.side_effect = RuntimeError("boom")
+        mock_k8s_connection.v1.list_pod_for_all_namespaces.return_value = _raw_list()
+        
+        KubernetesHandler(mock_k8s_connection)
+        KubernetesHandler(mock_k8s_connection)
+        
+        assert mock_k8s_connection.v1.list_node.call_count == 2
+        assert cni._DETECTION_CACHE == {}
+    
+    def test_detection_cache_shared_with_cni_manager(self, mock_k8s_connection):
+        """Test handler results live in the CNIManager cache under the same cluster key"""
+        mock_k8s_connection.v1.list_node.return_value = _raw_list(1)
+        mock_k8s_connection.v1.list_pod_for_all_namespaces.return_value = _raw_list()
+        
+        KubernetesHandler(mock_k8s_connection)
+        
+        key = (cni._cluster_key(mock_k8s_connection), "cni_plugins")
+        assert cni._DETECTION_CACHE[key][1] == ["calico"]
+        KubernetesHandler.invalidate_detection_cache()
+        assert cni._DETECTION_CACHE == {}
+    
     def test_get_os_info(self, k8s_handler, mock_k8s_connection):
         """Test getting Kubernetes cluster information"""
         # Mock cluster info
@@ -67,26 +243,50 @@ class TestKubernetesHandler:
             "git_version": "v1.28.0"
         }
         
-        # Mock node list
-        mock_node = Mock()
-        mock_node.metadata.name = "node-1"
-        mock_node.status.node_info.operating_system = "linux"
-        mock_node.status.node_info.architecture = "amd64"
-        mock_node.status.node_info.kernel_version = "5.15.0"
-        mock_node.status.node_info.container_runtime_version = "containerd://1.6.0"
-        mock_node.status.node_info.kubelet_version = "v1.28.0"
-        mock_node.status.capacity = {"cpu": "4", "memory": "8Gi"}
-        mock_node.status.conditions = []
+        # Raw node list pages, the second reached through the continue token
+        def node(name):
+            return {
+                "metadata": {"name": name, "managedFields": [{"manager": "kubelet"}]},
+                "status": {
+                    "nodeInfo": {
+                        "operatingSystem": "linux",
+                        "architecture": "amd64",
+                        "kernelVersion": "5.15.0",
+                        "containerRuntimeVersion": "containerd://1.6.0",
+                        "kubeletVersion": "v1.28.0"
+                    },
+                    "capacity": {"cpu": "4", "memory": "8Gi"},
+                    "conditions": [{"type": "Ready", "status": "True"}]
+                }
+            }
         
-        mock_k8s_connection.v1.list_node.return_value = Mock(items=[mock_node])
+        pages = [
+            {"metadata": {"continue": "page-2"}, "items": [node("node-1")]},
+            {"metadata": {}, "items": [node("node-2")]},
+        ]
+        responses = [Mock(data=json.dumps(page).encode()) for page in pages]
+        mock_k8s_connection.v1.list_node.reset_mock()
+        mock_k8s_connection.v1.list_node.side_effect = responses
         
         info = k8s_handler.get_os_info()
         
         assert info["type"] == "kubernetes"
         assert info["cluster_version"] == "1.28"
-        assert len(info["nodes"]) == 1
+        assert len(info["nodes"]) == 2
         assert info["nodes"][0]["name"] == "node-1"
         assert info["nodes"][0]["os"] == "linux"
+        assert info["nodes"][0]["cpu_capacity"] == "4"
+        assert info["nodes"][0]["conditions"] == [{"type": "Ready", "status": "True", "reason": "Unknown"}]
+        assert info["nodes"][1]["name"] == "node-2"
+        
+        first, second = mock_k8s_connection.v1.list_node.call_args_list
+        assert first.kwargs == {
+            "limit": 500, "_preload_content": False,
+            "resource_version": "0", "resource_version_match": "NotOlderThan"
+        }
+        assert second.kwargs == {"limit": 500, "_preload_content": False, "_continue": "page-2"}
+        for response in responses:
+            response.release_conn.assert_called_once()
     
     def test_configure_network_with_vlan(self, k8s_handler):
         """Test network configuration with VLAN"""
@@ -102,7 +302,6 @@ class TestKubernetesHandler:
                 stdout="VLAN configured",
                 stderr="",
                 exit_code=0,
-                success=True,
                 command="configure_vlan",
                 duration=1.0
             )
@@ -126,7 +325,6 @@ class TestKubernetesHandler:
                 stdout="Standard network configured",
                 stderr="",
                 exit_code=0,
-                success=True,
                 command="configure_standard",
                 duration=0.5
             )
@@ -156,6 +354,35 @@ class TestKubernetesHandler:
         assert "VLAN 100 NetworkAttachmentDefinition created" in result.stdout
         mock_k8s_connection.custom_objects_v1.create_namespaced_custom_object.assert_called_once()
     
+    @pytest.mark.parametrize("config", [
+        NetworkConfig(interface="eth0", ip_address="192.168.100.10", netmask="255.255.255.0",
+                      gateway="192.168.100.1", dns_servers=["10.0.0.53", "10.0.0.54"], vlan_id=100),
+        NetworkConfig(interface="", ip_address="10.1.0.5", netmask="255.255.0.0", vlan_id=4094),
+        NetworkConfig(interface='en"p1s0', ip_address="10.1.0.5", vlan_id=None),
+    ])
+    def test_multus_vlan_config_template(self, k8s_handler, mock_k8s_connection, config):
+        """Test the templated CNI config matches serializing the equivalent dict"""
+        k8s_handler._configure_multus_vlan(config)
+        
+        body = mock_k8s_connection.custom_objects_v1.create_namespaced_custom_object.call_args.kwargs["body"]
+        assert body["spec"]["config"] == json.dumps({
+            "cniVersion": "0.3.1",
+            "name": f"vlan-{config.vlan_id}",
+            "type": "macvlan",
+            "master": config.interface or "eth0",
+            "vlan": config.vlan_id,
+            "ipam": {
+                "type": "static",
+                "addresses": [
+                    {
+                        "address": f"{config.ip_address}/{k8s_handler._netmask_to_cidr(config.netmask)}",
+                        "gateway": config.gateway
+                    }
+                ],
+                "dns": {"nameservers": config.dns_servers or ["8.8.8.8"]}
+            }
+        })
+    
     def test_configure_calico_vlan(self, k8s_handler, mock_k8s_connection):
         """Test VLAN configuration with Calico CNI"""
         k8s_handler.cni_plugins = ["calico"]
@@ -214,32 +441,134 @@ class TestKubernetesHandler:
         assert "NetworkPolicy for VLAN 100 created" in result.stdout
         mock_k8s_connection.networking_v1.create_namespaced_network_policy.assert_called_once()
     
+    def test_concurrent_vlan_creates_coalesce(self, k8s_handler, mock_k8s_connection):
+        """Test concurrent configuration of one VLAN issues a single create"""
+        from concurrent.futures import ThreadPoolExecutor
+        k8s_handler.cni_plugins = ["default"]
+        config = NetworkConfig(interface="eth0", vlan_id=100)
+        release = threading.Event()
+        
+        def slow_create(**kwargs):
+            release.wait(5)
+        
+        create = mock_k8s_connection.networking_v1.create_namespaced_network_policy
+        create.side_effect = slow_create
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(k8s_handler._configure_generic_vlan, config) for _ in range(4)]
+            while create.call_count == 0:
+                time.sleep(0.01)
+            time.sleep(0.05)
+            release.set()
+            results = [future.result() for future in futures]
+        
+        assert create.call_count == 1
+        assert all(result.success for result in results)
+        assert sum("created successfully" in result.stdout for result in results) == 1
+        
+        # Known to exist now, so later calls skip the API entirely
+        assert "already exists" in k8s_handler._configure_generic_vlan(config).stdout
+        assert create.call_count == 1
+    
+    def test_listed_vlan_resources_skip_create(self, k8s_handler, mock_k8s_connection):
+        """Test one list per kind answers later existence checks without creates"""
+        body = {"items": [{"metadata": {"name": "vlan-100"}}, {"metadata": {"name": "vlan-101"}}]}
+        listing = Mock(data=json.dumps(body).encode())
+        custom_objects = mock_k8s_connection.custom_objects_v1
+        custom_objects.list_namespaced_custom_object.return_value = listing
+        
+        results = [
+            k8s_handler._configure_multus_vlan(NetworkConfig(interface="eth0", ip_address="10.0.0.2", vlan_id=vlan_id))
+            for vlan_id in (100, 101, 102, 102)
+        ]
+        
+        assert [result.stdout.split()[-2:] for result in results] == [
+            ["already", "exists"], ["already", "exists"], ["created", "successfully"], ["already", "exists"]
+        ]
+        custom_objects.list_namespaced_custom_object.assert_called_once_with(
+            group="k8s.cni.cncf.io", version="v1", namespace="test-namespace",
+            plural="network-attachment-definitions", _preload_content=False
+        )
+        listing.release_conn.assert_called_once()
+        assert custom_objects.create_namespaced_custom_object.call_count == 1
+    
+    def test_vlan_create_conflict_reports_existing(self, k8s_handler, mock_k8s_connection):
+        """Test a 409 from the apiserver is reported as an existing resource"""
+        from kubernetes.client.rest import ApiException
+        create = mock_k8s_connection.custom_objects_v1.create_cluster_custom_object
+        create.side_effect = ApiException(status=409, reason="Conflict")
+        
+        result = k8s_handler._configure_calico_vlan(
+            NetworkConfig(interface="eth0", ip_address="10.1.0.0", netmask="255.255.0.0", vlan_id=200)
+        )
+        
+        assert result.success is True
+        assert "Calico IP Pool for VLAN 200 already exists" in result.stdout
+    
+    def test_failed_vlan_create_is_retried(self, k8s_handler, mock_k8s_connection):
+        """Test a failed create is not remembered as existing"""
+        from kubernetes.client.rest import ApiException
+        k8s_handler.cni_plugins = ["default"]
+        create = mock_k8s_connection.networking_v1.create_namespaced_network_policy
+        create.side_effect = [ApiException(status=403, reason="Forbidden"), Mock()]
+        config = NetworkConfig(interface="eth0", vlan_id=300)
+        
+        failed = k8s_handler._configure_vlan_network(config)
+        retried = k8s_handler._configure_vlan_network(config)
+        
+        assert failed.success is False
+        assert "created successfully" in retried.stdout
+        assert create.call_count == 2
+        assert k8s_handler._pending_creates == {}
+    
+    def test_configure_vlan_network_builds_context_once(self, k8s_handler):
+        """Test the derived VLAN fields are computed once and handed to the configurer"""
+        k8s_handler.cni_plugins = ["calico"]
+        config = NetworkConfig(interface="", ip_address="10.1.0.0", netmask="255.255.0.0",
+                               gateway="10.1.0.1", vlan_id=42)
+        
+        with patch.object(k8s_handler, '_configure_calico_vlan', return_value=CommandResult.ok("", "")) as calico:
+            k8s_handler._configure_vlan_network(config)
+        
+        ctx = calico.call_args.args[1]
+        assert ctx == kubernetes._VlanContext(
+            vlan_id=42, name="vlan-42", interface="eth0", address="10.1.0.0/16",
+            gateway="10.1.0.1", dns_servers=("8.8.8.8",)
+        )
+    
     def test_netmask_to_cidr(self, k8s_handler):
         """Test netmask to CIDR conversion"""
         assert k8s_handler._netmask_to_cidr("255.255.255.0") == 24
         assert k8s_handler._netmask_to_cidr("255.255.0.0") == 16
         assert k8s_handler._netmask_to_cidr("255.0.0.0") == 8
+        assert k8s_handler._netmask_to_cidr("255.0.255.0") == 16  # Non-contiguous falls back to bit count
         assert k8s_handler._netmask_to_cidr(None) == 24  # Default
     
+    def test_netmask_to_cidr_all_prefixes(self, k8s_handler):
+        """Test every contiguous netmask converts to its prefix length"""
+        import ipaddress
+        for prefix in range(33):
+            netmask = str(ipaddress.IPv4Network(f"0.0.0.0/{prefix}").netmask)
+            assert k8s_handler._netmask_to_cidr(netmask) == prefix
+    
     def test_get_network_interfaces(self, k8s_handler, mock_k8s_connection):
         """Test getting network interfaces for pods"""
-        # Mock pod list
-        mock_k8s_connection.list_pods.return_value = [
-            {
-                "name": "test-pod-1",
-                "namespace": "default",
-                "status": "Running",
-                "node": "node-1",
-                "ip": "10.244.1.5"
-            },
-            {
-                "name": "test-pod-2",
-                "namespace": "default", 
-                "status": "Pending",
-                "node": "node-1",
-                "ip": None
-            }
-        ]
+        # Raw pod list as filtered server-side by status.phase=Running
+        body = {
+            "items": [
+                {
+                    "metadata": {"name": "test-pod-1", "namespace": "default"},
+                    "spec": {"nodeName": "node-1"},
+                    "status": {"phase": "Running", "podIP": "10.244.1.5"}
+                },
+                {
+                    "metadata": {"name": "test-pod-2", "namespace": "default"},
+                    "spec": {"nodeName": "node-1"},
+                    "status": {"phase": "Running"}
+                }
+            ]
+        }
+        response = Mock(status=200, data=json.dumps(body).encode())
+        mock_k8s_connection.v1.list_namespaced_pod.return_value = response
         
         interfaces = k8s_handler.get_network_interfaces()
         
@@ -247,6 +576,76 @@ class TestKubernetesHandler:
         assert interfaces[0].name == "pod-test-pod-1"
         assert interfaces[0].ip_addresses == ["10.244.1.5"]
         assert interfaces[0].type == "pod"
+        mock_k8s_connection.v1.list_namespaced_pod.assert_called_once_with(
+            "test-namespace", field_selector="status.phase=Running", _preload_content=False
+        )
+        response.release_conn.assert_called_once()
+    
+    def test_pod_interfaces_use_pod_defaults(self):
+        """Test pod interfaces carry the shared defaults without sharing mutable state"""
+        interfaces = KubernetesHandler._pod_interfaces([("a", "10.0.0.1"), ("b", None), ("c", "10.0.0.3")])
+        
+        assert [i.name for i in interfaces] == ["pod-a", "pod-c"]
+        assert interfaces[0] == NetworkInterface(
+            name="pod-a", mac_address="unknown", ip_addresses=["10.0.0.1"],
+            netmask="255.255.255.0", gateway="unknown", vlan_id=None,
+            mtu=1500, state="up", type="pod"
+        )
+        assert interfaces[0].ip_addresses is not interfaces[1].ip_addresses
+    
+    def test_get_network_interfaces_for_batches_pods(self, k8s_handler, mock_k8s_connection):
+        """Test several pods are fetched with one app-label List and matched by name"""
+        body = {"items": [
+            {"metadata": {"name": "web"}, "status": {"podIP": "10.0.0.5"}},
+            {"metadata": {"name": "db"}, "status": {"podIP": "10.0.0.6"}},
+            {"metadata": {"name": "web-7d9f", "labels": {"app": "web"}}, "status": {"podIP": "10.0.0.7"}},
+        ]}
+        response = Mock(status=200, data=json.dumps(body).encode())
+        mock_k8s_connection.v1.list_namespaced_pod.return_value = response
+        
+        interfaces = k8s_handler.get_network_interfaces_for(["web", "db", "web"])
+        
+        assert [interface.name for interface in interfaces] == ["pod-web", "pod-db"]
+        mock_k8s_connection.v1.list_namespaced_pod.assert_called_once_with(
+            "test-namespace",
+            label_selector="app in (db,web)",
+            field_selector="status.phase=Running",
+            _preload_content=False
+        )
+        response.release_conn.assert_called_once()
+    
+    def test_get_network_interfaces_for_falls_back_for_other_labels(self, k8s_handler, mock_k8s_connection):
+        """Test names the app selector misses are found in one List of running pods"""
+        labelled = {"items": [{"metadata": {"name": "web"}, "status": {"podIP": "10.0.0.5"}}]}
+        running = {"items": [
+            {"metadata": {"name": "web"}, "status": {"podIP": "10.0.0.5"}},
+            {"metadata": {"name": "db", "labels": {"app": "postgres"}}, "status": {"podIP": "10.0.0.6"}},
+            {"metadata": {"name": "cache"}, "status": {"podIP": "10.0.0.8"}},
+        ]}
+        responses = [Mock(status=200, data=json.dumps(body).encode()) for body in (labelled, running)]
+        mock_k8s_connection.v1.list_namespaced_pod.side_effect = responses
+        
+        interfaces = k8s_handler.get_network_interfaces_for(["web", "db"])
+        
+        assert [interface.name for interface in interfaces] == ["pod-web", "pod-db"]
+        calls = mock_k8s_connection.v1.list_namespaced_pod.call_args_list
+        assert [call.kwargs["label_selector"] for call in calls] == ["app in (db,web)", None]
+        assert all(response.release_conn.called for response in responses)
+    
+    def test_get_network_interfaces_for_single_pod(self, k8s_handler, mock_k8s_connection):
+        """Test a single pod is fetched with a Get instead of a List"""
+        pod = Mock()
+        pod.metadata.name = "web"
+        pod.status.phase = "Running"
+        pod.status.pod_ip = "10.0.0.5"
+        mock_k8s_connection.v1.read_namespaced_pod.return_value = pod
+        
+        interfaces = k8s_handler.get_network_interfaces_for(["web"])
+        
+        assert [interface.ip_addresses for interface in interfaces] == [["10.0.0.5"]]
+        mock_k8s_connection.v1.read_namespaced_pod.assert_called_once_with("web", "test-namespace")
+        mock_k8s_connection.v1.list_namespaced_pod.assert_not_called()
+        assert k8s_handler.get_network_interfaces_for([]) == []
     
     def test_create_pod_with_vlan(self, k8s_handler, mock_k8s_connection):
         """Test creating pod with VLAN configuration"""
@@ -260,7 +659,7 @@ class TestKubernetesHandler:
         # Mock successful pod creation
         mock_pod = Mock()
         mock_pod.metadata.name = "test-pod"
-        mock_k8s_connection.v1.create_namespaced_pod.return_value = mock_pod
+        mock_k8s_connection.v1.patch_namespaced_pod.return_value = mock_pod
         
         # Mock VLAN configuration
         with patch.object(k8s_handler, '_configure_vlan_network') as mock_vlan:
@@ -268,7 +667,6 @@ class TestKubernetesHandler:
                 stdout="VLAN configured",
                 stderr="",
                 exit_code=0,
-                success=True,
                 command="configure_vlan",
                 duration=1.0
             )
@@ -284,40 +682,122 @@ class TestKubernetesHandler:
         
         assert result.success is True
         assert "test-pod created successfully with VLAN 100" in result.stdout
-        mock_k8s_connection.v1.create_namespaced_pod.assert_called_once()
+        mock_k8s_connection.v1.patch_namespaced_pod.assert_called_once()
+        call = mock_k8s_connection.v1.patch_namespaced_pod.call_args.kwargs
+        assert call["name"] == "test-pod"
+        assert call["field_manager"] == "pod-lib"
+        assert call["force"] is True
+        assert call["_content_type"] == "application/apply-patch+yaml"
+        assert call["body"]["metadata"]["labels"]["vlan-100"] == "true"
+        mock_k8s_connection.v1.create_namespaced_pod.assert_not_called()
     
-    @patch('time.sleep')
-    @patch('time.time')
-    def test_wait_for_pod_ready_success(self, mock_time, mock_sleep, k8s_handler, mock_k8s_connection):
-        """Test waiting for pod to be ready successfully"""
-        # Mock time progression
-        mock_time.side_effect = [0, 5]  # Start time, end time
-        
-        # Mock pod ready
-        mock_pod = Mock()
-        mock_pod.status.phase = "Running"
-        mock_pod.status.container_statuses = [Mock(ready=True)]
-        mock_k8s_connection.v1.read_namespaced_pod.return_value = mock_pod
+    @staticmethod
+    def _pod_event(event_type, phase, ready=(), resource_version="1"):
+        """Build a watch event for a pod with the given container readiness"""
+        pod = Mock()
+        pod.status.phase = phase
+        pod.status.container_statuses = [Mock(ready=r) for r in ready]
+        pod.metadata.resource_version = resource_version
+        return {"type": event_type, "object": pod}
+    
+    @patch('pod.os_abstraction.kubernetes.watch.Watch')
+    def test_wait_for_pod_ready_success(self, mock_watch_cls, k8s_handler, mock_k8s_connection):
+        """Test waiting for pod to be ready returns on the first ready event"""
+        mock_watch = mock_watch_cls.return_value
+        mock_watch.stream.return_value = iter([
+            self._pod_event("ADDED", "Pending"),
+            self._pod_event("MODIFIED", "Running", ready=(True, False)),
+            self._pod_event("MODIFIED", "Running", ready=(True, True)),
+        ])
         
         result = k8s_handler._wait_for_pod_ready("test-pod", timeout=10)
         
         assert result is True
+        mock_watch.stream.assert_called_once_with(
+            mock_k8s_connection.v1.list_namespaced_pod,
+            namespace="test-namespace",
+            field_selector="metadata.name=test-pod",
+            resource_version=None,
+            timeout_seconds=10
+        )
+        mock_watch.stop.assert_called_once()
+        mock_k8s_connection.v1.read_namespaced_pod.assert_not_called()
     
-    @patch('time.sleep')
-    @patch('time.time')
-    def test_wait_for_pod_ready_timeout(self, mock_time, mock_sleep, k8s_handler, mock_k8s_connection):
+    @patch('pod.os_abstraction.kubernetes.time.monotonic')
+    @patch('pod.os_abstraction.kubernetes.watch.Watch')
+    def test_wait_for_pod_ready_timeout(self, mock_watch_cls, mock_monotonic, k8s_handler):
         """Test waiting for pod ready timeout"""
-        # Mock time progression
-        mock_time.side_effect = [0, 301]  # Start time, timeout
-        
-        # Mock pod not ready
-        mock_pod = Mock()
-        mock_pod.status.phase = "Pending"
-        mock_k8s_connection.v1.read_namespaced_pod.return_value = mock_pod
+        mock_monotonic.side_effect = [0, 0, 301]  # Deadline, first stream, expired
+        mock_watch_cls.return_value.stream.return_value = iter([
+            self._pod_event("ADDED", "Pending"),
+        ])
         
         result = k8s_handler._wait_for_pod_ready("test-pod", timeout=300)
         
         assert result is False
+        assert mock_watch_cls.return_value.stream.call_count == 1
+    
+    @patch('pod.os_abstraction.kubernetes.time.sleep')
+    @patch('pod.os_abstraction.kubernetes.watch.Watch')
+    def test_wait_for_pod_ready_backs_off_on_repeated_errors(self, mock_watch_cls, mock_sleep, k8s_handler):
+        """Test retries start fast and grow while the watch keeps failing"""
+        from kubernetes.client.rest import ApiException
+        
+        def failing_stream():
+            raise ApiException(status=500, reason="Internal Server Error")
+            yield
+        
+        ready = self._pod_event("ADDED", "Running", ready=(True,))
+        mock_watch_cls.return_value.stream.side_effect = [failing_stream() for _ in range(4)] + [iter([ready])]
+        
+        with patch('pod.os_abstraction.kubernetes.random.uniform', return_value=1.0):
+            assert k8s_handler._wait_for_pod_ready("test-pod", timeout=60) is True
+        
+        delays = [call.args[0] for call in mock_sleep.call_args_list]
+        assert delays == pytest.approx([0.3, 0.45, 0.675, 1.0125])
+        assert all(k8s_handler._retry_delay(50) <= 5.0 * 1.2 for _ in range(20))
+    
+    @patch('pod.os_abstraction.kubernetes.time.sleep')
+    @patch('pod.os_abstraction.kubernetes.watch.Watch')
+    def test_wait_for_pod_ready_resumes_after_error(self, mock_watch_cls, mock_sleep, k8s_handler):
+        """Test a failed watch reopens from the last seen resourceVersion"""
+        from kubernetes.client.rest import ApiException
+        
+        def failing_stream():
+            yield self._pod_event("ADDED", "Pending", resource_version="41")
+            raise ApiException(status=500, reason="Internal Server Error")
+        
+        mock_watch = mock_watch_cls.return_value
+        mock_watch.stream.side_effect = [
+            failing_stream(),
+            iter([self._pod_event("MODIFIED", "Running", ready=(True,), resource_version="42")]),
+        ]
+        
+        result = k8s_handler._wait_for_pod_ready("test-pod", timeout=60)
+        
+        assert result is True
+        assert mock_watch.stream.call_args_list[1].kwargs["resource_version"] == "41"
+        assert mock_watch.stop.call_count == 2
+    
+    @patch('pod.os_abstraction.kubernetes.time.sleep')
+    @patch('pod.os_abstraction.kubernetes.watch.Watch')
+    def test_wait_for_pod_ready_survives_dropped_connection(self, mock_watch_cls, mock_sleep, k8s_handler):
+        """Test a watch connection dropped mid-stream is reopened instead of raising"""
+        from urllib3.exceptions import ProtocolError
+        
+        def dropped_stream():
+            yield self._pod_event("ADDED", "Pending", resource_version="41")
+            raise ProtocolError("Connection broken: IncompleteRead")
+        
+        mock_watch = mock_watch_cls.return_value
+        mock_watch.stream.side_effect = [
+            dropped_stream(),
+            iter([self._pod_event("MODIFIED", "Running", ready=(True,), resource_version="42")]),
+        ]
+        
+        assert k8s_handler._wait_for_pod_ready("test-pod", timeout=60) is True
+        assert mock_watch.stream.call_args_list[1].kwargs["resource_version"] == "41"
+        mock_sleep.assert_called_once()
     
     def test_delete_pod(self, k8s_handler, mock_k8s_connection):
         """Test pod deletion"""
@@ -393,7 +873,6 @@ class TestKubernetesHandler:
                 stdout="Pod deleted",
                 stderr="",
                 exit_code=0,
-                success=True,
                 command="delete_pod",
                 duration=1.0
             )
@@ -417,7 +896,6 @@ class TestKubernetesHandler:
                 stdout="Pod deleted",
                 stderr="",
                 exit_code=0,
-                success=True,
                 command="delete_pod",
                 duration=1.0
             )
@@ -432,4 +910,301 @@ class TestKubernetesHandler:
         result = k8s_handler.shutdown()
         
         assert result.success is False
-        assert "pod_name required for pod shutdown" in result.stderr
\ No newline at end of file
+        assert "pod_name required for pod shutdown" in result.stderr
+
+def _k8s_object(name, namespace=None, **status):
+    """Build a node or pod object as delivered by list and watch calls"""
+    obj = Mock()
+    obj.metadata.name = name
+    obj.metadata.namespace = namespace
+    for field, value in status.items():
+        setattr(obj.status, field, value)
+    return obj
+
+
+class _FakeAsyncWatch:
+    """kubernetes_asyncio Watch stand-in that replays queued events, then idles"""
+    
+    def __init__(self, events, idle=0):
+        self._events = events
+        self._idle = idle
+        self.calls = []
+        
+    async def __aenter__(self):
+        return self
+        
+    async def __aexit__(self, *exc_info):
+        return False
+        
+    def stream(self, func, **kwargs):
+        self.calls.append(kwargs)
+        return self._replay()
+        
+    async def _replay(self):
+        for event in self._events:
+            yield event
+        await asyncio.sleep(self._idle)
+
+
+class _FakeWatch:
+    """Watch stand-in that yields queued events, then blocks until stopped"""
+    
+    def __init__(self, events):
+        self._events = events
+        self._stopped = threading.Event()
+        
+    def stream(self, func, **kwargs):
+        yield from self._events.get(func, [])
+        self._stopped.wait(5)
+        
+    def stop(self):
+        self._stopped.set()
+
+
+class TestClusterStateCache:
+    """Test the shared watch-driven cluster state cache"""
+    
+    @pytest.fixture
+    def v1(self):
+        """Core API returning one node and two pods on the initial list"""
+        v1 = Mock()
+        v1.list_node.return_value = Mock(items=[_k8s_object("node-1")])
+        v1.list_node.return_value.metadata.resource_version = "10"
+        v1.list_pod_for_all_namespaces.return_value = Mock(items=[
+            _k8s_object("web", "default", phase="Running", pod_ip="10.0.0.5"),
+            _k8s_object("db", "default", phase="Running", pod_ip="10.0.0.6"),
+        ])
+        v1.list_pod_for_all_namespaces.return_value.metadata.resource_version = "20"
+        return v1
+    
+    def test_applies_watch_events(self, v1):
+        """Test list results are updated by subsequent watch events"""
+        events = {
+            v1.list_node: [{"type": "ADDED", "object": _k8s_object("node-2")}],
+            v1.list_pod_for_all_namespaces: [
+                {"type": "DELETED", "object": _k8s_object("db", "default")},
+            ],
+        }
+        with patch('pod.os_abstraction.kubernetes.watch.Watch', side_effect=lambda: _FakeWatch(events)):
+            state = kubernetes._ClusterStateCache(v1)
+            state.start()
+            try:
+                for _ in range(100):
+                    nodes = state.nodes(timeout=1)
+                    pods = state.pods(timeout=1)
+                    if len(nodes) == 2 and len(pods) == 1:
+                        break
+                    time.sleep(0.01)
+            finally:
+                state.stop()
+        
+        assert sorted(node.metadata.name for node in nodes) == ["node-1", "node-2"]
+        assert [pod.metadata.name for pod in pods] == ["web"]
+        v1.list_node.assert_called_with()
+    
+    def test_unsynced_cache_returns_none(self, v1):
+        """Test readers can tell an unsynced cache from an empty one"""
+        state = kubernetes._ClusterStateCache(v1)
+        
+        assert state.nodes() is None
+        assert state.pods() is None
+    
+    def test_acquire_is_shared_and_reference_counted(self, v1):
+        """Test one cache per cluster, stopped when the last user releases it"""
+        key = ("/tmp/kubeconfig", "lab")
+        with patch.object(kubernetes._ClusterStateCache, 'start') as mock_start, \
+             patch.object(kubernetes._ClusterStateCache, 'stop') as mock_stop:
+            first = kubernetes._ClusterStateCache.acquire(key, v1)
+            second = kubernetes._ClusterStateCache.acquire(key, v1)
+            
+            assert first is second
+            mock_start.assert_called_once()
+            
+            first.release()
+            mock_stop.assert_not_called()
+            second.release()
+            mock_stop.assert_called_once()
+            
+        assert key not in kubernetes._CLUSTER_STATES
+    
+    def test_handler_reads_from_cache(self):
+        """Test an informer-backed handler answers without listing"""
+        connection = Mock(spec=KubernetesConnection)
+        connection.namespace = "default"
+        connection.api_server = None
+        connection.kubeconfig_path = "/tmp/kubeconfig"
+        connection.context = "lab"
+        connection.v1 = Mock()
+        connection.get_cluster_info.return_value = {"version": "1.28"}
+        
+        node = _k8s_object("node-1")
+        node.status.capacity = {"cpu": "4"}
+        node.status.conditions = []
+        state = Mock()
+        state.nodes.return_value = [node]
+        state.pods.return_value = [
+            _k8s_object("web", "default", phase="Running", pod_ip="10.0.0.5"),
+            _k8s_object("job", "default", phase="Succeeded", pod_ip="10.0.0.7"),
+            _k8s_object("api", "other", phase="Running", pod_ip="10.0.0.8"),
+        ]
+        
+        with patch.object(KubernetesHandler, '_detect_cluster'), \
+             patch.object(KubernetesHandler, 'network_capabilities', new_callable=PropertyMock, return_value={}), \
+             patch.object(kubernetes._ClusterStateCache, 'acquire', return_value=state) as mock_acquire:
+            handler = KubernetesHandler(connection, use_informer=True)
+            handler.cni_plugins = ["default"]
+            
+            info = handler.get_os_info()
+            interfaces = handler.get_network_interfaces()
+            handler.close()
+        
+        mock_acquire.assert_called_once_with(("/tmp/kubeconfig", "lab"), connection.v1)
+        assert info["nodes"][0]["name"] == "node-1"
+        assert [interface.name for interface in interfaces] == ["pod-web"]
+        connection.v1.list_node.assert_not_called()
+        connection.v1.list_namespaced_pod.assert_not_called()
+        state.release.assert_called_once()
+
+
+class TestKubernetesHandlerAsync:
+    """Test the kubernetes_asyncio backed coroutine variants"""
+    
+    @pytest.fixture(autouse=True)
+    def clear_detection_cache(self):
+        """Isolate tests from detection results cached by other tests"""
+        KubernetesHandler.invalidate_detection_cache()
+        yield
+        KubernetesHandler.invalidate_detection_cache()
+    
+    @pytest.fixture
+    def async_v1(self):
+        """Async Core API client"""
+        return AsyncMock()
+    
+    @pytest.fixture
+    def k8s_handler(self, async_v1):
+        """Handler whose connection hands out the async Core API client"""
+        connection = Mock(spec=KubernetesConnection)
+        connection.namespace = "test-namespace"
+        connection.api_server = None
+        connection.kubeconfig_path = "/tmp/kubeconfig"
+        connection.context = "lab"
+        connection.v1 = Mock()
+        connection.get_async_v1.return_value = async_v1
+        with patch.object(KubernetesHandler, '_detect_cluster'):
+            handler = KubernetesHandler(connection)
+        handler.cni_plugins = ["default"]
+        return handler
+    
+    def test_get_network_interfaces_async(self, k8s_handler, async_v1):
+        """Test pod interfaces are read from a raw async list response"""
+        body = {"items": [
+            {"metadata": {"name": "web"}, "status": {"phase": "Running", "podIP": "10.0.0.5"}},
+            {"metadata": {"name": "init"}, "status": {"phase": "Running"}},
+        ]}
+        response = Mock()
+        response.read = AsyncMock(return_value=json.dumps(body).encode())
+        async_v1.list_namespaced_pod.return_value = response
+        
+        interfaces = asyncio.run(k8s_handler.get_network_interfaces_async())
+        
+        assert [interface.name for interface in interfaces] == ["pod-web"]
+        async_v1.list_namespaced_pod.assert_awaited_once_with(
+            "test-namespace", field_selector="status.phase=Running", _preload_content=False
+        )
+        response.release.assert_called_once()
+        k8s_handler.k8s.v1.list_namespaced_pod.assert_not_called()
+    
+    def test_create_pod_with_vlan_async(self, k8s_handler, async_v1):
+        """Test pod creation awaits the async API and watches for readiness"""
+        pod = Mock()
+        pod.status.phase = "Running"
+        pod.status.container_statuses = [Mock(ready=True)]
+        fake_watch = _FakeAsyncWatch([{"type": "ADDED", "object": pod}])
+        
+        with patch('pod.os_abstraction.kubernetes.async_watch.Watch', return_value=fake_watch):
+            result = asyncio.run(k8s_handler.create_pod_with_vlan_async(
+                "test-pod", "nginx:alpine", 0, NetworkConfig(interface="eth0")
+            ))
+        
+        assert result.success is True
+        assert "test-pod created successfully with VLAN 0" in result.stdout
+        call = async_v1.patch_namespaced_pod.await_args.kwargs
+        body = call["body"]
+        assert call["name"] == "test-pod"
+        assert call["_content_type"] == "application/apply-patch+yaml"
+        assert body["metadata"]["labels"] == {"vlan-0": "true", "app": "test-pod"}
+        assert fake_watch.calls[0]["field_selector"] == "metadata.name=test-pod"
+        k8s_handler.k8s.v1.patch_namespaced_pod.assert_not_called()
+    
+    def test_create_pod_with_vlan_async_api_error(self, k8s_handler, async_v1):
+        """Test async API errors become a failed result"""
+        from kubernetes_asyncio.client.exceptions import ApiException
+        async_v1.patch_namespaced_pod.side_effect = ApiException(status=422, reason="Unprocessable Entity")
+        
+        result = asyncio.run(k8s_handler.create_pod_with_vlan_async(
+            "test-pod", "nginx:alpine", 0, NetworkConfig(interface="eth0")
+        ))
+        
+        assert result.success is False
+        assert "Failed to create pod" in result.stderr
+    
+    def test_wait_for_pod_ready_async_timeout(self, k8s_handler):
+        """Test the async wait gives up once the timeout elapses"""
+        pending = Mock()
+        pending.status.phase = "Pending"
+        fake_watch = _FakeAsyncWatch([{"type": "ADDED", "object": pending}], idle=0.25)
+        
+        with patch('pod.os_abstraction.kubernetes.async_watch.Watch', return_value=fake_watch):
+            result = asyncio.run(k8s_handler._wait_for_pod_ready_async("test-pod", timeout=0.2))
+        
+        assert result is False
+        assert fake_watch.calls[0]["timeout_seconds"] == 1
+        assert len(fake_watch.calls) == 1
+    
+    def test_delete_pod_async(self, k8s_handler, async_v1):
+        """Test async pod deletion"""
+        result = asyncio.run(k8s_handler.delete_pod_async("test-pod"))
+        
+        assert result.success is True
+        async_v1.delete_namespaced_pod.assert_awaited_once_with(
+            name="test-pod", namespace="test-namespace"
+        )
+    
+    def test_test_network_connectivity_many_runs_concurrently(self, k8s_handler):
+        """Test every target's exec is in flight at once and results keep target order"""
+        started = []
+        all_started = asyncio.Event()
+        
+        async def execute(command, **kwargs):
+            started.append(command)
+            if len(started) == 3:
+                all_started.set()
+            await asyncio.wait_for(all_started.wait(), timeout=1)
+            if "10.0.0.2" in command:
+                return "", "unreachable", 1
+            return f"ok {command}", "", 0
+        
+        k8s_handler.k8s.execute_command_async.side_effect = execute
+        
+        results = asyncio.run(k8s_handler.test_network_connectivity_many(
+            "source-pod", [("10.0.0.1", None), ("10.0.0.2", 80), ("10.0.0.3", 443)]
+        ))
+        
+        assert [r.command for r in results] == [
+            "ping -c 3 10.0.0.1", "nc -zv 10.0.0.2 80", "nc -zv 10.0.0.3 443"
+        ]
+        assert [r.success for r in results] == [True, False, True]
+        assert k8s_handler.k8s.execute_command_async.call_args.kwargs == {
+            "pod_name": "source-pod", "namespace": "test-namespace"
+        }
+    
+    def test_test_network_connectivity_async_failure(self, k8s_handler):
+        """Test the single-target async check reports exec errors as a failed result"""
+        k8s_handler.k8s.execute_command_async.side_effect = ValueError("pod gone")
+        
+        result = asyncio.run(k8s_handler.test_network_connectivity_async("source-pod", "10.0.0.1"))
+        
+        assert result.success is False
+        assert result.command == "ping -c 3 10.0.0.1"
+        assert "pod gone" in result.stderr
@@ -63,28 +63,31 @@ class TestLinuxHandler:
         handler = linux_handler_with_mock_connection
         
         # Mock successful JSON command
-        success_result = CommandResult("", "", 0, True, "ip -j addr show", 0.1)
+        success_result = CommandResult("", "", 0, "ip -j addr show", 0.1)
         success_result.stdout = mock_ip_addr_json
         
         with patch.object(handler, 'execute_command', return_value=success_result):
-            with patch.object(handler, '_get_default_gateway', return_value="192.168.1.1"):
+            with patch.object(handler, '_get_default_gateways', return_value={"eth0": "192.168.1.1"}) as mock_gateways:
                 interfaces = handler.get_network_interfaces()
         
+        mock_gateways.assert_called_once_with()
         assert len(interfaces) == 2
         assert interfaces[0].name == "lo"
         assert interfaces[0].ip_addresses == ["127.0.0.1"]
+        assert interfaces[0].gateway is None
         assert interfaces[1].name == "eth0"
         assert interfaces[1].ip_addresses == ["192.168.1.100"]
         assert interfaces[1].mac_address == "00:50:56:12:34:56"
+        assert interfaces[1].gateway == "192.168.1.1"
 
     def test_get_network_interfaces_json_fallback(self, linux_handler_with_mock_connection):
         """Test getting network interfaces with JSON fallback to text"""
         handler = linux_handler_with_mock_connection
         
         # Mock failed JSON command, successful text command
-        failed_result = CommandResult("", "error", 1, False, "ip -j addr show", 0.1)
+        failed_result = CommandResult("", "error", 1, "ip -j addr show", 0.1)
         text_output = "1: lo: <LOOPBACK,UP,LOWER_UP> mtu 65536 qdisc noqueue state UNKNOWN\n    inet 127.0.0.1/8 scope host lo"
-        success_result = CommandResult("", "", 0, True, "ip addr show", 0.1)
+        success_result = CommandResult("", "", 0, "ip addr show", 0.1)
         success_result.stdout = text_output
         
         with patch.object(handler, 'execute_command', side_effect=[failed_result, success_result]):
@@ -98,7 +101,7 @@ class TestLinuxHandler:
         handler = linux_handler_with_mock_connection
         
         # Mock successful command but invalid JSON
-        success_result = CommandResult("", "", 0, True, "ip -j addr show", 0.1)
+        success_result = CommandResult("", "", 0, "ip -j addr show", 0.1)
         success_result.stdout = "invalid json"
         
         with patch.object(handler, 'execute_command', return_value=success_result):
@@ -112,11 +115,11 @@ class TestLinuxHandler:
         handler = linux_handler_with_mock_connection
         
         # Mock detection and NetworkManager configuration
-        nm_active = CommandResult("active", "", 0, True, "systemctl is-active NetworkManager", 0.1)
-        systemd_inactive = CommandResult("inactive", "", 1, False, "systemctl is-active systemd-networkd", 0.1)
-        delete_result = CommandResult("", "", 0, True, "nmcli con delete", 0.1)
-        config_success = CommandResult("", "", 0, True, "nmcli con add", 0.1)
-        activate_success = CommandResult("", "", 0, True, "nmcli con up", 0.1)
+        nm_active = CommandResult("active", "", 0, "systemctl is-active NetworkManager", 0.1)
+        systemd_inactive = CommandResult("inactive", "", 1, "systemctl is-active systemd-networkd", 0.1)
+        delete_result = CommandResult("", "", 0, "nmcli con delete", 0.1)
+        config_success = CommandResult("", "", 0, "nmcli con add", 0.1)
+        activate_success = CommandResult("", "", 0, "nmcli con up", 0.1)
         
         with patch.object(handler, 'execute_command', side_effect=[nm_active, systemd_inactive, delete_result, config_success, activate_success]):
             with patch.object(handler, '_netmask_to_prefix', return_value=24):
@@ -129,11 +132,11 @@ class TestLinuxHandler:
         handler = linux_handler_with_mock_connection
         
         # Mock systemd-networkd detection
-        nm_inactive = CommandResult("inactive", "", 1, False, "systemctl is-active NetworkManager", 0.1)
-        systemd_active = CommandResult("active", "", 0, True, "systemctl is-active systemd-networkd", 0.1)
+        nm_inactive = CommandResult("inactive", "", 1, "systemctl is-active NetworkManager", 0.1)
+        systemd_active = CommandResult("active", "", 0, "systemctl is-active systemd-networkd", 0.1)
         
         with patch.object(handler, 'execute_command', side_effect=[nm_inactive, systemd_active]):
-            with patch.object(handler, '_configure_network_systemd', return_value=CommandResult("", "", 0, True, "configure", 0.1)) as mock_systemd:
+            with patch.object(handler, '_configure_network_systemd', return_value=CommandResult("", "", 0, "configure", 0.1)) as mock_systemd:
                 result = handler.configure_network(sample_network_config)
         
         mock_systemd.assert_called_once_with(sample_network_config)
@@ -144,20 +147,32 @@ class TestLinuxHandler:
         handler = linux_handler_with_mock_connection
         
         # Mock no network managers active
-        nm_inactive = CommandResult("inactive", "", 1, False, "systemctl is-active NetworkManager", 0.1)
-        systemd_inactive = CommandResult("inactive", "", 1, False, "systemctl is-active systemd-networkd", 0.1)
+        nm_inactive = CommandResult("inactive", "", 1, "systemctl is-active NetworkManager", 0.1)
+        systemd_inactive = CommandResult("inactive", "", 1, "systemctl is-active systemd-networkd", 0.1)
         
         with patch.object(handler, 'execute_command', side_effect=[nm_inactive, systemd_inactive]):
-            with patch.object(handler, '_configure_network_ip', return_value=CommandResult("", "", 0, True, "configure", 0.1)) as mock_ip:
+            with patch.object(handler, '_configure_network_ip', return_value=CommandResult("", "", 0, "configure", 0.1)) as mock_ip:
                 result = handler.configure_network(sample_network_config)
         
         mock_ip.assert_called_once_with(sample_network_config)
         assert result.success is True
 
+    def test_detect_network_manager_cached(self, linux_handler_with_mock_connection):
+        """Test network manager detection runs once per handler"""
+        handler = linux_handler_with_mock_connection
+        nm_inactive = CommandResult("inactive", "", 3, "systemctl is-active NetworkManager", 0.1)
+        systemd_active = CommandResult("active", "", 0, "systemctl is-active systemd-networkd", 0.1)
+        
+        with patch.object(handler, 'execute_command', side_effect=[nm_inactive, systemd_active]) as mock_exec:
+            assert handler._detect_network_manager() == 'systemd-networkd'
+            assert handler._detect_network_manager() == 'systemd-networkd'
+        
+        assert mock_exec.call_count == 2
+
     def test_restart_network_service_success(self, linux_handler_with_mock_connection):
         """Test successful network service restart"""
         handler = linux_handler_with_mock_connection
-        success_result = CommandResult("", "", 0, True, "systemctl restart NetworkManager", 0.1)
+        success_result = CommandResult("", "", 0, "systemctl restart NetworkManager", 0.1)
         
         with patch.object(handler, 'execute_command', return_value=success_result):
             result = handler.restart_network_service()
@@ -169,8 +184,8 @@ class TestLinuxHandler:
         handler = linux_handler_with_mock_connection
         
         # Mock failures for first few services, success for last
-        failed_result = CommandResult("", "error", 1, False, "systemctl restart", 0.1)
-        success_result = CommandResult("", "", 0, True, "ifdown -a && ifup -a", 0.1)
+        failed_result = CommandResult("", "error", 1, "systemctl restart", 0.1)
+        success_result = CommandResult("", "", 0, "ifdown -a && ifup -a", 0.1)
         
         with patch.object(handler, 'execute_command', side_effect=[failed_result, failed_result, failed_result, failed_result, success_result]):
             result = handler.restart_network_service()
@@ -190,16 +205,17 @@ class TestLinuxHandler:
         """Test getting new OS info"""
         handler = linux_handler_with_mock_connection
         
-        os_release_result = CommandResult("", "", 0, True, "cat /etc/os-release", 0.1)
-        os_release_result.stdout = mock_os_release_content
-        
-        kernel_result = CommandResult("5.14.0-70.el9.x86_64", "", 0, True, "uname -r", 0.1)
-        arch_result = CommandResult("x86_64", "", 0, True, "uname -m", 0.1)
-        hostname_result = CommandResult("test-vm", "", 0, True, "hostname", 0.1)
+        batched = CommandResult(
+            "\x1e".join([mock_os_release_content, "5.14.0-70.el9.x86_64\n", "x86_64\n", "test-vm\n"]),
+            "", 0, "batched", 0.1
+        )
         
-        with patch.object(handler, 'execute_command', side_effect=[os_release_result, kernel_result, arch_result, hostname_result]):
+        with patch.object(handler, 'execute_command', return_value=batched) as mock_exec:
             result = handler.get_os_info()
         
+        mock_exec.assert_called_once_with(
+            "cat /etc/os-release; printf '\\036'; uname -r; printf '\\036'; uname -m; printf '\\036'; hostname"
+        )
         assert result['type'] == 'linux'
         assert result['distribution'] == 'Rocky Linux'
         assert result['version'] == '9.0 (Blue Onyx)'
@@ -208,12 +224,25 @@ class TestLinuxHandler:
         assert result['hostname'] == 'test-vm'
         assert handler._os_info == result
 
+    def test_get_os_info_missing_sections(self, linux_handler_with_mock_connection):
+        """Test failed or truncated batched commands leave their facts unknown"""
+        handler = linux_handler_with_mock_connection
+        truncated = CommandResult('NAME="Ubuntu"\n\x1e\x1ex86_64\n', "", 0, "batched", 0.1)
+        
+        with patch.object(handler, 'execute_command', return_value=truncated):
+            result = handler.get_os_info()
+        
+        assert result['distribution'] == 'Ubuntu'
+        assert result['kernel'] == 'unknown'
+        assert result['architecture'] == 'x86_64'
+        assert result['hostname'] == 'unknown'
+
     def test_install_package_dnf(self, linux_handler_with_mock_connection):
         """Test package installation with dnf"""
         handler = linux_handler_with_mock_connection
         
-        dnf_found = CommandResult("/usr/bin/dnf", "", 0, True, "which dnf", 0.1)
-        install_success = CommandResult("", "", 0, True, "dnf install -y tcpdump", 0.1)
+        dnf_found = CommandResult("/usr/bin/dnf", "", 0, "which dnf", 0.1)
+        install_success = CommandResult("", "", 0, "dnf install -y tcpdump", 0.1)
         
         with patch.object(handler, 'execute_command', side_effect=[dnf_found, install_success]):
             result = handler.install_package("tcpdump")
@@ -224,21 +253,36 @@ class TestLinuxHandler:
         """Test package installation with apt"""
         handler = linux_handler_with_mock_connection
         
-        dnf_not_found = CommandResult("", "not found", 1, False, "which dnf", 0.1)
-        yum_not_found = CommandResult("", "not found", 1, False, "which yum", 0.1)
-        apt_found = CommandResult("/usr/bin/apt-get", "", 0, True, "which apt-get", 0.1)
-        install_success = CommandResult("", "", 0, True, "apt-get install -y tcpdump", 0.1)
+        apt_found = CommandResult("/usr/bin/apt-get\n", "", 0, "command -v", 0.1)
+        install_success = CommandResult("", "", 0, "apt-get install -y tcpdump", 0.1)
         
-        with patch.object(handler, 'execute_command', side_effect=[dnf_not_found, yum_not_found, apt_found, install_success]):
+        with patch.object(handler, 'execute_command', side_effect=[apt_found, install_success]) as mock_exec:
             result = handler.install_package("tcpdump")
         
         assert result.success is True
+        mock_exec.assert_any_call("for m in dnf yum apt-get zypper pacman; do command -v $m && break; done")
+        mock_exec.assert_called_with("apt-get install -y tcpdump", as_admin=True)
+
+    def test_install_package_detects_manager_once(self, linux_handler_with_mock_connection):
+        """Test the package manager is detected on the first install only"""
+        handler = linux_handler_with_mock_connection
+        
+        dnf_found = CommandResult("/usr/bin/dnf", "", 0, "command -v", 0.1)
+        install_success = CommandResult("", "", 0, "dnf install -y", 0.1)
+        
+        with patch.object(handler, 'execute_command',
+                          side_effect=[dnf_found, install_success, install_success]) as mock_exec:
+            handler.install_package("tcpdump")
+            handler.install_package("iperf3")
+        
+        assert mock_exec.call_count == 3
+        mock_exec.assert_called_with("dnf install -y iperf3", as_admin=True)
 
     def test_install_package_no_manager(self, linux_handler_with_mock_connection):
         """Test package installation with no package manager"""
         handler = linux_handler_with_mock_connection
         
-        not_found = CommandResult("", "not found", 1, False, "which", 0.1)
+        not_found = CommandResult("", "not found", 1, "which", 0.1)
         
         with patch.object(handler, 'execute_command', return_value=not_found):
             result = handler.install_package("tcpdump")
@@ -249,7 +293,7 @@ class TestLinuxHandler:
     def test_start_service(self, linux_handler_with_mock_connection):
         """Test starting a service"""
         handler = linux_handler_with_mock_connection
-        success_result = CommandResult("", "", 0, True, "systemctl start nginx", 0.1)
+        success_result = CommandResult("", "", 0, "systemctl start nginx", 0.1)
         
         with patch.object(handler, 'execute_command', return_value=success_result):
             result = handler.start_service("nginx")
@@ -259,7 +303,7 @@ class TestLinuxHandler:
     def test_stop_service(self, linux_handler_with_mock_connection):
         """Test stopping a service"""
         handler = linux_handler_with_mock_connection
-        success_result = CommandResult("", "", 0, True, "systemctl stop nginx", 0.1)
+        success_result = CommandResult("", "", 0, "systemctl stop nginx", 0.1)
         
         with patch.object(handler, 'execute_command', return_value=success_result):
             result = handler.stop_service("nginx")
@@ -269,7 +313,7 @@ class TestLinuxHandler:
     def test_get_service_status(self, linux_handler_with_mock_connection):
         """Test getting service status"""
         handler = linux_handler_with_mock_connection
-        success_result = CommandResult("active (running)", "", 0, True, "systemctl status nginx", 0.1)
+        success_result = CommandResult("active (running)", "", 0, "systemctl status nginx", 0.1)
         
         with patch.object(handler, 'execute_command', return_value=success_result):
             result = handler.get_service_status("nginx")
@@ -280,7 +324,7 @@ class TestLinuxHandler:
     def test_create_user_without_password(self, linux_handler_with_mock_connection):
         """Test creating user without password"""
         handler = linux_handler_with_mock_connection
-        success_result = CommandResult("", "", 0, True, "useradd testuser", 0.1)
+        success_result = CommandResult("", "", 0, "useradd testuser", 0.1)
         
         with patch.object(handler, 'execute_command', return_value=success_result):
             result = handler.create_user("testuser")
@@ -290,8 +334,8 @@ class TestLinuxHandler:
     def test_create_user_with_password(self, linux_handler_with_mock_connection):
         """Test creating user with password"""
         handler = linux_handler_with_mock_connection
-        user_success = CommandResult("", "", 0, True, "useradd testuser", 0.1)
-        pass_success = CommandResult("", "", 0, True, "echo 'testuser:password' | chpasswd", 0.1)
+        user_success = CommandResult("", "", 0, "useradd testuser", 0.1)
+        pass_success = CommandResult("", "", 0, "echo 'testuser:password' | chpasswd", 0.1)
         
         with patch.object(handler, 'execute_command', side_effect=[user_success, pass_success]):
             result = handler.create_user("testuser", password="password")
@@ -301,7 +345,7 @@ class TestLinuxHandler:
     def test_create_user_with_groups(self, linux_handler_with_mock_connection):
         """Test creating user with groups"""
         handler = linux_handler_with_mock_connection
-        success_result = CommandResult("", "", 0, True, "useradd testuser -G wheel,docker", 0.1)
+        success_result = CommandResult("", "", 0, "useradd testuser -G wheel,docker", 0.1)
         
         with patch.object(handler, 'execute_command', return_value=success_result):
             result = handler.create_user("testuser", groups=["wheel", "docker"])
@@ -311,7 +355,7 @@ class TestLinuxHandler:
     def test_set_hostname(self, linux_handler_with_mock_connection):
         """Test setting hostname"""
         handler = linux_handler_with_mock_connection
-        success_result = CommandResult("", "", 0, True, "hostnamectl set-hostname test-host", 0.1)
+        success_result = CommandResult("", "", 0, "hostnamectl set-hostname test-host", 0.1)
         
         with patch.object(handler, 'execute_command', return_value=success_result):
             result = handler.set_hostname("test-host")
@@ -321,7 +365,7 @@ class TestLinuxHandler:
     def test_get_processes(self, linux_handler_with_mock_connection, mock_ps_aux_output):
         """Test getting processes"""
         handler = linux_handler_with_mock_connection
-        success_result = CommandResult("", "", 0, True, "ps aux", 0.1)
+        success_result = CommandResult("", "", 0, "ps aux", 0.1)
         success_result.stdout = mock_ps_aux_output
         
         with patch.object(handler, 'execute_command', return_value=success_result):
@@ -336,7 +380,7 @@ class TestLinuxHandler:
     def test_kill_process(self, linux_handler_with_mock_connection):
         """Test killing a process"""
         handler = linux_handler_with_mock_connection
-        success_result = CommandResult("", "", 0, True, "kill -15 1234", 0.1)
+        success_result = CommandResult("", "", 0, "kill -15 1234", 0.1)
         
         with patch.object(handler, 'execute_command', return_value=success_result):
             result = handler.kill_process(1234)
@@ -346,7 +390,7 @@ class TestLinuxHandler:
     def test_kill_process_custom_signal(self, linux_handler_with_mock_connection):
         """Test killing a process with custom signal"""
         handler = linux_handler_with_mock_connection
-        success_result = CommandResult("", "", 0, True, "kill -9 1234", 0.1)
+        success_result = CommandResult("", "", 0, "kill -9 1234", 0.1)
         
         with patch.object(handler, 'execute_command', return_value=success_result):
             result = handler.kill_process(1234, signal=9)
@@ -356,7 +400,7 @@ class TestLinuxHandler:
     def test_get_disk_usage(self, linux_handler_with_mock_connection, mock_df_output):
         """Test getting disk usage"""
         handler = linux_handler_with_mock_connection
-        success_result = CommandResult("", "", 0, True, "df -h", 0.1)
+        success_result = CommandResult("", "", 0, "df -h", 0.1)
         success_result.stdout = mock_df_output
         
         with patch.object(handler, 'execute_command', return_value=success_result):
@@ -368,27 +412,55 @@ class TestLinuxHandler:
         assert disks[0]['use_percent'] == '28'
         assert disks[0]['mount_point'] == '/'
 
-    def test_get_memory_info(self, linux_handler_with_mock_connection, mock_free_output):
+    def test_get_memory_info(self, linux_handler_with_mock_connection, mock_meminfo_output):
         """Test getting memory info"""
         handler = linux_handler_with_mock_connection
-        success_result = CommandResult("", "", 0, True, "free -b", 0.1)
-        success_result.stdout = mock_free_output
+        success_result = CommandResult(mock_meminfo_output, "", 0, "meminfo", 0.1)
         
-        with patch.object(handler, 'execute_command', return_value=success_result):
+        with patch.object(handler, 'execute_command', return_value=success_result) as mock_exec:
             info = handler.get_memory_info()
         
-        assert info['total'] == 4147159040
-        assert info['used'] == 524288000
-        assert info['free'] == 3000000000
-        assert info['available'] == 3500000000
-        assert info['swap_total'] == 2147483648
+        assert "/proc/meminfo" in mock_exec.call_args.args[0]
+        assert info['total'] == 4049960 * 1024
+        assert info['free'] == 2929688 * 1024
+        assert info['used'] == (4049960 - 2929688 - 102400 - 450000 - 55872) * 1024
+        assert info['available'] == 3417968 * 1024
+        assert info['swap_total'] == 2097152 * 1024
         assert info['swap_used'] == 0
-        assert info['swap_free'] == 2147483648
+        assert info['swap_free'] == 2097152 * 1024
+
+    def test_get_memory_info_cached(self, linux_handler_with_mock_connection, mock_meminfo_output):
+        """Test memory info is reused within its TTL and refetched after it"""
+        handler = linux_handler_with_mock_connection
+        success_result = CommandResult(mock_meminfo_output, "", 0, "meminfo", 0.1)
+        
+        with patch.object(handler, 'execute_command', return_value=success_result) as mock_exec, \
+                patch('pod.os_abstraction.linux.time.monotonic', side_effect=[100.0, 102.0, 106.0, 106.0]):
+            first = handler.get_memory_info()
+            first['total'] = 0
+            second = handler.get_memory_info()
+            handler.get_memory_info()
+        
+        assert second['total'] == 4049960 * 1024
+        assert mock_exec.call_count == 2
+
+    def test_get_cpu_info_failure_not_cached(self, linux_handler_with_mock_connection, mock_lscpu_output):
+        """Test a failed CPU query is retried on the next call"""
+        handler = linux_handler_with_mock_connection
+        failed = CommandResult("", "lscpu: not found", 127, "lscpu", 0.1)
+        success_result = CommandResult(mock_lscpu_output, "", 0, "lscpu", 0.1)
+        
+        with patch.object(handler, 'execute_command', side_effect=[failed, success_result]) as mock_exec:
+            assert handler.get_cpu_info()['count'] == 0
+            assert handler.get_cpu_info()['count'] == 4
+            assert handler.get_cpu_info()['count'] == 4
+        
+        assert mock_exec.call_count == 2
 
     def test_get_cpu_info(self, linux_handler_with_mock_connection, mock_lscpu_output):
         """Test getting CPU info"""
         handler = linux_handler_with_mock_connection
-        success_result = CommandResult("", "", 0, True, "lscpu", 0.1)
+        success_result = CommandResult("", "", 0, "lscpu", 0.1)
         success_result.stdout = mock_lscpu_output
         
         with patch.object(handler, 'execute_command', return_value=success_result):
@@ -422,7 +494,7 @@ class TestLinuxHandler:
     def test_file_exists_true(self, linux_handler_with_mock_connection):
         """Test file exists check - file exists"""
         handler = linux_handler_with_mock_connection
-        success_result = CommandResult("", "", 0, True, "test -e '/path/file.txt'", 0.1)
+        success_result = CommandResult("", "", 0, "test -e '/path/file.txt'", 0.1)
         
         with patch.object(handler, 'execute_command', return_value=success_result):
             result = handler.file_exists("/path/file.txt")
@@ -432,7 +504,7 @@ class TestLinuxHandler:
     def test_file_exists_false(self, linux_handler_with_mock_connection):
         """Test file exists check - file doesn't exist"""
         handler = linux_handler_with_mock_connection
-        failed_result = CommandResult("", "", 1, False, "test -e '/path/file.txt'", 0.1)
+        failed_result = CommandResult("", "", 1, "test -e '/path/file.txt'", 0.1)
         
         with patch.object(handler, 'execute_command', return_value=failed_result):
             result = handler.file_exists("/path/file.txt")
@@ -442,7 +514,7 @@ class TestLinuxHandler:
     def test_create_directory(self, linux_handler_with_mock_connection):
         """Test directory creation"""
         handler = linux_handler_with_mock_connection
-        success_result = CommandResult("", "", 0, True, "mkdir -p '/path/dir'", 0.1)
+        success_result = CommandResult("", "", 0, "mkdir -p '/path/dir'", 0.1)
         
         with patch.object(handler, 'execute_command', return_value=success_result):
             result = handler.create_directory("/path/dir")
@@ -452,7 +524,7 @@ class TestLinuxHandler:
     def test_create_directory_non_recursive(self, linux_handler_with_mock_connection):
         """Test non-recursive directory creation"""
         handler = linux_handler_with_mock_connection
-        success_result = CommandResult("", "", 0, True, "mkdir  '/path/dir'", 0.1)
+        success_result = CommandResult("", "", 0, "mkdir  '/path/dir'", 0.1)
         
         with patch.object(handler, 'execute_command', return_value=success_result):
             result = handler.create_directory("/path/dir", recursive=False)
@@ -462,7 +534,7 @@ class TestLinuxHandler:
     def test_remove_file(self, linux_handler_with_mock_connection):
         """Test file removal"""
         handler = linux_handler_with_mock_connection
-        success_result = CommandResult("", "", 0, True, "rm -f '/path/file.txt'", 0.1)
+        success_result = CommandResult("", "", 0, "rm -f '/path/file.txt'", 0.1)
         
         with patch.object(handler, 'execute_command', return_value=success_result):
             result = handler.remove_file("/path/file.txt")
@@ -477,7 +549,7 @@ drwxr-xr-x 2 root root 4096 Oct 1 10:30 .
 drwxr-xr-x 3 root root 4096 Oct 1 10:29 ..
 -rw-r--r-- 1 root root   12 Oct 1 10:30 test.txt"""
         
-        success_result = CommandResult("", "", 0, True, "ls -la '/path'", 0.1)
+        success_result = CommandResult("", "", 0, "ls -la '/path'", 0.1)
         success_result.stdout = ls_output
         
         with patch.object(handler, 'execute_command', return_value=success_result):
@@ -492,7 +564,7 @@ drwxr-xr-x 3 root root 4096 Oct 1 10:29 ..
     def test_reboot(self, linux_handler_with_mock_connection):
         """Test system reboot"""
         handler = linux_handler_with_mock_connection
-        success_result = CommandResult("", "", 0, True, "shutdown -r now", 0.1)
+        success_result = CommandResult("", "", 0, "shutdown -r now", 0.1)
         
         with patch.object(handler, 'execute_command', return_value=success_result):
             with patch.object(handler.connection, 'wait_for_reboot') as mock_wait:
@@ -504,7 +576,7 @@ drwxr-xr-x 3 root root 4096 Oct 1 10:29 ..
     def test_reboot_no_wait(self, linux_handler_with_mock_connection):
         """Test system reboot without waiting"""
         handler = linux_handler_with_mock_connection
-        success_result = CommandResult("", "", 0, True, "shutdown -r now", 0.1)
+        success_result = CommandResult("", "", 0, "shutdown -r now", 0.1)
         
         with patch.object(handler, 'execute_command', return_value=success_result):
             result = handler.reboot(wait_for_reboot=False)
@@ -514,7 +586,7 @@ drwxr-xr-x 3 root root 4096 Oct 1 10:29 ..
     def test_shutdown(self, linux_handler_with_mock_connection):
         """Test system shutdown"""
         handler = linux_handler_with_mock_connection
-        success_result = CommandResult("", "", 0, True, "shutdown -h now", 0.1)
+        success_result = CommandResult("", "", 0, "shutdown -h now", 0.1)
         
         with patch.object(handler, 'execute_command', return_value=success_result):
             result = handler.shutdown()
@@ -539,28 +611,72 @@ drwxr-xr-x 3 root root 4096 Oct 1 10:29 ..
         assert handler._netmask_to_prefix("255.255.0.0") == 16
         assert handler._netmask_to_prefix("255.0.0.0") == 8
         assert handler._netmask_to_prefix("255.255.255.252") == 30
+        # Non-contiguous masks are bit-counted
+        assert handler._netmask_to_prefix("255.0.255.0") == 16
+
+    def test_netmask_tables_round_trip(self, linux_handler_with_mock_connection):
+        """Test every prefix maps to its mask and back"""
+        handler = linux_handler_with_mock_connection
+        
+        for prefix in range(33):
+            assert handler._netmask_to_prefix(handler._prefix_to_netmask(prefix)) == prefix
+        assert handler._prefix_to_netmask(0) == "0.0.0.0"
+        assert handler._prefix_to_netmask(32) == "255.255.255.255"
+        # Non-contiguous masks are not in the table and still count bits
+        assert handler._netmask_to_prefix("255.0.255.0") == 16
 
     def test_get_default_gateway(self, linux_handler_with_mock_connection):
         """Test getting default gateway"""
         handler = linux_handler_with_mock_connection
-        route_output = "default via 192.168.1.1 dev eth0 proto dhcp metric 100"
-        success_result = CommandResult("", "", 0, True, "ip route show default dev eth0", 0.1)
-        success_result.stdout = route_output
+        route_output = json.dumps([{"dst": "default", "gateway": "192.168.1.1", "dev": "eth0"}])
+        success_result = CommandResult(route_output, "", 0, "ip -j route show default", 0.1)
         
         with patch.object(handler, 'execute_command', return_value=success_result):
-            gateway = handler._get_default_gateway("eth0")
+            gateways = handler._get_default_gateways()
         
-        assert gateway == "192.168.1.1"
+        assert gateways.get("eth0") == "192.168.1.1"
+
+    def test_get_default_gateways_json(self, linux_handler_with_mock_connection):
+        """Test default gateways of all interfaces come from one JSON route query"""
+        handler = linux_handler_with_mock_connection
+        routes = CommandResult(json.dumps([
+            {"dst": "default", "gateway": "192.168.1.1", "dev": "eth0", "metric": 100},
+            {"dst": "default", "gateway": "192.168.1.254", "dev": "eth0", "metric": 200},
+            {"dst": "default", "gateway": "10.0.0.1", "dev": "eth1"},
+            {"dst": "default", "dev": "wg0"},
+        ]), "", 0, "ip -j route show default", 0.1)
+        
+        with patch.object(handler, 'execute_command', return_value=routes) as mock_exec:
+            gateways = handler._get_default_gateways()
+        
+        mock_exec.assert_called_once_with("ip -j route show default")
+        assert gateways == {"eth0": "192.168.1.1", "eth1": "10.0.0.1"}
+
+    def test_get_default_gateways_text_fallback(self, linux_handler_with_mock_connection):
+        """Test default gateways are parsed from text when ip lacks JSON output"""
+        handler = linux_handler_with_mock_connection
+        no_json = CommandResult("", "Option \"-j\" is unknown", 255, "ip -j route show default", 0.1)
+        text = CommandResult(
+            "default via 192.168.1.1 dev eth0 proto dhcp metric 100\n"
+            "default via 10.0.0.1 dev eth1 proto static\n",
+            "", 0, "ip route show default", 0.1
+        )
+        
+        with patch.object(handler, 'execute_command', side_effect=[no_json, text]):
+            gateways = handler._get_default_gateways()
+        
+        assert gateways == {"eth0": "192.168.1.1", "eth1": "10.0.0.1"}
 
     def test_get_default_gateway_not_found(self, linux_handler_with_mock_connection):
         """Test getting default gateway when not found"""
         handler = linux_handler_with_mock_connection
-        failed_result = CommandResult("", "", 1, False, "ip route show default dev eth0", 0.1)
+        failed_result = CommandResult("", "", 1, "ip route show default", 0.1)
         
-        with patch.object(handler, 'execute_command', return_value=failed_result):
-            gateway = handler._get_default_gateway("eth0")
+        with patch.object(handler, 'execute_command', return_value=failed_result) as mock_exec:
+            gateways = handler._get_default_gateways()
         
-        assert gateway is None
+        assert mock_exec.call_count == 2
+        assert gateways.get("eth0") is None
 
     def test_get_interface_type(self, linux_handler_with_mock_connection):
         """Test determining interface type"""
@@ -174,14 +174,8 @@ class TestLinuxHandlerExtended:
     
     def test_install_package_no_manager_found(self, linux_handler, mock_ssh_connection):
         """Test package installation when no package manager is found"""
-        # All package managers fail
-        mock_ssh_connection.execute_command.side_effect = [
-            ("", "command not found", 1),  # dnf
-            ("", "command not found", 1),  # yum
-            ("", "command not found", 1),  # apt-get
-            ("", "command not found", 1),  # zypper
-            ("", "command not found", 1),  # pacman
-        ]
+        # command -v finds none of the package managers
+        mock_ssh_connection.execute_command.return_value = ("", "", 0)
         
         result = linux_handler.install_package("test-package")
         
@@ -263,11 +257,15 @@ class TestLinuxHandlerExtended:
     
     def test_memory_info_edge_cases(self, linux_handler, mock_ssh_connection):
         """Test memory info parsing edge cases"""
-        # Output without available memory (older systems)
+        # No MemAvailable before Linux 3.14, and no swap configured
         mock_ssh_connection.execute_command.return_value = (
-            "              total        used        free      shared  buff/cache   available\n"
-            "Mem:     8589934592  4294967296  2147483648   134217728  2147483648\n"
-            "Swap:    4294967296  1073741824  3221225472",
+            "MemTotal: 8388608\n"
+            "MemFree: 2097152\n"
+            "Buffers: 1048576\n"
+            "Cached: 1048576\n"
+            "SwapTotal: 0\n"
+            "SwapFree: 0\n"
+            "garbage line here\n",
             "", 0
         )
         
@@ -277,4 +275,5 @@ class TestLinuxHandlerExtended:
         assert memory['used'] == 4294967296
         assert memory['free'] == 2147483648
         assert memory['available'] == memory['free']  # Falls back to free
-        assert memory['swap_total'] == 4294967296
\ No newline at end of file
+        assert memory['swap_total'] == 0
+        assert memory['swap_used'] == 0
\ No newline at end of file
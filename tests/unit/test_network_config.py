@@ -2,6 +2,7 @@
 Unit tests for Network Configuration
 """
 
+import asyncio
 import pytest
 from unittest.mock import Mock, patch
 from pyVmomi import vim
@@ -34,6 +35,16 @@ class TestNetworkConfigurator:
         mock_vm.ReconfigVM_Task.assert_called_once()
         mock_vsphere_client.wait_for_task.assert_called_once_with(mock_task)
 
+    def test_configure_vlan_many(self, mock_vsphere_client):
+        """Test configuring the same VLAN across many VMs"""
+        configurator = NetworkConfigurator(mock_vsphere_client)
+        
+        with patch.object(configurator, 'configure_vlan', return_value=True) as mock_configure:
+            result = configurator.configure_vlan_many(["vm-1", "vm-2"], "Network adapter 1", 100)
+        
+        assert result == {"vm-1": True, "vm-2": True}
+        mock_configure.assert_any_call("vm-2", "Network adapter 1", 100, None)
+
     def test_configure_vlan_adapter_not_found(self, mock_vsphere_client, mock_vm):
         """Test VLAN configuration with non-existent adapter"""
         mock_vsphere_client.get_vm.return_value = mock_vm
@@ -283,6 +294,49 @@ class TestNetworkConfigurator:
         
         assert result == 1
 
+    def test_get_next_adapter_number_ignores_missing_labels(self, mock_vsphere_client, mock_vm):
+        """Test adapters without device info or label are skipped"""
+        from tests.mocks.vsphere.network_adapters import create_mock_vmxnet3
+        unlabelled = create_mock_vmxnet3(4000, "Network adapter 1")
+        unlabelled.deviceInfo.label = None
+        no_info = create_mock_vmxnet3(4001, "Network adapter 5")
+        no_info.deviceInfo = None
+        mock_vm.config.hardware.device = [unlabelled, no_info, create_mock_vmxnet3(4002, "Network adapter 2")]
+        
+        configurator = NetworkConfigurator(mock_vsphere_client)
+        
+        assert configurator._get_next_adapter_number(mock_vm) == 3
+
+    def test_get_next_adapter_number_cached(self, mock_vsphere_client, mock_vm, mock_network):
+        """Test adapter numbers are cached per VM and bumped on add"""
+        from tests.mocks.vsphere.network_adapters import create_mock_vmxnet3
+        mock_vm._moId = "vm-42"
+        mock_vm.config.hardware.device = [create_mock_vmxnet3(4000, "Network adapter 3")]
+        mock_vsphere_client.get_vm.return_value = mock_vm
+        mock_vsphere_client.get_network.return_value = mock_network
+        
+        configurator = NetworkConfigurator(mock_vsphere_client)
+        first = configurator.add_network_adapter("test-vm", "test-network")
+        
+        # Later scans of the device list are skipped
+        mock_vm.config.hardware.device = []
+        second = configurator.add_network_adapter("test-vm", "test-network")
+        
+        assert first == "Network adapter 4"
+        assert second == "Network adapter 5"
+
+    def test_remove_network_adapter_invalidates_number_cache(self, mock_vsphere_client, mock_vm, mock_network_adapter):
+        """Test removing an adapter drops the cached adapter number"""
+        mock_vm._moId = "vm-42"
+        mock_vm.config.hardware.device = [mock_network_adapter]
+        mock_vsphere_client.get_vm.return_value = mock_vm
+        
+        configurator = NetworkConfigurator(mock_vsphere_client)
+        configurator._adapter_numbers["vm-42"] = 7
+        configurator.remove_network_adapter("test-vm", "Network adapter 1")
+        
+        assert "vm-42" not in configurator._adapter_numbers
+
     def test_get_network_adapters_empty(self, mock_vsphere_client, mock_vm):
         """Test getting network adapters when none exist"""
         mock_vm.config.hardware.device = []
@@ -305,4 +359,149 @@ class TestNetworkConfigurator:
         
         # Should only return network adapters
         assert len(adapters) == 1
-        assert adapters[0]['label'] == "Network adapter 1"
\ No newline at end of file
+        assert adapters[0]['label'] == "Network adapter 1"
+
+    def test_configure_vlan_async(self, mock_vsphere_client):
+        """Test async VLAN configuration delegates to the blocking implementation"""
+        configurator = NetworkConfigurator(mock_vsphere_client)
+        
+        with patch.object(configurator, 'configure_vlan', return_value=True) as mock_configure:
+            result = asyncio.run(configurator.configure_vlan_async("test-vm", "Network adapter 1", 100))
+        
+        assert result is True
+        mock_configure.assert_called_once_with("test-vm", "Network adapter 1", 100, network_name=None)
+
+    def test_batch_single_reconfigure(self, mock_vsphere_client, mock_vm, mock_network, mock_network_adapter):
+        """Test batched adapter changes are applied in one reconfigure task"""
+        mock_vm._moId = "vm-42"
+        mock_vm.config.hardware.device = [mock_network_adapter]
+        mock_vsphere_client.get_vm.return_value = mock_vm
+        mock_vsphere_client.get_network.return_value = mock_network
+        mock_task = Mock()
+        mock_vm.ReconfigVM_Task.return_value = mock_task
+        
+        configurator = NetworkConfigurator(mock_vsphere_client)
+        
+        with configurator.batch("test-vm") as batch:
+            first = batch.add_network_adapter("test-network")
+            second = batch.add_network_adapter("test-network", "e1000")
+            batch.connect_adapter("Network adapter 1", connected=False)
+        
+        assert (first, second) == ("Network adapter 2", "Network adapter 3")
+        mock_vm.ReconfigVM_Task.assert_called_once()
+        spec = mock_vm.ReconfigVM_Task.call_args.kwargs["spec"]
+        assert len(spec.deviceChange) == 3
+        mock_vsphere_client.wait_for_task.assert_called_once_with(mock_task)
+        assert configurator._adapter_numbers["vm-42"] == 3
+
+    def test_batch_added_adapters_get_distinct_temporary_keys(self, mock_vsphere_client, mock_vm, mock_network):
+        """Test each adapter added in one batch gets its own negative device key"""
+        mock_vm.config.hardware.device = []
+        mock_vsphere_client.get_vm.return_value = mock_vm
+        mock_vsphere_client.get_network.return_value = mock_network
+        
+        configurator = NetworkConfigurator(mock_vsphere_client)
+        
+        with configurator.batch("test-vm") as batch:
+            for _ in range(3):
+                batch.add_network_adapter("test-network")
+        
+        spec = mock_vm.ReconfigVM_Task.call_args.kwargs["spec"]
+        assert [change.device.key for change in spec.deviceChange] == [-1, -2, -3]
+
+    def test_batch_merges_edits_of_one_adapter(self, mock_vsphere_client, mock_vm, mock_dvs_portgroup):
+        """Test a VLAN change and a connect on one adapter become a single edit spec"""
+        from tests.mocks.vsphere.network_adapters import create_mock_vmxnet3
+        from tests.mocks.vsphere.network_backing import MockVirtualEthernetCardNetworkBackingInfo
+        
+        def fresh_adapter(vm, label):
+            # Every vm.config read returns new device objects
+            adapter = create_mock_vmxnet3(4000, label)
+            adapter.backing = MockVirtualEthernetCardNetworkBackingInfo("VM Network")
+            adapter.connectable.connected = True
+            return adapter
+        
+        mock_vsphere_client.get_vm.return_value = mock_vm
+        mock_vsphere_client.get_network.return_value = mock_dvs_portgroup
+        configurator = NetworkConfigurator(mock_vsphere_client)
+        
+        with patch.object(configurator, '_get_network_adapter', side_effect=fresh_adapter):
+            with configurator.batch("test-vm") as batch:
+                batch.configure_vlan("Network adapter 1", 100, "test-portgroup")
+                batch.connect_adapter("Network adapter 1", connected=False)
+        
+        spec = mock_vm.ReconfigVM_Task.call_args.kwargs["spec"]
+        assert len(spec.deviceChange) == 1
+        device = spec.deviceChange[0].device
+        assert device.backing.port.portgroupKey == "pg-key-123"
+        assert device.connectable.connected is False
+
+    def test_batch_not_applied_on_error(self, mock_vsphere_client, mock_vm):
+        """Test queued changes are discarded when the batch body raises"""
+        mock_vm.config.hardware.device = []
+        mock_vsphere_client.get_vm.return_value = mock_vm
+        
+        configurator = NetworkConfigurator(mock_vsphere_client)
+        
+        with pytest.raises(NetworkConfigError):
+            with configurator.batch("test-vm") as batch:
+                batch.remove_network_adapter("Network adapter 9")
+        
+        mock_vm.ReconfigVM_Task.assert_not_called()
+
+    def test_get_network_adapters_prefetches_network_names(self, mock_vsphere_client, mock_vm, mock_network):
+        """Test backing network names are fetched once for all adapters"""
+        from tests.mocks.vsphere.network_adapters import create_mock_vmxnet3
+        adapters = [create_mock_vmxnet3(4000 + i, f"Network adapter {i + 1}") for i in range(3)]
+        for adapter in adapters:
+            adapter.backing = Mock(network=mock_network)
+        mock_vm.config.hardware.device = adapters
+        mock_vsphere_client.get_vm.return_value = mock_vm
+        mock_vsphere_client.get_properties_many.side_effect = None
+        mock_vsphere_client.get_properties_many.return_value = {mock_network: {'name': "VM Network"}}
+        
+        configurator = NetworkConfigurator(mock_vsphere_client)
+        result = configurator.get_network_adapters("test-vm")
+        
+        assert [a['network'] for a in result] == ["VM Network"] * 3
+        mock_vsphere_client.get_properties_many.assert_called_once_with([mock_network], vim.Network, ['name'])
+
+    def test_configure_vlan_by_id_dvs(self, mock_vsphere_client, mock_vm, mock_dvs_portgroup, mock_network_adapter):
+        """Test VLAN ID lookup uses the VLAN portgroup on a distributed switch"""
+        mock_network_adapter.backing = Mock(spec=['port'])
+        mock_vm.config.hardware.device = [mock_network_adapter]
+        mock_vsphere_client.get_vm.return_value = mock_vm
+        mock_vsphere_client.find_network.return_value = mock_dvs_portgroup
+        
+        configurator = NetworkConfigurator(mock_vsphere_client)
+        result = configurator.configure_vlan("test-vm", "Network adapter 1", 100)
+        
+        assert result is True
+        mock_vsphere_client.find_network.assert_called_once_with("VLAN-100")
+        mock_vm.ReconfigVM_Task.assert_called_once()
+
+    def test_configure_vlan_by_id_missing_portgroup(self, mock_vsphere_client, mock_vm, mock_network_adapter):
+        """Test a missing VLAN portgroup raises NetworkConfigError"""
+        mock_network_adapter.backing = Mock(spec=['port'])
+        mock_vm.config.hardware.device = [mock_network_adapter]
+        mock_vsphere_client.get_vm.return_value = mock_vm
+        mock_vsphere_client.find_network.return_value = None
+        
+        configurator = NetworkConfigurator(mock_vsphere_client)
+        
+        with pytest.raises(NetworkConfigError, match="VLAN 100"):
+            configurator.configure_vlan("test-vm", "Network adapter 1", 100)
+        mock_vm.ReconfigVM_Task.assert_not_called()
+
+    def test_configure_vlan_by_id_propagates_connection_errors(self, mock_vsphere_client, mock_vm, mock_network_adapter):
+        """Test unrelated lookup failures are not reported as a missing portgroup"""
+        from pod.exceptions import ConnectionError
+        mock_network_adapter.backing = Mock(spec=['port'])
+        mock_vm.config.hardware.device = [mock_network_adapter]
+        mock_vsphere_client.get_vm.return_value = mock_vm
+        mock_vsphere_client.find_network.side_effect = ConnectionError("Not connected to vSphere")
+        
+        configurator = NetworkConfigurator(mock_vsphere_client)
+        
+        with pytest.raises(ConnectionError):
+            configurator.configure_vlan("test-vm", "Network adapter 1", 100)
@@ -60,6 +60,32 @@ class TestOSHandlerFactory:
             handler = OSHandlerFactory.create_handler(mock_ssh_connection, os_info)
             assert isinstance(handler, expected_handler)
     
+    @pytest.mark.parametrize("guest_id,expected", [
+        ('rhel7_64Guest', 'rhel'),
+        ('rhel9_64Guest', 'rhel'),
+        ('centos8_64Guest', 'centos'),
+        ('debian12_64Guest', 'debian'),
+        ('sles15_64Guest', 'opensuse'),
+        ('other5xLinux64Guest', 'linux'),
+        ('windows2022srvNext_64Guest', 'windows_server'),
+        ('windows9Server64Guest', 'windows_server'),
+        ('windows10_64Guest', 'windows_10'),
+        ('windows11_64Guest', 'windows_11'),
+        ('windows9_64Guest', 'windows'),
+        ('freebsd13_64Guest', None),
+    ])
+    def test_guest_id_prefix_rules(self, guest_id, expected):
+        """Test guest IDs are classified by prefix, including unlisted versions"""
+        assert OSHandlerFactory._guest_id_os_type(guest_id) == expected
+    
+    def test_guest_id_override_beats_rules(self):
+        """Test registered mappings take precedence over the prefix rules"""
+        OSHandlerFactory.register_guest_id_mapping('rhel10_64Guest', 'centos')
+        try:
+            assert OSHandlerFactory._guest_id_os_type('rhel10_64Guest') == 'centos'
+        finally:
+            OSHandlerFactory._vsphere_guest_map.pop('rhel10_64Guest')
+    
     def test_create_handler_from_connection_type(self, mock_ssh_connection, mock_winrm_connection):
         """Test handler creation based on connection type"""
         # SSH connection should create Linux handler
@@ -114,6 +140,33 @@ ID_LIKE="rhel centos fedora"
         handler = OSHandlerFactory.create_handler(mock_ssh_connection)
         assert isinstance(handler, LinuxHandler)
     
+    @pytest.mark.parametrize("os_release,expected", [
+        ('NAME="Ubuntu"\nID=ubuntu\nID_LIKE=debian', 'ubuntu'),
+        ('NAME="Red Hat Enterprise Linux"\nID_LIKE="fedora"', 'rhel'),
+        # ID_LIKE naming rhel outranks the distribution's own name, as before
+        ('NAME="Rocky Linux"\nID="rocky"\nID_LIKE="rhel centos fedora"', 'rhel'),
+        ('NAME="Fedora Linux"\nID=fedora', 'fedora'),
+        ('NAME="SLES"\nID="sles"\nID_LIKE="suse"', 'opensuse'),
+        ('NAME="Alpine Linux"\nID=alpine', 'linux'),
+    ])
+    def test_detect_linux_distro_precedence(self, mock_ssh_connection, os_release, expected):
+        """Test distribution markers resolve by precedence, not position"""
+        mock_ssh_connection.execute_command.side_effect = [(os_release, "", 0), ("Linux host", "", 0)]
+        
+        assert OSHandlerFactory._detect_linux_distro(mock_ssh_connection) == expected
+    
+    def test_distro_detection_cached_per_connection(self, mock_ssh_connection):
+        """Test repeated handler creation probes the host only once"""
+        mock_ssh_connection.execute_command.return_value = ('ID=ubuntu', "", 0)
+        
+        OSHandlerFactory.create_handler(mock_ssh_connection)
+        OSHandlerFactory.create_handler(mock_ssh_connection)
+        assert mock_ssh_connection.execute_command.call_count == 1
+        
+        OSHandlerFactory.invalidate_cache(mock_ssh_connection)
+        OSHandlerFactory.create_handler(mock_ssh_connection)
+        assert mock_ssh_connection.execute_command.call_count == 2
+    
     def test_fallback_to_uname(self, mock_ssh_connection):
         """Test fallback to uname when os-release fails"""
         # First call fails (os-release), second succeeds (uname)
@@ -161,6 +214,20 @@ ID_LIKE="rhel centos fedora"
         assert isinstance(handler, CustomHandler)
         assert 'custom_os' in OSHandlerFactory.get_supported_os_types()
     
+    def test_registered_handlers_view(self):
+        """Test the handler registry is exposed read-only and stays current"""
+        class ViewHandler(LinuxHandler):
+            pass
+        
+        with pytest.raises(TypeError):
+            OSHandlerFactory.registered_handlers['linux'] = ViewHandler
+        
+        OSHandlerFactory.register_handler('View_OS', ViewHandler)
+        try:
+            assert OSHandlerFactory.registered_handlers['view_os'] is ViewHandler
+        finally:
+            OSHandlerFactory._handlers.pop('view_os')
+    
     def test_register_invalid_handler(self):
         """Test registering invalid handler class"""
         class InvalidHandler:
@@ -247,4 +314,22 @@ ID_LIKE="rhel centos fedora"
         
         # Should log handler creation
         mock_logger.info.assert_called()
-        assert 'LinuxHandler' in str(mock_logger.info.call_args)
\ No newline at end of file
+        assert 'LinuxHandler' in str(mock_logger.info.call_args)
+
+class TestOSAbstractionPackage:
+    """Test lazy exports of the os_abstraction package"""
+    
+    def test_handlers_resolved_on_access(self):
+        """Test handler exports resolve to the submodule classes"""
+        import pod.os_abstraction as os_abstraction
+        
+        assert os_abstraction.LinuxHandler is LinuxHandler
+        assert os_abstraction.OSHandlerFactory is OSHandlerFactory
+        assert set(os_abstraction.__all__) <= set(dir(os_abstraction))
+    
+    def test_unknown_attribute(self):
+        """Test unknown names still raise AttributeError"""
+        import pod.os_abstraction as os_abstraction
+        
+        with pytest.raises(AttributeError):
+            os_abstraction.SolarisHandler
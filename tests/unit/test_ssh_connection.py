@@ -86,6 +86,17 @@ class TestSSHConnection:
         mock_client.set_missing_host_key_policy.assert_called_once()
         mock_client.connect.assert_called_once()
 
+    @patch('paramiko.SSHClient')
+    def test_connect_enables_keepalive(self, mock_ssh_client_class):
+        """Test the transport is kept alive between commands"""
+        from pod.connections.ssh import SSH_KEEPALIVE_INTERVAL
+        mock_client = Mock()
+        mock_ssh_client_class.return_value = mock_client
+        
+        SSHConnection("192.168.1.100", "root", "password").connect()
+        
+        mock_client.get_transport.return_value.set_keepalive.assert_called_once_with(SSH_KEEPALIVE_INTERVAL)
+
     @patch('paramiko.SSHClient')
     def test_connect_with_key_file(self, mock_ssh_client_class):
         """Test successful connection with key file"""
@@ -229,6 +240,27 @@ class TestSSHConnection:
         with pytest.raises(ConnectionError):
             connection.execute_command("ls")
 
+    def test_execute_command_reconnects_dropped_transport(self):
+        """Test a session whose transport died is re-established before running the command"""
+        connection = SSHConnection("host", "user", "pass")
+        connection._connected = True
+        connection._client = Mock()
+        connection._client.get_transport.return_value.is_active.return_value = False
+        
+        def reconnect():
+            connection._client = Mock()
+            connection._client.exec_command.return_value = (
+                Mock(), Mock(read=Mock(return_value=b"ok"), channel=Mock(recv_exit_status=Mock(return_value=0))),
+                Mock(read=Mock(return_value=b""))
+            )
+            connection._connected = True
+        
+        with patch.object(connection, 'connect', side_effect=reconnect) as mock_connect:
+            result = connection.execute_command("ls")
+        
+        mock_connect.assert_called_once()
+        assert result == ("ok", "", 0)
+
     def test_execute_command_ssh_exception(self):
         """Test command execution with SSH exception"""
         connection = SSHConnection("host", "user", "pass")
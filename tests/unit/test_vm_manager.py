@@ -2,6 +2,7 @@
 Unit tests for VM Manager
 """
 
+import asyncio
 import pytest
 import time
 from unittest.mock import Mock, patch, MagicMock
@@ -33,9 +34,8 @@ class TestVMManager:
         manager = VMManager(mock_vsphere_client)
         
         with patch.object(manager, '_detect_os_type', return_value='linux'):
-            with patch.object(manager, '_get_disk_info', return_value=[]):
-                with patch.object(manager, '_get_network_info', return_value=[]):
-                    info = manager.get_vm_info("test-vm")
+            with patch.object(manager, '_get_device_info', return_value=([], [])):
+                info = manager.get_vm_info("test-vm")
         
         assert info['name'] == "test-vm"
         assert info['uuid'] == "vm-uuid-123"
@@ -46,13 +46,32 @@ class TestVMManager:
         assert info['hardware']['cpu_count'] == 2
         assert info['hardware']['memory_mb'] == 4096
 
+    def test_get_vm_info_single_property_fetch(self, mock_vsphere_client, mock_vm):
+        """Test VM info is built from one batched property fetch"""
+        from tests.mocks.vsphere.device_specs import create_mock_virtual_disk
+        mock_vsphere_client.get_vm.return_value = mock_vm
+        mock_vm.config.hardware.device = [create_mock_virtual_disk("Hard disk 1", 20971520, True)]
+        mock_vm.config.guestId = "rhel8_64Guest"
+        mock_vm.guest.guestFamily = "linuxGuest"
+        
+        manager = VMManager(mock_vsphere_client)
+        info = manager.get_vm_info("test-vm")
+        
+        mock_vsphere_client.get_properties.assert_called_once_with(
+            mock_vm, vim.VirtualMachine, VMManager._VM_INFO_PROPERTIES
+        )
+        assert info['guest']['os_type'] == 'linux'
+        assert info['hardware']['disks'][0]['capacity_gb'] == 20
+        assert info['hardware']['networks'] == []
+
     def test_detect_os_type_linux(self, mock_vsphere_client, mock_vm):
         """Test OS type detection for Linux"""
         mock_vm.config.guestId = "rhel8_64Guest"
         mock_vm.guest.guestFamily = "linuxGuest"
         
         manager = VMManager(mock_vsphere_client)
-        os_type = manager._detect_os_type(mock_vm)
+        os_type = manager._detect_os_type(mock_vsphere_client.get_properties(
+            mock_vm, vim.VirtualMachine, VMManager._VM_INFO_PROPERTIES))
         
         assert os_type == 'linux'
 
@@ -62,10 +81,21 @@ class TestVMManager:
         mock_vm.guest.guestFamily = "windowsGuest"
         
         manager = VMManager(mock_vsphere_client)
-        os_type = manager._detect_os_type(mock_vm)
+        os_type = manager._detect_os_type(mock_vsphere_client.get_properties(
+            mock_vm, vim.VirtualMachine, VMManager._VM_INFO_PROPERTIES))
         
         assert os_type == 'windows'
 
+    def test_detect_os_type_linux_without_tools(self, mock_vsphere_client):
+        """Test Linux guest IDs are recognised before tools report a guest family"""
+        manager = VMManager(mock_vsphere_client)
+        
+        for guest_id in ("rhel8_64Guest", "ubuntu64Guest", "sles15_64Guest", "other3xLinux64Guest"):
+            props = {'config.guestId': guest_id, 'guest.guestFamily': None, 'name': "vm"}
+            assert manager._detect_os_type(props) == 'linux'
+        
+        assert manager._detect_os_type({'config.guestId': "darwin64Guest", 'name': "vm"}) == 'unknown'
+
     def test_detect_os_type_container(self, mock_vsphere_client, mock_vm):
         """Test OS type detection for container"""
         mock_vm.config.guestId = "ubuntu64Guest"
@@ -75,7 +105,8 @@ class TestVMManager:
         manager = VMManager(mock_vsphere_client)
         
         with patch.object(manager, '_is_container', return_value=True):
-            os_type = manager._detect_os_type(mock_vm)
+            os_type = manager._detect_os_type(mock_vsphere_client.get_properties(
+            mock_vm, vim.VirtualMachine, VMManager._VM_INFO_PROPERTIES))
         
         assert os_type == 'container'
 
@@ -84,7 +115,7 @@ class TestVMManager:
         mock_vm.name = "container-test-vm"
         
         manager = VMManager(mock_vsphere_client)
-        result = manager._is_container(mock_vm)
+        result = manager._is_container(mock_vm.name)
         
         assert result is True
 
@@ -93,7 +124,7 @@ class TestVMManager:
         mock_vm.name = "regular-test-vm"
         
         manager = VMManager(mock_vsphere_client)
-        result = manager._is_container(mock_vm)
+        result = manager._is_container(mock_vm.name)
         
         assert result is False
 
@@ -173,14 +204,22 @@ class TestVMManager:
             mock_vm.runtime.powerState = vim.VirtualMachinePowerState.poweredOff
         
         mock_vm.ShutdownGuest.side_effect = shutdown_side_effect
+        mock_vsphere_client.wait_for_updates.return_value = {
+            'runtime.powerState': vim.VirtualMachinePowerState.poweredOff
+        }
         
         manager = VMManager(mock_vsphere_client)
-        
-        with patch('time.sleep'):
-            result = manager.power_off("test-vm", force=False)
+        result = manager.power_off("test-vm", force=False)
         
         assert result is True
         mock_vm.ShutdownGuest.assert_called_once()
+        mock_vm.PowerOffVM_Task.assert_not_called()
+        # Power state and tools status come from a single property fetch
+        mock_vsphere_client.get_properties.assert_called_once_with(
+            mock_vm, vim.VirtualMachine, ['runtime.powerState', 'guest.toolsStatus']
+        )
+        assert mock_vsphere_client.wait_for_updates.call_args.args[2] == ['runtime.powerState']
+        assert mock_vsphere_client.wait_for_updates.call_args.kwargs['timeout'] == 60
 
     def test_power_off_graceful_timeout(self, mock_vsphere_client, mock_vm):
         """Test graceful power off with timeout"""
@@ -190,11 +229,10 @@ class TestVMManager:
         mock_task = Mock()
         mock_vm.PowerOffVM_Task.return_value = mock_task
         
-        manager = VMManager(mock_vsphere_client)
+        mock_vsphere_client.wait_for_updates.return_value = None  # Simulate timeout
         
-        with patch('time.sleep'):
-            with patch('time.time', side_effect=[0, 30, 70]):  # Simulate timeout
-                result = manager.power_off("test-vm", force=False)
+        manager = VMManager(mock_vsphere_client)
+        result = manager.power_off("test-vm", force=False)
         
         assert result is True
         mock_vm.ShutdownGuest.assert_called_once()
@@ -270,6 +308,73 @@ class TestVMManager:
         mock_source_vm.Clone.assert_called_once()
         mock_vsphere_client.wait_for_task.assert_called_once_with(mock_task)
 
+    def test_clone_vm_linked_creates_base_snapshot(self, mock_vsphere_client, mock_vm):
+        """Test linked clone snapshots a source without one and clones from it"""
+        from tests.mocks.vsphere.device_specs import create_mock_resource_pool
+        snapshot = vim.vm.Snapshot('snapshot-1')
+        mock_source_vm = Mock(snapshot=None)
+        
+        def create_snapshot(**kwargs):
+            mock_source_vm.snapshot = Mock(currentSnapshot=snapshot)
+            return Mock()
+        
+        mock_source_vm.CreateSnapshot_Task.side_effect = create_snapshot
+        mock_vsphere_client.get_vm.side_effect = [mock_source_vm, mock_vm]
+        
+        manager = VMManager(mock_vsphere_client)
+        
+        with patch.object(manager, '_get_default_resource_pool', return_value=create_mock_resource_pool()):
+            result = manager.clone_vm("source-vm", "new-vm", linked=True)
+        
+        assert result == mock_vm
+        assert mock_source_vm.CreateSnapshot_Task.call_args.kwargs['memory'] is False
+        spec = mock_source_vm.Clone.call_args.kwargs['spec']
+        assert spec.snapshot == snapshot
+        assert spec.location.diskMoveType == 'createNewChildDiskBacking'
+        assert mock_vsphere_client.wait_for_task.call_count == 2
+
+    def test_clone_vm_linked_reuses_snapshot(self, mock_vsphere_client, mock_vm):
+        """Test linked clone uses the existing current snapshot"""
+        from tests.mocks.vsphere.device_specs import create_mock_resource_pool
+        snapshot = vim.vm.Snapshot('snapshot-1')
+        mock_source_vm = Mock()
+        mock_source_vm.snapshot.currentSnapshot = snapshot
+        mock_vsphere_client.get_vm.side_effect = [mock_source_vm, mock_vm]
+        
+        manager = VMManager(mock_vsphere_client)
+        
+        with patch.object(manager, '_get_default_resource_pool', return_value=create_mock_resource_pool()):
+            manager.clone_vm("source-vm", "new-vm", linked=True)
+        
+        mock_source_vm.CreateSnapshot_Task.assert_not_called()
+        assert mock_source_vm.Clone.call_args.kwargs['spec'].snapshot == snapshot
+
+    def test_clone_vm_instant(self, mock_vsphere_client, mock_vm):
+        """Test instant clone forks the source through InstantClone_Task"""
+        from tests.mocks.vsphere.device_specs import create_mock_resource_pool
+        folder = vim.Folder('group-v1')
+        mock_source_vm = Mock()
+        mock_vsphere_client.get_vm.side_effect = [mock_source_vm, mock_vm]
+        mock_vsphere_client.get_datacenter.return_value = Mock(vmFolder=folder)
+        
+        manager = VMManager(mock_vsphere_client)
+        
+        with patch.object(manager, '_get_default_resource_pool', return_value=create_mock_resource_pool()):
+            result = manager.clone_vm("source-vm", "new-vm", instant=True)
+        
+        assert result == mock_vm
+        mock_source_vm.Clone.assert_not_called()
+        spec = mock_source_vm.InstantClone_Task.call_args.kwargs['spec']
+        assert spec.name == "new-vm"
+        assert spec.location.folder == folder
+
+    def test_clone_vm_linked_and_instant_rejected(self, mock_vsphere_client):
+        """Test linked and instant cannot be combined"""
+        manager = VMManager(mock_vsphere_client)
+        
+        with pytest.raises(ValueError):
+            manager.clone_vm("source-vm", "new-vm", linked=True, instant=True)
+
     def test_delete_vm_success(self, mock_vsphere_client, mock_vm):
         """Test successful VM deletion"""
         mock_vsphere_client.get_vm.return_value = mock_vm
@@ -284,6 +389,89 @@ class TestVMManager:
         mock_vm.Destroy_Task.assert_called_once()
         mock_vsphere_client.wait_for_task.assert_called_once_with(mock_task)
 
+    def test_power_on_many_reports_failures_per_vm(self, mock_vsphere_client):
+        """Test bulk power on keeps going when one VM fails"""
+        manager = VMManager(mock_vsphere_client)
+        
+        def power_on(name, wait_for_ip):
+            if name == "bad-vm":
+                raise VMNotFoundError(name)
+            return True
+        
+        with patch.object(manager, 'power_on', side_effect=power_on) as mock_power_on:
+            result = manager.power_on_many(["vm-1", "bad-vm", "vm-2"], max_concurrent=2, wait_for_ip=False)
+        
+        assert result == {"vm-1": True, "bad-vm": False, "vm-2": True}
+        mock_power_on.assert_any_call("vm-1", False)
+
+    def test_clone_many(self, mock_vsphere_client):
+        """Test bulk clone returns the new VM per name"""
+        manager = VMManager(mock_vsphere_client)
+        clones = {"clone-1": Mock(), "clone-2": Mock()}
+        
+        with patch.object(manager, 'clone_vm', side_effect=lambda src, name, **kw: clones[name]) as mock_clone:
+            result = manager.clone_many("template", ["clone-1", "clone-2"], datastore_name="ds1")
+        
+        assert result == clones
+        mock_clone.assert_any_call("template", "clone-1", datastore_name="ds1")
+
+    def test_clone_many_linked_shares_one_base_snapshot(self, mock_vsphere_client):
+        """Test linked bulk clones resolve the base snapshot once before fanning out"""
+        snapshot = vim.vm.Snapshot('snapshot-1')
+        source_vm = Mock(snapshot=None)
+        
+        def create_snapshot(**kwargs):
+            source_vm.snapshot = Mock(currentSnapshot=snapshot)
+            return Mock()
+        
+        source_vm.CreateSnapshot_Task.side_effect = create_snapshot
+        mock_vsphere_client.get_vm.return_value = source_vm
+        manager = VMManager(mock_vsphere_client)
+        
+        with patch.object(manager, 'clone_vm', return_value=Mock()) as mock_clone:
+            manager.clone_many("template", ["clone-1", "clone-2", "clone-3"], linked=True)
+        
+        source_vm.CreateSnapshot_Task.assert_called_once()
+        assert mock_clone.call_count == 3
+        for call in mock_clone.call_args_list:
+            assert call.kwargs == {"linked": True, "snapshot": snapshot}
+
+    def test_linked_clone_snapshot_created_once_across_threads(self, mock_vsphere_client):
+        """Test concurrent snapshot lookups on a source without one create a single snapshot"""
+        import threading
+        import time
+        snapshot = vim.vm.Snapshot('snapshot-1')
+        source_vm = Mock(snapshot=None)
+        
+        def create_snapshot(**kwargs):
+            time.sleep(0.05)
+            source_vm.snapshot = Mock(currentSnapshot=snapshot)
+            return Mock()
+        
+        source_vm.CreateSnapshot_Task.side_effect = create_snapshot
+        manager = VMManager(mock_vsphere_client)
+        results = []
+        
+        threads = [threading.Thread(target=lambda: results.append(manager._get_linked_clone_snapshot(source_vm)))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        source_vm.CreateSnapshot_Task.assert_called_once()
+        assert results == [snapshot] * 4
+
+    def test_delete_many(self, mock_vsphere_client):
+        """Test bulk delete"""
+        manager = VMManager(mock_vsphere_client)
+        
+        with patch.object(manager, 'delete_vm', return_value=True):
+            result = manager.delete_many(["vm-1", "vm-2"])
+        
+        assert result == {"vm-1": True, "vm-2": True}
+        assert manager.delete_many([]) == {}
+
     def test_delete_vm_powered_on(self, mock_vsphere_client, mock_vm):
         """Test VM deletion when powered on"""
         mock_vsphere_client.get_vm.return_value = mock_vm
@@ -292,12 +480,13 @@ class TestVMManager:
         mock_vm.Destroy_Task.return_value = mock_task
         
         manager = VMManager(mock_vsphere_client)
-        
-        with patch.object(manager, 'power_off', return_value=True):
-            result = manager.delete_vm("test-vm")
+        result = manager.delete_vm("test-vm")
         
         assert result is True
+        mock_vm.PowerOffVM_Task.assert_called_once()
         mock_vm.Destroy_Task.assert_called_once()
+        # The VM is looked up once rather than again by power_off
+        mock_vsphere_client.get_vm.assert_called_once_with("test-vm")
 
     def test_get_disk_info(self, mock_vsphere_client, mock_vm):
         """Test getting disk information"""
@@ -307,7 +496,7 @@ class TestVMManager:
         mock_vm.config.hardware.device = [mock_disk]
         
         manager = VMManager(mock_vsphere_client)
-        disks = manager._get_disk_info(mock_vm)
+        disks = manager._get_disk_info(mock_vm.config.hardware.device)
         
         assert len(disks) == 1
         assert disks[0]['label'] == "Hard disk 1"
@@ -320,7 +509,7 @@ class TestVMManager:
         mock_vm.config.hardware.device = [mock_network_adapter]
         
         manager = VMManager(mock_vsphere_client)
-        networks = manager._get_network_info(mock_vm)
+        networks = manager._get_network_info(mock_vm.config.hardware.device)
         
         assert len(networks) == 1
         assert networks[0]['label'] == "Network adapter 1"
@@ -328,6 +517,18 @@ class TestVMManager:
         assert networks[0]['mac_address'] == "00:50:56:12:34:56"
         assert networks[0]['connected'] is True
 
+    def test_get_device_info_single_pass(self, mock_vsphere_client, mock_network_adapter):
+        """Test disks and adapters are classified in one pass over the devices"""
+        from tests.mocks.vsphere.device_specs import create_mock_virtual_disk
+        mock_network_adapter.backing.network.name = "VM Network"
+        devices = [create_mock_virtual_disk("Hard disk 1", 20971520, True), mock_network_adapter, Mock()]
+        
+        manager = VMManager(mock_vsphere_client)
+        disks, networks = manager._get_device_info(devices)
+        
+        assert [d['label'] for d in disks] == ["Hard disk 1"]
+        assert [n['network'] for n in networks] == ["VM Network"]
+
     def test_wait_for_ip_success(self, mock_vsphere_client, mock_vm):
         """Test successful waiting for IP"""
         mock_vm.guest.ipAddress = "192.168.1.100"
@@ -340,12 +541,25 @@ class TestVMManager:
     def test_wait_for_ip_timeout(self, mock_vsphere_client, mock_vm):
         """Test timeout waiting for IP"""
         mock_vm.guest.ipAddress = None
+        mock_vsphere_client.wait_for_updates.return_value = None
         
         manager = VMManager(mock_vsphere_client)
         
-        with patch('time.sleep'):
-            with pytest.raises(OSError):
-                manager._wait_for_ip(mock_vm, timeout=1)
+        with pytest.raises(OSError):
+            manager._wait_for_ip(mock_vm, timeout=1)
+
+    def test_wait_for_ip_from_property_update(self, mock_vsphere_client, mock_vm):
+        """Test IP address pushed by the property collector is returned"""
+        mock_vm.guest.ipAddress = None
+        mock_vsphere_client.wait_for_updates.return_value = {"guest.ipAddress": "192.168.1.101"}
+        
+        manager = VMManager(mock_vsphere_client)
+        result = manager._wait_for_ip(mock_vm, timeout=30)
+        
+        assert result == "192.168.1.101"
+        args = mock_vsphere_client.wait_for_updates.call_args
+        assert args.args[2] == ['guest.ipAddress']
+        assert args.kwargs["timeout"] == 30
 
     def test_get_folder_by_path_root(self, mock_vsphere_client):
         """Test getting folder by path - root"""
@@ -362,24 +576,29 @@ class TestVMManager:
         mock_datacenter = Mock()
         mock_root_folder = Mock()
         mock_subfolder = Mock()
-        mock_subfolder.name = "subfolder"
-        mock_root_folder.childEntity = [mock_subfolder]
+        mock_leaf = Mock()
+        mock_other = Mock()
         mock_datacenter.vmFolder = mock_root_folder
+        mock_vsphere_client.get_view_properties.return_value = [
+            (mock_subfolder, {'name': "subfolder", 'parent': mock_root_folder}),
+            (mock_other, {'name': "leaf", 'parent': mock_root_folder}),
+            (mock_leaf, {'name': "leaf", 'parent': mock_subfolder}),
+        ]
         
         manager = VMManager(mock_vsphere_client)
         
-        # Mock the isinstance function in the vm_manager module
-        with patch('pod.infrastructure.vsphere.vm_manager.isinstance', return_value=True):
-            result = manager._get_folder_by_path(mock_datacenter, "subfolder")
-        
-        assert result == mock_subfolder
+        assert manager._get_folder_by_path(mock_datacenter, "subfolder") == mock_subfolder
+        assert manager._get_folder_by_path(mock_datacenter, "subfolder/leaf") == mock_leaf
+        mock_vsphere_client.get_view_properties.assert_called_with(
+            mock_root_folder, [vim.Folder], ['name', 'parent']
+        )
 
     def test_get_folder_by_path_not_found(self, mock_vsphere_client):
         """Test getting folder by path - not found"""
         mock_datacenter = Mock()
         mock_root_folder = Mock()
-        mock_root_folder.childEntity = []
         mock_datacenter.vmFolder = mock_root_folder
+        mock_vsphere_client.get_view_properties.return_value = []
         
         manager = VMManager(mock_vsphere_client)
         
@@ -424,4 +643,38 @@ class TestVMManager:
         manager = VMManager(mock_vsphere_client)
         
         with pytest.raises(VMNotFoundError):
-            manager._get_default_resource_pool(mock_datacenter)
\ No newline at end of file
+            manager._get_default_resource_pool(mock_datacenter)
+
+    def test_power_on_many_async(self, mock_vsphere_client):
+        """Test concurrent power on submits every task and waits through the task monitor"""
+        from concurrent.futures import Future
+        vms = {}
+        for name, state in (("vm-1", "poweredOff"), ("vm-2", "poweredOn"), ("vm-3", "poweredOff")):
+            vm = Mock()
+            vm.runtime.powerState = getattr(vim.VirtualMachinePowerState, state)
+            vms[name] = vm
+        mock_vsphere_client.get_vm.side_effect = lambda name: vms[name]
+        
+        def watch(task):
+            future = Future()
+            future.set_result(True)
+            return future
+        mock_vsphere_client.watch_task.side_effect = watch
+        
+        manager = VMManager(mock_vsphere_client)
+        results = asyncio.run(manager.power_on_many_async(["vm-1", "vm-2", "vm-3"], wait_for_ip=False))
+        
+        assert results == [True, True, True]
+        assert mock_vsphere_client.watch_task.call_count == 2
+        vms["vm-2"].PowerOnVM_Task.assert_not_called()
+        mock_vsphere_client.wait_for_task.assert_not_called()
+
+    def test_clone_vm_async(self, mock_vsphere_client, mock_vm):
+        """Test async clone delegates to the blocking implementation"""
+        manager = VMManager(mock_vsphere_client)
+        
+        with patch.object(manager, 'clone_vm', return_value=mock_vm) as mock_clone:
+            result = asyncio.run(manager.clone_vm_async("template", "new-vm", datastore_name="ds1"))
+        
+        assert result == mock_vm
+        mock_clone.assert_called_once_with("template", "new-vm", datastore_name="ds1")
@@ -2,8 +2,10 @@
 Unit tests for vSphere client
 """
 
+import asyncio
 import pytest
 import ssl
+import threading
 from unittest.mock import Mock, patch, MagicMock
 from pyVmomi import vim, vmodl
 from pod.infrastructure.vsphere.client import VSphereClient
@@ -42,8 +44,8 @@ class TestVSphereClient:
         assert client.port == 443
 
     @patch('pyVim.connect.SmartConnect')
-    @patch('atexit.register')
-    def test_connect_success(self, mock_atexit, mock_smart_connect, mock_vsphere_service_instance):
+    @patch('pod.infrastructure.vsphere.client.weakref.finalize')
+    def test_connect_success(self, mock_finalize, mock_smart_connect, mock_vsphere_service_instance):
         """Test successful connection"""
         mock_smart_connect.return_value = mock_vsphere_service_instance
         
@@ -58,11 +60,25 @@ class TestVSphereClient:
         assert client._service_instance == mock_vsphere_service_instance
         assert client._content is not None
         mock_smart_connect.assert_called_once()
-        mock_atexit.assert_called_once()
+        mock_finalize.assert_called_once()
+        assert client._finalizer == mock_finalize.return_value
+
+    @patch('pyVim.connect.SmartConnect')
+    @patch('pod.infrastructure.vsphere.client.weakref.finalize')
+    def test_connect_widens_connection_pool(self, mock_finalize, mock_smart_connect, mock_vsphere_service_instance):
+        """Test the SOAP stub keeps enough idle connections for concurrent callers"""
+        mock_vsphere_service_instance._stub = Mock(poolSize=5)
+        mock_smart_connect.return_value = mock_vsphere_service_instance
+        
+        client = VSphereClient("vcenter.example.com", "admin", "password", pool_size=16)
+        client.connect()
+        
+        assert mock_vsphere_service_instance._stub.poolSize == 16
 
     @patch('pyVim.connect.SmartConnect')
     @patch('ssl._create_unverified_context')
-    def test_connect_with_ssl_disabled(self, mock_ssl_context, mock_smart_connect, mock_vsphere_service_instance):
+    @patch('pod.infrastructure.vsphere.client.weakref.finalize')
+    def test_connect_with_ssl_disabled(self, mock_finalize, mock_ssl_context, mock_smart_connect, mock_vsphere_service_instance):
         """Test connection with SSL verification disabled"""
         mock_smart_connect.return_value = mock_vsphere_service_instance
         mock_ssl_context.return_value = Mock()
@@ -139,6 +155,26 @@ class TestVSphereClient:
         assert client._service_instance is None
         assert client._content is None
 
+    @patch('pyVim.connect.Disconnect')
+    def test_disconnect_detaches_finalizer(self, mock_disconnect):
+        """Test explicit disconnect detaches the session finalizer"""
+        client = VSphereClient(
+            host="vcenter.example.com",
+            username="admin@vsphere.local",
+            password="password"
+        )
+        
+        mock_finalizer = Mock()
+        client._finalizer = mock_finalizer
+        client._service_instance = Mock()
+        client._content = Mock()
+        
+        client.disconnect()
+        
+        mock_finalizer.detach.assert_called_once()
+        mock_disconnect.assert_called_once()
+        assert client._finalizer is None
+
     def test_content_property_connected(self):
         """Test content property when connected"""
         client = VSphereClient(
@@ -163,7 +199,21 @@ class TestVSphereClient:
         with pytest.raises(ConnectionError):
             _ = client.content
 
-    def test_get_obj_found(self):
+    def _mock_name_page(self, names, token=None):
+        """Create mock RetrievePropertiesEx result holding object names"""
+        page = Mock()
+        page.token = token
+        page.objects = []
+        for name in names:
+            prop = Mock(val=name)
+            prop.name = "name"
+            obj = Mock()
+            obj.name = name
+            page.objects.append(Mock(obj=obj, propSet=[prop]))
+        return page
+
+    @patch('pod.infrastructure.vsphere.client.vmodl')
+    def test_get_obj_found(self, mock_vmodl):
         """Test getting object when found"""
         client = VSphereClient(
             host="vcenter.example.com",
@@ -171,22 +221,47 @@ class TestVSphereClient:
             password="password"
         )
         
-        # Mock content and container view
+        # Mock content, container view and batched name retrieval
         mock_content = Mock()
         mock_container = Mock()
-        mock_vm = Mock()
-        mock_vm.name = "test-vm"
+        mock_content.viewManager.CreateContainerView.return_value = mock_container
+        mock_content.propertyCollector.RetrievePropertiesEx.return_value = self._mock_name_page(
+            ["other-vm", "test-vm"]
+        )
+        client._content = mock_content
         
-        mock_container.view = [mock_vm]
+        result = client.get_obj([vim.VirtualMachine], "test-vm")
+        
+        assert result.name == "test-vm"
+        mock_content.propertyCollector.RetrievePropertiesEx.assert_called_once()
+        mock_container.Destroy.assert_not_called()
+
+    @patch('pod.infrastructure.vsphere.client.vmodl')
+    def test_get_obj_paginated(self, mock_vmodl):
+        """Test object lookup follows continuation tokens"""
+        client = VSphereClient(
+            host="vcenter.example.com",
+            username="admin@vsphere.local",
+            password="password"
+        )
+        
+        mock_content = Mock()
+        mock_container = Mock()
         mock_content.viewManager.CreateContainerView.return_value = mock_container
+        collector = mock_content.propertyCollector
+        collector.RetrievePropertiesEx.return_value = self._mock_name_page(["vm-1"], token="page-2")
+        collector.ContinueRetrievePropertiesEx.return_value = self._mock_name_page(["test-vm"], token="page-3")
         client._content = mock_content
         
         result = client.get_obj([vim.VirtualMachine], "test-vm")
         
-        assert result == mock_vm
-        mock_container.Destroy.assert_called_once()
+        assert result.name == "test-vm"
+        collector.ContinueRetrievePropertiesEx.assert_called_once_with("page-2")
+        collector.CancelRetrievePropertiesEx.assert_called_once_with("page-3")
+        mock_container.Destroy.assert_not_called()
 
-    def test_get_obj_not_found(self):
+    @patch('pod.infrastructure.vsphere.client.vmodl')
+    def test_get_obj_not_found(self, mock_vmodl):
         """Test getting object when not found"""
         client = VSphereClient(
             host="vcenter.example.com",
@@ -197,14 +272,14 @@ class TestVSphereClient:
         # Mock content and container view
         mock_content = Mock()
         mock_container = Mock()
-        mock_container.view = []
         mock_content.viewManager.CreateContainerView.return_value = mock_container
+        mock_content.propertyCollector.RetrievePropertiesEx.return_value = None
         client._content = mock_content
         
         result = client.get_obj([vim.VirtualMachine], "non-existent-vm")
         
         assert result is None
-        mock_container.Destroy.assert_called_once()
+        mock_container.Destroy.assert_not_called()
 
     def test_get_vm_found(self, mock_vm):
         """Test getting VM when found"""
@@ -248,7 +323,7 @@ class TestVSphereClient:
         result = client.get_all_vms()
         
         assert result == [mock_vm]
-        mock_container.Destroy.assert_called_once()
+        mock_container.Destroy.assert_not_called()
 
     def test_get_network_found(self, mock_network):
         """Test getting network when found"""
@@ -306,7 +381,7 @@ class TestVSphereClient:
         result = client.get_datacenter()
         
         assert result == mock_datacenter
-        mock_container.Destroy.assert_called_once()
+        mock_container.Destroy.assert_not_called()
 
     def test_get_datacenter_not_found(self):
         """Test getting datacenter when not found"""
@@ -367,27 +442,321 @@ class TestVSphereClient:
         with pytest.raises(Exception):
             client.wait_for_task(mock_task)
 
-    def test_wait_for_task_running_then_success(self):
-        """Test waiting for task that completes successfully"""
+    def _mock_update(self, version, **changes):
+        """Create mock WaitForUpdatesEx update set"""
+        update = Mock()
+        update.version = version
+        obj_update = Mock()
+        obj_update.changeSet = [Mock(val=val) for val in changes.values()]
+        for change, name in zip(obj_update.changeSet, changes):
+            change.name = name
+        update.filterSet = [Mock(objectSet=[obj_update])]
+        return update
+
+    @patch('pod.infrastructure.vsphere.client.vmodl')
+    def test_wait_for_task_running_then_success(self, mock_vmodl):
+        """Test waiting on a running task blocks on property updates"""
+        client = VSphereClient(
+            host="vcenter.example.com",
+            username="admin@vsphere.local",
+            password="password"
+        )
+        mock_collector = Mock()
+        mock_collector.WaitForUpdatesEx.side_effect = [
+            self._mock_update("1", **{"info.state": vim.TaskInfo.State.running}),
+            None,
+            self._mock_update("2", **{"info.state": vim.TaskInfo.State.success, "info.error": None})
+        ]
+        client._content = Mock()
+        client._content.propertyCollector.CreatePropertyCollector.return_value = mock_collector
+        
+        mock_task = Mock()
+        mock_task.info.state = vim.TaskInfo.State.running
+        
+        result = client.wait_for_task(mock_task)
+        assert result is True
+        
+        versions = [c.args[0] for c in mock_collector.WaitForUpdatesEx.call_args_list]
+        assert versions == ["", "1", "1"]
+        mock_collector.CreateFilter.assert_called_once()
+        mock_collector.Destroy.assert_called_once()
+
+    @patch('pod.infrastructure.vsphere.client.vmodl')
+    def test_wait_for_task_running_then_error(self, mock_vmodl):
+        """Test task errors reported through property updates are raised"""
         client = VSphereClient(
             host="vcenter.example.com",
             username="admin@vsphere.local",
             password="password"
         )
+        mock_collector = Mock()
+        mock_collector.WaitForUpdatesEx.return_value = self._mock_update(
+            "1", **{"info.state": vim.TaskInfo.State.error, "info.error": "disk full"}
+        )
+        client._content = Mock()
+        client._content.propertyCollector.CreatePropertyCollector.return_value = mock_collector
         
         mock_task = Mock()
-        # Mock state progression: first running, then success
-        state_progression = [vim.TaskInfo.State.running, vim.TaskInfo.State.success]
-        state_iter = iter(state_progression)
+        mock_task.info.state = vim.TaskInfo.State.queued
         
-        def get_state():
-            try:
-                return next(state_iter)
-            except StopIteration:
-                return vim.TaskInfo.State.success
+        with pytest.raises(Exception, match="disk full"):
+            client.wait_for_task(mock_task)
+        mock_collector.Destroy.assert_called_once()
+
+    @patch('pod.infrastructure.vsphere.client.vmodl')
+    def test_wait_for_updates_timeout(self, mock_vmodl):
+        """Test property wait returns None once the timeout expires"""
+        client = VSphereClient(
+            host="vcenter.example.com",
+            username="admin@vsphere.local",
+            password="password"
+        )
+        mock_collector = Mock()
+        mock_collector.WaitForUpdatesEx.return_value = None
+        client._content = Mock()
+        client._content.propertyCollector.CreatePropertyCollector.return_value = mock_collector
         
-        # Set up the mock to change state on access
-        type(mock_task.info).state = property(lambda self: get_state())
+        with patch('pod.infrastructure.vsphere.client.time.time', side_effect=[0, 0, 11]):
+            result = client.wait_for_updates(Mock(), vim.VirtualMachine, ['guest.ipAddress'],
+                                             lambda v: False, timeout=10)
         
-        result = client.wait_for_task(mock_task)
-        assert result is True
\ No newline at end of file
+        assert result is None
+        mock_collector.Destroy.assert_called_once()
+
+    @patch('pod.infrastructure.vsphere.client.vmodl')
+    def test_get_properties_single_call(self, mock_vmodl):
+        """Test properties are fetched in one RetrievePropertiesEx call"""
+        client = VSphereClient(
+            host="vcenter.example.com",
+            username="admin@vsphere.local",
+            password="password"
+        )
+        name_prop = Mock(val="test-vm")
+        name_prop.name = "name"
+        cpu_prop = Mock(val=4)
+        cpu_prop.name = "config.hardware.numCPU"
+        client._content = Mock()
+        client._content.propertyCollector.RetrievePropertiesEx.return_value.objects = [
+            Mock(propSet=[name_prop, cpu_prop])
+        ]
+        
+        result = client.get_properties(Mock(), vim.VirtualMachine,
+                                       ['name', 'config.hardware.numCPU', 'guest.ipAddress'])
+        
+        assert result == {"name": "test-vm", "config.hardware.numCPU": 4}
+        client._content.propertyCollector.RetrievePropertiesEx.assert_called_once()
+        mock_vmodl.query.PropertyCollector.PropertySpec.assert_called_once_with(
+            type=vim.VirtualMachine,
+            pathSet=['name', 'config.hardware.numCPU', 'guest.ipAddress']
+        )
+
+    def test_get_properties_no_objects(self):
+        """Test empty result when the object has no matching properties"""
+        client = VSphereClient(
+            host="vcenter.example.com",
+            username="admin@vsphere.local",
+            password="password"
+        )
+        client._content = Mock()
+        client._content.propertyCollector.RetrievePropertiesEx.return_value = None
+        
+        with patch('pod.infrastructure.vsphere.client.vmodl'):
+            assert client.get_properties(Mock(), vim.VirtualMachine, ['name']) == {}
+
+    @patch('pod.infrastructure.vsphere.client.vmodl')
+    def test_container_views_cached(self, mock_vmodl):
+        """Test repeated lookups reuse one ContainerView per type list"""
+        client = VSphereClient(
+            host="vcenter.example.com",
+            username="admin@vsphere.local",
+            password="password"
+        )
+        mock_content = Mock()
+        mock_content.propertyCollector.RetrievePropertiesEx.return_value = None
+        mock_content.viewManager.CreateContainerView.return_value.view = []
+        client._content = mock_content
+        
+        client.get_obj([vim.VirtualMachine], "vm-1")
+        client.get_obj([vim.VirtualMachine], "vm-2")
+        client.get_all_vms()
+        client.get_obj([vim.Network], "net-1")
+        
+        assert mock_content.viewManager.CreateContainerView.call_count == 2
+
+    @patch('pod.infrastructure.vsphere.client.connect.Disconnect')
+    def test_disconnect_destroys_cached_views(self, mock_disconnect):
+        """Test cached views are destroyed on disconnect"""
+        client = VSphereClient(
+            host="vcenter.example.com",
+            username="admin@vsphere.local",
+            password="password"
+        )
+        mock_view = Mock()
+        stale_view = Mock()
+        stale_view.Destroy.side_effect = Exception("session expired")
+        client._views = {(vim.VirtualMachine,): mock_view, (vim.Network,): stale_view}
+        client._service_instance = Mock()
+        client._content = Mock()
+        
+        client.disconnect()
+        
+        mock_view.Destroy.assert_called_once()
+        assert client._views == {}
+
+    def test_wait_for_task_async(self):
+        """Test async task wait runs the blocking wait off the event loop"""
+        client = VSphereClient(
+            host="vcenter.example.com",
+            username="admin@vsphere.local",
+            password="password"
+        )
+        mock_task = Mock()
+        mock_task.info.state = vim.TaskInfo.State.success
+        
+        assert asyncio.run(client.wait_for_task_async(mock_task)) is True
+
+    @patch('pod.infrastructure.vsphere.client.vmodl')
+    def test_get_all_vms_with_props_paginated(self, mock_vmodl):
+        """Test VM properties are fetched in pages of the requested size"""
+        client = VSphereClient(
+            host="vcenter.example.com",
+            username="admin@vsphere.local",
+            password="password"
+        )
+        mock_content = Mock()
+        collector = mock_content.propertyCollector
+        collector.RetrievePropertiesEx.return_value = self._mock_name_page(["vm-1", "vm-2"], token="page-2")
+        collector.ContinueRetrievePropertiesEx.return_value = self._mock_name_page(["vm-3"])
+        client._content = mock_content
+        
+        result = client.get_all_vms_with_props(['name'], page=2)
+        
+        assert [props for _, props in result] == [{"name": "vm-1"}, {"name": "vm-2"}, {"name": "vm-3"}]
+        assert [vm.name for vm, _ in result] == ["vm-1", "vm-2", "vm-3"]
+        mock_vmodl.query.PropertyCollector.RetrieveOptions.assert_called_once_with(maxObjects=2)
+        mock_vmodl.query.PropertyCollector.PropertySpec.assert_called_once_with(
+            type=vim.VirtualMachine, pathSet=['name']
+        )
+        collector.CancelRetrievePropertiesEx.assert_not_called()
+
+    @patch('pod.infrastructure.vsphere.client.vmodl')
+    def test_get_obj_uses_name_cache(self, mock_vmodl):
+        """Test repeated lookups validate the cached reference instead of rescanning"""
+        client = VSphereClient(
+            host="vcenter.example.com",
+            username="admin@vsphere.local",
+            password="password"
+        )
+        mock_content = Mock()
+        mock_content.propertyCollector.RetrievePropertiesEx.return_value = self._mock_name_page(["pg-100"])
+        client._content = mock_content
+        
+        first = client.get_obj([vim.Network], "pg-100")
+        with patch.object(client, 'get_properties', return_value={"name": "pg-100"}) as mock_props:
+            second = client.get_obj([vim.Network], "pg-100")
+        
+        assert second is first
+        mock_props.assert_called_once_with(first, vim.Network, ['name'])
+        mock_content.propertyCollector.RetrievePropertiesEx.assert_called_once()
+
+    @patch('pod.infrastructure.vsphere.client.vmodl')
+    def test_get_obj_evicts_stale_cache_entry(self, mock_vmodl):
+        """Test a renamed or deleted cached object triggers a fresh lookup"""
+        client = VSphereClient(
+            host="vcenter.example.com",
+            username="admin@vsphere.local",
+            password="password"
+        )
+        mock_content = Mock()
+        mock_content.propertyCollector.RetrievePropertiesEx.side_effect = [
+            self._mock_name_page(["pg-100"]), self._mock_name_page(["pg-100"])
+        ]
+        client._content = mock_content
+        
+        first = client.get_obj([vim.Network], "pg-100")
+        with patch.object(client, 'get_properties', return_value={"name": "renamed"}):
+            second = client.get_obj([vim.Network], "pg-100")
+        
+        assert second is not first
+        assert mock_content.propertyCollector.RetrievePropertiesEx.call_count == 2
+
+    @patch('pod.infrastructure.vsphere.client.vmodl')
+    def test_get_view_properties_temporary_view(self, mock_vmodl):
+        """Test properties below an arbitrary root use a view that is destroyed afterwards"""
+        client = VSphereClient(
+            host="vcenter.example.com",
+            username="admin@vsphere.local",
+            password="password"
+        )
+        mock_content = Mock()
+        mock_container = Mock()
+        mock_root = Mock()
+        mock_content.viewManager.CreateContainerView.return_value = mock_container
+        mock_content.propertyCollector.RetrievePropertiesEx.return_value = self._mock_name_page(["folder-a"])
+        client._content = mock_content
+        
+        result = client.get_view_properties(mock_root, [vim.Folder], ['name'])
+        
+        assert [props for _, props in result] == [{"name": "folder-a"}]
+        mock_content.viewManager.CreateContainerView.assert_called_once_with(mock_root, [vim.Folder], True)
+        mock_container.Destroy.assert_called_once()
+        assert client._views == {}
+
+    @patch('pod.infrastructure.vsphere.client.vmodl')
+    def test_task_monitor_resolves_many_tasks(self, mock_vmodl):
+        """Test one collector and waiter resolve futures for several tasks"""
+        client = VSphereClient(
+            host="vcenter.example.com",
+            username="admin@vsphere.local",
+            password="password"
+        )
+        mock_collector = Mock()
+        client._content = Mock()
+        client._content.propertyCollector.CreatePropertyCollector.return_value = mock_collector
+        
+        tasks = [Mock(_moId=f"task-{i}") for i in range(2)]
+        
+        def update_for(task, state, error=None):
+            state_change = Mock(val=state)
+            state_change.name = "info.state"
+            error_change = Mock(val=error)
+            error_change.name = "info.error"
+            return Mock(obj=task, changeSet=[state_change, error_change])
+        
+        update = Mock(version="1")
+        update.filterSet = [Mock(objectSet=[
+            update_for(tasks[0], vim.TaskInfo.State.success),
+            update_for(tasks[1], vim.TaskInfo.State.error, "no space")
+        ])]
+        release = threading.Event()
+        mock_collector.WaitForUpdatesEx.side_effect = lambda *args: update if release.wait(5) else None
+        
+        futures = [client.watch_task(task) for task in tasks]
+        release.set()
+        
+        assert futures[0].result(timeout=5) is True
+        with pytest.raises(Exception, match="no space"):
+            futures[1].result(timeout=5)
+        client._content.propertyCollector.CreatePropertyCollector.assert_called_once()
+        assert mock_collector.CreateFilter.call_count == 2
+        
+        client._task_monitor.close()
+        mock_collector.Destroy.assert_called_once()
+
+    @patch('pod.infrastructure.vsphere.client.vmodl')
+    def test_get_properties_many(self, mock_vmodl):
+        """Test properties of several objects are fetched in one call"""
+        client = VSphereClient(
+            host="vcenter.example.com",
+            username="admin@vsphere.local",
+            password="password"
+        )
+        client._content = Mock()
+        page = self._mock_name_page(["net-a", "net-b"])
+        client._content.propertyCollector.RetrievePropertiesEx.return_value = page
+        
+        result = client.get_properties_many([Mock(), Mock()], vim.Network, ['name'])
+        
+        assert sorted(props['name'] for props in result.values()) == ["net-a", "net-b"]
+        client._content.propertyCollector.RetrievePropertiesEx.assert_called_once()
+        assert client.get_properties_many([], vim.Network, ['name']) == {}
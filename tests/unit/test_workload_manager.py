@@ -0,0 +1,279 @@
+"""
+Unit tests for Kubernetes workload manager
+"""
+
+import asyncio
+import pytest
+from unittest.mock import Mock, PropertyMock, patch
+from pod.infrastructure.kubernetes.workload_manager import WorkloadManager
+from pod.network.cni import CNIConfig
+from pod.exceptions import ProviderError
+from kubernetes.client.rest import ApiException
+
+
+def _detected(**enabled):
+    """Build a CNI detection map with the given plugins enabled"""
+    detected = {name: False for name in ("calico", "cilium", "flannel", "weave", "multus", "sriov")}
+    detected.update(enabled)
+    return detected
+
+
+class TestWorkloadManager:
+    """Test Kubernetes workload manager"""
+
+    @pytest.fixture
+    def mock_connection(self):
+        """Create mock Kubernetes connection"""
+        connection = Mock()
+        connection.namespace = "test-namespace"
+        return connection
+
+    def _create_manager(self, connection, detected):
+        """Create workload manager with a mocked CNI manager"""
+        with patch('pod.infrastructure.kubernetes.workload_manager.CNIManager') as mock_cni_cls:
+            mock_cni_cls.return_value.detected_cnis = detected
+            return WorkloadManager(connection)
+
+    def test_init_makes_no_api_calls(self, mock_connection):
+        """Test construction defers CNI detection until a workload needs it"""
+        with patch('pod.infrastructure.kubernetes.workload_manager.CNIManager') as mock_cni_cls:
+            detected_cnis = PropertyMock(return_value=_detected(calico=True))
+            type(mock_cni_cls.return_value).detected_cnis = detected_cnis
+            manager = WorkloadManager(mock_connection)
+
+            detected_cnis.assert_not_called()
+            assert manager._vlan_handler == manager._apply_calico_ip_pool
+            assert manager._vlan_handler == manager._apply_calico_ip_pool
+            detected_cnis.assert_called_once()
+
+    def test_init_resolves_calico_handler(self, mock_connection):
+        """Test Calico is selected for VLAN isolation"""
+        manager = self._create_manager(mock_connection, _detected(calico=True, cilium=True))
+
+        assert manager._vlan_handler == manager._apply_calico_ip_pool
+        assert manager._multus_enabled is False
+
+    def test_init_resolves_cilium_handler(self, mock_connection):
+        """Test Cilium is selected when Calico is absent"""
+        manager = self._create_manager(mock_connection, _detected(cilium=True, multus=True))
+
+        assert manager._vlan_handler == manager._apply_cilium_policy
+        assert manager._multus_enabled is True
+
+    def test_init_without_vlan_cni(self, mock_connection):
+        """Test no VLAN handler when no supporting CNI is detected"""
+        manager = self._create_manager(mock_connection, _detected(flannel=True))
+
+        assert manager._vlan_handler is None
+
+    def test_setup_network_configuration_calico(self, mock_connection):
+        """Test network setup creates Calico IP pool"""
+        manager = self._create_manager(mock_connection, _detected(calico=True))
+        config = CNIConfig(name="vlan-net", type="macvlan", vlan_id=100)
+
+        manager._setup_network_configuration(config, "test-namespace")
+
+        manager.cni_manager.create_calico_ip_pool.assert_called_once_with(
+            name="vlan-100-pool",
+            cidr="192.168.100.0/24",
+            vlan_id=100
+        )
+        manager.cni_manager.create_network_attachment_definition.assert_not_called()
+        manager.cni_manager.apply_network_configuration.assert_called_once()
+
+    def test_setup_network_configuration_multus_and_cilium(self, mock_connection):
+        """Test network setup with Multus attachment and Cilium policy"""
+        manager = self._create_manager(mock_connection, _detected(multus=True, cilium=True))
+        manager.cni_manager.create_network_attachment_definition.return_value = {"metadata": {}}
+        config = CNIConfig(name="vlan-net", type="macvlan", vlan_id=200)
+
+        manager._setup_network_configuration(config, "test-namespace")
+
+        manager.cni_manager.create_network_attachment_definition.assert_called_once_with(config)
+        manager.cni_manager.create_cilium_network_policy.assert_called_once()
+        assert manager.cni_manager.apply_network_configuration.call_count == 2
+
+    def test_setup_network_configuration_no_vlan(self, mock_connection):
+        """Test VLAN isolation is skipped without a VLAN ID"""
+        manager = self._create_manager(mock_connection, _detected(calico=True))
+        config = CNIConfig(name="plain-net", type="bridge")
+
+        manager._setup_network_configuration(config, "test-namespace")
+
+        manager.cni_manager.create_calico_ip_pool.assert_not_called()
+        manager.cni_manager.apply_network_configuration.assert_not_called()
+
+    def test_create_hpa_cpu_only(self, mock_connection):
+        """Test HPA creation with CPU metric only"""
+        manager = self._create_manager(mock_connection, _detected())
+
+        result = manager.create_hpa("web-hpa", "web", cpu_percent=70)
+
+        body = mock_connection.autoscaling_v2.create_namespaced_horizontal_pod_autoscaler.call_args.kwargs["body"]
+        assert body["spec"]["metrics"] == [{
+            "type": "Resource",
+            "resource": {
+                "name": "cpu",
+                "target": {"type": "Utilization", "averageUtilization": 70}
+            }
+        }]
+        assert result["target"] == "Deployment/web"
+        assert result["status"] == "created"
+
+    def test_create_hpa_with_memory(self, mock_connection):
+        """Test HPA creation with CPU and memory metrics"""
+        manager = self._create_manager(mock_connection, _detected())
+
+        manager.create_hpa("web-hpa", "web", cpu_percent=70, memory_percent=60)
+
+        body = mock_connection.autoscaling_v2.create_namespaced_horizontal_pod_autoscaler.call_args.kwargs["body"]
+        metrics = body["spec"]["metrics"]
+        assert [m["resource"]["name"] for m in metrics] == ["cpu", "memory"]
+        assert metrics[1]["resource"]["target"]["averageUtilization"] == 60
+
+    def test_create_many_async_deployments(self, mock_connection):
+        """Test concurrent creation of multiple deployments"""
+        manager = self._create_manager(mock_connection, _detected())
+        mock_connection.apps_v1.create_namespaced_deployment.return_value.metadata.uid = "uid-1"
+        specs = [{"name": f"web-{i}", "image": "nginx"} for i in range(3)]
+
+        results = asyncio.run(manager.create_many_async(specs))
+
+        assert [r["name"] for r in results] == ["web-0", "web-1", "web-2"]
+        assert mock_connection.apps_v1.create_namespaced_deployment.call_count == 3
+
+    def test_create_job_async(self, mock_connection):
+        """Test async job creation delegates to sync implementation"""
+        manager = self._create_manager(mock_connection, _detected())
+
+        result = asyncio.run(manager.create_job_async("batch", "busybox", ["echo", "hi"], backoff_limit=1))
+
+        assert result["backoff_limit"] == 1
+        mock_connection.batch_v1.create_namespaced_job.assert_called_once()
+
+    def test_create_many_async_unsupported_type(self, mock_connection):
+        """Test bulk creation rejects unknown workload types"""
+        manager = self._create_manager(mock_connection, _detected())
+
+        with pytest.raises(ProviderError, match="Unsupported workload type"):
+            asyncio.run(manager.create_many_async([], workload_type="daemonset"))
+
+    def test_create_advanced_deployment_does_not_mutate_inputs(self, mock_connection):
+        """Test caller-supplied labels and annotations are left untouched"""
+        manager = self._create_manager(mock_connection, _detected(multus=True))
+        manager.cni_manager.create_network_attachment_definition.return_value = {"metadata": {}}
+        labels = {"tier": "frontend"}
+        annotations = {"owner": "team-a"}
+        config = CNIConfig(name="vlan-net", type="macvlan", vlan_id=100)
+
+        result = manager.create_advanced_deployment(
+            "web", "nginx", labels=labels, annotations=annotations, network_config=config
+        )
+
+        assert labels == {"tier": "frontend"}
+        assert annotations == {"owner": "team-a"}
+        assert result["labels"] == {"tier": "frontend", "app": "web", "vlan-100": "true"}
+
+        body = mock_connection.apps_v1.create_namespaced_deployment.call_args.kwargs["body"]
+        assert body["spec"]["template"]["metadata"]["annotations"] == {
+            "owner": "team-a",
+            "k8s.v1.cni.cncf.io/networks": "vlan-net"
+        }
+
+    def test_create_job_does_not_mutate_labels(self, mock_connection):
+        """Test job creation copies caller labels"""
+        manager = self._create_manager(mock_connection, _detected())
+        labels = {"team": "qa"}
+
+        manager.create_job("batch", "busybox", ["true"], labels=labels)
+
+        body = mock_connection.batch_v1.create_namespaced_job.call_args.kwargs["body"]
+        assert labels == {"team": "qa"}
+        assert body["metadata"]["labels"] == {"team": "qa", "app": "batch", "type": "job"}
+
+    def _mock_deployment(self, name, revision="1"):
+        """Create mock deployment object"""
+        deployment = Mock()
+        deployment.metadata.name = name
+        deployment.metadata.annotations = {"deployment.kubernetes.io/revision": revision}
+        deployment.spec.replicas = 2
+        deployment.spec.strategy.type = "RollingUpdate"
+        deployment.status.replicas = 2
+        deployment.status.ready_replicas = 2
+        deployment.status.available_replicas = 2
+        deployment.status.unavailable_replicas = None
+        deployment.status.conditions = None
+        return deployment
+
+    def test_get_many_deployment_status_paginates(self, mock_connection):
+        """Test batched status follows continue tokens without per-item reads"""
+        manager = self._create_manager(mock_connection, _detected())
+        first_page = Mock(items=[self._mock_deployment("web")])
+        first_page.metadata._continue = "next-token"
+        second_page = Mock(items=[self._mock_deployment("api", revision="3")])
+        second_page.metadata._continue = None
+        mock_connection.apps_v1.list_namespaced_deployment.side_effect = [first_page, second_page]
+
+        statuses = manager.get_many_deployment_status("prod", label_selector="tier=frontend")
+
+        assert set(statuses) == {"web", "api"}
+        assert statuses["api"]["revision"] == "3"
+        assert statuses["web"]["replicas"]["unavailable"] == 0
+        calls = mock_connection.apps_v1.list_namespaced_deployment.call_args_list
+        assert calls[0].kwargs["_continue"] is None
+        assert calls[1].kwargs["_continue"] == "next-token"
+        assert calls[1].kwargs["label_selector"] == "tier=frontend"
+        mock_connection.apps_v1.read_namespaced_deployment.assert_not_called()
+
+    def test_warmup_primes_api_clients(self, mock_connection):
+        """Test warmup touches discovery on every API group in the background"""
+        with patch('pod.infrastructure.kubernetes.workload_manager.CNIManager') as mock_cni_cls:
+            mock_cni_cls.return_value.detected_cnis = _detected()
+            manager = WorkloadManager(mock_connection, warmup=True)
+        manager._warmup_thread.join(timeout=5)
+
+        for api in ("v1", "apps_v1", "batch_v1", "autoscaling_v2"):
+            getattr(mock_connection, api).get_api_resources.assert_called_once()
+
+    def test_no_warmup_by_default(self, mock_connection):
+        """Test warmup is opt-in"""
+        manager = self._create_manager(mock_connection, _detected())
+
+        assert manager._warmup_thread is None
+        mock_connection.apps_v1.get_api_resources.assert_not_called()
+
+    def test_create_cronjob_env_vars(self, mock_connection):
+        """Test env vars are converted to container env entries"""
+        manager = self._create_manager(mock_connection, _detected())
+
+        manager.create_cronjob("nightly", "busybox", ["true"], "0 0 * * *",
+                               env_vars={"POD_NAME": "nightly", "MODE": "full"})
+
+        body = mock_connection.batch_v1.create_namespaced_cron_job.call_args.kwargs["body"]
+        container = body["spec"]["jobTemplate"]["spec"]["template"]["spec"]["containers"][0]
+        assert container["env"] == [
+            {"name": "POD_NAME", "value": "nightly"},
+            {"name": "MODE", "value": "full"}
+        ]
+
+    def test_rollback_deployment_patches_annotation_only(self, mock_connection):
+        """Test rollback sends a small annotation patch without reading the deployment"""
+        manager = self._create_manager(mock_connection, _detected())
+
+        assert manager.rollback_deployment("web", "prod", revision=3) is True
+
+        mock_connection.apps_v1.read_namespaced_deployment.assert_not_called()
+        mock_connection.apps_v1.patch_namespaced_deployment.assert_called_once_with(
+            name="web",
+            namespace="prod",
+            body={"spec": {"template": {"metadata": {"annotations": {
+                "deployment.kubernetes.io/rollback": "3"
+            }}}}}
+        )
+
+    def test_rollback_deployment_api_error(self, mock_connection):
+        """Test rollback returns False on API errors"""
+        manager = self._create_manager(mock_connection, _detected())
+        mock_connection.apps_v1.patch_namespaced_deployment.side_effect = ApiException(status=404)
+
+        assert manager.rollback_deployment("missing") is False